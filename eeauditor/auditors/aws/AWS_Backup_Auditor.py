@@ -22,6 +22,7 @@ import datetime
 import botocore.exceptions
 from dateutil.parser import parse
 from check_register import CheckRegister
+from collectors.aws_dynamodb_collector import get_dynamodb_tables
 import base64
 import json
 from botocore.config import Config
@@ -81,21 +82,6 @@ def describe_instances(cache, session):
         cache["describe_instances"] = instanceList
         return cache["describe_instances"]
 
-# loop through DynamoDB tables
-def list_tables(cache, session):
-    dynamodb = session.client("dynamodb")
-    ddbTables = []
-    response = cache.get("list_tables")
-    if response:
-        return response
-    paginator = dynamodb.get_paginator("list_tables")
-    if paginator:
-        for page in paginator.paginate():
-            for cluster in page["TableNames"]:
-                ddbTables.append(cluster)
-        cache["list_tables"] = ddbTables
-        return cache["list_tables"]
-
 # loop through RDS/Aurora DB Instances
 def describe_db_instances(cache, session):
     rds = session.client("rds")
@@ -522,14 +508,13 @@ def ec2_backup_check(cache: dict, session, awsAccountId: str, awsRegion: str, aw
 def ddb_backup_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Backup.3] DynamoDB tables should be protected by AWS Backup"""
     backup = session.client("backup")
-    dynamodb = session.client("dynamodb")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
-    for table in list_tables(cache, session):
+    for response in get_dynamodb_tables(session):
+        table = response["Table"]["TableName"]
         # B64 encode all of the details for the Asset
         assetJson = json.dumps(table,default=str).encode("utf-8")
         assetB64 = base64.b64encode(assetJson)
-        response = dynamodb.describe_table(TableName=table)
         tableArn = str(response["Table"]["TableArn"])
         tableName = str(response["Table"]["TableName"])
         # this is a passing check
@@ -24,6 +24,8 @@ import datetime
 import base64
 import json
 from botocore.exceptions import ClientError
+from collectors.aws_cloudwatch_collector import get_metric_filter_alarm_index, metric_filter_has_alarm
+from collectors.aws_s3_collector import get_bucket_configuration
 
 logger = logging.getLogger(__name__)
 
@@ -40,20 +42,18 @@ def get_all_shadow_trails(cache, session):
     return cache["get_all_shadow_trails"]
 
 def check_if_bucket_is_public(session, bucketName):
-    s3 = session.client("s3")
-
-    try:
-        bucketPublic = s3.get_bucket_policy_status(Bucket=bucketName)["PolicyStatus"]["IsPublic"]
-    except ClientError:
+    # the bucket configuration is shared with the S3 Auditor and every other Trail that logs to the same bucket
+    bucketConfig = get_bucket_configuration(session, bucketName, components=["PolicyStatus"])
+    if bucketConfig and bucketConfig["PolicyStatus"]:
+        bucketPublic = bucketConfig["PolicyStatus"]["IsPublic"]
+    else:
         bucketPublic = False
 
     return bucketPublic
 
 def check_bucket_server_access_logging(session, bucketName):
-    s3 = session.client("s3")
-
-    logging = s3.get_bucket_logging(Bucket=bucketName)
-    if "LoggingEnabled" in logging:
+    bucketConfig = get_bucket_configuration(session, bucketName, components=["Logging"])
+    if bucketConfig and bucketConfig["Logging"] and "LoggingEnabled" in bucketConfig["Logging"]:
         serverAccessLogging = True
     else:
         serverAccessLogging = False
@@ -930,7 +930,6 @@ def cloudtrail_log_file_validation_check(cache: dict, session, awsAccountId: str
 @registry.register_check("cloudtrail")
 def cloudtrail_bucket_public_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.6] AWS CloudTrail trail Amazon S3 logs bucket should not be publicly accessible"""
-    s3 = session.client("s3")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -942,10 +941,9 @@ def cloudtrail_bucket_public_check(cache: dict, session, awsAccountId: str, awsR
         bucketName = trail["S3BucketName"]
         # Get the bucket from the trail and pass it to another function to check if it is public facing. If so, that's really fucking bad and stupid
         # first, we need to use HeadBucket to make sure it's in our Account, if not we'll skip it
-        try:
-            s3.head_bucket(Bucket=bucketName)
+        if get_bucket_configuration(session, bucketName, components=[]) is not None:
             bucketInAccount = True
-        except ClientError:
+        else:
             print(f"S3 Bucket {bucketName} for AWS CloudTrail trail {trailName} is not located in this Account - skipping!")
             bucketInAccount = False
 
@@ -1085,7 +1083,6 @@ def cloudtrail_bucket_public_check(cache: dict, session, awsAccountId: str, awsR
 @registry.register_check("cloudtrail")
 def cloudtrail_bucket_server_access_logging_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.7] AWS CloudTrail trail Amazon S3 logs bucket should enable server access logging"""
-    s3 = session.client("s3")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -1097,10 +1094,9 @@ def cloudtrail_bucket_server_access_logging_check(cache: dict, session, awsAccou
         bucketName = trail["S3BucketName"]
         # Get the bucket from the trail and pass it to another function to check if it is public facing. If so, that's really fucking bad and stupid
         # first, we need to use HeadBucket to make sure it's in our Account, if not we'll skip it
-        try:
-            s3.head_bucket(Bucket=bucketName)
+        if get_bucket_configuration(session, bucketName, components=[]) is not None:
             bucketInAccount = True
-        except ClientError:
+        else:
             print(f"S3 Bucket {bucketName} for AWS CloudTrail trail {trailName} is not located in this Account - skipping!")
             bucketInAccount = False
 
@@ -1540,9 +1536,6 @@ def cloudtrail_s3_read_and_write_data_events_check(cache: dict, session, awsAcco
 @registry.register_check("cloudtrail")
 def cloudtrail_cloudwatch_metric_alarm_unauth_api_calls_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.9] AWS CloudTrail trails should have CloudWatch metrics and alarms configured to monitor unauthorized API calls"""
-    # CloudWatch Logs & CloudWatch Client
-    logs = session.client("logs")
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -1571,25 +1564,11 @@ def cloudtrail_cloudwatch_metric_alarm_unauth_api_calls_check(cache: dict, sessi
                     trailName, awsRegion
                 )
             else:
-                # Pull out the filters for the Log Group
-                metricFilters = logs.describe_metric_filters(
-                    logGroupName=logGroupName,
-                )["metricFilters"]
-                # Check if any filter matches the pattern being assessed
+                # Check if any filter on the Log Group matches the pattern being assessed and if the metric & namespace combo have an alarm
                 filterPattern = '{ ($.errorCode = *UnauthorizedOperation) || ($.errorCode = AccessDenied*) || ($.sourceIPAddress!=delivery.logs.amazonaws.com) || ($.eventName!=HeadBucket) }'
-                matchedPatterns = [filters for filters in metricFilters if filterPattern == filters["filterPattern"]]
-                # if there is content, we have match, now to check the alarm
-                if matchedPatterns:
-                    filterAlarmPassing = True
-                    # check if the metric & namespace combo have an alarm
-                    alarmCheck = cloudwatch.describe_alarms_for_metric(
-                        MetricName=matchedPatterns[0]["metricTransformations"][0]["metricName"],
-                        Namespace=matchedPatterns[0]["metricTransformations"][0]["metricNamespace"]
-                    )["MetricAlarms"]
-                    if not alarmCheck:
-                        filterAlarmPassing = False
-                else:
-                    filterAlarmPassing = False
+                filterAlarmPassing = metric_filter_has_alarm(
+                    get_metric_filter_alarm_index(cache, session), logGroupName, filterPattern
+                )
         else:
             filterAlarmPassing = False
 
@@ -1786,9 +1765,6 @@ def cloudtrail_cloudwatch_metric_alarm_unauth_api_calls_check(cache: dict, sessi
 @registry.register_check("cloudtrail")
 def cloudtrail_cloudwatch_metric_alarm_console_login_no_mfa_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.10] AWS CloudTrail trails should have CloudWatch metrics and alarms configured to monitor Management Console sign-in without MFA"""
-    # CloudWatch Logs & CloudWatch Client
-    logs = session.client("logs")
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -1817,25 +1793,11 @@ def cloudtrail_cloudwatch_metric_alarm_console_login_no_mfa_check(cache: dict, s
                     trailName, awsRegion
                 )
             else:
-                # Pull out the filters for the Log Group
-                metricFilters = logs.describe_metric_filters(
-                    logGroupName=logGroupName,
-                )["metricFilters"]
-                # Check if any filter matches the pattern being assessed
+                # Check if any filter on the Log Group matches the pattern being assessed and if the metric & namespace combo have an alarm
                 filterPattern = '{ ($.eventName = "ConsoleLogin") && ($.additionalEventData.MFAUsed != "Yes") }'
-                matchedPatterns = [filters for filters in metricFilters if filterPattern == filters["filterPattern"]]
-                # if there is content, we have match, now to check the alarm
-                if matchedPatterns:
-                    filterAlarmPassing = True
-                    # check if the metric & namespace combo have an alarm
-                    alarmCheck = cloudwatch.describe_alarms_for_metric(
-                        MetricName=matchedPatterns[0]["metricTransformations"][0]["metricName"],
-                        Namespace=matchedPatterns[0]["metricTransformations"][0]["metricNamespace"]
-                    )["MetricAlarms"]
-                    if not alarmCheck:
-                        filterAlarmPassing = False
-                else:
-                    filterAlarmPassing = False
+                filterAlarmPassing = metric_filter_has_alarm(
+                    get_metric_filter_alarm_index(cache, session), logGroupName, filterPattern
+                )
         else:
             filterAlarmPassing = False
 
@@ -2032,9 +1994,6 @@ def cloudtrail_cloudwatch_metric_alarm_console_login_no_mfa_check(cache: dict, s
 @registry.register_check("cloudtrail")
 def cloudtrail_cloudwatch_metric_alarm_root_user_usage_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.11] AWS CloudTrail trails should have CloudWatch metrics and alarms configured to monitor usage of 'root' account"""
-    # CloudWatch Logs & CloudWatch Client
-    logs = session.client("logs")
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -2063,25 +2022,11 @@ def cloudtrail_cloudwatch_metric_alarm_root_user_usage_check(cache: dict, sessio
                     trailName, awsRegion
                 )
             else:
-                # Pull out the filters for the Log Group
-                metricFilters = logs.describe_metric_filters(
-                    logGroupName=logGroupName,
-                )["metricFilters"]
-                # Check if any filter matches the pattern being assessed
+                # Check if any filter on the Log Group matches the pattern being assessed and if the metric & namespace combo have an alarm
                 filterPattern = '{ $.userIdentity.type = "Root" && $.userIdentity.invokedBy NOT EXISTS && $.eventType != "AwsServiceEvent" }'
-                matchedPatterns = [filters for filters in metricFilters if filterPattern == filters["filterPattern"]]
-                # if there is content, we have match, now to check the alarm
-                if matchedPatterns:
-                    filterAlarmPassing = True
-                    # check if the metric & namespace combo have an alarm
-                    alarmCheck = cloudwatch.describe_alarms_for_metric(
-                        MetricName=matchedPatterns[0]["metricTransformations"][0]["metricName"],
-                        Namespace=matchedPatterns[0]["metricTransformations"][0]["metricNamespace"]
-                    )["MetricAlarms"]
-                    if not alarmCheck:
-                        filterAlarmPassing = False
-                else:
-                    filterAlarmPassing = False
+                filterAlarmPassing = metric_filter_has_alarm(
+                    get_metric_filter_alarm_index(cache, session), logGroupName, filterPattern
+                )
         else:
             filterAlarmPassing = False
 
@@ -2278,9 +2223,6 @@ def cloudtrail_cloudwatch_metric_alarm_root_user_usage_check(cache: dict, sessio
 @registry.register_check("cloudtrail")
 def cloudtrail_cloudwatch_metric_alarm_iam_policy_changes_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.12] AWS CloudTrail trails should have CloudWatch metrics and alarms configured to monitor IAM policy changes"""
-    # CloudWatch Logs & CloudWatch Client
-    logs = session.client("logs")
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -2309,25 +2251,11 @@ def cloudtrail_cloudwatch_metric_alarm_iam_policy_changes_check(cache: dict, ses
                     trailName, awsRegion
                 )
             else:
-                # Pull out the filters for the Log Group
-                metricFilters = logs.describe_metric_filters(
-                    logGroupName=logGroupName,
-                )["metricFilters"]
-                # Check if any filter matches the pattern being assessed
+                # Check if any filter on the Log Group matches the pattern being assessed and if the metric & namespace combo have an alarm
                 filterPattern = '{ ($.eventName=DeleteGroupPolicy) || ($.eventName=DeleteRolePolicy) || ($.eventName=DeleteUserPolicy) || ($.eventName=PutGroupPolicy) || ($.eventName=PutRolePolicy) || ($.eventName=PutUserPolicy) || ($.eventName=CreatePolicy) || ($.eventName=DeletePolicy) || ($.eventName=CreatePolicyVersion) || ($.eventName=DeletePolicyVersion) || ($.eventName=AttachRolePolicy) || ($.eventName=DetachRolePolicy) || ($.eventName=AttachUserPolicy) || ($.eventName=DetachUserPolicy) || ($.eventName=AttachGroupPolicy) || ($.eventName=DetachGroupPolicy) }'
-                matchedPatterns = [filters for filters in metricFilters if filterPattern == filters["filterPattern"]]
-                # if there is content, we have match, now to check the alarm
-                if matchedPatterns:
-                    filterAlarmPassing = True
-                    # check if the metric & namespace combo have an alarm
-                    alarmCheck = cloudwatch.describe_alarms_for_metric(
-                        MetricName=matchedPatterns[0]["metricTransformations"][0]["metricName"],
-                        Namespace=matchedPatterns[0]["metricTransformations"][0]["metricNamespace"]
-                    )["MetricAlarms"]
-                    if not alarmCheck:
-                        filterAlarmPassing = False
-                else:
-                    filterAlarmPassing = False
+                filterAlarmPassing = metric_filter_has_alarm(
+                    get_metric_filter_alarm_index(cache, session), logGroupName, filterPattern
+                )
         else:
             filterAlarmPassing = False
 
@@ -2524,9 +2452,6 @@ def cloudtrail_cloudwatch_metric_alarm_iam_policy_changes_check(cache: dict, ses
 @registry.register_check("cloudtrail")
 def cloudtrail_cloudwatch_metric_alarm_cloudtrail_config_changes_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.13] AWS CloudTrail trails should have CloudWatch metrics and alarms configured to monitor CloudTrail configuration changes"""
-    # CloudWatch Logs & CloudWatch Client
-    logs = session.client("logs")
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -2555,25 +2480,11 @@ def cloudtrail_cloudwatch_metric_alarm_cloudtrail_config_changes_check(cache: di
                     trailName, awsRegion
                 )
             else:
-                # Pull out the filters for the Log Group
-                metricFilters = logs.describe_metric_filters(
-                    logGroupName=logGroupName,
-                )["metricFilters"]
-                # Check if any filter matches the pattern being assessed
+                # Check if any filter on the Log Group matches the pattern being assessed and if the metric & namespace combo have an alarm
                 filterPattern = '{ ($.eventName = CreateTrail) || ($.eventName = UpdateTrail) || ($.eventName = DeleteTrail) || ($.eventName = StartLogging) || ($.eventName = StopLogging) }'
-                matchedPatterns = [filters for filters in metricFilters if filterPattern == filters["filterPattern"]]
-                # if there is content, we have match, now to check the alarm
-                if matchedPatterns:
-                    filterAlarmPassing = True
-                    # check if the metric & namespace combo have an alarm
-                    alarmCheck = cloudwatch.describe_alarms_for_metric(
-                        MetricName=matchedPatterns[0]["metricTransformations"][0]["metricName"],
-                        Namespace=matchedPatterns[0]["metricTransformations"][0]["metricNamespace"]
-                    )["MetricAlarms"]
-                    if not alarmCheck:
-                        filterAlarmPassing = False
-                else:
-                    filterAlarmPassing = False
+                filterAlarmPassing = metric_filter_has_alarm(
+                    get_metric_filter_alarm_index(cache, session), logGroupName, filterPattern
+                )
         else:
             filterAlarmPassing = False
 
@@ -2770,9 +2681,6 @@ def cloudtrail_cloudwatch_metric_alarm_cloudtrail_config_changes_check(cache: di
 @registry.register_check("cloudtrail")
 def cloudtrail_cloudwatch_metric_alarm_console_authentication_failures_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.14] AWS CloudTrail trails should have CloudWatch metrics and alarms configured to monitor AWS Management Console authentication failures"""
-    # CloudWatch Logs & CloudWatch Client
-    logs = session.client("logs")
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -2801,25 +2709,11 @@ def cloudtrail_cloudwatch_metric_alarm_console_authentication_failures_check(cac
                     trailName, awsRegion
                 )
             else:
-                # Pull out the filters for the Log Group
-                metricFilters = logs.describe_metric_filters(
-                    logGroupName=logGroupName,
-                )["metricFilters"]
-                # Check if any filter matches the pattern being assessed
+                # Check if any filter on the Log Group matches the pattern being assessed and if the metric & namespace combo have an alarm
                 filterPattern = '{ ($.eventName = ConsoleLogin) && ($.errorMessage = "Failed authentication") }'
-                matchedPatterns = [filters for filters in metricFilters if filterPattern == filters["filterPattern"]]
-                # if there is content, we have match, now to check the alarm
-                if matchedPatterns:
-                    filterAlarmPassing = True
-                    # check if the metric & namespace combo have an alarm
-                    alarmCheck = cloudwatch.describe_alarms_for_metric(
-                        MetricName=matchedPatterns[0]["metricTransformations"][0]["metricName"],
-                        Namespace=matchedPatterns[0]["metricTransformations"][0]["metricNamespace"]
-                    )["MetricAlarms"]
-                    if not alarmCheck:
-                        filterAlarmPassing = False
-                else:
-                    filterAlarmPassing = False
+                filterAlarmPassing = metric_filter_has_alarm(
+                    get_metric_filter_alarm_index(cache, session), logGroupName, filterPattern
+                )
         else:
             filterAlarmPassing = False
 
@@ -3016,9 +2910,6 @@ def cloudtrail_cloudwatch_metric_alarm_console_authentication_failures_check(cac
 @registry.register_check("cloudtrail")
 def cloudtrail_cloudwatch_metric_alarm_disable_or_delete_aws_kms_cmks_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.15] AWS CloudTrail trails should have CloudWatch metrics and alarms configured to monitor disabling or scheduled deletion of customer created AWS KMS CMKs"""
-    # CloudWatch Logs & CloudWatch Client
-    logs = session.client("logs")
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -3047,25 +2938,11 @@ def cloudtrail_cloudwatch_metric_alarm_disable_or_delete_aws_kms_cmks_check(cach
                     trailName, awsRegion
                 )
             else:
-                # Pull out the filters for the Log Group
-                metricFilters = logs.describe_metric_filters(
-                    logGroupName=logGroupName,
-                )["metricFilters"]
-                # Check if any filter matches the pattern being assessed
+                # Check if any filter on the Log Group matches the pattern being assessed and if the metric & namespace combo have an alarm
                 filterPattern = '{ ($.eventSource = kms.amazonaws.com) && (($.eventName=DisableKey) || ($.eventName=ScheduleKeyDeletion)) }'
-                matchedPatterns = [filters for filters in metricFilters if filterPattern == filters["filterPattern"]]
-                # if there is content, we have match, now to check the alarm
-                if matchedPatterns:
-                    filterAlarmPassing = True
-                    # check if the metric & namespace combo have an alarm
-                    alarmCheck = cloudwatch.describe_alarms_for_metric(
-                        MetricName=matchedPatterns[0]["metricTransformations"][0]["metricName"],
-                        Namespace=matchedPatterns[0]["metricTransformations"][0]["metricNamespace"]
-                    )["MetricAlarms"]
-                    if not alarmCheck:
-                        filterAlarmPassing = False
-                else:
-                    filterAlarmPassing = False
+                filterAlarmPassing = metric_filter_has_alarm(
+                    get_metric_filter_alarm_index(cache, session), logGroupName, filterPattern
+                )
         else:
             filterAlarmPassing = False
 
@@ -3262,9 +3139,6 @@ def cloudtrail_cloudwatch_metric_alarm_disable_or_delete_aws_kms_cmks_check(cach
 @registry.register_check("cloudtrail")
 def cloudtrail_cloudwatch_metric_alarm_s3_bucket_policy_change_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.16] AWS CloudTrail trails should have CloudWatch metrics and alarms configured to monitor Amazon S3 bucket policy changes"""
-    # CloudWatch Logs & CloudWatch Client
-    logs = session.client("logs")
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -3293,25 +3167,11 @@ def cloudtrail_cloudwatch_metric_alarm_s3_bucket_policy_change_check(cache: dict
                     trailName, awsRegion
                 )
             else:
-                # Pull out the filters for the Log Group
-                metricFilters = logs.describe_metric_filters(
-                    logGroupName=logGroupName,
-                )["metricFilters"]
-                # Check if any filter matches the pattern being assessed
+                # Check if any filter on the Log Group matches the pattern being assessed and if the metric & namespace combo have an alarm
                 filterPattern = '{ ($.eventSource = s3.amazonaws.com) && (($.eventName = PutBucketAcl) || ($.eventName = PutBucketPolicy) || ($.eventName = PutBucketCors) || ($.eventName = PutBucketLifecycle) || ($.eventName = PutBucketReplication) || ($.eventName = DeleteBucketPolicy) || ($.eventName = DeleteBucketCors) || ($.eventName = DeleteBucketLifecycle) || ($.eventName = DeleteBucketReplication)) }'
-                matchedPatterns = [filters for filters in metricFilters if filterPattern == filters["filterPattern"]]
-                # if there is content, we have match, now to check the alarm
-                if matchedPatterns:
-                    filterAlarmPassing = True
-                    # check if the metric & namespace combo have an alarm
-                    alarmCheck = cloudwatch.describe_alarms_for_metric(
-                        MetricName=matchedPatterns[0]["metricTransformations"][0]["metricName"],
-                        Namespace=matchedPatterns[0]["metricTransformations"][0]["metricNamespace"]
-                    )["MetricAlarms"]
-                    if not alarmCheck:
-                        filterAlarmPassing = False
-                else:
-                    filterAlarmPassing = False
+                filterAlarmPassing = metric_filter_has_alarm(
+                    get_metric_filter_alarm_index(cache, session), logGroupName, filterPattern
+                )
         else:
             filterAlarmPassing = False
 
@@ -3508,9 +3368,6 @@ def cloudtrail_cloudwatch_metric_alarm_s3_bucket_policy_change_check(cache: dict
 @registry.register_check("cloudtrail")
 def cloudtrail_cloudwatch_metric_alarm_aws_config_configuration_changes_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.17] AWS CloudTrail trails should have CloudWatch metrics and alarms configured to monitor AWS Config configuration changes"""
-    # CloudWatch Logs & CloudWatch Client
-    logs = session.client("logs")
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -3539,25 +3396,11 @@ def cloudtrail_cloudwatch_metric_alarm_aws_config_configuration_changes_check(ca
                     trailName, awsRegion
                 )
             else:
-                # Pull out the filters for the Log Group
-                metricFilters = logs.describe_metric_filters(
-                    logGroupName=logGroupName,
-                )["metricFilters"]
-                # Check if any filter matches the pattern being assessed
+                # Check if any filter on the Log Group matches the pattern being assessed and if the metric & namespace combo have an alarm
                 filterPattern = '{ ($.eventSource = config.amazonaws.com) && (($.eventName=StopConfigurationRecorder) || ($.eventName=DeleteDeliveryChannel) || ($.eventName=PutDeliveryChannel) || ($.eventName=PutConfigurationRecorder)) }'
-                matchedPatterns = [filters for filters in metricFilters if filterPattern == filters["filterPattern"]]
-                # if there is content, we have match, now to check the alarm
-                if matchedPatterns:
-                    filterAlarmPassing = True
-                    # check if the metric & namespace combo have an alarm
-                    alarmCheck = cloudwatch.describe_alarms_for_metric(
-                        MetricName=matchedPatterns[0]["metricTransformations"][0]["metricName"],
-                        Namespace=matchedPatterns[0]["metricTransformations"][0]["metricNamespace"]
-                    )["MetricAlarms"]
-                    if not alarmCheck:
-                        filterAlarmPassing = False
-                else:
-                    filterAlarmPassing = False
+                filterAlarmPassing = metric_filter_has_alarm(
+                    get_metric_filter_alarm_index(cache, session), logGroupName, filterPattern
+                )
         else:
             filterAlarmPassing = False
 
@@ -3754,9 +3597,6 @@ def cloudtrail_cloudwatch_metric_alarm_aws_config_configuration_changes_check(ca
 @registry.register_check("cloudtrail")
 def cloudtrail_cloudwatch_metric_alarm_security_group_changes_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.18] AWS CloudTrail trails should have CloudWatch metrics and alarms configured to monitor AWS EC2 security group changes"""
-    # CloudWatch Logs & CloudWatch Client
-    logs = session.client("logs")
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -3785,25 +3625,11 @@ def cloudtrail_cloudwatch_metric_alarm_security_group_changes_check(cache: dict,
                     trailName, awsRegion
                 )
             else:
-                # Pull out the filters for the Log Group
-                metricFilters = logs.describe_metric_filters(
-                    logGroupName=logGroupName,
-                )["metricFilters"]
-                # Check if any filter matches the pattern being assessed
+                # Check if any filter on the Log Group matches the pattern being assessed and if the metric & namespace combo have an alarm
                 filterPattern = '{ ($.eventName = AuthorizeSecurityGroupIngress) || ($.eventName = AuthorizeSecurityGroupEgress) || ($.eventName = RevokeSecurityGroupIngress) || ($.eventName = RevokeSecurityGroupEgress) || ($.eventName = CreateSecurityGroup) || ($.eventName = DeleteSecurityGroup) }'
-                matchedPatterns = [filters for filters in metricFilters if filterPattern == filters["filterPattern"]]
-                # if there is content, we have match, now to check the alarm
-                if matchedPatterns:
-                    filterAlarmPassing = True
-                    # check if the metric & namespace combo have an alarm
-                    alarmCheck = cloudwatch.describe_alarms_for_metric(
-                        MetricName=matchedPatterns[0]["metricTransformations"][0]["metricName"],
-                        Namespace=matchedPatterns[0]["metricTransformations"][0]["metricNamespace"]
-                    )["MetricAlarms"]
-                    if not alarmCheck:
-                        filterAlarmPassing = False
-                else:
-                    filterAlarmPassing = False
+                filterAlarmPassing = metric_filter_has_alarm(
+                    get_metric_filter_alarm_index(cache, session), logGroupName, filterPattern
+                )
         else:
             filterAlarmPassing = False
 
@@ -4000,9 +3826,6 @@ def cloudtrail_cloudwatch_metric_alarm_security_group_changes_check(cache: dict,
 @registry.register_check("cloudtrail")
 def cloudtrail_cloudwatch_metric_alarm_nacl_changes_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.19] AWS CloudTrail trails should have CloudWatch metrics and alarms configured to monitor Amazon VPC Network Access Control Lists (NACL) changes"""
-    # CloudWatch Logs & CloudWatch Client
-    logs = session.client("logs")
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -4031,25 +3854,11 @@ def cloudtrail_cloudwatch_metric_alarm_nacl_changes_check(cache: dict, session,
                     trailName, awsRegion
                 )
             else:
-                # Pull out the filters for the Log Group
-                metricFilters = logs.describe_metric_filters(
-                    logGroupName=logGroupName,
-                )["metricFilters"]
-                # Check if any filter matches the pattern being assessed
+                # Check if any filter on the Log Group matches the pattern being assessed and if the metric & namespace combo have an alarm
                 filterPattern = '{ ($.eventName = CreateNetworkAcl) || ($.eventName = CreateNetworkAclEntry) || ($.eventName = DeleteNetworkAcl) || ($.eventName = DeleteNetworkAclEntry) || ($.eventName = ReplaceNetworkAclEntry) || ($.eventName = ReplaceNetworkAclAssociation) }'
-                matchedPatterns = [filters for filters in metricFilters if filterPattern == filters["filterPattern"]]
-                # if there is content, we have match, now to check the alarm
-                if matchedPatterns:
-                    filterAlarmPassing = True
-                    # check if the metric & namespace combo have an alarm
-                    alarmCheck = cloudwatch.describe_alarms_for_metric(
-                        MetricName=matchedPatterns[0]["metricTransformations"][0]["metricName"],
-                        Namespace=matchedPatterns[0]["metricTransformations"][0]["metricNamespace"]
-                    )["MetricAlarms"]
-                    if not alarmCheck:
-                        filterAlarmPassing = False
-                else:
-                    filterAlarmPassing = False
+                filterAlarmPassing = metric_filter_has_alarm(
+                    get_metric_filter_alarm_index(cache, session), logGroupName, filterPattern
+                )
         else:
             filterAlarmPassing = False
 
@@ -4246,9 +4055,6 @@ def cloudtrail_cloudwatch_metric_alarm_nacl_changes_check(cache: dict, session,
 @registry.register_check("cloudtrail")
 def cloudtrail_cloudwatch_metric_alarm_network_gateway_changes_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.20] AWS CloudTrail trails should have CloudWatch metrics and alarms configured to monitor network gateway changes"""
-    # CloudWatch Logs & CloudWatch Client
-    logs = session.client("logs")
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -4277,25 +4083,11 @@ def cloudtrail_cloudwatch_metric_alarm_network_gateway_changes_check(cache: dict
                     trailName, awsRegion
                 )
             else:
-                # Pull out the filters for the Log Group
-                metricFilters = logs.describe_metric_filters(
-                    logGroupName=logGroupName,
-                )["metricFilters"]
-                # Check if any filter matches the pattern being assessed
+                # Check if any filter on the Log Group matches the pattern being assessed and if the metric & namespace combo have an alarm
                 filterPattern = '{ ($.eventName = CreateCustomerGateway) || ($.eventName = DeleteCustomerGateway) || ($.eventName = AttachInternetGateway) || ($.eventName = CreateInternetGateway) || ($.eventName = DeleteInternetGateway) || ($.eventName = DetachInternetGateway) }'
-                matchedPatterns = [filters for filters in metricFilters if filterPattern == filters["filterPattern"]]
-                # if there is content, we have match, now to check the alarm
-                if matchedPatterns:
-                    filterAlarmPassing = True
-                    # check if the metric & namespace combo have an alarm
-                    alarmCheck = cloudwatch.describe_alarms_for_metric(
-                        MetricName=matchedPatterns[0]["metricTransformations"][0]["metricName"],
-                        Namespace=matchedPatterns[0]["metricTransformations"][0]["metricNamespace"]
-                    )["MetricAlarms"]
-                    if not alarmCheck:
-                        filterAlarmPassing = False
-                else:
-                    filterAlarmPassing = False
+                filterAlarmPassing = metric_filter_has_alarm(
+                    get_metric_filter_alarm_index(cache, session), logGroupName, filterPattern
+                )
         else:
             filterAlarmPassing = False
 
@@ -4492,9 +4284,6 @@ def cloudtrail_cloudwatch_metric_alarm_network_gateway_changes_check(cache: dict
 @registry.register_check("cloudtrail")
 def cloudtrail_cloudwatch_metric_alarm_vpc_route_table_changes_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.21] AWS CloudTrail trails should have CloudWatch metrics and alarms configured to monitor Amazon VPC route table changes"""
-    # CloudWatch Logs & CloudWatch Client
-    logs = session.client("logs")
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -4523,25 +4312,11 @@ def cloudtrail_cloudwatch_metric_alarm_vpc_route_table_changes_check(cache: dict
                     trailName, awsRegion
                 )
             else:
-                # Pull out the filters for the Log Group
-                metricFilters = logs.describe_metric_filters(
-                    logGroupName=logGroupName,
-                )["metricFilters"]
-                # Check if any filter matches the pattern being assessed
+                # Check if any filter on the Log Group matches the pattern being assessed and if the metric & namespace combo have an alarm
                 filterPattern = '{ ($.eventName = CreateRoute) || ($.eventName = CreateRouteTable) || ($.eventName = ReplaceRoute) || ($.eventName = ReplaceRouteTableAssociation) || ($.eventName = DeleteRouteTable) || ($.eventName = DeleteRoute) || ($.eventName = DisassociateRouteTable) }'
-                matchedPatterns = [filters for filters in metricFilters if filterPattern == filters["filterPattern"]]
-                # if there is content, we have match, now to check the alarm
-                if matchedPatterns:
-                    filterAlarmPassing = True
-                    # check if the metric & namespace combo have an alarm
-                    alarmCheck = cloudwatch.describe_alarms_for_metric(
-                        MetricName=matchedPatterns[0]["metricTransformations"][0]["metricName"],
-                        Namespace=matchedPatterns[0]["metricTransformations"][0]["metricNamespace"]
-                    )["MetricAlarms"]
-                    if not alarmCheck:
-                        filterAlarmPassing = False
-                else:
-                    filterAlarmPassing = False
+                filterAlarmPassing = metric_filter_has_alarm(
+                    get_metric_filter_alarm_index(cache, session), logGroupName, filterPattern
+                )
         else:
             filterAlarmPassing = False
 
@@ -4738,9 +4513,6 @@ def cloudtrail_cloudwatch_metric_alarm_vpc_route_table_changes_check(cache: dict
 @registry.register_check("cloudtrail")
 def cloudtrail_cloudwatch_metric_alarm_vpc_changes_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.22] AWS CloudTrail trails should have CloudWatch metrics and alarms configured to monitor Amazon VPC changes"""
-    # CloudWatch Logs & CloudWatch Client
-    logs = session.client("logs")
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -4769,25 +4541,11 @@ def cloudtrail_cloudwatch_metric_alarm_vpc_changes_check(cache: dict, session, a
                     trailName, awsRegion
                 )
             else:
-                # Pull out the filters for the Log Group
-                metricFilters = logs.describe_metric_filters(
-                    logGroupName=logGroupName,
-                )["metricFilters"]
-                # Check if any filter matches the pattern being assessed
+                # Check if any filter on the Log Group matches the pattern being assessed and if the metric & namespace combo have an alarm
                 filterPattern = '{ ($.eventName = CreateVpc) || ($.eventName = DeleteVpc) || ($.eventName = ModifyVpcAttribute) || ($.eventName = AcceptVpcPeeringConnection) || ($.eventName = CreateVpcPeeringConnection) || ($.eventName = DeleteVpcPeeringConnection) || ($.eventName = RejectVpcPeeringConnection) || ($.eventName = AttachClassicLinkVpc) || ($.eventName = DetachClassicLinkVpc) || ($.eventName = DisableVpcClassicLink) || ($.eventName = EnableVpcClassicLink) }'
-                matchedPatterns = [filters for filters in metricFilters if filterPattern == filters["filterPattern"]]
-                # if there is content, we have match, now to check the alarm
-                if matchedPatterns:
-                    filterAlarmPassing = True
-                    # check if the metric & namespace combo have an alarm
-                    alarmCheck = cloudwatch.describe_alarms_for_metric(
-                        MetricName=matchedPatterns[0]["metricTransformations"][0]["metricName"],
-                        Namespace=matchedPatterns[0]["metricTransformations"][0]["metricNamespace"]
-                    )["MetricAlarms"]
-                    if not alarmCheck:
-                        filterAlarmPassing = False
-                else:
-                    filterAlarmPassing = False
+                filterAlarmPassing = metric_filter_has_alarm(
+                    get_metric_filter_alarm_index(cache, session), logGroupName, filterPattern
+                )
         else:
             filterAlarmPassing = False
 
@@ -4984,9 +4742,6 @@ def cloudtrail_cloudwatch_metric_alarm_vpc_changes_check(cache: dict, session, a
 @registry.register_check("cloudtrail")
 def cloudtrail_cloudwatch_metric_alarm_aws_organizations_changes_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[CloudTrail.23] AWS CloudTrail trails should have CloudWatch metrics and alarms configured to monitor AWS Organizations changes"""
-    # CloudWatch Logs & CloudWatch Client
-    logs = session.client("logs")
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for trail in get_all_shadow_trails(cache, session):
@@ -5015,25 +4770,11 @@ def cloudtrail_cloudwatch_metric_alarm_aws_organizations_changes_check(cache: di
                     trailName, awsRegion
                 )
             else:
-                # Pull out the filters for the Log Group
-                metricFilters = logs.describe_metric_filters(
-                    logGroupName=logGroupName,
-                )["metricFilters"]
-                # Check if any filter matches the pattern being assessed
+                # Check if any filter on the Log Group matches the pattern being assessed and if the metric & namespace combo have an alarm
                 filterPattern = '{ ($.eventSource = organizations.amazonaws.com) && (($.eventName = "AcceptHandshake") || ($.eventName = "AttachPolicy") || ($.eventName = "CreateAccount") || ($.eventName = "CreateOrganizationalUnit") || ($.eventName = "CreatePolicy") || ($.eventName = "DeclineHandshake") || ($.eventName = "DeleteOrganization") || ($.eventName = "DeleteOrganizationalUnit") || ($.eventName = "DeletePolicy") || ($.eventName = "DetachPolicy") || ($.eventName = "DisablePolicyType") || ($.eventName = "EnablePolicyType") || ($.eventName = "InviteAccountToOrganization") || ($.eventName = "LeaveOrganization") || ($.eventName = "MoveAccount") || ($.eventName = "RemoveAccountFromOrganization") || ($.eventName = "UpdatePolicy") || ($.eventName = "UpdateOrganizationalUnit")) }'
-                matchedPatterns = [filters for filters in metricFilters if filterPattern == filters["filterPattern"]]
-                # if there is content, we have match, now to check the alarm
-                if matchedPatterns:
-                    filterAlarmPassing = True
-                    # check if the metric & namespace combo have an alarm
-                    alarmCheck = cloudwatch.describe_alarms_for_metric(
-                        MetricName=matchedPatterns[0]["metricTransformations"][0]["metricName"],
-                        Namespace=matchedPatterns[0]["metricTransformations"][0]["metricNamespace"]
-                    )["MetricAlarms"]
-                    if not alarmCheck:
-                        filterAlarmPassing = False
-                else:
-                    filterAlarmPassing = False
+                filterAlarmPassing = metric_filter_has_alarm(
+                    get_metric_filter_alarm_index(cache, session), logGroupName, filterPattern
+                )
         else:
             filterAlarmPassing = False
 
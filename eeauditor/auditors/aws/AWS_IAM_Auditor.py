@@ -23,6 +23,7 @@ import datetime
 from check_register import CheckRegister
 import base64
 import json
+from collectors.aws_iam_collector import get_iam_inventory, get_policy_default_document
 
 registry = CheckRegister()
 
@@ -51,20 +52,22 @@ def get_iam_users(cache, session):
     response = cache.get("get_iam_users")
     if response:
         return response
-    
-    iam = session.client("iam")
 
-    cache["get_iam_users"] = iam.list_users(MaxItems=1000)["Users"]
+    cache["get_iam_users"] = [record["User"] for record in get_iam_inventory(cache, session)["Users"].values()]
     return cache["get_iam_users"]
 
+def get_iam_user_record(cache, session, userName):
+    return get_iam_inventory(cache, session)["Users"][userName]
+
 def get_custom_policies(cache, session):
     response = cache.get("get_custom_policies")
     if response:
         return response
-    
-    iam = session.client("iam")
 
-    cache["get_custom_policies"] = iam.list_policies(Scope="Local")["Policies"]
+    # drop the version documents so the Asset details match ListPolicies
+    cache["get_custom_policies"] = [
+        {k: v for k, v in policy.items() if k != "PolicyVersionList"} for policy in get_iam_inventory(cache, session)["Policies"].values()
+    ]
     return cache["get_custom_policies"]
 
 def get_managed_policies(cache, session):
@@ -85,20 +88,22 @@ def get_iam_groups(cache, session):
     response = cache.get("get_iam_groups")
     if response:
         return response
-    
-    iam = session.client("iam")
 
-    cache["get_iam_groups"] = iam.list_groups()["Groups"]
+    # drop the policy lists so the Asset details match ListGroups
+    cache["get_iam_groups"] = [
+        {k: v for k, v in group.items() if k not in ["GroupPolicyList", "AttachedManagedPolicies"]} for group in get_iam_inventory(cache, session)["Groups"].values()
+    ]
     return cache["get_iam_groups"]
 
 def get_iam_roles(cache, session):
     response = cache.get("get_iam_roles")
     if response:
         return response
-    
-    iam = session.client("iam")
 
-    cache["get_iam_roles"] = iam.list_roles()["Roles"]
+    # drop the policy and instance profile lists so the Asset details match ListRoles
+    cache["get_iam_roles"] = [
+        {k: v for k, v in role.items() if k not in ["RolePolicyList", "AttachedManagedPolicies", "InstanceProfileList"]} for role in get_iam_inventory(cache, session)["Roles"].values()
+    ]
     return cache["get_iam_roles"]
 
 def get_account_summary(cache, session):
@@ -124,7 +129,6 @@ def get_virtual_mfa(cache, session):
 @registry.register_check("iam")
 def iam_access_key_age_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.1] IAM Access Keys should be rotated every 90 days"""
-    iam = session.client("iam")
     todaysDatetime = datetime.datetime.now(datetime.timezone.utc)
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
@@ -132,7 +136,8 @@ def iam_access_key_age_check(cache: dict, session, awsAccountId: str, awsRegion:
         userName = users["UserName"]
         userArn = users["Arn"]
         # Get keys per User
-        for keys in iam.list_access_keys(UserName=userName)["AccessKeyMetadata"]:
+        for accessKey in get_iam_user_record(cache, session, userName)["AccessKeys"]:
+            keys = accessKey["Metadata"]
             # B64 encode all of the details for the Asset
             assetJson = json.dumps(keys,default=str).encode("utf-8")
             assetB64 = base64.b64encode(assetJson)
@@ -477,7 +482,6 @@ def user_permission_boundary_check(cache: dict, session, awsAccountId: str, awsR
 @registry.register_check("iam")
 def user_mfa_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.3] IAM users with passwords should have Multi-Factor Authentication (MFA) enabled"""
-    iam = session.client("iam")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for users in get_iam_users(cache, session):
@@ -486,11 +490,17 @@ def user_mfa_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsP
         assetB64 = base64.b64encode(assetJson)
         userName = users["UserName"]
         userArn = users["Arn"]
-        # check if the user has a password - override MFA passing if not
-        if "PasswordLastUsed" not in users:
+        userRecord = get_iam_user_record(cache, session, userName)
+        # check if the user has a password - override MFA passing if not. The Credential Report knows if a
+        # password is enabled, otherwise fall back to whether a password was ever used
+        if userRecord["PasswordEnabled"] is not None:
+            hasPassword = userRecord["PasswordEnabled"]
+        else:
+            hasPassword = "PasswordLastUsed" in users
+        if not hasPassword:
             passwordMfaPassing = True
         else:
-            if not iam.list_mfa_devices(UserName=userName)["MFADevices"]:
+            if not userRecord["MfaActive"]:
                 passwordMfaPassing = False
             else:
                 passwordMfaPassing = True
@@ -662,7 +672,6 @@ def user_mfa_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsP
 @registry.register_check("iam")
 def user_inline_policy_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.4] IAM users should not have attached in-line policies"""
-    iam = session.client("iam")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for users in get_iam_users(cache, session):
@@ -673,7 +682,7 @@ def user_inline_policy_check(cache: dict, session, awsAccountId: str, awsRegion:
         userArn = users["Arn"]
         # use a list comprehension to check if there are any inline policies
         # this is a failing check
-        if iam.list_user_policies(UserName=userName)["PolicyNames"]:
+        if get_iam_user_record(cache, session, userName)["InlinePolicies"]:
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": f"{userArn}/iam-user-attach-inline-check",
@@ -834,7 +843,6 @@ def user_inline_policy_check(cache: dict, session, awsAccountId: str, awsRegion:
 @registry.register_check("iam")
 def user_direct_attached_policy_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.5] IAM users should not have attached managed policies"""
-    iam = session.client("iam")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for users in get_iam_users(cache, session):
@@ -845,7 +853,7 @@ def user_direct_attached_policy_check(cache: dict, session, awsAccountId: str, a
         userArn = users["Arn"]
         # use a list comprehension to check if there are any attached managed policies
         # this is a failing check
-        if iam.list_attached_user_policies(UserName=userName)["AttachedPolicies"]:
+        if get_iam_user_record(cache, session, userName)["AttachedManagedPolicies"]:
             finding = {
                 "SchemaVersion": "2018-10-08",
                 "Id": f"{userArn}/iam-user-attach-managed-policy-check",
@@ -1388,7 +1396,6 @@ def aws_iam_server_certifcates_check(cache: dict, session, awsAccountId: str, aw
 @registry.register_check("iam")
 def iam_created_managed_policy_least_priv_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.8] Managed policies should follow least privilege principles"""
-    iam = session.client("iam")
     # ISO time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     try:
@@ -1397,11 +1404,9 @@ def iam_created_managed_policy_least_priv_check(cache: dict, session, awsAccount
             assetJson = json.dumps(mpolicy,default=str).encode("utf-8")
             assetB64 = base64.b64encode(assetJson)
             policyArn = mpolicy["Arn"]
-            versionId = mpolicy["DefaultVersionId"]
-            policyDocument = iam.get_policy_version(
-                PolicyArn=policyArn,
-                VersionId=versionId
-            )["PolicyVersion"]["Document"]
+            policyDocument = get_policy_default_document(
+                get_iam_inventory(cache, session)["Policies"][policyArn]
+            )
             #handle policies docs returned as strings
             if isinstance(policyDocument, str):
                 policyDocument = json.loads(policyDocument)
@@ -1648,7 +1653,6 @@ def iam_created_managed_policy_least_priv_check(cache: dict, session, awsAccount
 @registry.register_check("iam")
 def iam_user_policy_least_priv_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.9] User inline policies should follow least privilege principles"""
-    iam = session.client("iam")
     try:
         for users in get_iam_users(cache, session):
             # B64 encode all of the details for the Asset
@@ -1657,14 +1661,8 @@ def iam_user_policy_least_priv_check(cache: dict, session, awsAccountId: str, aw
             userArn = users["Arn"]
             userName = users["UserName"]
 
-            policyNames = iam.list_user_policies(
-                UserName=userName
-            )["PolicyNames"]
-            for policyName in policyNames:
-                policyDocument = iam.get_user_policy(
-                    UserName=userName,
-                    PolicyName=policyName
-                )["PolicyDocument"]
+            inlinePolicies = get_iam_user_record(cache, session, userName)["InlinePolicies"]
+            for policyName, policyDocument in inlinePolicies.items():
 
                 #handle policies docs returned as strings
                 if isinstance(policyDocument, str):
@@ -1924,7 +1922,6 @@ def iam_user_policy_least_priv_check(cache: dict, session, awsAccountId: str, aw
 @registry.register_check("iam")
 def iam_group_policy_least_priv_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.10] Group inline policies should follow least privilege principles"""
-    iam = session.client("iam")
     try:
         for group in get_iam_groups(cache, session):
             # B64 encode all of the details for the Asset
@@ -1933,14 +1930,10 @@ def iam_group_policy_least_priv_check(cache: dict, session, awsAccountId: str, a
             groupArn = group["Arn"]
             groupName = group["GroupName"]
 
-            policyNames = iam.list_group_policies(
-                GroupName=groupName
-            )["PolicyNames"]
-            for policyName in policyNames:
-                policyDocument = iam.get_group_policy(
-                    GroupName=groupName,
-                    PolicyName=policyName
-                )["PolicyDocument"]
+            groupPolicies = get_iam_inventory(cache, session)["Groups"][groupName].get("GroupPolicyList", [])
+            for groupPolicy in groupPolicies:
+                policyName = groupPolicy["PolicyName"]
+                policyDocument = groupPolicy["PolicyDocument"]
 
                 #handle policies docs returned as strings
                 if isinstance(policyDocument, str):
@@ -2200,7 +2193,6 @@ def iam_group_policy_least_priv_check(cache: dict, session, awsAccountId: str, a
 @registry.register_check("iam")
 def iam_role_policy_least_priv_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.11] Role inline policies should follow least privilege principles"""
-    iam = session.client("iam")
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     try:
         for role in get_iam_roles(cache, session):
@@ -2210,14 +2202,10 @@ def iam_role_policy_least_priv_check(cache: dict, session, awsAccountId: str, aw
             roleArn = role["Arn"]
             roleName = role["RoleName"]
 
-            policyNames = iam.list_role_policies(
-                RoleName=roleName
-            )["PolicyNames"]
-            for policyName in policyNames:
-                policyDocument = iam.get_role_policy(
-                    RoleName=roleName,
-                    PolicyName=policyName
-                )["PolicyDocument"]
+            rolePolicies = get_iam_inventory(cache, session)["Roles"][roleName].get("RolePolicyList", [])
+            for rolePolicy in rolePolicies:
+                policyName = rolePolicy["PolicyName"]
+                policyDocument = rolePolicy["PolicyDocument"]
 
                 #handle policies docs returned as strings
                 if isinstance(policyDocument, str):
@@ -3005,7 +2993,6 @@ def aws_iam_root_user_hardware_mfa_check(cache: dict, session, awsAccountId: str
 @registry.register_check("iam")
 def iam_access_key_unused_fortyfive_days_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.15] AWS IAM Access Keys that have not been used in the last 45 days should be disabled"""
-    iam = session.client("iam")
     todaysDatetime = datetime.datetime.now(datetime.timezone.utc)
     fortyFiveDayDelta = datetime.timedelta(days=45)
     # ISO Time
@@ -3013,14 +3000,15 @@ def iam_access_key_unused_fortyfive_days_check(cache: dict, session, awsAccountI
     for users in get_iam_users(cache, session):
         userName = users["UserName"]
         # Get keys per User
-        for keys in iam.list_access_keys(UserName=userName)["AccessKeyMetadata"]:
+        for accessKey in get_iam_user_record(cache, session, userName)["AccessKeys"]:
+            keys = accessKey["Metadata"]
             # B64 encode all of the details for the Asset
             assetJson = json.dumps(keys,default=str).encode("utf-8")
             assetB64 = base64.b64encode(assetJson)
             keyUserName = keys["UserName"]
             keyId = keys["AccessKeyId"]
             keyArn = f"arn:{awsPartition}:iam::{awsAccountId}:user/{keyUserName}/access-key/{keyId}"
-            lastUsed = iam.get_access_key_last_used(AccessKeyId=keyId)["AccessKeyLastUsed"]
+            lastUsed = accessKey["LastUsed"]
             if "LastUsedDate" not in lastUsed or lastUsed["LastUsedDate"] < (todaysDatetime - fortyFiveDayDelta):
                 # this is a failing check
                 finding = {
@@ -3553,14 +3541,13 @@ def aws_iam_access_analyzer_enabled_check(cache: dict, session, awsAccountId: st
 @registry.register_check("iam")
 def iam_user_multiple_access_key_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[IAM.18] AWS IAM Users should never have more than one IAM Access Key"""
-    iam = session.client("iam")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for users in get_iam_users(cache, session):
         userName = users["UserName"]
         userArn = users["Arn"]
         # Check for more than one key
-        accessKeys = iam.list_access_keys(UserName=userName)["AccessKeyMetadata"]
+        accessKeys = [accessKey["Metadata"] for accessKey in get_iam_user_record(cache, session, userName)["AccessKeys"]]
         # B64 encode all of the details for the Asset
         assetJson = json.dumps(accessKeys,default=str).encode("utf-8")
         assetB64 = base64.b64encode(assetJson)
@@ -19,8 +19,8 @@
 #under the License.
 
 from check_register import CheckRegister
+from collectors.aws_kms_collector import get_kms_key_inventory
 import datetime
-from botocore.exceptions import ClientError
 import base64
 import json
 
@@ -30,36 +30,33 @@ def list_keys(cache, session):
     response = cache.get("list_keys")
     if response:
         return response
-    
-    kms = session.client("kms")
 
-    cache["list_keys"] = kms.list_keys()["Keys"]
+    cache["list_keys"] = list(get_kms_key_inventory(session).values())
     return cache["list_keys"]
 
 @registry.register_check("kms")
 def kms_key_rotation_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[KMS.1] AWS KMS symmetric keys should enable automatic key rotation"""
-    kms = session.client("kms")
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
-    for key in list_keys(cache, session):
+    for keyRecord in list_keys(cache, session):
+        key = keyRecord["Key"]
         # B64 encode all of the details for the Asset
         assetJson = json.dumps(key,default=str).encode("utf-8")
         assetB64 = base64.b64encode(assetJson)
         keyid = key["KeyId"]
         keyarn = key["KeyArn"]
-        # KMS Key Policies can block us from snooping the type of Key - in the event we run into an issue we have to handle it gracefully
-        try:
-            keyData = kms.describe_key(KeyId=keyid)
+        # KMS Key Policies can block us from snooping the type of Key - in the event we run into an issue the collector records it as None
+        if keyRecord["KeyMetadata"] is not None:
             # override the asset info
             del assetB64
-            assetB64 = base64.b64encode(json.dumps(keyData,default=str).encode("utf-8"))
+            assetB64 = base64.b64encode(json.dumps({"KeyMetadata": keyRecord["KeyMetadata"]},default=str).encode("utf-8"))
             # Auto-pass the asymmetric keys
-            if keyData["KeyMetadata"]["KeyUsage"] == "SIGN_VERIFY":
+            if keyRecord["KeyMetadata"]["KeyUsage"] == "SIGN_VERIFY":
                 rotationEnabled = True
             else:
-                rotationEnabled = kms.get_key_rotation_status(KeyId=keyid)["KeyRotationEnabled"]
-        except ClientError:
+                rotationEnabled = keyRecord["KeyRotationEnabled"] is True
+        else:
             rotationEnabled = False
 
         # this is a passing check
@@ -225,25 +222,24 @@ def kms_key_rotation_check(cache: dict, session, awsAccountId: str, awsRegion: s
 @registry.register_check("kms")
 def kms_key_exposed_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[KMS.2] AWS KMS keys should not be publicly exposed to every AWS principal"""
-    kms = session.client("kms")
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
-    for key in list_keys(cache, session):
+    for keyRecord in list_keys(cache, session):
+        key = keyRecord["Key"]
         # B64 encode all of the details for the Asset
         assetJson = json.dumps(key,default=str).encode("utf-8")
         assetB64 = base64.b64encode(assetJson)
         keyid = key["KeyId"]
         keyarn = key["KeyArn"]
-        # KMS Key Policies can block us from snooping the type of Key - in the event we run into an issue we have to handle it gracefully
-        try:
-            keyData = kms.describe_key(KeyId=keyid)
+        # KMS Key Policies can block us from snooping the type of Key - in the event we run into an issue the collector records it as None
+        if keyRecord["KeyMetadata"] is None or keyRecord["Policy"] is None:
+            keyExposureStatus = "UNKNOWN"
+        else:
             # override the asset info
             del assetB64
-            assetB64 = base64.b64encode(json.dumps(keyData,default=str).encode("utf-8"))
+            assetB64 = base64.b64encode(json.dumps({"KeyMetadata": keyRecord["KeyMetadata"]},default=str).encode("utf-8"))
             # Pull out the Policy
-            policy = json.loads(
-                kms.get_key_policy(KeyId=keyid, PolicyName="default")["Policy"]
-            )
+            policy = keyRecord["Policy"]
             keyExposureStatus = "NOT_EXPOSED"
             # Begin policy eval
             for sid in policy["Statement"]:
@@ -256,8 +252,6 @@ def kms_key_exposed_check(cache: dict, session, awsAccountId: str, awsRegion: st
                 else:
                     keyExposureStatus = "EXPOSED"
                     break
-        except ClientError or KeyError:
-            keyExposureStatus = "UNKNOWN"
 
         # Parse the the different failure conditions we set - this will modify some details in the finding
         if keyExposureStatus == "EXPOSED":
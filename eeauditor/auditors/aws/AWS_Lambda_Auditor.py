@@ -22,6 +22,7 @@ import datetime
 from dateutil import parser
 import botocore
 from check_register import CheckRegister
+from collectors.aws_cloudwatch_collector import get_metric_window_totals
 import base64
 import json
 
@@ -79,10 +80,25 @@ def get_lambda_layers(cache, session):
     cache["get_lambda_layers"] = lambdaLayers
     return cache["get_lambda_layers"]
 
+def get_lambda_invocation_totals(cache, session):
+    response = cache.get("get_lambda_invocation_totals")
+    if response:
+        return response
+
+    # Total invocations per function over the last 30 days, batched across all functions
+    cache["get_lambda_invocation_totals"] = get_metric_window_totals(
+        session,
+        namespace="AWS/Lambda",
+        metricName="Invocations",
+        dimensionName="FunctionName",
+        dimensionValues=[function["FunctionName"] for function in get_lambda_functions(cache, session)],
+        days=30
+    )
+    return cache["get_lambda_invocation_totals"]
+
 @registry.register_check("lambda")
 def aws_lambda_unused_function_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[Lambda.1] Lambda functions should be deleted after 30 days of no use"""
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for function in get_lambda_functions(cache, session):
@@ -91,161 +107,142 @@ def aws_lambda_unused_function_check(cache: dict, session, awsAccountId: str, aw
         assetB64 = base64.b64encode(assetJson)
         functionName = function["FunctionName"]
         lambdaArn = function["FunctionArn"]
-        metricResponse = cloudwatch.get_metric_data(
-            MetricDataQueries=[
-                {
-                    "Id": "m1",
-                    "MetricStat": {
-                        "Metric": {
-                            "Namespace": "AWS/Lambda",
-                            "MetricName": "Invocations",
-                            "Dimensions": [{"Name": "FunctionName", "Value": functionName},],
-                        },
-                        "Period": 300,
-                        "Stat": "Sum",
-                    },
-                }
-            ],
-            StartTime=datetime.datetime.now() - datetime.timedelta(days=30),
-            EndTime=datetime.datetime.now(),
-        )
-        for metric in metricResponse["MetricDataResults"]:
-            modifiedDate = parser.parse(function["LastModified"])
-            dateDelta = datetime.datetime.now(datetime.timezone.utc) - modifiedDate
+        modifiedDate = parser.parse(function["LastModified"])
+        dateDelta = datetime.datetime.now(datetime.timezone.utc) - modifiedDate
 
-            if len(metric["Values"]) > 0 or dateDelta.days < 30:
-                # this is a passing check
-                finding = {
-                    "SchemaVersion": "2018-10-08",
-                    "Id": f"{lambdaArn}/lambda-function-unused-check",
-                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                    "GeneratorId": lambdaArn,
-                    "AwsAccountId": awsAccountId,
-                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                    "FirstObservedAt": iso8601Time,
-                    "CreatedAt": iso8601Time,
-                    "UpdatedAt": iso8601Time,
-                    "Severity": {"Label": "INFORMATIONAL"},
-                    "Confidence": 99,
-                    "Title": "[Lambda.1] Lambda functions should be deleted after 30 days of no use",
-                    "Description": f"Lambda function {functionName} has seen activity within the last 30 days.",
-                    "Remediation": {
-                        "Recommendation": {
-                            "Text": "For more information on best practices for lambda functions refer to the Best Practices for Working with AWS Lambda Functions section of the Amazon Lambda Developer Guide",
-                            "Url": "https://docs.aws.amazon.com/lambda/latest/dg/best-practices.html#function-configuration",
-                        }
-                    },
-                    "ProductFields": {
-                        "ProductName": "ElectricEye",
-                        "Provider": "AWS",
-                        "ProviderType": "CSP",
-                        "ProviderAccountId": awsAccountId,
-                        "AssetRegion": awsRegion,
-                        "AssetDetails": assetB64,
-                        "AssetClass": "Compute",
-                        "AssetService": "AWS Lambda",
-                        "AssetComponent": "Function"
-                    },
-                    "Resources": [
-                        {
-                            "Type": "AwsLambdaFunction",
-                            "Id": lambdaArn,
-                            "Partition": awsPartition,
-                            "Region": awsRegion,
-                            "Details": {
-                                "AwsLambdaFunction": {
-                                    "FunctionName": functionName
-                                }
+        if get_lambda_invocation_totals(cache, session).get(functionName, 0) > 0 or dateDelta.days < 30:
+            # this is a passing check
+            finding = {
+                "SchemaVersion": "2018-10-08",
+                "Id": f"{lambdaArn}/lambda-function-unused-check",
+                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                "GeneratorId": lambdaArn,
+                "AwsAccountId": awsAccountId,
+                "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+                "FirstObservedAt": iso8601Time,
+                "CreatedAt": iso8601Time,
+                "UpdatedAt": iso8601Time,
+                "Severity": {"Label": "INFORMATIONAL"},
+                "Confidence": 99,
+                "Title": "[Lambda.1] Lambda functions should be deleted after 30 days of no use",
+                "Description": f"Lambda function {functionName} has seen activity within the last 30 days.",
+                "Remediation": {
+                    "Recommendation": {
+                        "Text": "For more information on best practices for lambda functions refer to the Best Practices for Working with AWS Lambda Functions section of the Amazon Lambda Developer Guide",
+                        "Url": "https://docs.aws.amazon.com/lambda/latest/dg/best-practices.html#function-configuration",
+                    }
+                },
+                "ProductFields": {
+                    "ProductName": "ElectricEye",
+                    "Provider": "AWS",
+                    "ProviderType": "CSP",
+                    "ProviderAccountId": awsAccountId,
+                    "AssetRegion": awsRegion,
+                    "AssetDetails": assetB64,
+                    "AssetClass": "Compute",
+                    "AssetService": "AWS Lambda",
+                    "AssetComponent": "Function"
+                },
+                "Resources": [
+                    {
+                        "Type": "AwsLambdaFunction",
+                        "Id": lambdaArn,
+                        "Partition": awsPartition,
+                        "Region": awsRegion,
+                        "Details": {
+                            "AwsLambdaFunction": {
+                                "FunctionName": functionName
                             }
                         }
-                    ],
-                    "Compliance": {
-                        "Status": "PASSED",
-                        "RelatedRequirements": [
-                            "NIST CSF V1.1 PR.DS-3",
-                            "NIST SP 800-53 Rev. 4 CM-8",
-                            "NIST SP 800-53 Rev. 4 MP-6",
-                            "NIST SP 800-53 Rev. 4 PE-16",
-                            "AICPA TSC CC6.1",
-                            "AICPA TSC CC6.5",
-                            "ISO 27001:2013 A.8.2.3",
-                            "ISO 27001:2013 A.8.3.1",
-                            "ISO 27001:2013 A.8.3.2",
-                            "ISO 27001:2013 A.8.3.3",
-                            "ISO 27001:2013 A.11.2.5",
-                            "ISO 27001:2013 A.11.2.7"
-                        ]
-                    },
-                    "Workflow": {"Status": "RESOLVED"},
-                    "RecordState": "ARCHIVED"
-                }
-                yield finding
-            else:
-                finding = {
-                    "SchemaVersion": "2018-10-08",
-                    "Id": f"{lambdaArn}/lambda-function-unused-check",
-                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                    "GeneratorId": lambdaArn,
-                    "AwsAccountId": awsAccountId,
-                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                    "FirstObservedAt": iso8601Time,
-                    "CreatedAt": iso8601Time,
-                    "UpdatedAt": iso8601Time,
-                    "Severity": {"Label": "LOW"},
-                    "Confidence": 99,
-                    "Title": "[Lambda.1] Lambda functions should be deleted after 30 days of no use",
-                    "Description": f"Lambda function {functionName} has not been used within the last 30 days. Functions should be deleted if they are not used to avoid any potential malicious modifications and to lessen the consumption of default Lambda quotas such as stored code and number of functions.",
-                    "Remediation": {
-                        "Recommendation": {
-                            "Text": "For more information on best practices for lambda functions refer to the Best Practices for Working with AWS Lambda Functions section of the Amazon Lambda Developer Guide",
-                            "Url": "https://docs.aws.amazon.com/lambda/latest/dg/best-practices.html#function-configuration",
-                        }
-                    },
-                    "ProductFields": {
-                        "ProductName": "ElectricEye",
-                        "Provider": "AWS",
-                        "ProviderType": "CSP",
-                        "ProviderAccountId": awsAccountId,
-                        "AssetRegion": awsRegion,
-                        "AssetDetails": assetB64,
-                        "AssetClass": "Compute",
-                        "AssetService": "AWS Lambda",
-                        "AssetComponent": "Function"
-                    },
-                    "Resources": [
-                        {
-                            "Type": "AwsLambdaFunction",
-                            "Id": lambdaArn,
-                            "Partition": awsPartition,
-                            "Region": awsRegion,
-                            "Details": {
-                                "AwsLambdaFunction": {
-                                    "FunctionName": functionName
-                                }
+                    }
+                ],
+                "Compliance": {
+                    "Status": "PASSED",
+                    "RelatedRequirements": [
+                        "NIST CSF V1.1 PR.DS-3",
+                        "NIST SP 800-53 Rev. 4 CM-8",
+                        "NIST SP 800-53 Rev. 4 MP-6",
+                        "NIST SP 800-53 Rev. 4 PE-16",
+                        "AICPA TSC CC6.1",
+                        "AICPA TSC CC6.5",
+                        "ISO 27001:2013 A.8.2.3",
+                        "ISO 27001:2013 A.8.3.1",
+                        "ISO 27001:2013 A.8.3.2",
+                        "ISO 27001:2013 A.8.3.3",
+                        "ISO 27001:2013 A.11.2.5",
+                        "ISO 27001:2013 A.11.2.7"
+                    ]
+                },
+                "Workflow": {"Status": "RESOLVED"},
+                "RecordState": "ARCHIVED"
+            }
+            yield finding
+        else:
+            finding = {
+                "SchemaVersion": "2018-10-08",
+                "Id": f"{lambdaArn}/lambda-function-unused-check",
+                "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+                "GeneratorId": lambdaArn,
+                "AwsAccountId": awsAccountId,
+                "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+                "FirstObservedAt": iso8601Time,
+                "CreatedAt": iso8601Time,
+                "UpdatedAt": iso8601Time,
+                "Severity": {"Label": "LOW"},
+                "Confidence": 99,
+                "Title": "[Lambda.1] Lambda functions should be deleted after 30 days of no use",
+                "Description": f"Lambda function {functionName} has not been used within the last 30 days. Functions should be deleted if they are not used to avoid any potential malicious modifications and to lessen the consumption of default Lambda quotas such as stored code and number of functions.",
+                "Remediation": {
+                    "Recommendation": {
+                        "Text": "For more information on best practices for lambda functions refer to the Best Practices for Working with AWS Lambda Functions section of the Amazon Lambda Developer Guide",
+                        "Url": "https://docs.aws.amazon.com/lambda/latest/dg/best-practices.html#function-configuration",
+                    }
+                },
+                "ProductFields": {
+                    "ProductName": "ElectricEye",
+                    "Provider": "AWS",
+                    "ProviderType": "CSP",
+                    "ProviderAccountId": awsAccountId,
+                    "AssetRegion": awsRegion,
+                    "AssetDetails": assetB64,
+                    "AssetClass": "Compute",
+                    "AssetService": "AWS Lambda",
+                    "AssetComponent": "Function"
+                },
+                "Resources": [
+                    {
+                        "Type": "AwsLambdaFunction",
+                        "Id": lambdaArn,
+                        "Partition": awsPartition,
+                        "Region": awsRegion,
+                        "Details": {
+                            "AwsLambdaFunction": {
+                                "FunctionName": functionName
                             }
                         }
-                    ],
-                    "Compliance": {
-                        "Status": "FAILED",
-                        "RelatedRequirements": [
-                            "NIST CSF V1.1 PR.DS-3",
-                            "NIST SP 800-53 Rev. 4 CM-8",
-                            "NIST SP 800-53 Rev. 4 MP-6",
-                            "NIST SP 800-53 Rev. 4 PE-16",
-                            "AICPA TSC CC6.1",
-                            "AICPA TSC CC6.5",
-                            "ISO 27001:2013 A.8.2.3",
-                            "ISO 27001:2013 A.8.3.1",
-                            "ISO 27001:2013 A.8.3.2",
-                            "ISO 27001:2013 A.8.3.3",
-                            "ISO 27001:2013 A.11.2.5",
-                            "ISO 27001:2013 A.11.2.7"
-                        ]
-                    },
-                    "Workflow": {"Status": "NEW"},
-                    "RecordState": "ACTIVE"
-                }
-                yield finding
+                    }
+                ],
+                "Compliance": {
+                    "Status": "FAILED",
+                    "RelatedRequirements": [
+                        "NIST CSF V1.1 PR.DS-3",
+                        "NIST SP 800-53 Rev. 4 CM-8",
+                        "NIST SP 800-53 Rev. 4 MP-6",
+                        "NIST SP 800-53 Rev. 4 PE-16",
+                        "AICPA TSC CC6.1",
+                        "AICPA TSC CC6.5",
+                        "ISO 27001:2013 A.8.2.3",
+                        "ISO 27001:2013 A.8.3.1",
+                        "ISO 27001:2013 A.8.3.2",
+                        "ISO 27001:2013 A.8.3.3",
+                        "ISO 27001:2013 A.11.2.5",
+                        "ISO 27001:2013 A.11.2.7"
+                    ]
+                },
+                "Workflow": {"Status": "NEW"},
+                "RecordState": "ACTIVE"
+            }
+            yield finding
 
 @registry.register_check("lambda")
 def aws_lambda_function_tracing_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
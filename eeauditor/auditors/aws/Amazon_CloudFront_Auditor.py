@@ -18,17 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import tomli
-import os
-import sys
-import boto3
 import requests
 import ipaddress
 import datetime
 import base64
 import json
-from botocore.exceptions import ClientError
 from check_register import CheckRegister
+from external_providers import get_global_credential
 
 registry = CheckRegister()
 
@@ -59,59 +55,7 @@ def get_shodan_api_key(cache):
     if response:
         return response
 
-    validCredLocations = ["AWS_SSM", "AWS_SECRETS_MANAGER", "CONFIG_FILE"]
-
-    # Get the absolute path of the current directory
-    currentDir = os.path.abspath(os.path.dirname(__file__))
-    # Go two directories back to /eeauditor/
-    twoBack = os.path.abspath(os.path.join(currentDir, "../../"))
-
-    # TOML is located in /eeauditor/ directory
-    tomlFile = f"{twoBack}/external_providers.toml"
-    with open(tomlFile, "rb") as f:
-        data = tomli.load(f)
-
-    # Parse from [global] to determine credential location of PostgreSQL Password
-    credLocation = data["global"]["credentials_location"]
-    shodanCredValue = data["global"]["shodan_api_key_value"]
-    if credLocation not in validCredLocations:
-        print(f"Invalid option for [global.credLocation]. Must be one of {str(validCredLocations)}.")
-        sys.exit(2)
-    if not shodanCredValue:
-        apiKey = None
-    else:
-
-        # Boto3 Clients
-        ssm = boto3.client("ssm")
-        asm = boto3.client("secretsmanager")
-
-        # Retrieve API Key
-        if credLocation == "CONFIG_FILE":
-            apiKey = shodanCredValue
-
-        # Retrieve the credential from SSM Parameter Store
-        elif credLocation == "AWS_SSM":
-            
-            try:
-                apiKey = ssm.get_parameter(
-                    Name=shodanCredValue,
-                    WithDecryption=True
-                )["Parameter"]["Value"]
-            except ClientError as e:
-                print(f"Error retrieving API Key from SSM, skipping all Shodan checks, error: {e}")
-                apiKey = None
-
-        # Retrieve the credential from AWS Secrets Manager
-        elif credLocation == "AWS_SECRETS_MANAGER":
-            try:
-                apiKey = asm.get_secret_value(
-                    SecretId=shodanCredValue,
-                )["SecretString"]
-            except ClientError as e:
-                print(f"Error retrieving API Key from ASM, skipping all Shodan checks, error: {e}")
-                apiKey = None
-        
-    cache["get_shodan_api_key"] = apiKey
+    cache["get_shodan_api_key"] = get_global_credential("shodan_api_key_value")
     return cache["get_shodan_api_key"]
 
 def google_dns_resolver(target):
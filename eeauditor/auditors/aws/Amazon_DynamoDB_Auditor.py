@@ -20,6 +20,7 @@
 
 import datetime
 from check_register import CheckRegister
+from collectors.aws_dynamodb_collector import get_dynamodb_tables
 import base64
 import json
 
@@ -29,19 +30,8 @@ def list_tables(cache, session):
     response = cache.get("list_tables")
     if response:
         return response
-    
-    dynamodb = session.client("dynamodb")
-    ddbTables = []
-    
-    for page in dynamodb.get_paginator("list_tables").paginate():
-        for table in page["TableNames"]:
-            ddbTables.append(
-                dynamodb.describe_table(
-                    TableName=table
-                )
-            )
 
-    cache["list_tables"] = ddbTables
+    cache["list_tables"] = get_dynamodb_tables(session)
     return cache["list_tables"]
 
 @registry.register_check("dynamodb")
@@ -193,7 +183,6 @@ def ddb_kms_cmk_check(cache: dict, session, awsAccountId: str, awsRegion: str, a
 @registry.register_check("dynamodb")
 def ddb_pitr_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[DynamoDB.2] Amazon DynamoDB tables should have Point-in-Time Recovery (PITR) enabled"""
-    dynamodb = session.client("dynamodb")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for table in list_tables(cache, session):
@@ -202,10 +191,11 @@ def ddb_pitr_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsP
         assetB64 = base64.b64encode(assetJson)
         tableArn = table["Table"]["TableArn"]
         tableName = table["Table"]["TableName"]
-        # Check for PITR
-        pitrCheck = dynamodb.describe_continuous_backups(
-            TableName=tableName
-        )["ContinuousBackupsDescription"]["PointInTimeRecoveryDescription"]["PointInTimeRecoveryStatus"]
+        # Check for PITR - skip tables whose continuous backups could not be described (e.g., AccessDenied) as the
+        # status is unknown, not disabled
+        if table["ContinuousBackupsDescription"] is None:
+            continue
+        pitrCheck = table["ContinuousBackupsDescription"]["PointInTimeRecoveryDescription"]["PointInTimeRecoveryStatus"]
         # this is a failing check
         if pitrCheck == "DISABLED":
             finding={
@@ -19,12 +19,9 @@
 #under the License.
 
 import logging
-import tomli
-import os
-import sys
 from botocore.config import Config
 from check_register import CheckRegister
-from botocore.exceptions import ClientError
+from external_providers import get_global_credential
 import requests
 import datetime
 from dateutil.parser import parse
@@ -156,65 +153,12 @@ def find_exploitable_vulnerabilities_for_instance(session, instanceId):
     return exploitable, exploitableCves
 
 def get_shodan_api_key(cache):
-    import boto3
 
     response = cache.get("get_shodan_api_key")
     if response:
         return response
 
-    validCredLocations = ["AWS_SSM", "AWS_SECRETS_MANAGER", "CONFIG_FILE"]
-
-    # Get the absolute path of the current directory
-    currentDir = os.path.abspath(os.path.dirname(__file__))
-    # Go two directories back to /eeauditor/
-    twoBack = os.path.abspath(os.path.join(currentDir, "../../"))
-
-    # TOML is located in /eeauditor/ directory
-    tomlFile = f"{twoBack}/external_providers.toml"
-    with open(tomlFile, "rb") as f:
-        data = tomli.load(f)
-
-    # Parse from [global] to determine credential location of PostgreSQL Password
-    credLocation = data["global"]["credentials_location"]
-    shodanCredValue = data["global"]["shodan_api_key_value"]
-    if credLocation not in validCredLocations:
-        logger.error("Invalid option for [global.credLocation]. Must be one of %s.", validCredLocations)
-        sys.exit(2)
-    if not shodanCredValue:
-        apiKey = None
-    else:
-
-        # Boto3 Clients
-        ssm = boto3.client("ssm")
-        asm = boto3.client("secretsmanager")
-
-        # Retrieve API Key
-        if credLocation == "CONFIG_FILE":
-            apiKey = shodanCredValue
-
-        # Retrieve the credential from SSM Parameter Store
-        elif credLocation == "AWS_SSM":
-            
-            try:
-                apiKey = ssm.get_parameter(
-                    Name=shodanCredValue,
-                    WithDecryption=True
-                )["Parameter"]["Value"]
-            except ClientError as err:
-                logger.warning("Error retrieving API Key from AWS Systems Manager Parameter Store, skipping all Shodan checks, error: %s", err)
-                apiKey = None
-
-        # Retrieve the credential from AWS Secrets Manager
-        elif credLocation == "AWS_SECRETS_MANAGER":
-            try:
-                apiKey = asm.get_secret_value(
-                    SecretId=shodanCredValue,
-                )["SecretString"]
-            except ClientError as err:
-                logger.warning("Error retrieving API Key from AWS Secrets Manager, skipping all Shodan checks, error: %s", err)
-                apiKey = None
-        
-    cache["get_shodan_api_key"] = apiKey
+    cache["get_shodan_api_key"] = get_global_credential("shodan_api_key_value")
     return cache["get_shodan_api_key"]
 
 @registry.register_check("ec2")
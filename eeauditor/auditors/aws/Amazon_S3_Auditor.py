@@ -23,6 +23,7 @@ import datetime
 import base64
 import json
 from botocore.exceptions import ClientError
+from collectors.aws_s3_collector import get_bucket_configurations
 
 registry = CheckRegister()
 
@@ -52,9 +53,26 @@ def list_buckets(cache, session):
     
     s3 = session.client("s3")
 
-    cache["list_buckets"] = s3.list_buckets()["Buckets"]
+    buckets = []
+    for page in s3.get_paginator("list_buckets").paginate():
+        buckets.extend(page["Buckets"])
+
+    cache["list_buckets"] = buckets
     return cache["list_buckets"]
 
+def get_bucket_configuration_records(cache, session):
+    response = cache.get("get_bucket_configuration_records")
+    if response:
+        return response
+
+    # Only the sub-resources used by the active Checks are collected up front, anything else is fetched on demand
+    cache["get_bucket_configuration_records"] = get_bucket_configurations(
+        session,
+        list_buckets(cache, session),
+        components=["Policy", "PolicyStatus", "Logging"]
+    )
+    return cache["get_bucket_configuration_records"]
+
 '''@registry.register_check("s3")
 def aws_s3_bucket_encryption_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[S3.1] Amazon S3 buckets should be encrypted"""
@@ -531,7 +549,6 @@ def aws_s3_bucket_versioning_check(cache: dict, session, awsAccountId: str, awsR
 @registry.register_check("s3")
 def aws_s3_bucket_policy_allows_public_access_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[S3.4] Amazon S3 Bucket Policies should not allow public access to the bucket"""
-    s3 = session.client("s3")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for buckets in list_buckets(cache, session):
@@ -542,9 +559,10 @@ def aws_s3_bucket_policy_allows_public_access_check(cache: dict, session, awsAcc
         s3Arn = f"arn:{awsPartition}:s3:::{bucketName}"
         # A bucket (for the most part) requires explicit settings in a Bucket Polocy to make it Public
         # if there is not a Policy, or the Policy doesn't return "IsPublic" then it's not
-        try:
-            bucketPublic = s3.get_bucket_policy_status(Bucket=bucketName)["PolicyStatus"]["IsPublic"]
-        except ClientError:
+        bucketConfig = get_bucket_configuration_records(cache, session).get(bucketName)
+        if bucketConfig and bucketConfig["PolicyStatus"]:
+            bucketPublic = bucketConfig["PolicyStatus"]["IsPublic"]
+        else:
             bucketPublic = False
 
         # this is a failing check
@@ -770,7 +788,6 @@ def aws_s3_bucket_policy_allows_public_access_check(cache: dict, session, awsAcc
 @registry.register_check("s3")
 def aws_s3_bucket_policy_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[S3.5] Amazon S3 buckets should have a bucket policy configured"""
-    s3 = session.client("s3")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for buckets in list_buckets(cache, session):
@@ -780,11 +797,11 @@ def aws_s3_bucket_policy_check(cache: dict, session, awsAccountId: str, awsRegio
         bucketName = buckets["Name"]
         s3Arn = f"arn:{awsPartition}:s3:::{bucketName}"
         
-        bucketHasPolicy = True
         # Check to see if there is a policy at all
-        try:
-            s3.get_bucket_policy(Bucket=bucketName)
-        except ClientError:
+        bucketConfig = get_bucket_configuration_records(cache, session).get(bucketName)
+        if bucketConfig and bucketConfig["Policy"]:
+            bucketHasPolicy = True
+        else:
             bucketHasPolicy = False
         
         # this is a failing check
@@ -1006,7 +1023,6 @@ def aws_s3_bucket_policy_check(cache: dict, session, awsAccountId: str, awsRegio
 @registry.register_check("s3")
 def aws_s3_bucket_access_logging_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[S3.6] Amazon S3 buckets that serve content should have server access logging enabled"""
-    s3 = session.client("s3")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for buckets in list_buckets(cache, session):
@@ -1017,12 +1033,10 @@ def aws_s3_bucket_access_logging_check(cache: dict, session, awsAccountId: str,
         s3Arn = f"arn:{awsPartition}:s3:::{bucketName}"
         
         # attempt to get server access logging
-        try:
-            s3.get_bucket_logging(Bucket=bucketName)["LoggingEnabled"]
+        bucketConfig = get_bucket_configuration_records(cache, session).get(bucketName)
+        if bucketConfig and bucketConfig["Logging"] and "LoggingEnabled" in bucketConfig["Logging"]:
             bucketServerLogging = True
-        except ClientError:
-            bucketServerLogging = False
-        except KeyError:
+        else:
             bucketServerLogging = False
         
         # this is a passing check
@@ -1464,7 +1478,6 @@ def s3_account_level_block(cache: dict, session, awsAccountId: str, awsRegion: s
 @registry.register_check("s3")
 def aws_s3_bucket_deny_http_access_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[S3.8] Amazon S3 buckets should define a policy block insecure (HTTP) access to all objects"""
-    s3 = session.client("s3")
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for buckets in list_buckets(cache, session):
@@ -1475,8 +1488,9 @@ def aws_s3_bucket_deny_http_access_check(cache: dict, session, awsAccountId: str
         s3Arn = f"arn:{awsPartition}:s3:::{bucketName}"
         # Attempt to find a blocking policy for HTTP - default the status to not passing
         blockHttpObjectAccess = False
-        try:
-            bucketPolicy = json.loads(s3.get_bucket_policy(Bucket=bucketName)["Policy"])
+        bucketConfig = get_bucket_configuration_records(cache, session).get(bucketName)
+        if bucketConfig and bucketConfig["Policy"]:
+            bucketPolicy = json.loads(bucketConfig["Policy"])
             for statement in bucketPolicy["Statement"]:
                 if s3Arn and f"{s3Arn}/*" in statement["Resource"]:
                     if statement["Effect"] == "Deny" and statement["Action"] == "s3:*":
@@ -1485,8 +1499,6 @@ def aws_s3_bucket_deny_http_access_check(cache: dict, session, awsAccountId: str
                                 if statement["Condition"]["Bool"].get("aws:SecureTransport") == "false":
                                     blockHttpObjectAccess = True
                                     break
-        except ClientError:
-            blockHttpObjectAccess = False
         
         # This is a failing check
         if blockHttpObjectAccess is False:
@@ -19,6 +19,7 @@
 #under the License.
 
 from check_register import CheckRegister
+from collectors.aws_cloudwatch_collector import get_metric_data_batched
 import datetime
 import base64
 import json
@@ -53,10 +54,35 @@ def list_queues(cache, session):
     cache["list_queues"] = queuesWithAttributes
     return cache["list_queues"]
 
+def get_oldest_message_age_metrics(cache, session):
+    response = cache.get("get_oldest_message_age_metrics")
+    if response:
+        return response
+
+    # Hourly maximum age of the oldest message for the last day, batched across all queues
+    metricStats = {
+        queue["QueueName"]: {
+            "Metric": {
+                "Namespace": "AWS/SQS",
+                "MetricName": "ApproximateAgeOfOldestMessage",
+                "Dimensions": [{"Name": "QueueName", "Value": queue["QueueName"]}]
+            },
+            "Period": 3600,
+            "Stat": "Maximum",
+            "Unit": "Seconds"
+        } for queue in list_queues(cache, session)
+    }
+    cache["get_oldest_message_age_metrics"] = get_metric_data_batched(
+        session,
+        metricStats,
+        startTime=datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=1),
+        endTime=datetime.datetime.now(datetime.timezone.utc)
+    )
+    return cache["get_oldest_message_age_metrics"]
+
 @registry.register_check("sqs")
 def sqs_old_message_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SQS.1] Amazon Simple Queue Service (SQS) messages should not be older than 80 percent of message retention"""
-    cloudwatch = session.client("cloudwatch")
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for queue in list_queues(cache, session):
@@ -67,26 +93,7 @@ def sqs_old_message_check(cache: dict, session, awsAccountId: str, awsRegion: st
         messageRetention = queue["Attributes"]["MessageRetentionPeriod"]
         queueArn = queue["Attributes"]["QueueArn"]
         # Evaluate metrics
-        metricResponse = cloudwatch.get_metric_data(
-            MetricDataQueries=[
-                {
-                    "Id": "m1",
-                    "MetricStat": {
-                        "Metric": {
-                            "Namespace": "AWS/SQS",
-                            "MetricName": "ApproximateAgeOfOldestMessage",
-                            "Dimensions": [{"Name": "QueueName", "Value": queueName}]
-                        },
-                        "Period": 3600,
-                        "Stat": "Maximum",
-                        "Unit": "Seconds"
-                    }
-                }
-            ],
-            StartTime=datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=1),
-            EndTime=datetime.datetime.now(datetime.timezone.utc)
-        )
-        metrics = metricResponse["MetricDataResults"]
+        metrics = [get_oldest_message_age_metrics(cache, session)[queueName]]
         counter = 0
         fail = False
         for metric in metrics:
@@ -1,5 +1,6 @@
 from azure.mgmt.web  import WebSiteManagementClient, models
 from check_register import CheckRegister
+from collectors.azure_collector import get_azure_management_client
 
 registry = CheckRegister()
 
@@ -7,7 +8,7 @@ def get_all_app_services_apps(cache: dict, azureCredential, azSubId: str) -> lis
     """
     Returns a list of all Azure Database for MySQL Servers in a Subscription
     """
-    azAppServicesClient = WebSiteManagementClient(azureCredential, azSubId)
+    azAppServicesClient = get_azure_management_client(WebSiteManagementClient, azureCredential, azSubId)
 
     response = cache.get("get_all_app_services_apps")
     if response:
@@ -26,7 +27,7 @@ def azure_app_services_service_authentication_check(cache: dict, awsAccountId: s
     """
     [Azure.AppServices.1] Azure App Services web applications should use Azure App Service Authentication 
     """
-    azAppServicesClient = WebSiteManagementClient(azureCredential, azSubId)
+    azAppServicesClient = get_azure_management_client(WebSiteManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for webapp in get_all_app_services_apps(cache, azureCredential, azSubId):
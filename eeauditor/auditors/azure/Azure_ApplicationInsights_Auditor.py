@@ -3,6 +3,7 @@ import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.azure_collector import get_azure_management_client
 
 registry = CheckRegister()
 
@@ -10,7 +11,7 @@ def get_all_app_insights_components(cache: dict, azureCredential, azSubId: str)
     """
     Returns a list of all Azure Database for MySQL Servers in a Subscription
     """
-    azAppInsightsClient = ApplicationInsightsManagementClient(azureCredential, azSubId)
+    azAppInsightsClient = get_azure_management_client(ApplicationInsightsManagementClient, azureCredential, azSubId)
 
     response = cache.get("get_all_app_insights_components")
     if response:
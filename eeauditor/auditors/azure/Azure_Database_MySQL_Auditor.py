@@ -3,6 +3,7 @@ import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.azure_collector import get_azure_management_client
 
 registry = CheckRegister()
 
@@ -10,7 +11,7 @@ def get_all_mysql_servers(cache: dict, azureCredential, azSubId: str):
     """
     Returns a list of all Azure Database for MySQL Servers in a Subscription
     """
-    azMysqlClient = mysql_flexibleservers.MySQLManagementClient(azureCredential, azSubId)
+    azMysqlClient = get_azure_management_client(mysql_flexibleservers.MySQLManagementClient, azureCredential, azSubId)
 
     response = cache.get("get_all_mysql_servers")
     if response:
@@ -28,7 +29,7 @@ def azure_db_for_mysql_flexible_server_enforce_ssl_connection_check(cache: dict,
     """
     [Azure.MySQLDatabase.1] Azure Database for MySQL flexible servers should enforce SSL connections
     """
-    azMysqlClient = mysql_flexibleservers.MySQLManagementClient(azureCredential, azSubId)
+    azMysqlClient = get_azure_management_client(mysql_flexibleservers.MySQLManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for serv in get_all_mysql_servers(cache, azureCredential, azSubId):
@@ -195,7 +196,7 @@ def azure_db_for_mysql_flexible_server_tls12_minimum_version_check(cache: dict,
     """
     [Azure.MySQLDatabase.2] Azure Database for MySQL flexible servers should enforce TLS 1.2 as the minimum TLS version for secure connections
     """
-    azMysqlClient = mysql_flexibleservers.MySQLManagementClient(azureCredential, azSubId)
+    azMysqlClient = get_azure_management_client(mysql_flexibleservers.MySQLManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for serv in get_all_mysql_servers(cache, azureCredential, azSubId):
@@ -362,7 +363,7 @@ def azure_db_for_mysql_flexible_server_tls12_minimum_version_for_admin_connectio
     """
     [Azure.MySQLDatabase.3] Azure Database for MySQL flexible servers should enforce TLS 1.2 as the minimum TLS version for secure administrator connections
     """
-    azMysqlClient = mysql_flexibleservers.MySQLManagementClient(azureCredential, azSubId)
+    azMysqlClient = get_azure_management_client(mysql_flexibleservers.MySQLManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for serv in get_all_mysql_servers(cache, azureCredential, azSubId):
@@ -529,7 +530,7 @@ def azure_db_for_mysql_flexible_server_audit_logging_enabled_check(cache: dict,
     """
     [Azure.MySQLDatabase.4] Azure Database for MySQL flexible servers should have audit logging enabled
     """
-    azMysqlClient = mysql_flexibleservers.MySQLManagementClient(azureCredential, azSubId)
+    azMysqlClient = get_azure_management_client(mysql_flexibleservers.MySQLManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for serv in get_all_mysql_servers(cache, azureCredential, azSubId):
@@ -756,7 +757,7 @@ def azure_db_for_mysql_flexible_server_audit_log_connection_events_check(cache:
     """
     [Azure.MySQLDatabase.5] Azure Database for MySQL flexible servers should be configured to collect 'CONNECTION' audit log events
     """
-    azMysqlClient = mysql_flexibleservers.MySQLManagementClient(azureCredential, azSubId)
+    azMysqlClient = get_azure_management_client(mysql_flexibleservers.MySQLManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for serv in get_all_mysql_servers(cache, azureCredential, azSubId):
@@ -983,7 +984,7 @@ def azure_db_for_mysql_flexible_server_aes_256_block_encryption_check(cache: dic
     """
     [Azure.MySQLDatabase.6] Azure Database for MySQL flexible servers should use 256-bit AES encryption for data at rest
     """
-    azMysqlClient = mysql_flexibleservers.MySQLManagementClient(azureCredential, azSubId)
+    azMysqlClient = get_azure_management_client(mysql_flexibleservers.MySQLManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for serv in get_all_mysql_servers(cache, azureCredential, azSubId):
@@ -3,6 +3,7 @@ import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.azure_collector import get_azure_management_client
 
 registry = CheckRegister()
 
@@ -10,7 +11,7 @@ def get_all_postgresql_servers(cache: dict, azureCredential, azSubId: str):
     """
     Returns a list of all Azure Database for PostgreSQL Servers in a Subscription
     """
-    azPostgresqlClient = postgresql_flexibleservers.PostgreSQLManagementClient(azureCredential, azSubId)
+    azPostgresqlClient = get_azure_management_client(postgresql_flexibleservers.PostgreSQLManagementClient, azureCredential, azSubId)
 
     response = cache.get("get_all_postgresql_servers")
     if response:
@@ -28,7 +29,7 @@ def azure_db_for_postgresql_flexible_server_enforce_ssl_connection_check(cache:
     """
     [Azure.PostgreSQLDatabase.1] Azure Database for PostgreSQL flexible servers should enforce SSL connections
     """
-    azPostgresqlClient = postgresql_flexibleservers.PostgreSQLManagementClient(azureCredential, azSubId)
+    azPostgresqlClient = get_azure_management_client(postgresql_flexibleservers.PostgreSQLManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for serv in get_all_postgresql_servers(cache, azureCredential, azSubId):
@@ -195,7 +196,7 @@ def azure_db_for_postgresql_tls_12_minimum_version_check(cache: dict, awsAccount
     """
     [Azure.PostgreSQLDatabase.2] Azure Database for PostgreSQL flexible servers should enforce TLS 1.2 as the minimum TLS version for secure connections
     """
-    azPostgresqlClient = postgresql_flexibleservers.PostgreSQLManagementClient(azureCredential, azSubId)
+    azPostgresqlClient = get_azure_management_client(postgresql_flexibleservers.PostgreSQLManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for serv in get_all_postgresql_servers(cache, azureCredential, azSubId):
@@ -362,7 +363,7 @@ def azure_db_for_postgresql_log_checkpoints_enabled_check(cache: dict, awsAccoun
     """
     [Azure.PostgreSQLDatabase.3] Azure Database for PostgreSQL flexible servers should ensure that the 'log_checkpoints' parameter is enabled
     """
-    azPostgresqlClient = postgresql_flexibleservers.PostgreSQLManagementClient(azureCredential, azSubId)
+    azPostgresqlClient = get_azure_management_client(postgresql_flexibleservers.PostgreSQLManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for serv in get_all_postgresql_servers(cache, azureCredential, azSubId):
@@ -591,7 +592,7 @@ def azure_db_for_postgresql_log_connections_enabled_check(cache: dict, awsAccoun
     """
     [Azure.PostgreSQLDatabase.4] Azure Database for PostgreSQL flexible servers should ensure that the 'log_connections' parameter is enabled
     """
-    azPostgresqlClient = postgresql_flexibleservers.PostgreSQLManagementClient(azureCredential, azSubId)
+    azPostgresqlClient = get_azure_management_client(postgresql_flexibleservers.PostgreSQLManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for serv in get_all_postgresql_servers(cache, azureCredential, azSubId):
@@ -820,7 +821,7 @@ def azure_db_for_postgresql_log_disconnections_enabled_check(cache: dict, awsAcc
     """
     [Azure.PostgreSQLDatabase.4] Azure Database for PostgreSQL flexible servers should ensure that the 'log_disconnections' parameter is enabled
     """
-    azPostgresqlClient = postgresql_flexibleservers.PostgreSQLManagementClient(azureCredential, azSubId)
+    azPostgresqlClient = get_azure_management_client(postgresql_flexibleservers.PostgreSQLManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for serv in get_all_postgresql_servers(cache, azureCredential, azSubId):
@@ -1049,7 +1050,7 @@ def azure_db_for_postgresql_connection_throttling_enabled_check(cache: dict, aws
     """
     [Azure.PostgreSQLDatabase.6] Azure Database for PostgreSQL flexible servers should ensure that the 'connection_throttling' parameter is enabled
     """
-    azPostgresqlClient = postgresql_flexibleservers.PostgreSQLManagementClient(azureCredential, azSubId)
+    azPostgresqlClient = get_azure_management_client(postgresql_flexibleservers.PostgreSQLManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for serv in get_all_postgresql_servers(cache, azureCredential, azSubId):
@@ -1278,7 +1279,7 @@ def azure_db_for_postgresql_retain_logs_for_at_least_3_days_check(cache: dict, a
     """
     [Azure.PostgreSQLDatabase.7] Azure Database for PostgreSQL flexible servers should ensure that the 'log_retention_days' parameter is enabled and configure for greater than 3 days
     """
-    azPostgresqlClient = postgresql_flexibleservers.PostgreSQLManagementClient(azureCredential, azSubId)
+    azPostgresqlClient = get_azure_management_client(postgresql_flexibleservers.PostgreSQLManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for serv in get_all_postgresql_servers(cache, azureCredential, azSubId):
@@ -1508,7 +1509,7 @@ def azure_db_for_postgresql_access_to_azure_services_disabled_check(cache: dict,
     """
     [Azure.PostgreSQLDatabase.8] Azure Database for PostgreSQL flexible servers should disable unfettered access to Azure services
     """
-    azPostgresqlClient = postgresql_flexibleservers.PostgreSQLManagementClient(azureCredential, azSubId)
+    azPostgresqlClient = get_azure_management_client(postgresql_flexibleservers.PostgreSQLManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for serv in get_all_postgresql_servers(cache, azureCredential, azSubId):
@@ -1998,7 +1999,7 @@ def azure_db_for_postgresql_double_encryption_check(cache: dict, awsAccountId: s
     """
     [Azure.PostgreSQLDatabase.10] Azure Database for PostgreSQL flexible servers running regulated workloads should have double encryption enabled
     """
-    azPostgresqlClient = postgresql_flexibleservers.PostgreSQLManagementClient(azureCredential, azSubId)
+    azPostgresqlClient = get_azure_management_client(postgresql_flexibleservers.PostgreSQLManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for serv in get_all_postgresql_servers(cache, azureCredential, azSubId):
@@ -23,6 +23,7 @@ import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.azure_collector import get_azure_management_client
 
 registry = CheckRegister()
 
@@ -30,7 +31,7 @@ def get_all_defender_for_cloud_plans(cache: dict, azureCredential, azSubId: str)
     """
     Returns a list of all Azure Virtual Networks in a Subscription
     """
-    azSecurityCenterClient = SecurityCenter(azureCredential,azSubId)
+    azSecurityCenterClient = get_azure_management_client(SecurityCenter, azureCredential, azSubId)
 
     response = cache.get("get_all_defender_for_cloud_plans")
     if response:
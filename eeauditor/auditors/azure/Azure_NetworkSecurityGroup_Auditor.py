@@ -24,6 +24,8 @@ import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.azure_collector import get_azure_management_client
+from collectors.azure_resource_graph_collector import get_resources_by_type, is_resource_graph_enabled
 
 registry = CheckRegister()
 
@@ -38,11 +40,16 @@ def get_all_azure_nsgs(cache: dict, azureCredential, azSubId: str) -> list[model
     """
     Returns a list of all NSGs in a Subscription
     """
-    azNetworkClient = NetworkManagementClient(azureCredential,azSubId)
+    azNetworkClient = get_azure_management_client(NetworkManagementClient, azureCredential, azSubId)
 
     response = cache.get("get_all_azure_nsgs")
     if response:
         return response
+
+    # serve the inventory from a cross-Subscription Azure Resource Graph query when that backend is enabled
+    if is_resource_graph_enabled(azureCredential):
+        cache["get_all_azure_nsgs"] = get_resources_by_type(azureCredential, azSubId, "microsoft.network/networksecuritygroups", models.NetworkSecurityGroup)
+        return cache["get_all_azure_nsgs"]
     
     nsgList = [nsg for nsg in azNetworkClient.network_security_groups.list_all()]
     if not nsgList or nsgList is None:
@@ -23,6 +23,8 @@ import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.azure_collector import fan_out_azure_resources, get_azure_management_client, get_resource_group_name
+from collectors.azure_resource_graph_collector import get_resources_by_type, is_resource_graph_enabled
 
 registry = CheckRegister()
 
@@ -30,11 +32,16 @@ def get_all_sql_servers(cache: dict, azureCredential, azSubId: str) -> list[mode
     """
     Returns a list of all Azure SQL Servers in a Subscription
     """
-    azSqlClient = SqlManagementClient(azureCredential, azSubId)
+    azSqlClient = get_azure_management_client(SqlManagementClient, azureCredential, azSubId)
 
     response = cache.get("get_all_sql_servers")
     if response:
         return response
+
+    # serve the inventory from a cross-Subscription Azure Resource Graph query when that backend is enabled
+    if is_resource_graph_enabled(azureCredential):
+        cache["get_all_sql_servers"] = get_resources_by_type(azureCredential, azSubId, "microsoft.sql/servers", models.Server)
+        return cache["get_all_sql_servers"]
     
     sqlList = [sql for sql in azSqlClient.servers.list()]
     if not sqlList or sqlList is None:
@@ -47,30 +54,94 @@ def get_all_sql_databases(cache: dict, azureCredential, azSubId: str) -> list[mo
     """
     Returns a list of all Azure SQL Databases by Server in a Subscription
     """
-    azSqlClient = SqlManagementClient(azureCredential, azSubId)
+    azSqlClient = get_azure_management_client(SqlManagementClient, azureCredential, azSubId)
 
     response = cache.get("get_all_sql_databases")
     if response:
         return response
+
+    # serve the inventory from a cross-Subscription Azure Resource Graph query when that backend is enabled
+    if is_resource_graph_enabled(azureCredential):
+        cache["get_all_sql_databases"] = get_resources_by_type(azureCredential, azSubId, "microsoft.sql/servers/databases", models.Database)
+        return cache["get_all_sql_databases"]
     
-    dbList = []
-    sqlList = [sql for sql in get_all_sql_servers(cache,azureCredential,azSubId)]
-    if sqlList or sqlList is not None:
-        for sql in sqlList:
-            rgName = sql.id.split("/")[4]
-            sqlservName = sql.name
-            for db in azSqlClient.databases.list_by_server(rgName,sqlservName):
-                dbList.append(db)
+    # list the Databases of every Server concurrently
+    dbsByServer = fan_out_azure_resources(
+        lambda sql: list(azSqlClient.databases.list_by_server(get_resource_group_name(sql.id), sql.name)),
+        get_all_sql_servers(cache, azureCredential, azSubId),
+        "SQL Databases"
+    )
+    dbList = [db for dbs in dbsByServer.values() if dbs for db in dbs]
 
     cache["get_all_sql_databases"] = dbList
     return cache["get_all_sql_databases"]
 
+def get_sql_server_auditing_policies(cache: dict, azureCredential, azSubId: str) -> dict:
+    """
+    Returns the server-level blob auditing policy of every Azure SQL Server in a Subscription keyed by Server ID
+    """
+    response = cache.get("get_sql_server_auditing_policies")
+    if response:
+        return response
+
+    azSqlClient = get_azure_management_client(SqlManagementClient, azureCredential, azSubId)
+
+    cache["get_sql_server_auditing_policies"] = fan_out_azure_resources(
+        lambda sql: azSqlClient.server_blob_auditing_policies.get(get_resource_group_name(sql.id), sql.name),
+        get_all_sql_servers(cache, azureCredential, azSubId),
+        "SQL Server auditing policy"
+    )
+    return cache["get_sql_server_auditing_policies"]
+
+def get_sql_server_encryption_protectors(cache: dict, azureCredential, azSubId: str) -> dict:
+    """
+    Returns the current TDE protector of every Azure SQL Server in a Subscription keyed by Server ID
+    """
+    response = cache.get("get_sql_server_encryption_protectors")
+    if response:
+        return response
+
+    azSqlClient = get_azure_management_client(SqlManagementClient, azureCredential, azSubId)
+
+    cache["get_sql_server_encryption_protectors"] = fan_out_azure_resources(
+        lambda sql: azSqlClient.encryption_protectors.get(get_resource_group_name(sql.id), sql.name, "current"),
+        get_all_sql_servers(cache, azureCredential, azSubId),
+        "SQL Server encryption protector"
+    )
+    return cache["get_sql_server_encryption_protectors"]
+
+def get_sql_database_tdes(cache: dict, azureCredential, azSubId: str) -> dict:
+    """
+    Returns the Transparent Data Encryption configuration of every Azure SQL Database in a Subscription keyed by
+    Database ID, each Database is looked up on its own Server
+    """
+    response = cache.get("get_sql_database_tdes")
+    if response:
+        return response
+
+    azSqlClient = get_azure_management_client(SqlManagementClient, azureCredential, azSubId)
+
+    cache["get_sql_database_tdes"] = fan_out_azure_resources(
+        # Database IDs are .../resourceGroups/{rg}/providers/Microsoft.Sql/servers/{server}/databases/{db}
+        lambda db: azSqlClient.transparent_data_encryptions.get(get_resource_group_name(db.id), str(db.id).split("/")[8], db.name, "current"),
+        get_all_sql_databases(cache, azureCredential, azSubId),
+        "SQL Database TDE configuration"
+    )
+    return cache["get_sql_database_tdes"]
+
+def get_sql_server_databases(cache: dict, azureCredential, azSubId: str, sqlservId: str) -> list[models.Database]:
+    """
+    Returns the Azure SQL Databases that belong to a single Server
+    """
+    return [
+        db for db in get_all_sql_databases(cache, azureCredential, azSubId) if str(db.id).lower().startswith(f"{sqlservId.lower()}/databases/")
+    ]
+
 @registry.register_check("azure.sql_server")
 def azure_sql_server_server_level_auditing_enabled_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str, azureCredential, azSubId: str) -> dict:
     """
     [Azure.SQLServer.1] Azure SQL Server should have Auditing enabled at the server level
     """
-    azSqlClient = SqlManagementClient(azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for sqlserv in get_all_sql_servers(cache, azureCredential, azSubId):
@@ -81,7 +152,9 @@ def azure_sql_server_server_level_auditing_enabled_check(cache: dict, awsAccount
         sqlservId = str(sqlserv.id)
         azRegion = sqlserv.location
         rgName = sqlservId.split("/")[4]
-        serverAuditingSettings = azSqlClient.server_blob_auditing_policies.get(rgName,sqlservName)
+        serverAuditingSettings = get_sql_server_auditing_policies(cache, azureCredential, azSubId).get(sqlservId)
+        if serverAuditingSettings is None:
+            continue
         serverAuditEnabled = False
         if serverAuditingSettings.state == "Enabled":
             if serverAuditingSettings.is_azure_monitor_target_enabled is not None or serverAuditingSettings.storage_account_subscription_id is not None or serverAuditingSettings.storage_account_subscription_id != "00000000-0000-0000-0000-000000000000":
@@ -298,7 +371,7 @@ def azure_sql_server_no_ingress_from_internet_check(cache: dict, awsAccountId: s
     """
     [Azure.SQLServer.2] Azure SQL Server should not allow ingress from the internet (0.0.0.0/0) to the server
     """
-    azSqlClient = SqlManagementClient(azureCredential, azSubId)
+    azSqlClient = get_azure_management_client(SqlManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for sqlserv in get_all_sql_servers(cache, azureCredential, azSubId):
@@ -467,7 +540,6 @@ def azure_sql_server_tde_with_cmk_check(cache: dict, awsAccountId: str, awsRegio
     """
     [Azure.SQLServer.3] Azure SQL Servers should use Transparent Data Encryption (TDE) with Customer Managed Keys (CMK)
     """
-    azSqlClient = SqlManagementClient(azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for sqlserv in get_all_sql_servers(cache, azureCredential, azSubId):
@@ -478,7 +550,9 @@ def azure_sql_server_tde_with_cmk_check(cache: dict, awsAccountId: str, awsRegio
         sqlservId = str(sqlserv.id)
         azRegion = sqlserv.location
         rgName = sqlservId.split("/")[4]
-        tdeProtector = azSqlClient.encryption_protectors.get(rgName,sqlservName,"current")
+        tdeProtector = get_sql_server_encryption_protectors(cache, azureCredential, azSubId).get(sqlservId)
+        if tdeProtector is None:
+            continue
         tdeWithCmk = False
         if tdeProtector.server_key_type != "ServiceManaged":
             tdeWithCmk = True
@@ -620,7 +694,7 @@ def azure_sql_server_entra_id_admin_authentication_configured_check(cache: dict,
     """
     [Azure.SQLServer.4] Azure SQL Server should have Microsoft Entra ID authentication configured for server admin
     """
-    azSqlClient = SqlManagementClient(azureCredential, azSubId)
+    azSqlClient = get_azure_management_client(SqlManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for sqlserv in get_all_sql_servers(cache, azureCredential, azSubId):
@@ -799,7 +873,6 @@ def azure_sql_database_tde_enabled_check(cache: dict, awsAccountId: str, awsRegi
     """
     [Azure.SQLServer.5] Azure SQL Databases should have Transparent Data Encryption (TDE) enabled
     """
-    azSqlClient = SqlManagementClient(azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for sqlserv in get_all_sql_servers(cache, azureCredential, azSubId):
@@ -807,14 +880,16 @@ def azure_sql_database_tde_enabled_check(cache: dict, awsAccountId: str, awsRegi
         sqlservId = str(sqlserv.id)
         azRegion = sqlserv.location
         rgName = sqlservId.split("/")[4]
-        for db in get_all_sql_databases(cache,azureCredential,azSubId):
+        for db in get_sql_server_databases(cache, azureCredential, azSubId, sqlservId):
             # B64 encode all of the details for the Asset
             assetJson = json.dumps(db.as_dict(),default=str).encode("utf-8")
             assetB64 = base64.b64encode(assetJson)
             dbTdeEnabled = False
             dbId = str(db.id)
             dbName = db.name
-            tde = azSqlClient.transparent_data_encryptions.get(rgName,sqlservName,dbName,"current")
+            tde = get_sql_database_tdes(cache, azureCredential, azSubId).get(dbId)
+            if tde is None:
+                continue
             if f"databases/{dbName}" in str(tde.id) and str(tde.status) == "Enabled":
                 dbTdeEnabled = True
 
@@ -1137,7 +1212,6 @@ def azure_sql_database_regulated_workloads_use_double_encryption_check(cache: di
     """
     [Azure.SQLServer.7] Azure SQL Databases with regulated workloads should use double encryption
     """
-    azSqlClient = SqlManagementClient(azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for sqlserv in get_all_sql_servers(cache, azureCredential, azSubId):
@@ -1145,14 +1219,16 @@ def azure_sql_database_regulated_workloads_use_double_encryption_check(cache: di
         sqlservId = str(sqlserv.id)
         azRegion = sqlserv.location
         rgName = sqlservId.split("/")[4]
-        for db in get_all_sql_databases(cache,azureCredential,azSubId):
+        for db in get_sql_server_databases(cache, azureCredential, azSubId, sqlservId):
             # B64 encode all of the details for the Asset
             assetJson = json.dumps(db.as_dict(),default=str).encode("utf-8")
             assetB64 = base64.b64encode(assetJson)
             dbDoubleEncryption = False
             dbId = str(db.id)
             dbName = db.name
-            tde = azSqlClient.transparent_data_encryptions.get(rgName,sqlservName,dbName,"current")
+            tde = get_sql_database_tdes(cache, azureCredential, azSubId).get(dbId)
+            if tde is None:
+                continue
             if (
                 f"databases/{dbName}" in str(tde.id) 
                 and str(tde.status) == "Enabled" 
@@ -1464,7 +1540,7 @@ def azure_sql_server_auditing_retention_greater_than_90_days_check(cache: dict,
     """
     [Azure.SQLServer.9] Azure SQL Server Auditing should have a retention greater than 90 days
     """
-    azSqlClient = SqlManagementClient(azureCredential, azSubId)
+    azSqlClient = get_azure_management_client(SqlManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for sqlserv in get_all_sql_servers(cache, azureCredential, azSubId):
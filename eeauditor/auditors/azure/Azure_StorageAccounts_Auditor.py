@@ -18,12 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-from azure.mgmt.storage import StorageManagementClient
+from azure.mgmt.storage import StorageManagementClient, models
 from azure.mgmt.network import NetworkManagementClient
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.azure_collector import get_azure_management_client
+from collectors.azure_resource_graph_collector import get_resources_by_type, is_resource_graph_enabled
 
 registry = CheckRegister()
 
@@ -31,11 +33,16 @@ def get_all_storage_accounts(cache: dict, azureCredential, azSubId: str):
     """
     Returns a list of all Azure VMs in a Subscription
     """
-    azStorageClient = StorageManagementClient(azureCredential,azSubId)
+    azStorageClient = get_azure_management_client(StorageManagementClient, azureCredential, azSubId)
 
     response = cache.get("get_all_storage_accounts")
     if response:
         return response
+
+    # serve the inventory from a cross-Subscription Azure Resource Graph query when that backend is enabled
+    if is_resource_graph_enabled(azureCredential):
+        cache["get_all_storage_accounts"] = get_resources_by_type(azureCredential, azSubId, "microsoft.storage/storageaccounts", models.StorageAccount)
+        return cache["get_all_storage_accounts"]
     
     saList = [sa for sa in azStorageClient.storage_accounts.list()]
     if not saList or saList is None:
@@ -595,7 +602,7 @@ def azure_storage_acct_public_acess_disabled_for_sa_with_blob_containers_check(c
     """
     [Azure.StorageAccount.4] Azure Storage Accounts should have public access disabled for Storage Accounts with Blob Containers
     """
-    azStorageClient = StorageManagementClient(azureCredential,azSubId)
+    azStorageClient = get_azure_management_client(StorageManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for sa in get_all_storage_accounts(cache, azureCredential, azSubId):
@@ -850,7 +857,7 @@ def azure_storage_acct_default_network_access_rule_set_to_deny_check(cache: dict
     """
     [Azure.StorageAccount.5] Azure Storage Accounts should have the default network access rule set to deny
     """
-    azStorageClient = StorageManagementClient(azureCredential,azSubId)
+    azStorageClient = get_azure_management_client(StorageManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for sa in get_all_storage_accounts(cache, azureCredential, azSubId):
@@ -1015,7 +1022,7 @@ def azure_storage_acct_trusted_azure_service_access_enabled_check(cache: dict, a
     """
     [Azure.StorageAccount.6] Azure Storage Accounts should enable Azure services on the trusted services list to access the storage account
     """
-    azStorageClient = StorageManagementClient(azureCredential,azSubId)
+    azStorageClient = get_azure_management_client(StorageManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for sa in get_all_storage_accounts(cache, azureCredential, azSubId):
@@ -1262,7 +1269,7 @@ def azure_storage_acct_private_endpoints_use_for_access_check(cache: dict, awsAc
     """
     [Azure.StorageAccount.7] Azure Virtual Network private endpoints should be used for accessing Azure Storage Accounts
     """
-    azNetworkClient = NetworkManagementClient(azureCredential,azSubId)
+    azNetworkClient = get_azure_management_client(NetworkManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for sa in get_all_storage_accounts(cache, azureCredential, azSubId):
@@ -1431,7 +1438,7 @@ def azure_storage_acct_soft_delete_enabled_for_blob_storage_check(cache: dict, a
     """
     [Azure.StorageAccount.8] Azure Storage Accounts should have soft delete enabled for blob storage
     """
-    azStorageClient = StorageManagementClient(azureCredential,azSubId)
+    azStorageClient = get_azure_management_client(StorageManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for sa in get_all_storage_accounts(cache, azureCredential, azSubId):
@@ -1621,7 +1628,7 @@ def azure_storage_acct_use_tls12_for_https_minimum_version_check(cache: dict, aw
     """
     [Azure.StorageAccount.9] Azure Storage Accounts should ensure that TLS 1.2 is the minimum TLS version for HTTPS connectivity
     """
-    azStorageClient = StorageManagementClient(azureCredential,azSubId)
+    azStorageClient = get_azure_management_client(StorageManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for sa in get_all_storage_accounts(cache, azureCredential, azSubId):
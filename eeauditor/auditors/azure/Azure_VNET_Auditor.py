@@ -23,6 +23,8 @@ import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.azure_collector import get_azure_management_client
+from collectors.azure_resource_graph_collector import get_resources_by_type, is_resource_graph_enabled
 
 registry = CheckRegister()
 
@@ -30,11 +32,16 @@ def get_all_azure_vnets(cache: dict, azureCredential, azSubId: str) -> list[mode
     """
     Returns a list of all Azure Virtual Networks in a Subscription
     """
-    azNetworkClient = NetworkManagementClient(azureCredential,azSubId)
+    azNetworkClient = get_azure_management_client(NetworkManagementClient, azureCredential, azSubId)
 
     response = cache.get("get_all_azure_vnets")
     if response:
         return response
+
+    # serve the inventory from a cross-Subscription Azure Resource Graph query when that backend is enabled
+    if is_resource_graph_enabled(azureCredential):
+        cache["get_all_azure_vnets"] = get_resources_by_type(azureCredential, azSubId, "microsoft.network/virtualnetworks", models.VirtualNetwork)
+        return cache["get_all_azure_vnets"]
     
     vnetList = [vnet for vnet in azNetworkClient.virtual_networks.list_all()]
     if not vnetList or vnetList is None:
@@ -47,11 +54,16 @@ def get_all_azure_network_watchers(cache: dict, azureCredential, azSubId: str) -
     """
     Returns a list of all Azure Network Watchers in a Subscription
     """
-    azNetworkClient = NetworkManagementClient(azureCredential,azSubId)
+    azNetworkClient = get_azure_management_client(NetworkManagementClient, azureCredential, azSubId)
 
     response = cache.get("get_all_azure_network_watchers")
     if response:
         return response
+
+    # serve the inventory from a cross-Subscription Azure Resource Graph query when that backend is enabled
+    if is_resource_graph_enabled(azureCredential):
+        cache["get_all_azure_network_watchers"] = get_resources_by_type(azureCredential, azSubId, "microsoft.network/networkwatchers", models.NetworkWatcher)
+        return cache["get_all_azure_network_watchers"]
     
     nwList = [nw for nw in azNetworkClient.network_watchers.list_all()]
     if not nwList or nwList is None:
@@ -64,11 +76,16 @@ def get_all_azure_nsgs(cache: dict, azureCredential, azSubId: str) -> list[model
     """
     Returns a list of all NSGs in a Subscription
     """
-    azNetworkClient = NetworkManagementClient(azureCredential,azSubId)
+    azNetworkClient = get_azure_management_client(NetworkManagementClient, azureCredential, azSubId)
 
     response = cache.get("get_all_azure_nsgs")
     if response:
         return response
+
+    # serve the inventory from a cross-Subscription Azure Resource Graph query when that backend is enabled
+    if is_resource_graph_enabled(azureCredential):
+        cache["get_all_azure_nsgs"] = get_resources_by_type(azureCredential, azSubId, "microsoft.network/networksecuritygroups", models.NetworkSecurityGroup)
+        return cache["get_all_azure_nsgs"]
     
     nsgList = [nsg for nsg in azNetworkClient.network_security_groups.list_all()]
     if not nsgList or nsgList is None:
@@ -91,7 +108,7 @@ def azure_vnet_bastion_host_exists_check(cache: dict, awsAccountId: str, awsRegi
     """
     [Azure.VNET.1] Azure Bastion Hosts should be deployed to Virtual Networks to provide secure RDP and SSH access to Azure Virtual Machines
     """
-    azNetworkClient = NetworkManagementClient(azureCredential,azSubId)
+    azNetworkClient = get_azure_management_client(NetworkManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for vnet in get_all_azure_vnets(cache, azureCredential, azSubId):
@@ -683,7 +700,7 @@ def azure_vnet_nsg_flow_logs_laws_check(cache: dict, awsAccountId: str, awsRegio
     """
     [Azure.VNET.4] Azure Network Security Groups (NSGs) should have flow logging enabled and sent to an Azure Log Analytics Workspace
     """
-    azNetworkClient = NetworkManagementClient(azureCredential,azSubId)
+    azNetworkClient = get_azure_management_client(NetworkManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
 
@@ -917,7 +934,7 @@ def azure_vnet_nsg_flow_logs_90_day_retention_check(cache: dict, awsAccountId: s
     """
     [Azure.VNET.5] Azure Network Security Group (NSG) flow logs should have a retention period of at least 90 days
     """
-    azNetworkClient = NetworkManagementClient(azureCredential,azSubId)
+    azNetworkClient = get_azure_management_client(NetworkManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
 
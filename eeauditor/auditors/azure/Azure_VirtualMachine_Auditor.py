@@ -27,6 +27,8 @@ import base64
 import json
 import re
 from check_register import CheckRegister
+from collectors.azure_collector import get_azure_management_client
+from collectors.azure_resource_graph_collector import get_resources_by_type, is_resource_graph_enabled
 
 registry = CheckRegister()
 
@@ -34,11 +36,16 @@ def get_all_azure_vms(cache: dict, azureCredential, azSubId: str) -> list[models
     """
     Returns a list of all Azure VMs in a Subscription
     """
-    azComputeClient = ComputeManagementClient(azureCredential,azSubId)
+    azComputeClient = get_azure_management_client(ComputeManagementClient, azureCredential, azSubId)
 
     response = cache.get("get_all_azure_vms")
     if response:
         return response
+
+    # serve the inventory from a cross-Subscription Azure Resource Graph query when that backend is enabled
+    if is_resource_graph_enabled(azureCredential):
+        cache["get_all_azure_vms"] = get_resources_by_type(azureCredential, azSubId, "microsoft.compute/virtualmachines", models.VirtualMachine)
+        return cache["get_all_azure_vms"]
     
     vmList = [vm for vm in azComputeClient.virtual_machines.list_all()]
     if not vmList or vmList is None:
@@ -51,7 +58,7 @@ def get_all_azure_rgs(cache: dict, azureCredential, azSubId: str):
     """
     Returns a list of all Azure Resource Groups in a Subscription
     """
-    azResourceClient = ResourceManagementClient(azureCredential, azSubId)
+    azResourceClient = get_azure_management_client(ResourceManagementClient, azureCredential, azSubId)
 
     response = cache.get("get_all_azure_rgs")
     if response:
@@ -232,7 +239,7 @@ def azure_vm_encrypt_os_and_data_disk_with_cmk_check(cache: dict, awsAccountId:
     """
     [Azure.VirtualMachines.2] Azure Virtual Machines should encrypt both the OS and Data disks with a Customer Managed Key (CMK)
     """
-    azComputeClient = ComputeManagementClient(azureCredential,azSubId)
+    azComputeClient = get_azure_management_client(ComputeManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for vm in get_all_azure_vms(cache, azureCredential, azSubId):
@@ -399,7 +406,7 @@ def azure_vm_unattached_disks_cmk_encryption_check(cache: dict, awsAccountId: st
     """
     [Azure.VirtualMachines.3] Ensure that unattached disks are encrypted with a Customer Managed Key (CMK)
     """
-    azComputeClient = ComputeManagementClient(azureCredential, azSubId)
+    azComputeClient = get_azure_management_client(ComputeManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     
@@ -557,7 +564,7 @@ def azure_vm_monitoring_agent_installed_check(cache: dict, awsAccountId: str, aw
     """
     [Azure.VirtualMachines.4] Azure Virtual Machines should have the Azure Monitor Agent installed
     """
-    azComputeClient = ComputeManagementClient(azureCredential, azSubId)
+    azComputeClient = get_azure_management_client(ComputeManagementClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for vm in get_all_azure_vms(cache, azureCredential, azSubId):
@@ -788,8 +795,8 @@ def azure_vm_azure_backup_coverage_check(cache: dict, awsAccountId: str, awsRegi
     """
     [Azure.VirtualMachines.5] Azure Virtual Machines should have Azure Backup coverage
     """
-    azBackupClient = RecoveryServicesBackupClient(azureCredential, azSubId)
-    azRecoverySvcClient = RecoveryServicesClient(azureCredential, azSubId)
+    azBackupClient = get_azure_management_client(RecoveryServicesBackupClient, azureCredential, azSubId)
+    azRecoverySvcClient = get_azure_management_client(RecoveryServicesClient, azureCredential, azSubId)
     # ISO Time
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
     for vm in get_all_azure_vms(cache, azureCredential, azSubId):
@@ -21,7 +21,7 @@
 import datetime
 import nmap3
 from check_register import CheckRegister
-import googleapiclient.discovery
+from collectors import gcp_collector
 import base64
 import json
 
@@ -34,34 +34,12 @@ def get_compute_engine_instances(cache: dict, gcpProjectId: str, gcpCredentials)
     '''
     AggregatedList result provides Zone information as well as every single Instance in a Project
     '''
-    if cache:
-        return cache
-    
-    results = []
+    response = cache.get("get_compute_engine_instances")
+    if response:
+        return response
 
-    compute = googleapiclient.discovery.build('compute', 'v1', credentials=gcpCredentials)
-
-    aggResult = compute.instances().aggregatedList(project=gcpProjectId).execute()
-
-    # Write all Zones to list
-    zoneList = []
-    for zone in aggResult["items"].keys():
-        zoneList.append(zone)
-
-    # If the Zone has a top level key of "warning" it does not contain entries
-    for z in zoneList:
-        for agg in aggResult["items"][z]:
-            if agg == 'warning':
-                continue
-            # reloop the list except looking at instances - this is a normal List we can loop
-            else:
-                for i in aggResult["items"][z]["instances"]:
-                    results.append(i)
-
-    del aggResult
-    del zoneList
-
-    return results
+    cache["get_compute_engine_instances"] = gcp_collector.get_compute_engine_instances(gcpProjectId, gcpCredentials)
+    return cache["get_compute_engine_instances"]
 
 # This function performs the actual NMAP Scan
 def scan_host(hostIp, assetName, assetComponent):
@@ -20,7 +20,7 @@
 
 import datetime
 from check_register import CheckRegister
-import googleapiclient.discovery
+from collectors.gcp_collector import get_discovery_client
 import base64
 import json
 
@@ -34,7 +34,7 @@ def get_bigquery_tables(cache: dict, gcpProjectId, gcpCredentials) -> list[dict]
     
     tableDetails: list[dict] = []
     
-    service = googleapiclient.discovery.build('bigquery', 'v2', credentials=gcpCredentials)
+    service = get_discovery_client("bigquery", "v2", gcpCredentials)
 
     datasets = service.datasets().list(projectId=gcpProjectId).execute()
 
@@ -20,7 +20,7 @@
 
 import datetime
 from check_register import CheckRegister
-import googleapiclient.discovery
+from collectors.gcp_collector import get_discovery_client
 import base64
 import json
 
@@ -35,7 +35,7 @@ def get_cloudsql_dbs(cache, gcpProjectId, gcpCredentials):
         return response
 
     # CloudSQL requires SQL Admin API - also doesnt need an aggregatedList
-    service = googleapiclient.discovery.build('sqladmin', 'v1beta4', credentials=gcpCredentials)
+    service = get_discovery_client("sqladmin", "v1beta4", gcpCredentials)
     instances = service.instances().list(project=gcpProjectId).execute()
 
     if instances:
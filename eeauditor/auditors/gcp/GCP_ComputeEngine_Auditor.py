@@ -20,7 +20,7 @@
 
 import datetime
 from check_register import CheckRegister
-import googleapiclient.discovery
+from collectors import gcp_collector
 import base64
 import json
 
@@ -30,34 +30,12 @@ def get_compute_engine_instances(cache: dict, gcpProjectId: str, gcpCredentials)
     '''
     AggregatedList result provides Zone information as well as every single Instance in a Project
     '''
-    if cache:
-        return cache
-    
-    results = []
+    response = cache.get("get_compute_engine_instances")
+    if response:
+        return response
 
-    compute = googleapiclient.discovery.build('compute', 'v1', credentials=gcpCredentials)
-
-    aggResult = compute.instances().aggregatedList(project=gcpProjectId).execute()
-
-    # Write all Zones to list
-    zoneList = []
-    for zone in aggResult["items"].keys():
-        zoneList.append(zone)
-
-    # If the Zone has a top level key of "warning" it does not contain entries
-    for z in zoneList:
-        for agg in aggResult["items"][z]:
-            if agg == 'warning':
-                continue
-            # reloop the list except looking at instances - this is a normal List we can loop
-            else:
-                for i in aggResult["items"][z]["instances"]:
-                    results.append(i)
-
-    del aggResult
-    del zoneList
-
-    return results
+    cache["get_compute_engine_instances"] = gcp_collector.get_compute_engine_instances(gcpProjectId, gcpCredentials)
+    return cache["get_compute_engine_instances"]
 
 @registry.register_check("gce")
 def gce_instance_deletion_protection_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str, gcpProjectId: str, gcpCredentials):
@@ -1437,7 +1415,7 @@ def gce_instance_serial_port_access_check(cache: dict, awsAccountId: str, awsReg
     [GCP.GCE.9] Google Compute Engine VM instances should not enabled serial port access
     """
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
-    compute = googleapiclient.discovery.build('compute', 'v1', credentials=gcpCredentials)
+    compute = gcp_collector.get_discovery_client("compute", "v1", gcpCredentials)
 
     for gce in get_compute_engine_instances(cache, gcpProjectId, gcpCredentials):
         # B64 encode all of the details for the Asset
@@ -1619,7 +1597,7 @@ def gce_instance_oslogon_access_check(cache: dict, awsAccountId: str, awsRegion:
     [GCP.GCE.10] Google Compute Engine Linux VM instances should be configured to be accessed using OS Logon
     """
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
-    compute = googleapiclient.discovery.build('compute', 'v1', credentials=gcpCredentials)
+    compute = gcp_collector.get_discovery_client("compute", "v1", gcpCredentials)
 
     for gce in get_compute_engine_instances(cache, gcpProjectId, gcpCredentials):
         # B64 encode all of the details for the Asset
@@ -1790,7 +1768,7 @@ def gce_instance_oslogon_2fa_access_check(cache: dict, awsAccountId: str, awsReg
     [GCP.GCE.11] Google Compute Engine Linux VM instances should be configured to be accessed using OS Logon with 2FA
     """
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
-    compute = googleapiclient.discovery.build('compute', 'v1', credentials=gcpCredentials)
+    compute = gcp_collector.get_discovery_client("compute", "v1", gcpCredentials)
 
     for gce in get_compute_engine_instances(cache, gcpProjectId, gcpCredentials):
         # B64 encode all of the details for the Asset
@@ -1998,7 +1976,7 @@ def gce_instance_block_proj_ssh_keys_check(cache: dict, awsAccountId: str, awsRe
     [GCP.GCE.12] Google Compute Engine VM instances should block access from Project-wide SSH Keys
     """
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
-    compute = googleapiclient.discovery.build('compute', 'v1', credentials=gcpCredentials)
+    compute = gcp_collector.get_discovery_client("compute", "v1", gcpCredentials)
 
     for gce in get_compute_engine_instances(cache, gcpProjectId, gcpCredentials):
         # B64 encode all of the details for the Asset
@@ -20,7 +20,7 @@
 
 import datetime
 from check_register import CheckRegister
-import googleapiclient.discovery
+from collectors.gcp_collector import get_discovery_client
 import base64
 import json
 
@@ -32,7 +32,7 @@ def get_service_accounts(cache: dict, gcpProjectId, gcpCredentials) -> list[dict
     if response:
         return response
     
-    service = googleapiclient.discovery.build("iam", "v1", credentials=gcpCredentials)
+    service = get_discovery_client("iam", "v1", gcpCredentials)
     request = service.projects().serviceAccounts().list(name=f"projects/{gcpProjectId}").execute()
     
     serviceAccounts = request.get("accounts", [])
@@ -45,7 +45,7 @@ def get_service_accounts(cache: dict, gcpProjectId, gcpCredentials) -> list[dict
     
 def get_service_account_keys(serviceAccountEmail: str, gcpCredentials) -> list[dict]:
     """Gets keys for a given service account"""
-    service = googleapiclient.discovery.build("iam", "v1", credentials=gcpCredentials)
+    service = get_discovery_client("iam", "v1", gcpCredentials)
     request = service.projects().serviceAccounts().keys().list(
         name=f"projects/-/serviceAccounts/{serviceAccountEmail}",
         keyTypes="USER_MANAGED"
@@ -23,6 +23,7 @@ import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.m365_graph_collector import GraphClient, index_by_key
 
 registry = CheckRegister()
 
@@ -55,44 +56,36 @@ def get_oauth_token(cache, tenantId, clientId, clientSecret):
         cache["get_oauth_token"] = token
         return cache["get_oauth_token"]
 
-def get_aad_users_with_enrichment(cache, tenantId, clientId, clientSecret):
+def get_graph_client(cache, tenantId, clientId, clientSecret):
 
-    response = cache.get("get_aad_users_with_enrichment")
+    response = cache.get("get_graph_client")
     if response:
         return response
 
     # Retrieve the Token from Cache
     token = get_oauth_token(cache, tenantId, clientId, clientSecret)
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
-    
-    userList = []
-    listUsersUrl = "https://graph.microsoft.com/v1.0/users"
 
-    # Implement pagination here in case a shitload of Users are returned
-    try:
-        listusers = json.loads(requests.get(listUsersUrl,headers=headers).text)
-        for user in listusers["value"]:
-            userList.append(user)
-
-        while listusers["@odata.nextLink"]:
-            listusers = json.loads(requests.get(listusers["@odata.nextLink"], headers=headers).text)
-            if "@odata.nextLink" in listusers:
-                listUsersUrl = listusers["@odata.nextLink"]
-            else:
-                for user in listusers["value"]:
-                    userList.append(user)
-                break
+    cache["get_graph_client"] = GraphClient(token, API_ROOT)
+    return cache["get_graph_client"]
+
+def get_aad_users_with_enrichment(cache, tenantId, clientId, clientSecret):
+
+    response = cache.get("get_aad_users_with_enrichment")
+    if response:
+        return response
 
-            for user in listusers["value"]:
-                userList.append(user)
-    except KeyError:
-        print("No more pagination for AD Users.")
+    graph = get_graph_client(cache, tenantId, clientId, clientSecret)
+
+    # Follow @odata.nextLink in case a shitload of Users are returned
+    try:
+        userList = graph.get_all_pages("/users")
+    except requests.HTTPError as e:
+        print(f"Unable to list AD Users because {e}")
+        userList = []
 
     print(f"{len(userList)} AD Users found. Attempting to retrieve MFA device & Identity Protection information.")
 
-    userList = check_user_mfa_and_risk(token, userList)
+    userList = check_user_mfa_and_risk(graph, userList)
     
     # Print the len() again just in case there was an issue, not like there is anything to do about it though
     print(f"Done retrieving MFA details for {len(userList)} users!")
@@ -100,99 +93,60 @@ def get_aad_users_with_enrichment(cache, tenantId, clientId, clientSecret):
     cache["get_aad_users_with_enrichment"] = userList
     return cache["get_aad_users_with_enrichment"]
 
-def check_user_mfa_and_risk(token, users):
+def check_user_mfa_and_risk(graph, users):
     """
     This function receives a full list of Users adds a list of authentication methods, and
     adds Identity Protection Risky User & Sign-in (Detection) information and returns the list
     """
 
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
+    # Index the Risk Detections and Risky Users by User ID so each User is a lookup instead of a search
+    riskDetections = index_by_key(get_identity_protection_risk_detections(graph), "userId")
+    # There *should* only ever be one Risky User entry per user
+    riskyUsers = {riskuser["id"]: riskuser for riskuser in get_identity_protection_risky_users(graph)}
 
-    riskDetections = get_identity_protection_risk_detections(token)
-    riskyUsers = get_identity_protection_risky_users(token)
+    # Get the MFA Devices for every User with batched requests
+    authMethodResponses = graph.batch_get(
+        [f"/users/{user['id']}/authentication/methods" for user in users]
+    )
 
     enrichedUsers = []
 
-    for user in users:
+    for user, authMethodResponse in zip(users, authMethodResponses):
         userId = user["id"]
 
-        # Use a list comprehension to check if the User has any Risk Detections - but only if there is a list to comprehend ;)
-        if riskDetections:
-            userRiskDetections = [risk for risk in riskDetections if risk["userId"] == userId]
-            if userRiskDetections:
-                user["identityProtectionRiskDetections"] = userRiskDetections
-            else:
-                user["identityProtectionRiskDetections"] = []
-        else:
-            user["identityProtectionRiskDetections"] = []
-
-        # Use a list comprehension to check if the User is...Risky :O - but only if there is a list to comprehend ;)
-        # Use a dictionary here as there *should* only ever be one entry per user
-        if riskyUsers:
-            userBeingRiskyAndShit = [riskuser for riskuser in riskyUsers if riskuser["id"] == userId]
-            if userBeingRiskyAndShit:
-                user["identityProtectionRiskyUser"] = userBeingRiskyAndShit[0]
-            else:
-                user["identityProtectionRiskyUser"] = {}
-        else:
-            user["identityProtectionRiskyUser"] = {}
-
-        # Get the MFA Devices now
-        r = requests.get(
-            f"{API_ROOT}/users/{userId}/authentication/methods",
-            headers=headers
-        )
+        user["identityProtectionRiskDetections"] = riskDetections.get(userId, [])
+        user["identityProtectionRiskyUser"] = riskyUsers.get(userId, {})
 
-        if r.status_code != 200:
-            print(f"Unable to get MFA for User {id} because {r.reason}")
+        if authMethodResponse["status"] != 200:
+            print(f"Unable to get MFA for User {userId} because of a {authMethodResponse['status']} response")
             user["authenticationMethods"] = []
         else:
-            user["authenticationMethods"] = json.loads(r.text)["value"]
+            user["authenticationMethods"] = authMethodResponse["body"].get("value", [])
             enrichedUsers.append(user)
     
     return enrichedUsers
 
-def get_identity_protection_risk_detections(token):
+def get_identity_protection_risk_detections(graph):
     """
     Returns a list of Risk Detections from Identity Protection, these are the "Risky Sign-ins"
     """
 
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
-
-    r = requests.get(
-        f"{API_ROOT}/identityProtection/riskDetections",
-        headers=headers
-    )
-
-    if r.status_code != 200:
-        print(f"Unable to get riskDetections because {r.reason}")
+    try:
+        return graph.get_all_pages("/identityProtection/riskDetections")
+    except requests.HTTPError as e:
+        print(f"Unable to get riskDetections because {e}")
         return []
-    else:
-        return json.loads(r.text)["value"]
 
-def get_identity_protection_risky_users(token):
+def get_identity_protection_risky_users(graph):
     """
     Returns a list of Risky Users from Identity Protection
     """
 
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
-
-    r = requests.get(
-        f"{API_ROOT}/identityProtection/riskyUsers",
-        headers=headers
-    )
-
-    if r.status_code != 200:
-        print(f"Unable to get riskyUsers because {r.reason}")
+    try:
+        return graph.get_all_pages("/identityProtection/riskyUsers")
+    except requests.HTTPError as e:
+        print(f"Unable to get riskyUsers because {e}")
         return []
-    else:
-        return json.loads(r.text)["value"]
     
 @registry.register_check("m365.aadusers")
 def m365_aad_user_mfa_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str, tenantId: str, clientId: str, clientSecret: str, tenantLocation: str) -> dict:
@@ -18,14 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import os
 import oci
-from oci.config import validate_config
 import nmap3
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_compute_instance_vnics, get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -51,89 +50,30 @@ def get_oci_compute_instances(cache, ociTenancyId, ociUserId, ociRegionName, oci
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    instanceClient = oci.core.ComputeClient(config)
-
-    instancesList = []
-
-    for compartment in ociCompartments:
-        listInstances = instanceClient.list_instances(compartment_id=compartment, lifecycle_state="RUNNING").data
-        if not listInstances:
-            return {}
-        else:
-            for instance in listInstances:
-                processedInstance = process_response(instance)
-                instancesList.append(processedInstance)
+    def _list_compartment_instances(compartment):
+        instanceClient = get_oci_client(oci.core.ComputeClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(instance) for instance in list_all(
+                instanceClient.list_instances, compartment_id=compartment, lifecycle_state="RUNNING"
+            )
+        ]
 
-    cache["get_oci_compute_instances"] = instancesList
+    cache["get_oci_compute_instances"] = sweep_compartments(_list_compartment_instances, ociCompartments)
     return cache["get_oci_compute_instances"]
 
-# Needed to get the Public IP of an Instance
-def get_compute_instance_vnic(ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint, compartmentId, instanceId):
-    """
-    Helper function to retrieve the Virtual NIC & Network Security Group information for a Cloud Compute Instance.
-    OCI requires you to call ListVnicAttachments, derive the VNC OCID, and use that to call the GetVnic ID in another
-    client object. The response of GetVnic contains information on the public IP of an instance and the associated NSGs
-    """
-
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    instanceClient = oci.core.ComputeClient(config)
-    vncClient = oci.core.VirtualNetworkClient(config)
-
-    vnics = instanceClient.list_vnic_attachments(compartment_id=compartmentId, instance_id=instanceId).data
-    vnicId = process_response(vnics)[0]["vnic_id"]
-    vnicData = vncClient.get_vnic(vnic_id=vnicId).data
-
-    return process_response(vnicData)
-
 def get_oci_load_balancers(cache, ociTenancyId, ociUserId, ociRegionName, ociCompartments, ociUserApiKeyFingerprint):
     
     response = cache.get("get_oci_load_balancers")
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
+    def _list_compartment_load_balancers(compartment):
+        lbClient = get_oci_client(oci.load_balancer.LoadBalancerClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(lb) for lb in list_all(lbClient.list_load_balancers, compartment_id=compartment)
+        ]
 
-    lbClient = oci.load_balancer.LoadBalancerClient(config)
-
-    lbList = []
-
-    for compartment in ociCompartments:
-        listLbs = lbClient.list_load_balancers(compartment_id=compartment)
-        for lb in listLbs.data:
-            processedInstance = process_response(lb)
-            lbList.append(processedInstance)
-
-    cache["get_oci_load_balancers"] = lbList
+    cache["get_oci_load_balancers"] = sweep_compartments(_list_compartment_load_balancers, ociCompartments)
     return cache["get_oci_load_balancers"]
 
 # This function performs the actual NMAP Scan
@@ -169,7 +109,10 @@ def oci_compute_attack_surface_open_tcp_port_check(cache, awsAccountId, awsRegio
         shape = instance["shape"]
         lifecycleState = instance["lifecycle_state"]
         # Get the VNIC info
-        instanceVnic = get_compute_instance_vnic(ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint, compartmentId, instanceId)
+        instanceVnic = get_compute_instance_vnics(ociTenancyId, ociUserId, ociRegionName, ociCompartments, ociUserApiKeyFingerprint).get(instanceId)
+        # Instances without an attached VNIC (e.g. mid-launch) cannot be evaluated
+        if instanceVnic is None:
+            continue
         # Skip over instances that are not public
         pubIp = instanceVnic["public_ip"]
         if instanceVnic["public_ip"] is None:
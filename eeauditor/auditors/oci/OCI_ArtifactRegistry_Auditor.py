@@ -18,15 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import tomli
-import os
 import oci
-from oci.config import validate_config
 import vt
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from external_providers import get_global_credential
+from collectors.oci_collector import get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -36,63 +35,7 @@ def get_virustotal_api_key(cache):
     if response:
         return response
 
-    import sys
-    import boto3
-    from botocore.exceptions import ClientError
-
-    validCredLocations = ["AWS_SSM", "AWS_SECRETS_MANAGER", "CONFIG_FILE"]
-
-    # Get the absolute path of the current directory
-    currentDir = os.path.abspath(os.path.dirname(__file__))
-    # Go two directories back to /eeauditor/
-    twoBack = os.path.abspath(os.path.join(currentDir, "../../"))
-
-    # TOML is located in /eeauditor/ directory
-    tomlFile = f"{twoBack}/external_providers.toml"
-    with open(tomlFile, "rb") as f:
-        data = tomli.load(f)
-
-    # Parse from [global] to determine credential location of PostgreSQL Password
-    credLocation = data["global"]["credentials_location"]
-    vtCredValue = data["global"]["virustotal_api_key_value"]
-    if credLocation not in validCredLocations:
-        print(f"Invalid option for [global.credLocation]. Must be one of {str(validCredLocations)}.")
-        sys.exit(2)
-    if not vtCredValue:
-        apiKey = None
-    else:
-
-        # Boto3 Clients
-        ssm = boto3.client("ssm")
-        asm = boto3.client("secretsmanager")
-
-        # Retrieve API Key
-        if credLocation == "CONFIG_FILE":
-            apiKey = vtCredValue
-
-        # Retrieve the credential from SSM Parameter Store
-        elif credLocation == "AWS_SSM":
-            
-            try:
-                apiKey = ssm.get_parameter(
-                    Name=vtCredValue,
-                    WithDecryption=True
-                )["Parameter"]["Value"]
-            except ClientError as e:
-                print(f"Error retrieving API Key from SSM, skipping all Shodan checks, error: {e}")
-                apiKey = None
-
-        # Retrieve the credential from AWS Secrets Manager
-        elif credLocation == "AWS_SECRETS_MANAGER":
-            try:
-                apiKey = asm.get_secret_value(
-                    SecretId=vtCredValue,
-                )["SecretString"]
-            except ClientError as e:
-                print(f"Error retrieving API Key from ASM, skipping all Shodan checks, error: {e}")
-                apiKey = None
-        
-    cache["get_virustotal_api_key"] = apiKey
+    cache["get_virustotal_api_key"] = get_global_credential("virustotal_api_key_value")
     return cache["get_virustotal_api_key"]
 
 def process_response(responseObject):
@@ -114,33 +57,23 @@ def get_artifact_repos(cache, ociTenancyId, ociUserId, ociRegionName, ociCompart
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    artifactClient = oci.artifacts.ArtifactsClient(config)
-
-    ociArtifactRepos = []
-
-    for compartment in ociCompartments:
-        for repo in process_response(artifactClient.list_repositories(compartment_id=compartment,lifecycle_state="AVAILABLE").data)["items"]:
+    def _list_compartment_artifact_repos(compartment):
+        artifactClient = get_oci_client(oci.artifacts.ArtifactsClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        ociArtifactRepos = []
+        for repo in list_all(artifactClient.list_repositories, compartment_id=compartment, lifecycle_state="AVAILABLE"):
+            repo = process_response(repo)
             # Get all of the Artifacts in the actual Repository and add it as a new list - this way we can avoid
             # multiple API calls
-            artifactStorage = process_response(
-                artifactClient.list_generic_artifacts(
-                    compartment_id=compartment, repository_id=repo["id"]).data
-                )["items"]
-            repo["generic_artifacts"] = artifactStorage
+            repo["generic_artifacts"] = [
+                process_response(artifact) for artifact in list_all(
+                    artifactClient.list_generic_artifacts, compartment_id=compartment, repository_id=repo["id"]
+                )
+            ]
             ociArtifactRepos.append(repo)
 
-    cache["get_artifact_repos"] = ociArtifactRepos
+        return ociArtifactRepos
+
+    cache["get_artifact_repos"] = sweep_compartments(_list_compartment_artifact_repos, ociCompartments)
     return cache["get_artifact_repos"]
 
 @registry.register_check("oci.artifactregistry")
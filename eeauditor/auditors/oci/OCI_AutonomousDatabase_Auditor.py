@@ -18,13 +18,12 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import os
 import oci
-from oci.config import validate_config
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -47,27 +46,15 @@ def get_autonomous_databases(cache, ociTenancyId, ociUserId, ociRegionName, ociC
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
+    def _list_compartment_autonomous_databases(compartment):
+        dbClient = get_oci_client(oci.database.DatabaseClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(autodb) for autodb in list_all(
+                dbClient.list_autonomous_databases, compartment_id=compartment, lifecycle_state="AVAILABLE"
+            )
+        ]
 
-    dbClient = oci.database.DatabaseClient(config)
-
-    aHugeBoxOfAutonomousDatabases = []
-
-    for compartment in ociCompartments:
-        for autodb in dbClient.list_autonomous_databases(compartment_id=compartment, lifecycle_state="AVAILABLE").data:
-            autodb = process_response(autodb)
-            aHugeBoxOfAutonomousDatabases.append(autodb)
-
-    cache["get_autonomous_databases"] = aHugeBoxOfAutonomousDatabases
+    cache["get_autonomous_databases"] = sweep_compartments(_list_compartment_autonomous_databases, ociCompartments)
     return cache["get_autonomous_databases"]
 
 @registry.register_check("oci.autonomousdatabase")
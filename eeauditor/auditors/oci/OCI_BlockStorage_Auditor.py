@@ -18,13 +18,12 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import os
 import oci
-from oci.config import validate_config
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -47,29 +46,19 @@ def get_block_storage_volumes(cache, ociTenancyId, ociUserId, ociRegionName, oci
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    blockStorageClient = oci.core.BlockstorageClient(config)
-
-    aBigBlockyListOfBlockyBois = []
-
-    for compartment in ociCompartments:
-        for blockyboi in process_response(blockStorageClient.list_volumes(compartment_id=compartment).data):
+    def _list_compartment_volumes(compartment):
+        blockStorageClient = get_oci_client(oci.core.BlockstorageClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        aBigBlockyListOfBlockyBois = []
+        for blockyboi in list_all(blockStorageClient.list_volumes, compartment_id=compartment):
+            blockyboi = process_response(blockyboi)
             # Get
             blockyBoiBackupPolicyAssignment = process_response(blockStorageClient.get_volume_backup_policy_asset_assignment(asset_id=blockyboi["id"]).data)
             blockyboi["backup_policy"] = blockyBoiBackupPolicyAssignment
             aBigBlockyListOfBlockyBois.append(blockyboi)
 
-    cache["get_block_storage_volumes"] = aBigBlockyListOfBlockyBois
+        return aBigBlockyListOfBlockyBois
+
+    cache["get_block_storage_volumes"] = sweep_compartments(_list_compartment_volumes, ociCompartments)
     return cache["get_block_storage_volumes"]
 
 @registry.register_check("oci.blockstorage")
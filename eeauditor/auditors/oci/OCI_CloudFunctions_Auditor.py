@@ -18,13 +18,12 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import os
 import oci
-from oci.config import validate_config
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -47,32 +46,22 @@ def get_cloud_function_apps(cache, ociTenancyId, ociUserId, ociRegionName, ociCo
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    funcMgmtClient = oci.functions.FunctionsManagementClient(config)
-
-    aListOfAppsAndFunctions = []
-
-    for compartment in ociCompartments:
-        for app in process_response(funcMgmtClient.list_applications(compartment_id=compartment).data):
+    def _list_compartment_apps(compartment):
+        funcMgmtClient = get_oci_client(oci.functions.FunctionsManagementClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        aListOfAppsAndFunctions = []
+        for app in list_all(funcMgmtClient.list_applications, compartment_id=compartment):
+            app = process_response(app)
             # Create a new nested list in the application dict to hold the individual functions
-            app["functions"] = []
-            for function in process_response(
-                funcMgmtClient.list_functions(application_id=app["id"]).data
-            ):
-                app["functions"].append(function)
+            app["functions"] = [
+                process_response(function) for function in list_all(
+                    funcMgmtClient.list_functions, application_id=app["id"]
+                )
+            ]
             aListOfAppsAndFunctions.append(app)
 
-    cache["get_cloud_function_apps"] = aListOfAppsAndFunctions
+        return aListOfAppsAndFunctions
+
+    cache["get_cloud_function_apps"] = sweep_compartments(_list_compartment_apps, ociCompartments)
     return cache["get_cloud_function_apps"]
 
 def get_scanned_repositories(cache, ociTenancyId, ociUserId, ociRegionName, ociCompartments, ociUserApiKeyFingerprint):
@@ -81,35 +70,26 @@ def get_scanned_repositories(cache, ociTenancyId, ociUserId, ociRegionName, ociC
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    artifactClient = oci.artifacts.ArtifactsClient(config)
-    vssClient = oci.vulnerability_scanning.VulnerabilityScanningClient(config)
-
-    scannedContainerRegistryRepos = []
-
-    for compartment in ociCompartments:
+    def _list_compartment_scanned_repositories(compartment):
+        artifactClient = get_oci_client(oci.artifacts.ArtifactsClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        vssClient = get_oci_client(oci.vulnerability_scanning.VulnerabilityScanningClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        scannedContainerRegistryRepos = []
         namespace = process_response(artifactClient.get_container_configuration(compartment_id=compartment).data)["namespace"]
-        for targets in process_response(vssClient.list_container_scan_targets(compartment_id=compartment).data)["items"]:
+        for targets in list_all(vssClient.list_container_scan_targets, compartment_id=compartment):
+            targets = process_response(targets)
             targetUrl = targets["target_registry"]["url"]
             for targetrepo in targets["target_registry"]["repositories"]:
                 # The repo name on its own isn't referenced by Cloud Functions, only the full tag including the OCR url, namespace, etc
                 # so we need to recreate that and compare it to the image split off by the version using .split(":")..
                 # ...just look at how it's down in Check 5, it's great, I promise
-                repoFqdn = f"{targetUrl}/{namespace}/{targetrepo}"
-                if repoFqdn not in scannedContainerRegistryRepos:
-                    scannedContainerRegistryRepos.append(repoFqdn)
+                scannedContainerRegistryRepos.append(f"{targetUrl}/{namespace}/{targetrepo}")
+
+        return scannedContainerRegistryRepos
+
+    scannedContainerRegistryRepos = sweep_compartments(_list_compartment_scanned_repositories, ociCompartments)
 
-    cache["get_scanned_repositories"] = scannedContainerRegistryRepos
+    # deduplicate while keeping the order the Compartments were swept in
+    cache["get_scanned_repositories"] = list(dict.fromkeys(scannedContainerRegistryRepos))
     return cache["get_scanned_repositories"]
 
 @registry.register_check("oci.cloudfunctions")
@@ -18,14 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import os
 import oci
-from oci.config import validate_config
 import requests
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_compute_instance_vnics, get_exploitable_compute_instance_cves, get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -48,60 +47,17 @@ def get_oci_compute_instances(cache, ociTenancyId, ociUserId, ociRegionName, oci
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    instanceClient = oci.core.ComputeClient(config)
-
-    instancesList = []
-
-    for compartment in ociCompartments:
-        listInstances = instanceClient.list_instances(compartment_id=compartment, lifecycle_state="RUNNING").data
-        if not listInstances:
-            return {}
-        else:
-            for instance in listInstances:
-                processedInstance = process_response(instance)
-                instancesList.append(processedInstance)
+    def _list_compartment_instances(compartment):
+        instanceClient = get_oci_client(oci.core.ComputeClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(instance) for instance in list_all(
+                instanceClient.list_instances, compartment_id=compartment, lifecycle_state="RUNNING"
+            )
+        ]
 
-    cache["get_oci_compute_instances"] = instancesList
+    cache["get_oci_compute_instances"] = sweep_compartments(_list_compartment_instances, ociCompartments)
     return cache["get_oci_compute_instances"]
 
-def get_compute_instance_vnic(ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint, compartmentId, instanceId):
-    """
-    Helper function to retrieve the Virtual NIC & Network Security Group information for a Cloud Compute Instance.
-    OCI requires you to call ListVnicAttachments, derive the VNC OCID, and use that to call the GetVnic ID in another
-    client object. The response of GetVnic contains information on the public IP of an instance and the associated NSGs
-    """
-
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    instanceClient = oci.core.ComputeClient(config)
-    vncClient = oci.core.VirtualNetworkClient(config)
-
-    vnics = instanceClient.list_vnic_attachments(compartment_id=compartmentId, instance_id=instanceId).data
-    vnicId = process_response(vnics)[0]["vnic_id"]
-    vnicData = vncClient.get_vnic(vnic_id=vnicId).data
-
-    return process_response(vnicData)
-
 def get_cisa_kev():
     """
     Retrieves the U.S. CISA's Known Exploitable Vulnerabilities (KEV) Catalog and returns a list of CVE ID's
@@ -119,54 +75,9 @@ def get_exploitable_compute_instances(cache, ociTenancyId, ociUserId, ociRegionN
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    vssClient = oci.vulnerability_scanning.VulnerabilityScanningClient(config)
-
-    kev = get_cisa_kev()
-
-    impactedInstancesMasterList = []
-
-    for compartment in ociCompartments:
-        vulns = process_response(
-            vssClient.list_vulnerabilities(
-                compartment_id=compartment,
-                vulnerability_type="CVE",
-                limit=100000
-            ).data
-        )["items"]
-        # Use a list comprehension to process the vulnerabilities by ensuring that the "state" is OPEN and that
-        # the "vulnerability_reference" is actually a CVE ID, though we filter for it within the API
-        # then, ensure that the vulns actually impact the Instances within the current Compartment
-        # finally, see if the vulns are in the KEV
-        activeCves = [
-            vuln for vuln in vulns if vuln["state"] == "OPEN" 
-            and vuln["vulnerability_reference"].startswith("CVE-")
-            and vuln["impacted_resources_count"]["host_count"] > 0
-            and vuln["vulnerability_reference"] in kev
-        ]
-        # For each CVE in the list of active, Instance-impacting, and exploitable vulnerabilities get the Instances
-        for cve in activeCves:
-            impactedInstances = process_response(
-                vssClient.list_vulnerability_impacted_hosts(
-                    vulnerability_id=cve["id"]
-                ).data
-            )["items"]
-
-            for instance in impactedInstances:
-                if instance["instance_id"] not in impactedInstancesMasterList:
-                    impactedInstancesMasterList.append(instance["instance_id"])
-
-    cache["get_exploitable_compute_instances"] = impactedInstancesMasterList
+    cache["get_exploitable_compute_instances"] = get_exploitable_compute_instance_cves(
+        ociTenancyId, ociUserId, ociRegionName, ociCompartments, ociUserApiKeyFingerprint, set(get_cisa_kev())
+    )
     return cache["get_exploitable_compute_instances"]
 
 @registry.register_check("oci.computeinstances")
@@ -1764,7 +1675,10 @@ def oci_cloud_compute_instance_public_ip_check(cache, awsAccountId, awsRegion, a
         shape = instance["shape"]
         lifecycleState = instance["lifecycle_state"]
         # Get the VNIC info
-        instanceVnic = get_compute_instance_vnic(ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint, compartmentId, instanceId)
+        instanceVnic = get_compute_instance_vnics(ociTenancyId, ociUserId, ociRegionName, ociCompartments, ociUserApiKeyFingerprint).get(instanceId)
+        # Instances without an attached VNIC (e.g. mid-launch) cannot be evaluated
+        if instanceVnic is None:
+            continue
         # Begin finding evaluation - public IP is null if not there
         if instanceVnic["public_ip"] is not None:
             finding = {
@@ -1931,7 +1845,10 @@ def oci_cloud_compute_instance_nsg_assigned_check(cache, awsAccountId, awsRegion
         shape = instance["shape"]
         lifecycleState = instance["lifecycle_state"]
         # Get the VNIC info
-        instanceVnic = get_compute_instance_vnic(ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint, compartmentId, instanceId)
+        instanceVnic = get_compute_instance_vnics(ociTenancyId, ociUserId, ociRegionName, ociCompartments, ociUserApiKeyFingerprint).get(instanceId)
+        # Instances without an attached VNIC (e.g. mid-launch) cannot be evaluated
+        if instanceVnic is None:
+            continue
         # Begin finding evaluation - public IP is null if not there
         if not instanceVnic["nsg_ids"]:
             finding = {
@@ -18,13 +18,12 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import os
 import oci
-from oci.config import validate_config
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -47,30 +46,14 @@ def get_instance_configurations(cache, ociTenancyId, ociUserId, ociRegionName, o
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
+    def _list_compartment_instance_configurations(compartment):
+        computeMgmtClient = get_oci_client(oci.core.ComputeManagementClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(computeMgmtClient.get_instance_configuration(instance_configuration_id=template.id).data)
+            for template in list_all(computeMgmtClient.list_instance_configurations, compartment_id=compartment)
+        ]
 
-    computeMgmtClient = oci.core.ComputeManagementClient(config)
-
-    aSlightlyConfigurableListOfInstanceConfigurations = []
-
-    for compartment in ociCompartments:
-        for template in process_response(computeMgmtClient.list_instance_configurations(compartment_id=compartment).data):
-            aSlightlyConfigurableListOfInstanceConfigurations.append(
-                process_response(
-                    computeMgmtClient.get_instance_configuration(instance_configuration_id=template["id"]).data
-                )
-            )
-
-    cache["get_instance_configurations"] = aSlightlyConfigurableListOfInstanceConfigurations
+    cache["get_instance_configurations"] = sweep_compartments(_list_compartment_instance_configurations, ociCompartments)
     return cache["get_instance_configurations"]
 
 @registry.register_check("oci.instanceconfiguration")
@@ -18,13 +18,12 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import os
 import oci
-from oci.config import validate_config
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -47,30 +46,14 @@ def get_container_instances(cache, ociTenancyId, ociUserId, ociRegionName, ociCo
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
+    def _list_compartment_container_instances(compartment):
+        ciClient = get_oci_client(oci.container_instances.ContainerInstanceClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(ciClient.get_container_instance(container_instance_id=cinstance.id).data)
+            for cinstance in list_all(ciClient.list_container_instances, compartment_id=compartment)
+        ]
 
-    ciClient = oci.container_instances.ContainerInstanceClient(config)
-
-    containerInstancesAreListedHere = []
-
-    for compartment in ociCompartments:
-        for cinstance in process_response(ciClient.list_container_instances(compartment_id=compartment).data)["items"]:
-            containerInstancesAreListedHere.append(
-                process_response(
-                    ciClient.get_container_instance(container_instance_id=cinstance["id"]).data
-                )
-            )
-
-    cache["get_container_instances"] = containerInstancesAreListedHere
+    cache["get_container_instances"] = sweep_compartments(_list_compartment_container_instances, ociCompartments)
     return cache["get_container_instances"]
 
 @registry.register_check("oci.containerinstances")
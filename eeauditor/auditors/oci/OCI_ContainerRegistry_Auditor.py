@@ -18,14 +18,14 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import os
 import oci
-from oci.config import validate_config
 import requests
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.collector_base import fan_out
+from collectors.oci_collector import get_exploitable_vulnerability_impacts, get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -48,29 +48,14 @@ def get_container_repos(cache, ociTenancyId, ociUserId, ociRegionName, ociCompar
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-    }
-    validate_config(config)
-
-    artifactClient = oci.artifacts.ArtifactsClient(config)
-
-    ociContainerRepos = []
-
-    for compartment in ociCompartments:
-        for repo in process_response(artifactClient.list_container_repositories(compartment_id=compartment, lifecycle_state="AVAILABLE").data)["items"]:
-            ociContainerRepos.append(
-                process_response(
-                    artifactClient.get_container_repository(repository_id=repo["id"]).data
-                )
-            )
+    def _list_compartment_container_repos(compartment):
+        artifactClient = get_oci_client(oci.artifacts.ArtifactsClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(artifactClient.get_container_repository(repository_id=repo.id).data)
+            for repo in list_all(artifactClient.list_container_repositories, compartment_id=compartment, lifecycle_state="AVAILABLE")
+        ]
 
-    cache["get_container_repos"] = ociContainerRepos
+    cache["get_container_repos"] = sweep_compartments(_list_compartment_container_repos, ociCompartments)
     return cache["get_container_repos"]
 
 def get_scanned_repositories(cache, ociTenancyId, ociUserId, ociRegionName, ociCompartments, ociUserApiKeyFingerprint):
@@ -79,29 +64,19 @@ def get_scanned_repositories(cache, ociTenancyId, ociUserId, ociRegionName, ociC
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    vssClient = oci.vulnerability_scanning.VulnerabilityScanningClient(config)
+    def _list_compartment_scanned_repositories(compartment):
+        vssClient = get_oci_client(oci.vulnerability_scanning.VulnerabilityScanningClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        scannedContainerRegistryRepos = []
+        for targets in list_all(vssClient.list_container_scan_targets, compartment_id=compartment):
+            scannedContainerRegistryRepos.extend(process_response(targets)["target_registry"]["repositories"])
 
-    scannedContainerRegistryRepos = []
+        return scannedContainerRegistryRepos
 
     # It looks similar to containers, but the plain repository means an Aritfact Repository
-    for compartment in ociCompartments:
-        for targets in process_response(vssClient.list_container_scan_targets(compartment_id=compartment).data)["items"]:
-            for targetrepo in targets["target_registry"]["repositories"]:
-                if targetrepo not in scannedContainerRegistryRepos:
-                    scannedContainerRegistryRepos.append(targetrepo)
+    scannedContainerRegistryRepos = sweep_compartments(_list_compartment_scanned_repositories, ociCompartments)
 
-    cache["get_scanned_repositories"] = scannedContainerRegistryRepos
+    # deduplicate while keeping the order the Compartments were swept in
+    cache["get_scanned_repositories"] = list(dict.fromkeys(scannedContainerRegistryRepos))
     return cache["get_scanned_repositories"]
 
 def get_repository_images(cache, ociTenancyId, ociUserId, ociRegionName, ociCompartments, ociUserApiKeyFingerprint):
@@ -110,31 +85,22 @@ def get_repository_images(cache, ociTenancyId, ociUserId, ociRegionName, ociComp
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-    }
-    validate_config(config)
-
-    artifactClient = oci.artifacts.ArtifactsClient(config)
-
-    containerRegistryImages = []
-
-    # It looks similar to containers, but the plain repository means an Aritfact Repository
-    for compartment in ociCompartments:
-        for image in process_response(artifactClient.list_container_images(compartment_id=compartment, lifecycle_state="AVAILABLE").data)["items"]:
-            signingData = process_response(
-                artifactClient.list_container_image_signatures(compartment_id=compartment, image_id=image["id"]).data
-            )
-            image["container_image_signatures"] = signingData["items"]
+    def _list_compartment_repository_images(compartment):
+        artifactClient = get_oci_client(oci.artifacts.ArtifactsClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        containerRegistryImages = []
+        for image in list_all(artifactClient.list_container_images, compartment_id=compartment, lifecycle_state="AVAILABLE"):
+            image = process_response(image)
+            image["container_image_signatures"] = [
+                process_response(signature) for signature in list_all(
+                    artifactClient.list_container_image_signatures, compartment_id=compartment, image_id=image["id"]
+                )
+            ]
 
             containerRegistryImages.append(image)
 
-    cache["get_repository_images"] = containerRegistryImages
+        return containerRegistryImages
+
+    cache["get_repository_images"] = sweep_compartments(_list_compartment_repository_images, ociCompartments)
     return cache["get_repository_images"]
 
 def get_cisa_kev():
@@ -153,66 +119,33 @@ def get_container_images_with_exploitable_vulns(cache, ociTenancyId, ociUserId,
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-    }
-    validate_config(config)
-
-    vssClient = oci.vulnerability_scanning.VulnerabilityScanningClient(config)
-    artifactClient = oci.artifacts.ArtifactsClient(config)
-    # Bring in the list of CISA KEV catalog CVEs
-    kev = get_cisa_kev()
-    # This will contain a deduplicated list of Image OCIDs
-    impactedContainerImagesOcidMasterList = []
-
-    # Pull in all of the vulns, these should technically be on item per-CVE
-    for compartment in ociCompartments:
-        vulns = process_response(
-            vssClient.list_vulnerabilities(
-                compartment_id=compartment,
-                vulnerability_type="CVE",
-                limit=100000
-            ).data
-        )["items"]
-        # Use a list comprehension to process the vulnerabilities by ensuring that the "state" is OPEN and that
-        # the "vulnerability_reference" is actually a CVE ID, though we filter for it within the API
-        # then, ensure that the vulns actually impact the Images within the current Compartment
-        # finally, see if the vulns are in the KEV
-        activeCves = [
-            vuln for vuln in vulns if vuln["state"] == "OPEN" 
-            and vuln["vulnerability_reference"].startswith("CVE-")
-            and vuln["impacted_resources_count"]["image_count"] > 0
-            and vuln["vulnerability_reference"] in kev
-        ]
-        # For each CVE in the list of active, container-impacted, and exploitable vulnerabilities get the containers
-        for cve in activeCves:
-            impactedContainers = process_response(
-                vssClient.list_vulnerability_impacted_containers(
-                    vulnerability_id=cve["id"]
-                ).data
-            )["items"]
-            for container in impactedContainers:
-                # We can get the OCID by adding args of the repo name and image version tag to the call to ListContainerImages API
-                repoName = container["repository"]
-                imageVersion = container["image"]
-                # Get the OCID of the Image
-                containerId = process_response(
-                    artifactClient.list_container_images(
-                        compartment_id=compartment,
-                        repository_name=repoName,
-                        version=imageVersion
-                    ).data
-                )["items"][0]["id"]
-                # Write the OCID to the list if it's not there already
-                if containerId not in impactedContainerImagesOcidMasterList:
-                    impactedContainerImagesOcidMasterList.append(containerId)
-
-    cache["get_container_images_with_exploitable_vulns"] = impactedContainerImagesOcidMasterList
+    # Bring in the CISA KEV catalog CVEs and every image they impact - grouped by the repo name and image version tag
+    kev = set(get_cisa_kev())
+    impactedImageCves = {}
+    for impact in get_exploitable_vulnerability_impacts(ociTenancyId, ociUserId, ociRegionName, ociCompartments, ociUserApiKeyFingerprint, kev, "image"):
+        container = impact["ImpactedResource"]
+        imageKey = (impact["CompartmentId"], container["repository"], container["image"])
+        impactedImageCves.setdefault(imageKey, set()).add(impact["Cve"])
+
+    def _get_image_ocid(imageKey):
+        compartment, repoName, imageVersion = imageKey
+        artifactClient = get_oci_client(oci.artifacts.ArtifactsClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        # We can get the OCID by adding args of the repo name and image version tag to the call to ListContainerImages API
+        images = artifactClient.list_container_images(
+            compartment_id=compartment,
+            repository_name=repoName,
+            version=imageVersion
+        ).data.items
+        return images[0].id if images else None
+
+    imageKeys = list(impactedImageCves)
+    # Index the exploitable CVEs by Image OCID
+    exploitableImageCves = {}
+    for imageKey, containerId in zip(imageKeys, fan_out(_get_image_ocid, imageKeys)):
+        if containerId is not None:
+            exploitableImageCves.setdefault(containerId, set()).update(impactedImageCves[imageKey])
+
+    cache["get_container_images_with_exploitable_vulns"] = exploitableImageCves
     return cache["get_container_images_with_exploitable_vulns"]
 
 @registry.register_check("oci.containerregistry")
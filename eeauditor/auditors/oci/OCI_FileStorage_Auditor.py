@@ -18,13 +18,12 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import os
 import oci
-from oci.config import validate_config
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -47,34 +46,21 @@ def get_file_storage_file_systems(cache, ociTenancyId, ociUserId, ociRegionName,
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    identityClient = oci.identity.IdentityClient(config)
-    fileSysClient = oci.file_storage.FileStorageClient(config)
-
-    aLargeSubsystemOfFileSystems = []
-
-    for compartment in ociCompartments:
+    def _list_compartment_file_systems(compartment):
+        identityClient = get_oci_client(oci.identity.IdentityClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        fileSysClient = get_oci_client(oci.file_storage.FileStorageClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        aLargeSubsystemOfFileSystems = []
         # The File System APIs for top-level objects (File System, Mount Targets) require the Availability Domain specified...for reasons
         for availabilityDomain in identityClient.list_availability_domains(compartment_id=compartment).data:
             availabilityDomain = process_response(availabilityDomain)
             availabilityDomainName = availabilityDomain["name"]
             # First we need to get the File System, list Exports for the File System and then get the configuration of "export options"
             # ElectricEye will combine all of these disparate data points into one asset schema instead of having it in 3 different pieces
-            for filesys in fileSysClient.list_file_systems(compartment_id=compartment, availability_domain=availabilityDomainName, lifecycle_state="ACTIVE").data:
+            for filesys in list_all(fileSysClient.list_file_systems, compartment_id=compartment, availability_domain=availabilityDomainName, lifecycle_state="ACTIVE"):
                 filesys = process_response(filesys)
                 filesysId = filesys["id"]
                 # ListExports
-                for exports in fileSysClient.list_exports(file_system_id=filesysId).data:
+                for exports in list_all(fileSysClient.list_exports, file_system_id=filesysId):
                     exports = process_response(exports)
                     exportId = exports["id"]
                     # GetExport gives the "export_options" which are rules and secure configuration settings for NFSv3
@@ -86,7 +72,9 @@ def get_file_storage_file_systems(cache, ociTenancyId, ociUserId, ociRegionName,
                 
                 aLargeSubsystemOfFileSystems.append(filesys)
 
-    cache["get_file_storage_file_systems"] = aLargeSubsystemOfFileSystems
+        return aLargeSubsystemOfFileSystems
+
+    cache["get_file_storage_file_systems"] = sweep_compartments(_list_compartment_file_systems, ociCompartments)
     return cache["get_file_storage_file_systems"]
 
 def get_file_storage_mount_targets(cache, ociTenancyId, ociUserId, ociRegionName, ociCompartments, ociUserApiKeyFingerprint):
@@ -95,34 +83,21 @@ def get_file_storage_mount_targets(cache, ociTenancyId, ociUserId, ociRegionName
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    identityClient = oci.identity.IdentityClient(config)
-    fileSysClient = oci.file_storage.FileStorageClient(config)
-
-    anInsurmountableListOfMountTargets = []
-
-    for compartment in ociCompartments:
+    def _list_compartment_mount_targets(compartment):
+        identityClient = get_oci_client(oci.identity.IdentityClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        fileSysClient = get_oci_client(oci.file_storage.FileStorageClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        anInsurmountableListOfMountTargets = []
         # The File System APIs for top-level objects (File System, Mount Targets) require the Availability Domain specified...for reasons
         for availabilityDomain in identityClient.list_availability_domains(compartment_id=compartment).data:
             availabilityDomain = process_response(availabilityDomain)
             availabilityDomainName = availabilityDomain["name"]
             # Mount Targets - at least the detail we need form it - is just one API call instead of 3 for File Systems...
-            for mountTarget in fileSysClient.list_mount_targets(compartment_id=compartment, availability_domain=availabilityDomainName, lifecycle_state="ACTIVE").data:
-                mountTarget = process_response(mountTarget)
-                
-                anInsurmountableListOfMountTargets.append(mountTarget)
+            for mountTarget in list_all(fileSysClient.list_mount_targets, compartment_id=compartment, availability_domain=availabilityDomainName, lifecycle_state="ACTIVE"):
+                anInsurmountableListOfMountTargets.append(process_response(mountTarget))
+
+        return anInsurmountableListOfMountTargets
 
-    cache["get_file_storage_mount_targets"] = anInsurmountableListOfMountTargets
+    cache["get_file_storage_mount_targets"] = sweep_compartments(_list_compartment_mount_targets, ociCompartments)
     return cache["get_file_storage_mount_targets"]
 
 @registry.register_check("oci.filestorage")
@@ -18,13 +18,12 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import os
 import oci
-from oci.config import validate_config
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -47,30 +46,14 @@ def get_golden_gate_deployments(cache, ociTenancyId, ociUserId, ociRegionName, o
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
+    def _list_compartment_deployments(compartment):
+        ggClient = get_oci_client(oci.golden_gate.GoldenGateClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(ggClient.get_deployment(deployment_id=deployment.id).data)
+            for deployment in list_all(ggClient.list_deployments, compartment_id=compartment)
+        ]
 
-    ggClient = oci.golden_gate.GoldenGateClient(config)
-
-    aBigListOfGoldenBois = []
-
-    for compartment in ociCompartments:
-        for deployment in process_response(ggClient.list_deployments(compartment_id=compartment).data)["items"]:
-            aBigListOfGoldenBois.append(
-                process_response(
-                    ggClient.get_deployment(deployment_id=deployment["id"]).data
-                )
-            )
-
-    cache["get_golden_gate_deployments"] = aBigListOfGoldenBois
+    cache["get_golden_gate_deployments"] = sweep_compartments(_list_compartment_deployments, ociCompartments)
     return cache["get_golden_gate_deployments"]
 
 def get_golden_gate_connections(cache, ociTenancyId, ociUserId, ociRegionName, ociCompartments, ociUserApiKeyFingerprint):
@@ -79,30 +62,14 @@ def get_golden_gate_connections(cache, ociTenancyId, ociUserId, ociRegionName, o
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    ggClient = oci.golden_gate.GoldenGateClient(config)
-
-    aConnectedListOfConnections = []
-
-    for compartment in ociCompartments:
-        for connection in process_response(ggClient.list_connections(compartment_id=compartment).data)["items"]:
-            aConnectedListOfConnections.append(
-                process_response(
-                    ggClient.get_connection(connection_id=connection["id"]).data
-                )
-            )
+    def _list_compartment_connections(compartment):
+        ggClient = get_oci_client(oci.golden_gate.GoldenGateClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(ggClient.get_connection(connection_id=connection.id).data)
+            for connection in list_all(ggClient.list_connections, compartment_id=compartment)
+        ]
 
-    cache["get_golden_gate_connections"] = aConnectedListOfConnections
+    cache["get_golden_gate_connections"] = sweep_compartments(_list_compartment_connections, ociCompartments)
     return cache["get_golden_gate_connections"]
 
 @registry.register_check("oci.goldengate")
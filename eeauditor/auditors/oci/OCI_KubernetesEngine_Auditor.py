@@ -18,13 +18,12 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import os
 import oci
-from oci.config import validate_config
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -57,26 +56,15 @@ def get_oke_clusters(cache, ociTenancyId, ociUserId, ociRegionName, ociCompartme
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
+    def _list_compartment_clusters(compartment):
+        okeClient = get_oci_client(oci.container_engine.ContainerEngineClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(cluster) for cluster in list_all(
+                okeClient.list_clusters, compartment_id=compartment
+            )
+        ]
 
-    okeClient = oci.container_engine.ContainerEngineClient(config)
-
-    aListOfClusters = []
-
-    for compartment in ociCompartments:
-        for cluster in okeClient.list_clusters(compartment_id=compartment).data:
-            aListOfClusters.append(process_response(cluster))
-
-    cache["get_oke_clusters"] = aListOfClusters
+    cache["get_oke_clusters"] = sweep_compartments(_list_compartment_clusters, ociCompartments)
     return cache["get_oke_clusters"]
 
 def get_oke_node_pools(cache, ociTenancyId, ociUserId, ociRegionName, ociCompartments, ociUserApiKeyFingerprint):
@@ -86,26 +74,15 @@ def get_oke_node_pools(cache, ociTenancyId, ociUserId, ociRegionName, ociCompart
         print("cache hit")
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    okeClient = oci.container_engine.ContainerEngineClient(config)
-
-    aListOfNodePools = []
+    def _list_compartment_node_pools(compartment):
+        okeClient = get_oci_client(oci.container_engine.ContainerEngineClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(nodepool) for nodepool in list_all(
+                okeClient.list_node_pools, compartment_id=compartment
+            )
+        ]
 
-    for compartment in ociCompartments:
-        for nodepool in okeClient.list_node_pools(compartment_id=compartment).data:
-            aListOfNodePools.append(process_response(nodepool))
-
-    cache["get_oke_node_pools"] = aListOfNodePools
+    cache["get_oke_node_pools"] = sweep_compartments(_list_compartment_node_pools, ociCompartments)
     return cache["get_oke_node_pools"]
 
 def get_oke_virtual_node_pools(cache, ociTenancyId, ociUserId, ociRegionName, ociCompartments, ociUserApiKeyFingerprint):
@@ -114,26 +91,15 @@ def get_oke_virtual_node_pools(cache, ociTenancyId, ociUserId, ociRegionName, oc
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    okeClient = oci.container_engine.ContainerEngineClient(config)
-
-    aListOfVirtualNodes = []
-
-    for compartment in ociCompartments:
-        for virtualnode in okeClient.list_virtual_node_pools(compartment_id=compartment).data:
-            aListOfVirtualNodes.append(process_response(virtualnode))
+    def _list_compartment_virtual_node_pools(compartment):
+        okeClient = get_oci_client(oci.container_engine.ContainerEngineClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(virtualnode) for virtualnode in list_all(
+                okeClient.list_virtual_node_pools, compartment_id=compartment
+            )
+        ]
 
-    cache["get_oke_virtual_node_pools"] = aListOfVirtualNodes
+    cache["get_oke_virtual_node_pools"] = sweep_compartments(_list_compartment_virtual_node_pools, ociCompartments)
     return cache["get_oke_virtual_node_pools"]
 
 @registry.register_check("oci.oke")
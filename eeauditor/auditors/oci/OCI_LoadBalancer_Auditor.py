@@ -18,13 +18,12 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import os
 import oci
-from oci.config import validate_config
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -47,46 +46,20 @@ def get_oci_load_balancers(cache, ociTenancyId, ociUserId, ociRegionName, ociCom
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
+    def _list_compartment_load_balancers(compartment):
+        lbClient = get_oci_client(oci.load_balancer.LoadBalancerClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(lb) for lb in list_all(lbClient.list_load_balancers, compartment_id=compartment)
+        ]
 
-    lbClient = oci.load_balancer.LoadBalancerClient(config)
-
-    lbList = []
-
-    for compartment in ociCompartments:
-        listLbs = lbClient.list_load_balancers(compartment_id=compartment)
-        for lb in listLbs.data:
-            processedInstance = process_response(lb)
-            lbList.append(processedInstance)
-
-    cache["get_oci_load_balancers"] = lbList
+    cache["get_oci_load_balancers"] = sweep_compartments(_list_compartment_load_balancers, ociCompartments)
     return cache["get_oci_load_balancers"]
 
 def get_load_balancer_health(ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint, loadBalancerId):
     """
     This function retrieves the health status of a particular Load Balancer
     """
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    lbClient = oci.load_balancer.LoadBalancerClient(config)
+    lbClient = get_oci_client(oci.load_balancer.LoadBalancerClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
 
     # Process & return the health status of a load balancer
     health = process_response(
@@ -18,13 +18,12 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import os
 import oci
-from oci.config import validate_config
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -47,30 +46,15 @@ def get_mysql_db_systems(cache, ociTenancyId, ociUserId, ociRegionName, ociCompa
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    mysqlDbsClient = oci.mysql.DbSystemClient(config)
-
-    mysqlDbSystems = []
-
-    for compartment in ociCompartments:
-        for mysqldb in mysqlDbsClient.list_db_systems(compartment_id=compartment, lifecycle_state="ACTIVE").data:
-            mysqlDbSystems.append(
-                process_response(
-                    mysqldb
-                )
+    def _list_compartment_db_systems(compartment):
+        mysqlDbsClient = get_oci_client(oci.mysql.DbSystemClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(mysqldb) for mysqldb in list_all(
+                mysqlDbsClient.list_db_systems, compartment_id=compartment, lifecycle_state="ACTIVE"
             )
+        ]
 
-    cache["get_mysql_db_systems"] = mysqlDbSystems
+    cache["get_mysql_db_systems"] = sweep_compartments(_list_compartment_db_systems, ociCompartments)
     return cache["get_mysql_db_systems"]
 
 @registry.register_check("oci.mysqldbs")
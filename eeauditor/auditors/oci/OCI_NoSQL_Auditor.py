@@ -18,13 +18,12 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import os
 import oci
-from oci.config import validate_config
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -47,27 +46,13 @@ def get_nosql_tables(cache, ociTenancyId, ociUserId, ociRegionName, ociCompartme
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
+    def _list_compartment_tables(compartment):
+        nosqlClient = get_oci_client(oci.nosql.NosqlClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(table) for table in list_all(nosqlClient.list_tables, compartment_id=compartment)
+        ]
 
-    nosqlClient = oci.nosql.NosqlClient(config)
-
-    aListOfDictsOfNoSqlTables = []
-
-    for compartment in ociCompartments:
-        listTables = nosqlClient.list_tables(compartment_id=compartment)
-        for table in process_response(listTables.data)["items"]:
-            aListOfDictsOfNoSqlTables.append(table)
-
-    cache["get_nosql_tables"] = aListOfDictsOfNoSqlTables
+    cache["get_nosql_tables"] = sweep_compartments(_list_compartment_tables, ociCompartments)
     return cache["get_nosql_tables"]
 
 @registry.register_check("oci.nosql")
@@ -18,13 +18,12 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import os
 import oci
-from oci.config import validate_config
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -47,27 +46,14 @@ def get_object_storage_buckets(cache, ociTenancyId, ociUserId, ociRegionName, oc
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    objectStorageClient = oci.object_storage.ObjectStorageClient(config)
-
-    aBigListOfBuckets = []
-
-    for compartment in ociCompartments:
+    def _list_compartment_buckets(compartment):
+        objectStorageClient = get_oci_client(oci.object_storage.ObjectStorageClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        aBigListOfBuckets = []
         # Each Oracle Cloud Infrastructure tenant is assigned one unique and uneditable Object Storage namespace.
         # The namespace is a system-generated string assigned during account creation.
         namespaceId = str(objectStorageClient.get_namespace(compartment_id=compartment).data)
         # Namespace is probably the same for every compartment...
-        for bucket in objectStorageClient.list_buckets(namespace_name=namespaceId, compartment_id=compartment).data:
+        for bucket in list_all(objectStorageClient.list_buckets, namespace_name=namespaceId, compartment_id=compartment):
             bucket = process_response(bucket)
             bucketName = bucket["name"]
             # Only the GetBucket API has the extended information, not the ListBucket API
@@ -90,7 +76,9 @@ def get_object_storage_buckets(cache, ociTenancyId, ociUserId, ociRegionName, oc
             # Append the new payload
             aBigListOfBuckets.append(bucketInfo)
 
-    cache["get_object_storage_buckets"] = aBigListOfBuckets
+        return aBigListOfBuckets
+
+    cache["get_object_storage_buckets"] = sweep_compartments(_list_compartment_buckets, ociCompartments)
     return cache["get_object_storage_buckets"]
 
 @registry.register_check("oci.objectstorage")
@@ -18,13 +18,12 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import os
 import oci
-from oci.config import validate_config
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -47,28 +46,14 @@ def get_oci_opensearch_clusters(cache, ociTenancyId, ociUserId, ociRegionName, o
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
+    def _list_compartment_clusters(compartment):
+        opensearchClient = get_oci_client(oci.opensearch.OpensearchClusterClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(opensearchClient.get_opensearch_cluster(opensearch_cluster_id=cluster.id).data)
+            for cluster in list_all(opensearchClient.list_opensearch_clusters, compartment_id=compartment)
+        ]
 
-    opensearchClient = oci.opensearch.OpensearchClusterClient(config)
-
-    aListOfClusters = []
-
-    for compartment in ociCompartments:
-        clusters = opensearchClient.list_opensearch_clusters(compartment_id=compartment).data
-        for cluster in process_response(clusters)["items"]:
-            getCluster = process_response(opensearchClient.get_opensearch_cluster(opensearch_cluster_id=cluster["id"]).data)
-            aListOfClusters.append(getCluster)
-
-    cache["get_oci_opensearch_clusters"] = aListOfClusters
+    cache["get_oci_opensearch_clusters"] = sweep_compartments(_list_compartment_clusters, ociCompartments)
     return cache["get_oci_opensearch_clusters"]
 
 @registry.register_check("oci.opensearch")
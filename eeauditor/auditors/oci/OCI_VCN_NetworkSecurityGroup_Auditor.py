@@ -20,11 +20,11 @@
 
 import os
 import oci
-from oci.config import validate_config
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -51,23 +51,10 @@ def get_oci_network_security_groups(cache, ociTenancyId, ociUserId, ociRegionNam
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    vncClient = oci.core.VirtualNetworkClient(config)
-
-    extendedNsgs = []
-
-    for compartment in ociCompartments:
-        for nsg in vncClient.list_network_security_groups(compartment_id=compartment).data:
+    def _list_compartment_network_security_groups(compartment):
+        vncClient = get_oci_client(oci.core.VirtualNetworkClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        extendedNsgs = []
+        for nsg in list_all(vncClient.list_network_security_groups, compartment_id=compartment):
             # The NetworkSecurityGroup response object only contains information about the NSG itself, not the rules
             nsg = process_response(
                 nsg
@@ -75,15 +62,16 @@ def get_oci_network_security_groups(cache, ociTenancyId, ociUserId, ociRegionNam
             nsgId = nsg["id"]
             # The rules come from a separate API call to ListNetworkSecurityGroupSecurityRules - they will be added to a "network_security_group_security_rules"
             # list within the rest of the NetworkSecurityGroup response object - not how it comes from OCI but is better suited for what we need
-            rules = process_response(
-                vncClient.list_network_security_group_security_rules(
-                    network_security_group_id=nsgId
-                    ).data
+            nsg["network_security_group_security_rules"] = [
+                process_response(rule) for rule in list_all(
+                    vncClient.list_network_security_group_security_rules, network_security_group_id=nsgId
                 )
-            nsg["network_security_group_security_rules"] = rules
+            ]
             extendedNsgs.append(nsg)
 
-    cache["get_oci_network_security_groups"] = extendedNsgs
+        return extendedNsgs
+
+    cache["get_oci_network_security_groups"] = sweep_compartments(_list_compartment_network_security_groups, ociCompartments)
     return cache["get_oci_network_security_groups"]
 
 @registry.register_check("oci.vcn.nsg")
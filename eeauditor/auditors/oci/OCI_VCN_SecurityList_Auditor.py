@@ -20,11 +20,11 @@
 
 import os
 import oci
-from oci.config import validate_config
 import datetime
 import base64
 import json
 from check_register import CheckRegister
+from collectors.oci_collector import get_oci_client, list_all, sweep_compartments
 
 registry = CheckRegister()
 
@@ -51,30 +51,15 @@ def get_oci_security_lists(cache, ociTenancyId, ociUserId, ociRegionName, ociCom
     if response:
         return response
 
-    # Create & Validate OCI Creds - do this after cache check to avoid doing it a lot
-    config = {
-        "tenancy": ociTenancyId,
-        "user": ociUserId,
-        "region": ociRegionName,
-        "fingerprint": ociUserApiKeyFingerprint,
-        "key_file": os.environ["OCI_PEM_FILE_PATH"],
-        
-    }
-    validate_config(config)
-
-    vcnClient = oci.core.VirtualNetworkClient(config)
-
-    anActualListOfSecurityLists = []
-
-    for compartment in ociCompartments:
-        for sl in vcnClient.list_security_lists(compartment_id=compartment).data:
-            anActualListOfSecurityLists.append(
-                process_response(
-                    sl
-                )
+    def _list_compartment_security_lists(compartment):
+        vcnClient = get_oci_client(oci.core.VirtualNetworkClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(sl) for sl in list_all(
+                vcnClient.list_security_lists, compartment_id=compartment
             )
+        ]
 
-    cache["get_oci_security_lists"] = anActualListOfSecurityLists
+    cache["get_oci_security_lists"] = sweep_compartments(_list_compartment_security_lists, ociCompartments)
     return cache["get_oci_security_lists"]
 
 @registry.register_check("oci.vcn.securitylist")
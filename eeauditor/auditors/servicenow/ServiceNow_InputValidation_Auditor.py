@@ -19,9 +19,9 @@
 #under the License.
 
 import datetime
-import pysnow
 import os
 from check_register import CheckRegister
+from collectors.servicenow_collector import get_sys_properties_snapshot, register_sys_properties
 import base64
 import json
 
@@ -33,31 +33,36 @@ SNOW_SSPM_USERNAME = os.environ["SNOW_SSPM_USERNAME"]
 SNOW_SSPM_PASSWORD = os.environ["SNOW_SSPM_PASSWORD"]
 SNOW_FAILED_LOGIN_BREACHING_RATE = os.environ["SNOW_FAILED_LOGIN_BREACHING_RATE"]
 
+# System Properties evaluated by the Checks in this Auditor
+SYS_PROPERTY_NAMES = [
+    "glide.ui.security.allow_codetag",
+    "glide.ui.security.codetag.allow_script",
+    "com.glide.security.check_unsanitized_html",
+    "glide.script.use.sandbox",
+    "glide.script.allow.ajaxevaluate",
+    "glide.export.escape_formulas",
+    "glide.ui.escape_html_list_field",
+    "glide.html.escape_script",
+    "glide.ui.escape_all_script",
+    "glide.ui.escape_text",
+    "glide.html.sanitize_all_fields",
+    "glide.ui.jelly.js_interpolation.protect",
+    "glide.soap.strict_security"
+]
+register_sys_properties(SYS_PROPERTY_NAMES)
+
 def get_servicenow_sys_properties(cache: dict):
     """
-    Pulls the entire Systems Properties table
+    Pulls the shared Systems Properties snapshot, indexed by property name
     """
     response = cache.get("get_servicenow_sys_properties")
     if response:
-        print("servicenow.access_control cache hit!")
         return response
-    
-    # Will need to create the pysnow.Client object everywhere - doesn't appear to be thread-safe
-    snow = pysnow.Client(
-        instance=SNOW_INSTANCE_NAME,
-        user=SNOW_SSPM_USERNAME,
-        password=SNOW_SSPM_PASSWORD
-    )
-
-    sysPropResource = snow.resource(api_path='/table/sys_properties')
-    sysProps = sysPropResource.get().all()
 
-    cache["get_servicenow_sys_properties"] = sysProps
+    cache["get_servicenow_sys_properties"] = get_sys_properties_snapshot()
 
     return cache["get_servicenow_sys_properties"]
 
-# NOTE: Dict search next() iterator thingy from: https://stackoverflow.com/questions/8653516/search-a-list-of-dictionaries-in-python
-
 @registry.register_check("servicenow.inputvalidation")
 def servicenow_sspm_disallow_embedded_html_code_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str):
     """
@@ -70,11 +75,10 @@ def servicenow_sspm_disallow_embedded_html_code_check(cache: dict, awsAccountId:
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -266,11 +270,10 @@ def servicenow_sspm_disallow_js_tags_embedded_html_code_check(cache: dict, awsAc
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -462,11 +465,10 @@ def servicenow_sspm_check_unsanitized_html_check(cache: dict, awsAccountId: str,
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -658,11 +660,10 @@ def servicenow_sspm_client_generated_scripts_sandbox_check(cache: dict, awsAccou
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -854,11 +855,10 @@ def servicenow_sspm_enable_ajaxevaluate_check(cache: dict, awsAccountId: str, aw
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -1050,11 +1050,10 @@ def servicenow_sspm_escape_excel_formula_check(cache: dict, awsAccountId: str, a
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -1246,11 +1245,10 @@ def servicenow_sspm_escape_html_check(cache: dict, awsAccountId: str, awsRegion:
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -1442,11 +1440,10 @@ def servicenow_sspm_escape_javascript_check(cache: dict, awsAccountId: str, awsR
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -1638,11 +1635,10 @@ def servicenow_sspm_escape_jelly_check(cache: dict, awsAccountId: str, awsRegion
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -1834,11 +1830,10 @@ def servicenow_sspm_escape_xml_check(cache: dict, awsAccountId: str, awsRegion:
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -2030,11 +2025,10 @@ def servicenow_sspm_html_sanitizer_check(cache: dict, awsAccountId: str, awsRegi
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -2226,11 +2220,10 @@ def servicenow_sspm_javascript_jelly_interpolation_check(cache: dict, awsAccount
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -2422,11 +2415,10 @@ def servicenow_sspm_soap_request_strict_security_check(cache: dict, awsAccountId
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
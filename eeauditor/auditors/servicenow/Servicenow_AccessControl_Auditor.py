@@ -19,9 +19,9 @@
 #under the License.
 
 import datetime
-import pysnow
 import os
 from check_register import CheckRegister
+from collectors.servicenow_collector import get_sys_properties_snapshot, register_sys_properties
 import base64
 import json
 
@@ -33,31 +33,49 @@ SNOW_SSPM_USERNAME = os.environ["SNOW_SSPM_USERNAME"]
 SNOW_SSPM_PASSWORD = os.environ["SNOW_SSPM_PASSWORD"]
 SNOW_FAILED_LOGIN_BREACHING_RATE = os.environ["SNOW_FAILED_LOGIN_BREACHING_RATE"]
 
+# System Properties evaluated by the Checks in this Auditor
+SYS_PROPERTY_NAMES = [
+    "glide.sandbox.usersession.allow_unsanitized_messages",
+    "glide.script_processor.authorized_script_module_role",
+    "glide.basicauth.required.jsonv2",
+    "glide.basicauth.required.soap",
+    "com.glide.sys.security.delegateddev.block_grant_roles",
+    "glide.basicauth.required.csv",
+    "glide.sm.default_mode",
+    "glide.security.strict.updates",
+    "glide.live_profile.details",
+    "glide.script.secure.ajaxgliderecord",
+    "glide.basicauth.required.excel",
+    "glide.basicauth.required.importprocessor",
+    "glide.basicauth.required.pdf",
+    "glide.security.diag_txns_acl",
+    "glide.custom.ip.authenticate.allow",
+    "glide.script.ccsi.ispublic",
+    "glide.ui.magellan.favorites.allow_public",
+    "com.snc.ipauthenticator",
+    "glide.basicauth.required.rss",
+    "glide.basicauth.required.scriptedprocessor",
+    "glide.soap.require_content_type_xml",
+    "glide.ip.authenticate.strict",
+    "glide.basicauth.required.unl",
+    "glide.basicauth.required.wsdl",
+    "glide.basicauth.required.xml",
+    "glide.basicauth.required.xsd"
+]
+register_sys_properties(SYS_PROPERTY_NAMES)
+
 def get_servicenow_sys_properties(cache: dict):
     """
-    Pulls the entire Systems Properties table
+    Pulls the shared Systems Properties snapshot, indexed by property name
     """
     response = cache.get("get_servicenow_sys_properties")
     if response:
-        print("servicenow.access_control cache hit!")
         return response
-    
-    # Will need to create the pysnow.Client object everywhere - doesn't appear to be thread-safe
-    snow = pysnow.Client(
-        instance=SNOW_INSTANCE_NAME,
-        user=SNOW_SSPM_USERNAME,
-        password=SNOW_SSPM_PASSWORD
-    )
-
-    sysPropResource = snow.resource(api_path='/table/sys_properties')
-    sysProps = sysPropResource.get().all()
 
-    cache["get_servicenow_sys_properties"] = sysProps
+    cache["get_servicenow_sys_properties"] = get_sys_properties_snapshot()
 
     return cache["get_servicenow_sys_properties"]
 
-# NOTE: Dict search next() iterator thingy from: https://stackoverflow.com/questions/8653516/search-a-list-of-dictionaries-in-python
-
 @registry.register_check("servicenow.access_control")
 def servicenow_sspm_user_session_allow_unsanitzed_messages_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str):
     """
@@ -70,11 +88,10 @@ def servicenow_sspm_user_session_allow_unsanitzed_messages_check(cache: dict, aw
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -266,11 +283,10 @@ def servicenow_sspm_sysappmodule_script_exec_restriction_check(cache: dict, awsA
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -462,11 +478,10 @@ def servicenow_sspm_jsonv2_enforce_basic_auth_check(cache: dict, awsAccountId: s
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -658,11 +673,10 @@ def servicenow_sspm_soap_enforce_basic_auth_check(cache: dict, awsAccountId: str
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -854,11 +868,10 @@ def servicenow_sspm_block_access_for_delegated_dev_check(cache: dict, awsAccount
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -1050,11 +1063,10 @@ def servicenow_sspm_csv_enforce_basic_auth_check(cache: dict, awsAccountId: str,
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -1246,11 +1258,10 @@ def servicenow_sspm_acl_default_deny_check(cache: dict, awsAccountId: str, awsRe
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -1442,11 +1453,10 @@ def servicenow_sspm_double_check_inbound_transactions_check(cache: dict, awsAcco
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -1638,11 +1648,10 @@ def servicenow_sspm_enable_acls_to_control_live_profile_details_check(cache: dic
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -1834,11 +1843,10 @@ def servicenow_sspm_ajaxgliderecord_acl_checking_check(cache: dict, awsAccountId
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -2030,11 +2038,10 @@ def servicenow_sspm_excel_enforce_basic_auth_check(cache: dict, awsAccountId: st
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -2226,11 +2233,10 @@ def servicenow_sspm_import_enforce_basic_auth_check(cache: dict, awsAccountId: s
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -2422,11 +2428,10 @@ def servicenow_sspm_pdf_enforce_basic_auth_check(cache: dict, awsAccountId: str,
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -2618,11 +2623,10 @@ def servicenow_sspm_performance_monitoring_acl_check(cache: dict, awsAccountId:
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -2814,11 +2818,10 @@ def servicenow_sspm_performance_monitoring_ip_restriction_check(cache: dict, aws
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -3010,11 +3013,10 @@ def servicenow_sspm_privacy_client_callable_script_includes_check(cache: dict, a
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -3206,11 +3208,10 @@ def servicenow_sspm_public_access_to_favorites_check(cache: dict, awsAccountId:
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -3402,11 +3403,10 @@ def servicenow_sspm_ip_allowlist_check(cache: dict, awsAccountId: str, awsRegion
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -3598,11 +3598,10 @@ def servicenow_sspm_rss_enforce_basic_auth_check(cache: dict, awsAccountId: str,
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -3794,11 +3793,10 @@ def servicenow_sspm_script_requests_enforce_basic_auth_check(cache: dict, awsAcc
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -3990,11 +3988,10 @@ def servicenow_sspm_soap_content_type_checking_check(cache: dict, awsAccountId:
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -4186,11 +4183,10 @@ def servicenow_sspm_strict_ip_restriction_check(cache: dict, awsAccountId: str,
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -4382,11 +4378,10 @@ def servicenow_sspm_unload_request_enforce_basic_auth_check(cache: dict, awsAcco
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -4578,11 +4573,10 @@ def servicenow_sspm_wsdl_request_enforce_basic_auth_check(cache: dict, awsAccoun
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -4774,11 +4768,10 @@ def servicenow_sspm_xml_request_enforce_basic_auth_check(cache: dict, awsAccount
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -4970,11 +4963,10 @@ def servicenow_sspm_xsd_request_enforce_basic_auth_check(cache: dict, awsAccount
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -19,9 +19,9 @@
 #under the License.
 
 import datetime
-import pysnow
 import os
 from check_register import CheckRegister
+from collectors.servicenow_collector import get_sys_properties_snapshot, register_sys_properties
 import base64
 import json
 
@@ -33,31 +33,34 @@ SNOW_SSPM_USERNAME = os.environ["SNOW_SSPM_USERNAME"]
 SNOW_SSPM_PASSWORD = os.environ["SNOW_SSPM_PASSWORD"]
 SNOW_FAILED_LOGIN_BREACHING_RATE = os.environ["SNOW_FAILED_LOGIN_BREACHING_RATE"]
 
+# System Properties evaluated by the Checks in this Auditor
+SYS_PROPERTY_NAMES = [
+    "glide.ui.attachment.download_mime_types",
+    "glide.security.attachment_type.use_blacklist",
+    "glide.ui.strict_customer_uploaded_static_content",
+    "glide.security.strict.user_image_upload",
+    "glide.ui.attachment.force_download_all_mime_types",
+    "glide.attachment.extensions",
+    "glide.image_provider.security_enabled",
+    "glide.attachment.blacklisted.extensions",
+    "glide.attachment.blacklisted.types",
+    "glide.ui.strict_customer_uploaded_content_types",
+    "glide.security.file.mime_type.validation"
+]
+register_sys_properties(SYS_PROPERTY_NAMES)
+
 def get_servicenow_sys_properties(cache: dict):
     """
-    Pulls the entire Systems Properties table
+    Pulls the shared Systems Properties snapshot, indexed by property name
     """
     response = cache.get("get_servicenow_sys_properties")
     if response:
-        print("servicenow.access_control cache hit!")
         return response
-    
-    # Will need to create the pysnow.Client object everywhere - doesn't appear to be thread-safe
-    snow = pysnow.Client(
-        instance=SNOW_INSTANCE_NAME,
-        user=SNOW_SSPM_USERNAME,
-        password=SNOW_SSPM_PASSWORD
-    )
-
-    sysPropResource = snow.resource(api_path='/table/sys_properties')
-    sysProps = sysPropResource.get().all()
 
-    cache["get_servicenow_sys_properties"] = sysProps
+    cache["get_servicenow_sys_properties"] = get_sys_properties_snapshot()
 
     return cache["get_servicenow_sys_properties"]
 
-# NOTE: Dict search next() iterator thingy from: https://stackoverflow.com/questions/8653516/search-a-list-of-dictionaries-in-python
-
 @registry.register_check("servicenow.attachments")
 def servicenow_sspm_downloadable_mime_types_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str):
     """
@@ -70,11 +73,10 @@ def servicenow_sspm_downloadable_mime_types_check(cache: dict, awsAccountId: str
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -266,11 +268,10 @@ def servicenow_sspm_enable_deny_list_for_attachments_check(cache: dict, awsAccou
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -462,11 +463,10 @@ def servicenow_sspm_enable_file_download_restrictions_check(cache: dict, awsAcco
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -658,11 +658,10 @@ def servicenow_sspm_strict_user_image_upload_check(cache: dict, awsAccountId: st
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -854,11 +853,10 @@ def servicenow_sspm_force_download_mime_types_check(cache: dict, awsAccountId: s
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -1050,11 +1048,10 @@ def servicenow_sspm_restrict_file_restrictions_check(cache: dict, awsAccountId:
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -1246,11 +1243,10 @@ def servicenow_sspm_restrict_unauthenticated_attachment_access_check(cache: dict
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -1442,11 +1438,10 @@ def servicenow_sspm_specify_excluded_attachments_check(cache: dict, awsAccountId
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -1638,11 +1633,10 @@ def servicenow_sspm_specify_excluded_attachments_mime_type_check(cache: dict, aw
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -1834,11 +1828,10 @@ def servicenow_sspm_restrict_downloaded_file_types_check(cache: dict, awsAccount
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -2030,11 +2023,10 @@ def servicenow_sspm_upload_mime_type_restriction_check(cache: dict, awsAccountId
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -19,9 +19,9 @@
 #under the License.
 
 import datetime
-import pysnow
 import os
 from check_register import CheckRegister
+from collectors.servicenow_collector import get_sys_properties_snapshot, register_sys_properties
 import base64
 import json
 
@@ -33,31 +33,26 @@ SNOW_SSPM_USERNAME = os.environ["SNOW_SSPM_USERNAME"]
 SNOW_SSPM_PASSWORD = os.environ["SNOW_SSPM_PASSWORD"]
 SNOW_FAILED_LOGIN_BREACHING_RATE = os.environ["SNOW_FAILED_LOGIN_BREACHING_RATE"]
 
+# System Properties evaluated by the Checks in this Auditor
+SYS_PROPERTY_NAMES = [
+    "glide.email.inbound.convert_html_inline_attachment_references",
+    "glide.email.email_with_no_target_visible_to_all",
+    "glide.user.trusted_domain"
+]
+register_sys_properties(SYS_PROPERTY_NAMES)
+
 def get_servicenow_sys_properties(cache: dict):
     """
-    Pulls the entire Systems Properties table
+    Pulls the shared Systems Properties snapshot, indexed by property name
     """
     response = cache.get("get_servicenow_sys_properties")
     if response:
-        print("servicenow.access_control cache hit!")
         return response
-    
-    # Will need to create the pysnow.Client object everywhere - doesn't appear to be thread-safe
-    snow = pysnow.Client(
-        instance=SNOW_INSTANCE_NAME,
-        user=SNOW_SSPM_USERNAME,
-        password=SNOW_SSPM_PASSWORD
-    )
-
-    sysPropResource = snow.resource(api_path='/table/sys_properties')
-    sysProps = sysPropResource.get().all()
 
-    cache["get_servicenow_sys_properties"] = sysProps
+    cache["get_servicenow_sys_properties"] = get_sys_properties_snapshot()
 
     return cache["get_servicenow_sys_properties"]
 
-# NOTE: Dict search next() iterator thingy from: https://stackoverflow.com/questions/8653516/search-a-list-of-dictionaries-in-python
-
 @registry.register_check("servicenow.emailsecurity")
 def servicenow_sspm_convert_inbound_email_html_check(cache: dict, awsAccountId: str, awsRegion: str, awsPartition: str):
     """
@@ -70,11 +65,10 @@ def servicenow_sspm_convert_inbound_email_html_check(cache: dict, awsAccountId:
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -268,11 +262,10 @@ def servicenow_sspm_restrict_access_to_empty_target_table_emails_check(cache: di
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
@@ -460,15 +453,14 @@ def servicenow_sspm_restrict_emails_by_domain_for_user_creation_check(cache: dic
     iso8601Time = datetime.datetime.now(datetime.timezone.utc).isoformat()
 
     # Name of the property to evaluate against
-    evalTarget = "	glide.user.trusted_domain"
+    evalTarget = "glide.user.trusted_domain"
     # Get cached props
     sysPropCache = get_servicenow_sys_properties(cache)
 
-    # There should not ever be a duplicate system property, use next() and a list comprehension to check if the
-    # property we're evaluating is in the list of properties we get from the cache. If it is NOT then set the
-    # value as `False` and we can fill in fake values. Not having a property for security hardening is the same
-    # as a failed finding with a lot less fan fair
-    propFinder = next((sysprop for sysprop in sysPropCache if sysprop["name"] == evalTarget), False)
+    # The cached properties are indexed by name, check if the property we're evaluating is in there. If it is NOT
+    # then set the value as `False` and we can fill in fake values. Not having a property for security hardening is
+    # the same as a failed finding with a lot less fan fair
+    propFinder = sysPropCache.get(evalTarget, False)
     # If we cannot find the property set "NOT_CONFIGURED" which will fail whatever the value should be
     if not propFinder:
         propertyValue = "NOT_CONFIGURED"
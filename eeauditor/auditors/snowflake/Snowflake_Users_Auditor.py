@@ -21,7 +21,6 @@
 import logging
 from datetime import datetime, timezone, timedelta, UTC
 from snowflake.connector import cursor
-import snowflake.connector.errors as snowerrors
 from check_register import CheckRegister
 import base64
 import json
@@ -47,72 +46,70 @@ def timestamp_to_iso(timestampNtz: str | None) -> str | None:
 
     return str(dt)
 
-def get_roles_for_user(username: str, snowflakeCursor: cursor.SnowflakeCursor) -> tuple[list[str | None], bool]:
+def get_roles_by_user(snowflakeCursor: cursor.SnowflakeCursor) -> dict[str, list[str]] | None:
     """
-    Retrieves the assigned grants (Roles) for a given user
+    Retrieves the assigned grants (Roles) for every user with a single query against GRANTS_TO_USERS, returns a dictionary of Roles keyed by user name or None if the grants could not be retrieved
     """
 
-    query = f"""
-    SHOW GRANTS TO USER "{username}"
+    query = """
+    SELECT
+        GRANTEE_NAME,
+        ROLE
+    FROM SNOWFLAKE.ACCOUNT_USAGE.GRANTS_TO_USERS
+    WHERE DELETED_ON IS NULL
     """
 
-    adminRoles = ["ACCOUNTADMIN","ORGADMIN","SECURITYADMIN","SYSADMIN"]
-    roles = []
+    rolesByUser = {}
 
     try:
         q = snowflakeCursor.execute(query)
         for row in q.fetchall():
-            roles.append(row["role"])
-    except TypeError:
-        logger.warn(f"no roles for the user: {username}")
-    except snowerrors.ProgrammingError as spe:
-        if "does not exist" in str(spe):
-            logger.warning("Snowflake User %s is inactive or roles are unable to be retrieved.", username)
+            rolesByUser.setdefault(row["GRANTEE_NAME"], []).append(row["ROLE"])
     except Exception as e:
-        logger.warning("Exception encounterd while trying to get roles for user %s: %s", username, e)
-        return (list(), None)
-    
-    if roles:
-        if any(adminrole in roles for adminrole in adminRoles):
-            isAdmin = True
-        else:
-            isAdmin = False
-    else:
-        isAdmin = False
+        logger.warning("Exception encountered while trying to get roles for Snowflake users: %s", e)
+        return None
 
-    return roles, isAdmin
+    return rolesByUser
 
-def check_user_logon_without_mfa(username: str, snowflakeCursor: cursor.SnowflakeCursor) -> tuple[bool, int]:
-    """Pulls distinct logs for a user where they did not use MFA, returns True if they did not use MFA along with the amount of times"""
+def get_logons_without_mfa_by_user(snowflakeCursor: cursor.SnowflakeCursor) -> dict[str, int]:
+    """Counts the logons for every user where they did not use MFA with a single aggregated LOGIN_HISTORY query, returns the counts keyed by user name"""
 
-    # Check for specific users that used Password, didn't fail, and didn't use a 2FA factor
-    query = f"""
-    SELECT DISTINCT
+    # Count the logons per user that used Password, didn't fail, and didn't use a 2FA factor
+    query = """
+    SELECT
         USER_NAME,
-        IS_SUCCESS
-        FIRST_AUTHENTICATION_FACTOR,
-        SECOND_AUTHENTICATION_FACTOR
+        COUNT(*) AS LOGONS_WITHOUT_MFA
     FROM SNOWFLAKE.ACCOUNT_USAGE.LOGIN_HISTORY
-    WHERE USER_NAME = '{username}'
-    AND IS_SUCCESS = 'YES'
+    WHERE IS_SUCCESS = 'YES'
     AND FIRST_AUTHENTICATION_FACTOR = 'PASSWORD'
     AND SECOND_AUTHENTICATION_FACTOR IS NULL
+    GROUP BY USER_NAME
     """
 
+    logonsByUser = {}
+
     try:
-        q = snowflakeCursor.execute(query).fetchall()
+        q = snowflakeCursor.execute(query)
+        for row in q.fetchall():
+            logonsByUser[row["USER_NAME"]] = int(row["LOGONS_WITHOUT_MFA"])
     except Exception as e:
-        logger.warning("Exception encountered while trying to get logon history for Snowflake user %s: %s", username, e)
-        return (False, 0)
+        logger.warning("Exception encountered while trying to get logon history for Snowflake users: %s", e)
 
-    if q:
-        loginWithoutMfa = True
-        logonsWithoutMfaCount = len(q)
-    else:
-        loginWithoutMfa = False
-        logonsWithoutMfaCount = 0
+    return logonsByUser
 
-    return (loginWithoutMfa, logonsWithoutMfaCount)
+def get_user_role_data(username: str, rolesByUser: dict[str, list[str]] | None) -> tuple[list[str | None], bool]:
+    """
+    Returns the Roles assigned to a user from the output of `get_roles_by_user` and if any of them are admin Roles
+    """
+    adminRoles = ["ACCOUNTADMIN","ORGADMIN","SECURITYADMIN","SYSADMIN"]
+
+    if rolesByUser is None:
+        return (list(), None)
+
+    roles = rolesByUser.get(username, [])
+    isAdmin = any(adminrole in roles for adminrole in adminRoles)
+
+    return roles, isAdmin
 
 def get_snowflake_users(cache: dict, snowflakeCursor: cursor.SnowflakeCursor) -> dict:
     """
@@ -157,6 +154,10 @@ def get_snowflake_users(cache: dict, snowflakeCursor: cursor.SnowflakeCursor) ->
     FROM SNOWFLAKE.ACCOUNT_USAGE.USERS
     """
 
+    # Roles and logons are retrieved for every user at once and joined in memory instead of querying per user
+    rolesByUser = get_roles_by_user(snowflakeCursor)
+    logonsByUser = get_logons_without_mfa_by_user(snowflakeCursor)
+
     try:
         q = snowflakeCursor.execute(query)
         for column in q.fetchall():
@@ -166,9 +167,10 @@ def get_snowflake_users(cache: dict, snowflakeCursor: cursor.SnowflakeCursor) ->
             except KeyError:
                 pwLastSetTime = None
 
-            roleData = get_roles_for_user(username, snowflakeCursor)
+            roleData = get_user_role_data(username, rolesByUser)
 
-            logins = check_user_logon_without_mfa(username, snowflakeCursor)
+            logonsWithoutMfaCount = logonsByUser.get(username, 0)
+            logins = (logonsWithoutMfaCount > 0, logonsWithoutMfaCount)
 
             snowflakeUsers.append(
                 {
@@ -0,0 +1,283 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import logging
+from datetime import datetime, timezone
+from queue import Empty, Queue
+from threading import Event, Lock, Thread
+from time import monotonic
+
+logger = logging.getLogger("CheckSupervisor")
+
+# Default wall-clock budgets, in seconds, for a single Check and for every Check of one Auditor (the Checks that
+# share an Auditor `cache`) against one target. A budget of 0 or None disables it
+CHECK_TIMEOUT_SECONDS = 600
+AUDITOR_TIMEOUT_SECONDS = 3600
+
+# Message kinds passed from the worker thread that drives a Check to the supervisor
+_FINDING = "finding"
+_ERROR = "error"
+_DONE = "done"
+
+class UnitOutcome(object):
+    """
+    Tracks whether any Check of one unit of work (an Auditor against a single Account, Region, Project, Subscription
+    and so on) raised or ran out of time. Each unit has its own, so concurrently running units never see each other's
+    failures
+    """
+
+    def __init__(self):
+        self.failed = False
+        self.timedOut = False
+
+    @property
+    def completed(self) -> bool:
+        return not (self.failed or self.timedOut)
+
+class CheckSupervisor(object):
+    """
+    Runs Checks under per-Check and per-Auditor wall-clock budgets. Each Check generator is driven from a daemon
+    thread and its findings are handed back through a queue, when a budget runs out the supervisor stops waiting,
+    records the timeout and yields a WARNING finding in place of the rest of the Check. Python threads cannot be
+    killed, an abandoned Check is told to stop and exits the next time it yields. Until then it still holds the
+    Auditor `cache` and the Boto3 `session`, neither of which is thread-safe, so every later Check is handed a fresh
+    `cache` and a cloned `session` in their place
+    """
+
+    def __init__(self, checkTimeout: int | None = CHECK_TIMEOUT_SECONDS, auditorTimeout: int | None = AUDITOR_TIMEOUT_SECONDS):
+        self.checkTimeout = checkTimeout
+        self.auditorTimeout = auditorTimeout
+        # One record per Check that was abandoned or skipped because a budget ran out
+        self.timeouts = []
+        # Replacements for the `cache` and `session` held by abandoned Checks, keyed by id() of the original and
+        # keeping the original alive so that its id() cannot be reused by another object
+        self._replacements = {}
+        self._lock = Lock()
+
+    def start_auditor(self) -> float | None:
+        """
+        Returns the monotonic deadline for an Auditor that is about to run, or None when it has no budget
+        """
+        if not self.auditorTimeout:
+            return None
+
+        return monotonic() + self.auditorTimeout
+
+    def run_check(self, check, checkName: str, auditorDeadline: float | None, provider: str, providerAccountId: str, outcome: UnitOutcome | None = None, **kwargs):
+        """
+        Yields the findings of `check(**kwargs)` until it finishes or a budget runs out. Exceptions raised by the Check
+        are re-raised to the caller so the runners keep logging them as before, both are also flagged on `outcome`
+        """
+        kwargs = self.isolate(kwargs)
+        startTime = monotonic()
+        deadlines = []
+        if self.checkTimeout:
+            deadlines.append((startTime + self.checkTimeout, "Check"))
+        if auditorDeadline is not None:
+            deadlines.append((auditorDeadline, "Auditor"))
+
+        # without a budget there is nothing to supervise, run the Check inline
+        if not deadlines:
+            try:
+                yield from check(**kwargs)
+            except Exception:
+                if outcome is not None:
+                    outcome.failed = True
+                raise
+            return
+
+        deadline, budget = min(deadlines)
+        if deadline <= startTime:
+            yield self.record_timeout(check, checkName, budget, 0, provider, providerAccountId, outcome, kwargs)
+            return
+
+        results = Queue()
+        cancelled = Event()
+
+        def _drive_check():
+            try:
+                for finding in check(**kwargs):
+                    if cancelled.is_set():
+                        return
+                    results.put((_FINDING, finding))
+            except Exception as e:
+                results.put((_ERROR, e))
+                return
+            results.put((_DONE, None))
+
+        Thread(target=_drive_check, name=f"check-{checkName}", daemon=True).start()
+
+        while True:
+            try:
+                kind, value = results.get(timeout=max(deadline - monotonic(), 0))
+            except Empty:
+                cancelled.set()
+                self.abandon(kwargs)
+                yield self.record_timeout(
+                    check, checkName, budget, monotonic() - startTime, provider, providerAccountId, outcome, kwargs
+                )
+                return
+
+            if kind == _DONE:
+                return
+            if kind == _ERROR:
+                if outcome is not None:
+                    outcome.failed = True
+                raise value
+            yield value
+
+    def abandon(self, kwargs: dict) -> None:
+        """
+        Replaces the `cache` and `session` an abandoned Check is still running with for every later Check
+        """
+        from collectors.collector_base import clone_session
+
+        replacements = {}
+        if "cache" in kwargs:
+            replacements["cache"] = {}
+        if kwargs.get("session") is not None:
+            replacements["session"] = clone_session(kwargs["session"])
+
+        with self._lock:
+            for name, replacement in replacements.items():
+                self._replacements[id(kwargs[name])] = (kwargs[name], replacement)
+
+    def isolate(self, kwargs: dict) -> dict:
+        """
+        Returns the Check arguments with any `cache` or `session` held by an abandoned Check replaced
+        """
+        with self._lock:
+            if not self._replacements:
+                return kwargs
+
+            kwargs = dict(kwargs)
+            for name in ["cache", "session"]:
+                # a replacement can itself be abandoned by a later Check
+                while name in kwargs and id(kwargs[name]) in self._replacements:
+                    kwargs[name] = self._replacements[id(kwargs[name])][1]
+
+        return kwargs
+
+    def record_timeout(self, check, checkName: str, budget: str, elapsedSeconds: float, provider: str, providerAccountId: str, outcome: UnitOutcome | None, kwargs: dict) -> dict:
+        """
+        Records a timeout metric and returns the finding that stands in for the abandoned (or skipped) Check
+        """
+        awsRegion = kwargs.get("awsRegion")
+        if elapsedSeconds:
+            logger.warning(
+                "Check %s for %s %s exceeded its %s budget and was abandoned after %.1f seconds",
+                checkName, provider, providerAccountId, budget, elapsedSeconds
+            )
+        else:
+            logger.warning(
+                "Check %s for %s %s was skipped because its %s budget was exhausted",
+                checkName, provider, providerAccountId, budget
+            )
+
+        if outcome is not None:
+            outcome.timedOut = True
+        with self._lock:
+            self.timeouts.append(
+                {
+                    "CheckName": checkName,
+                    "Provider": provider,
+                    "ProviderAccountId": providerAccountId,
+                    "Region": awsRegion,
+                    "Budget": budget,
+                    "ElapsedSeconds": round(elapsedSeconds, 3)
+                }
+            )
+
+        return create_timeout_finding(
+            checkName=checkName,
+            checkTitle=get_check_title(check, checkName),
+            budget=budget,
+            provider=provider,
+            providerAccountId=providerAccountId,
+            awsAccountId=kwargs.get("awsAccountId"),
+            awsRegion=awsRegion,
+            awsPartition=kwargs.get("awsPartition")
+        )
+
+def get_check_title(check, checkName: str) -> str:
+    """
+    Returns the Check title from the first line of its docstring, which is also what --list-controls prints
+    """
+    if check.__doc__:
+        return check.__doc__.strip().splitlines()[0]
+
+    return checkName
+
+def create_timeout_finding(checkName: str, checkTitle: str, budget: str, provider: str, providerAccountId: str, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
+    """
+    Creates an ASFF finding which records that a Check did not complete within its time budget, the Compliance status
+    is WARNING as the Check result is unknown
+    """
+    iso8601Time = datetime.now(timezone.utc).isoformat()
+
+    return {
+        "SchemaVersion": "2018-10-08",
+        "Id": f"{providerAccountId}/{awsRegion}/{checkName}/check-timeout",
+        "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
+        "GeneratorId": f"{providerAccountId}/{checkName}/check-timeout",
+        "AwsAccountId": awsAccountId,
+        "Types": ["Software and Configuration Checks"],
+        "FirstObservedAt": iso8601Time,
+        "CreatedAt": iso8601Time,
+        "UpdatedAt": iso8601Time,
+        "Severity": {"Label": "INFORMATIONAL"},
+        "Confidence": 99,
+        "Title": f"{checkTitle} - Check did not complete",
+        "Description": f"ElectricEye Check {checkName} did not complete for {provider} {providerAccountId} within its {budget} time budget and was abandoned, any findings it would have produced after that point are missing.",
+        "Remediation": {
+            "Recommendation": {
+                "Text": "Review the ElectricEye logs for the Check, ensure the target is reachable and not throttling requests, or increase the budget with --check-timeout and --auditor-timeout.",
+                "Url": "https://github.com/jonrau1/ElectricEye"
+            }
+        },
+        "ProductFields": {
+            "ProductName": "ElectricEye",
+            "Provider": provider,
+            "ProviderType": "CSP" if provider in ["AWS", "GCP", "OCI", "Azure"] else "SaaS",
+            "ProviderAccountId": providerAccountId,
+            "AssetRegion": awsRegion,
+            "AssetDetails": None,
+            "AssetClass": "Management & Governance",
+            "AssetService": "ElectricEye",
+            "AssetComponent": "Check"
+        },
+        "Resources": [
+            {
+                "Type": "ElectricEyeCheck",
+                "Id": checkName,
+                "Partition": awsPartition,
+                "Region": awsRegion
+            }
+        ],
+        "Compliance": {
+            "Status": "WARNING",
+            "RelatedRequirements": []
+        },
+        "Workflow": {"Status": "NEW"},
+        "RecordState": "ACTIVE"
+    }
+
+# EOF
@@ -0,0 +1,200 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import json
+import logging
+import sys
+from base64 import b64decode, b64encode
+from datetime import datetime, timezone
+from os import makedirs, path, remove
+from threading import Lock
+from uuid import uuid4
+
+logger = logging.getLogger("CheckpointJournal")
+
+here = path.abspath(path.dirname(__file__))
+# Journals are written to /eeauditor/checkpoints/<run-id>.jsonl unless another directory is configured
+CHECKPOINT_DIRECTORY = path.join(here, "checkpoints")
+
+def create_run_id() -> str:
+    """
+    Returns a sortable, unique identifier for a new run
+    """
+    return f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}-{uuid4().hex[:8]}"
+
+def encode_value(value):
+    """
+    JSON `default` hook for the non-JSON types found in ASFF findings, `AssetDetails` is base64 encoded bytes
+    """
+    if isinstance(value, bytes):
+        return {"__bytes__": b64encode(value).decode("ascii")}
+
+    return str(value)
+
+def decode_value(value: dict):
+    """
+    JSON `object_hook` which restores the values encoded by `encode_value`
+    """
+    if len(value) == 1 and "__bytes__" in value:
+        return b64decode(value["__bytes__"])
+
+    return value
+
+class CheckpointJournal(object):
+    """
+    Append-only JSONL journal of the units of work (an Auditor against a single Account, Region, Project, Subscription
+    and so on) that completed during a run, along with the findings they emitted. Resuming a run skips the completed
+    units and replays their findings so the Outputs receive the same results as an uninterrupted run. Until `open()`
+    is called nothing is journaled and no unit is ever completed
+    """
+
+    def __init__(self):
+        self.runId = None
+        self.journalPath = None
+        self._completed = {}
+        # units with a Check that raised or ran out of time during this run, they are run again when it is resumed
+        self._incomplete = []
+        self._lock = Lock()
+
+    def open(self, assessmentTarget: str, resumeRunId: str | None = None, directory: str = CHECKPOINT_DIRECTORY) -> str | None:
+        """
+        Starts a new journal, or loads the journal of `resumeRunId` and continues appending to it. Returns the run ID,
+        or None when a new journal cannot be written (e.g., a read-only directory) and the run continues without one
+        """
+        if resumeRunId is None:
+            self.runId = create_run_id()
+            self.journalPath = path.join(directory, f"{self.runId}.jsonl")
+            try:
+                makedirs(directory, exist_ok=True)
+            except OSError as e:
+                logger.error("Cannot create checkpoint directory %s, the run will not be checkpointed: %s", directory, e)
+                self.runId = self.journalPath = None
+                return None
+            self.append(
+                {
+                    "RunId": self.runId,
+                    "AssessmentTarget": assessmentTarget,
+                    "CreatedAt": datetime.now(timezone.utc).isoformat()
+                }
+            )
+            if self.journalPath is None:
+                self.runId = None
+                return None
+            logger.info("Checkpointing run %s to %s.", self.runId, self.journalPath)
+            return self.runId
+
+        self.runId = resumeRunId
+        self.journalPath = path.join(directory, f"{resumeRunId}.jsonl")
+        if not path.exists(self.journalPath):
+            logger.error("No checkpoint journal was found for run %s at %s.", resumeRunId, self.journalPath)
+            sys.exit(2)
+
+        self.load(assessmentTarget)
+        logger.info(
+            "Resuming run %s, %s completed units will be replayed from %s.",
+            self.runId, len(self._completed), self.journalPath
+        )
+        return self.runId
+
+    def load(self, assessmentTarget: str) -> None:
+        """
+        Reads the completed units from the journal, a partially written last line (the process died mid-write) is
+        ignored as that unit never completed
+        """
+        with open(self.journalPath, "r") as f:
+            for lineNumber, line in enumerate(f, start=1):
+                try:
+                    record = json.loads(line, object_hook=decode_value)
+                except json.JSONDecodeError:
+                    logger.warning("Ignoring incomplete checkpoint record on line %s of %s.", lineNumber, self.journalPath)
+                    continue
+
+                if "Unit" in record:
+                    self._completed[tuple(record["Unit"])] = record["Findings"]
+                elif record.get("AssessmentTarget") != assessmentTarget:
+                    logger.error(
+                        "Run %s was started for %s and cannot be resumed for %s.",
+                        self.runId, record.get("AssessmentTarget"), assessmentTarget
+                    )
+                    sys.exit(2)
+
+    def append(self, record: dict) -> None:
+        """
+        Writes a single record and flushes it so that it survives the process being killed
+        """
+        line = json.dumps(record, default=encode_value)
+        with self._lock:
+            if self.journalPath is None:
+                return
+            try:
+                with open(self.journalPath, "a") as f:
+                    f.write(f"{line}\n")
+                    f.flush()
+            except OSError as e:
+                # a checkpoint is never worth failing the scan for
+                logger.error("Cannot write to checkpoint journal %s, checkpointing is disabled: %s", self.journalPath, e)
+                self.journalPath = None
+
+    def is_completed(self, unit: tuple) -> bool:
+        return unit in self._completed
+
+    def replay(self, unit: tuple) -> list:
+        """
+        Returns the findings a completed unit emitted
+        """
+        logger.info("Replaying %s findings for completed unit %s.", len(self._completed[unit]), unit)
+        return self._completed[unit]
+
+    def complete(self, unit: tuple, findings: list) -> None:
+        """
+        Records a unit as completed along with its findings
+        """
+        if self.journalPath is None:
+            return
+
+        self.append({"Unit": list(unit), "Findings": findings})
+
+    def incomplete(self, unit: tuple) -> None:
+        """
+        Records that a unit did not complete, it is not journaled so a resumed run executes it again
+        """
+        with self._lock:
+            self._incomplete.append(unit)
+        if self.journalPath is not None:
+            logger.info("Unit %s did not complete and will be run again if run %s is resumed.", unit, self.runId)
+
+    def discard(self) -> None:
+        """
+        Deletes the journal once its findings reached the Outputs, it is kept when a unit did not complete so that the
+        run can still be resumed
+        """
+        if self.journalPath is None or self._incomplete:
+            return
+
+        try:
+            remove(self.journalPath)
+        except OSError as e:
+            logger.warning("Failed to delete checkpoint journal %s: %s", self.journalPath, e)
+            return
+        logger.info("Run %s completed, deleted checkpoint journal %s.", self.runId, self.journalPath)
+        self.journalPath = None
+
+# EOF
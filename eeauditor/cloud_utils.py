@@ -20,16 +20,11 @@
 
 import logging
 import boto3
-from tomli import load as tomload
 import sys
-from os import environ, path, chmod
+from os import environ, chmod
 from re import compile
 import json
 from botocore.exceptions import ClientError
-from google.oauth2 import service_account
-from azure.identity import ClientSecretCredential
-from azure.mgmt.resource.subscriptions import SubscriptionClient
-import snowflake.connector as snowconn
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("CloudUtils")
@@ -46,14 +41,10 @@ class CloudConfig(object):
 
     def __init__(self, assessmentTarget: str, tomlPath: str | None, useToml: str, args: str | None):
         if useToml == "True":
-            if tomlPath is None:
-                here = path.abspath(path.dirname(__file__))
-                tomlFile = f"{here}/external_providers.toml"
-            else:
-                tomlFile = tomlPath
+            from external_providers import activate_external_providers_config
 
-            with open(tomlFile, "rb") as f:
-                data = tomload(f)
+            # The same parsed snapshot is read by Auditors and Outputs, it is never re-read from disk during a run
+            data = activate_external_providers_config(tomlPath)
 
             # From TOML [global]
             if data["global"]["aws_multi_account_target_type"] not in AWS_MULTI_ACCOUNT_TARGET_TYPE_CHOICES:
@@ -81,13 +72,15 @@ class CloudConfig(object):
             # AWS
             if assessmentTarget == "AWS":
                 sts = boto3.client("sts")
+                # Only populated when Accounts are discovered from AWS Organizations
+                self.awsAccountMetadata = {}
                 # Process ["aws_account_targets"] 
                 awsAccountTargets = data["regions_and_accounts"]["aws"]["aws_account_targets"]
                 if self.awsMultiAccountTargetType == "Accounts":
                     if not awsAccountTargets:
                         self.awsAccountTargets = [sts.get_caller_identity()["Account"]]
                     else:
-                        self.awsAccountTargets = awsAccountTargets
+                        self.awsAccountTargets = list(awsAccountTargets)
                 elif self.awsMultiAccountTargetType == "OU":
                     if not awsAccountTargets:
                         logger.error("OU was specified but targets were not specified.")
@@ -132,7 +125,7 @@ class CloudConfig(object):
                     logger.error("No GCP Projects were provided in [regions_and_accounts.gcp.gcp_project_ids].")
                     sys.exit(2)
                 else:
-                    self.gcpProjectIds = gcpProjects
+                    self.gcpProjectIds = list(gcpProjects)
                 
                 # Process ["gcp_service_account_json_payload_value"]
                 gcpCred = data["credentials"]["gcp"]["gcp_service_account_json_payload_value"]
@@ -222,6 +215,7 @@ class CloudConfig(object):
                 azureSecretId = azureValues["azure_ent_app_client_secret_id_value"]
                 azureTenantId = azureValues["azure_ent_app_tenant_id_value"]
                 azureSubscriptions = data["regions_and_accounts"]["azure"]["azure_subscription_ids"]
+                azureUseResourceGraph = data["regions_and_accounts"]["azure"].get("azure_use_resource_graph", False)
 
                 del azureValues
 
@@ -235,40 +229,16 @@ class CloudConfig(object):
                     sys.exit(2)
 
                 # Retrieve the values for the azure Enterprise Application Client ID, Secret Value & Tenant ID
-                # SSM
-                if self.credentialsLocation == "AWS_SSM":
-                    # Client ID
-                    azureClientId = self.get_credential_from_aws_ssm(
-                        azureClientId,
-                        "azure_ent_app_client_id_value"
-                    )
-                    # Secret Value
-                    azureSecretId = self.get_credential_from_aws_ssm(
-                        azureSecretId,
-                        "azure_ent_app_client_secret_id_value"
-                    )
-                    # Tenant ID
-                    azureTenantId = self.get_credential_from_aws_ssm(
-                        azureTenantId,
-                        "azure_ent_app_tenant_id_value"
-                    )
-                # AWS Secrets Manager
-                elif self.credentialsLocation == "AWS_SECRETS_MANAGER":
-                    # Client ID
-                    azureClientId = self.get_credential_from_aws_secrets_manager(
-                        azureClientId,
-                        "azure_ent_app_client_id_value"
-                    )
-                    # Secret Value
-                    azureSecretId = self.get_credential_from_aws_secrets_manager(
-                        azureSecretId,
-                        "azure_ent_app_client_secret_id_value"
-                    )
-                    # Tenant ID
-                    azureTenantId = self.get_credential_from_aws_secrets_manager(
-                        azureTenantId,
-                        "azure_ent_app_tenant_id_value"
-                    )
+                azureCredentialValues = self.get_credentials_from_toml(
+                    {
+                        "azure_ent_app_client_id_value": azureClientId,
+                        "azure_ent_app_client_secret_id_value": azureSecretId,
+                        "azure_ent_app_tenant_id_value": azureTenantId
+                    }
+                )
+                azureClientId = azureCredentialValues["azure_ent_app_client_id_value"]
+                azureSecretId = azureCredentialValues["azure_ent_app_client_secret_id_value"]
+                azureTenantId = azureCredentialValues["azure_ent_app_tenant_id_value"]
 
                 # Create Azure Identity credentials from Client ID/Secret Value/Tenant ID
                 azureCredentials = self.create_azure_identity_credentials_from_client_secret(
@@ -286,8 +256,9 @@ class CloudConfig(object):
                         azureCredentials=azureCredentials
                     )
                 # pass list of subscriptions and the creds off
-                self.azureSubscriptions = azureSubscriptions
+                self.azureSubscriptions = list(azureSubscriptions)
                 self.azureCredentials = azureCredentials
+                self.azureUseResourceGraph = azureUseResourceGraph
 
             # Alibaba Cloud
             if assessmentTarget == "Alibaba":
@@ -360,44 +331,16 @@ class CloudConfig(object):
                 self.m365TenantLocation = m365TenantLocation
 
                 # Retrieve the values for the M365 Enterprise Application Client ID, Secret Value & Tenant ID
-                if self.credentialsLocation == "CONFIG_FILE":
-                    self.m365ClientId = m365ClientId
-                    self.m365SecretId = m365SecretId
-                    self.m365TenantId = m365TenantId
-                # SSM
-                elif self.credentialsLocation == "AWS_SSM":
-                    # Client ID
-                    self.m365ClientId = self.get_credential_from_aws_ssm(
-                        m365ClientId,
-                        "m365_ent_app_client_id_value"
-                    )
-                    # Secret Value
-                    self.m365SecretId = self.get_credential_from_aws_ssm(
-                        m365SecretId,
-                        "m365_ent_app_client_secret_id_value"
-                    )
-                    # Tenant ID
-                    self.m365TenantId = self.get_credential_from_aws_ssm(
-                        m365TenantId,
-                        "m365_ent_app_tenant_id_value"
-                    )
-                # AWS Secrets Manager
-                elif self.credentialsLocation == "AWS_SECRETS_MANAGER":
-                    # Client ID
-                    self.m365ClientId = self.get_credential_from_aws_secrets_manager(
-                        m365ClientId,
-                        "m365_ent_app_client_id_value"
-                    )
-                    # Secret Value
-                    self.m365SecretId = self.get_credential_from_aws_secrets_manager(
-                        m365SecretId,
-                        "m365_ent_app_client_secret_id_value"
-                    )
-                    # Tenant ID
-                    self.m365TenantId = self.get_credential_from_aws_secrets_manager(
-                        m365TenantId,
-                        "m365_ent_app_tenant_id_value"
-                    )
+                m365CredentialValues = self.get_credentials_from_toml(
+                    {
+                        "m365_ent_app_client_id_value": m365ClientId,
+                        "m365_ent_app_client_secret_id_value": m365SecretId,
+                        "m365_ent_app_tenant_id_value": m365TenantId
+                    }
+                )
+                self.m365ClientId = m365CredentialValues["m365_ent_app_client_id_value"]
+                self.m365SecretId = m365CredentialValues["m365_ent_app_client_secret_id_value"]
+                self.m365TenantId = m365CredentialValues["m365_ent_app_tenant_id_value"]
         
             # Salesforce
             if assessmentTarget == "Salesforce":
@@ -430,67 +373,20 @@ class CloudConfig(object):
                 self.salesforceInstanceLocation = salesforceInstanceLocation
 
                 # Retrieve the values for the Salesforce Client ID, Client Secret, Username, Password, and Security Token
-                # Local config file
-                if self.credentialsLocation == "CONFIG_FILE":
-                    self.salesforceAppClientId = salesforceAppClientId
-                    self.salesforceAppClientSecret = salesforceAppClientSecret
-                    self.salesforceApiUsername = salesforceApiUsername
-                    self.salesforceApiPassword = salesforceApiPassword
-                    self.salesforceUserSecurityToken = salesforceUserSecurityToken
-                # SSM
-                elif self.credentialsLocation == "AWS_SSM":
-                    # Client ID
-                    self.salesforceAppClientId = self.get_credential_from_aws_ssm(
-                        salesforceAppClientId,
-                        "salesforce_connected_app_client_id_value"
-                    )
-                    # Client Secret
-                    self.salesforceAppClientSecret = self.get_credential_from_aws_ssm(
-                        salesforceAppClientSecret,
-                        "salesforce_connected_app_client_secret_value"
-                    )
-                    # API Username
-                    self.salesforceApiUsername = self.get_credential_from_aws_ssm(
-                        salesforceApiUsername,
-                        "salesforce_api_enabled_username_value"
-                    )
-                    # API User Password
-                    self.salesforceApiPassword = self.get_credential_from_aws_ssm(
-                        salesforceApiPassword,
-                        "salesforce_api_enabled_password_value"
-                    )
-                    # API User Security Token
-                    self.salesforceUserSecurityToken = self.get_credential_from_aws_ssm(
-                        salesforceUserSecurityToken,
-                        "salesforce_api_enabled_security_token_value"
-                    )
-                # AWS Secrets Manager
-                elif self.credentialsLocation == "AWS_SECRETS_MANAGER":
-                    # Client ID
-                    self.salesforceAppClientId = self.get_credential_from_aws_secrets_manager(
-                        salesforceAppClientId,
-                        "salesforce_connected_app_client_id_value"
-                    )
-                    # Client Secret
-                    self.salesforceAppClientSecret = self.get_credential_from_aws_secrets_manager(
-                        salesforceAppClientSecret,
-                        "salesforce_connected_app_client_secret_value"
-                    )
-                    # API Username
-                    self.salesforceApiUsername = self.get_credential_from_aws_secrets_manager(
-                        salesforceApiUsername,
-                        "salesforce_api_enabled_username_value"
-                    )
-                    # API User Password
-                    self.salesforceApiPassword = self.get_credential_from_aws_secrets_manager(
-                        salesforceApiPassword,
-                        "salesforce_api_enabled_password_value"
-                    )
-                    # API User Security Token
-                    self.salesforceUserSecurityToken = self.get_credential_from_aws_secrets_manager(
-                        salesforceUserSecurityToken,
-                        "salesforce_api_enabled_security_token_value"
-                    )
+                salesforceCredentialValues = self.get_credentials_from_toml(
+                    {
+                        "salesforce_connected_app_client_id_value": salesforceAppClientId,
+                        "salesforce_connected_app_client_secret_value": salesforceAppClientSecret,
+                        "salesforce_api_enabled_username_value": salesforceApiUsername,
+                        "salesforce_api_enabled_password_value": salesforceApiPassword,
+                        "salesforce_api_enabled_security_token_value": salesforceUserSecurityToken
+                    }
+                )
+                self.salesforceAppClientId = salesforceCredentialValues["salesforce_connected_app_client_id_value"]
+                self.salesforceAppClientSecret = salesforceCredentialValues["salesforce_connected_app_client_secret_value"]
+                self.salesforceApiUsername = salesforceCredentialValues["salesforce_api_enabled_username_value"]
+                self.salesforceApiPassword = salesforceCredentialValues["salesforce_api_enabled_password_value"]
+                self.salesforceUserSecurityToken = salesforceCredentialValues["salesforce_api_enabled_security_token_value"]
 
             # Google Workspace
             if assessmentTarget == "GoogleWorkspace":
@@ -573,93 +469,65 @@ class CloudConfig(object):
         """
         Retrieves a TOML variable from AWS Systems Manager Parameter Store and returns it
         """
+        from external_providers import get_secret_resolver
 
-        ssm = boto3.client("ssm")
-
-        if value is None or value == "":
-            logger.error(
-                "A value for %s was not provided. Fix the TOML file and run ElectricEye again.",
-                configurationName
-            )
-            sys.exit(2)
-
-        # Retrieve the credential from SSM Parameter Store
-        try:
-            credential = ssm.get_parameter(
-                Name=value,
-                WithDecryption=True
-            )["Parameter"]["Value"]
-        except ClientError as e:
-            logger.error(
-                "Failed to retrieve the credential for %s from SSM Parameter Store: %s",
-                configurationName, e
-            )
-            raise e
-        
-        return credential
+        return get_secret_resolver("AWS_SSM").resolve(value, configurationName)
     
     def get_credential_from_aws_secrets_manager(self, value, configurationName) -> str:
         """
         Retrieves a TOML variable from AWS Secrets Manager and returns it
         """
-        asm = boto3.client("secretsmanager")
+        from external_providers import get_secret_resolver
 
-        if value is None or value == "":
-            logger.error(
-                "A value for %s was not provided. Fix the TOML file and run ElectricEye again.",
-                configurationName
-            )
-            sys.exit(2)
+        return get_secret_resolver("AWS_SECRETS_MANAGER").resolve(value, configurationName)
 
-        try:
-            credential = asm.get_secret_value(SecretId=value)["SecretString"]
-        except ClientError as e:
-            logger.error(
-                "Failed to retrieve the credential for %s from AWS Secrets Manager: %s",
-                configurationName, e
-            )
-            raise e
+    def get_credentials_from_toml(self, values: dict) -> dict:
+        """
+        Retrieves several TOML variables from the configured credentials location at once, keyed by the TOML setting
+        """
+        from external_providers import get_secret_resolver
 
-        return credential
+        return get_secret_resolver(self.credentialsLocation).resolve_many(values)
 
     def get_aws_accounts_from_organization(self) -> list[str]:
         """
-        Uses Organizations ListAccounts API to get a list of "ACTIVE" AWS Accounts in the entire Organization
+        Walks the entire AWS Organization to get a list of "ACTIVE" AWS Accounts, the Account metadata (name, OU path,
+        tags) is kept in `awsAccountMetadata`
         """
-        org = boto3.client("organizations")
+        from collectors.aws_organizations_collector import get_organization_accounts
 
         try:
-            accounts = [account["Id"] for account in org.list_accounts()["Accounts"] if account["Status"] == "ACTIVE"]
+            self.awsAccountMetadata = get_organization_accounts(boto3.Session())
         except ClientError as e:
             logger.error(
                 "Failed to retrieve accounts from AWS Organizations: %s", e
             )
             raise e
 
-        return accounts
+        return list(self.awsAccountMetadata)
 
     def get_aws_accounts_from_organizational_units(self, targets) -> list[str]:
         """
-        Uses Organizations ListAccountsForParent API to get a list of "ACTIVE" AWS Accounts for specified OUs
+        Walks the specified OUs, including nested OUs, to get a list of "ACTIVE" AWS Accounts, the Account metadata
+        (name, OU path, tags) is kept in `awsAccountMetadata`
         """
-        sts = boto3.client("sts")
-        org = boto3.client("organizations")
+        from collectors.aws_organizations_collector import get_organization_accounts
 
-        accounts = [sts.get_caller_identity()["Account"]]  # Caller account is added directly.
+        sts = boto3.client("sts")
+        callerAccount = sts.get_caller_identity()["Account"]
 
-        for parent in targets:
-            logger.info("Processing accounts for Organizational Unit %s.", parent)
-            try:
-                active_accounts = [account["Id"] for account in org.list_accounts_for_parent(ParentId=parent)["Accounts"] if account["Status"] == "ACTIVE"]
-                accounts.extend(account for account in active_accounts if account not in accounts)
-            except ClientError as e:
-                logger.error(
-                    "Failed to retrieve accounts for Organizational Unit %s: %s",
-                    parent, e
-                )
-                raise e
+        logger.info("Processing accounts for Organizational Units %s.", targets)
+        try:
+            self.awsAccountMetadata = get_organization_accounts(boto3.Session(), targets)
+        except ClientError as e:
+            logger.error(
+                "Failed to retrieve accounts for Organizational Units %s: %s",
+                targets, e
+            )
+            raise e
 
-        return accounts
+        # Caller account is added directly.
+        return [callerAccount] + [account for account in self.awsAccountMetadata if account != callerAccount]
 
     # This function is called outside of this Class
     def create_aws_session(account: str, partition: str, region: str, roleName: str) -> boto3.Session:
@@ -762,18 +630,10 @@ class CloudConfig(object):
         """
         Takes the credential value derived from the TOML file and creates a GCP credential object that can be passed to EEAuditor
         """
-        credentials = json.loads(credentialValue)
+        # Provider SDKs are only imported for their own Assessment Target, see provider_setup/__init__.py
+        from .provider_setup.gcp import create_gcp_credentials
 
-        # Create a GCP credential object from the JSON payload
-        try:
-            gcpCredentials = service_account.Credentials.from_service_account_info(credentials)
-        except Exception as e:
-            logger.error(
-                "Error encountered attempting to create GCP credentials from JSON payload: %s", e
-            )
-            sys.exit(2)
-
-        return gcpCredentials
+        return create_gcp_credentials(credentialValue)
 
     def setup_oci_credentials(self, credentialValue) -> None:
         """
@@ -791,71 +651,31 @@ class CloudConfig(object):
         logger.info("%s saved to environment variable", credentials_file_path)
         environ["OCI_PEM_FILE_PATH"] = credentials_file_path
 
-    def create_azure_identity_credentials_from_client_secret(self, clientId: str, clientSecret: str, tenantId: str) -> ClientSecretCredential:
+    def create_azure_identity_credentials_from_client_secret(self, clientId: str, clientSecret: str, tenantId: str):
         """
         Attempts to create and return Azure Identity Credentials built from Client Secret creds within an App Registration
         """
-        # Create Azure Identity credentials from Client ID/Secret Value/Tenant ID
-        try:
-            azureCredentials = ClientSecretCredential(client_id=clientId,client_secret=clientSecret,tenant_id=tenantId)
-        except Exception as e:
-            logger.error(
-                "Error encountered attempting to create Azure Identity credentials from client secret: %s", e
-            )
-            sys.exit(2)
+        from .provider_setup.azure import create_azure_client_secret_credential
 
-        return azureCredentials
+        return create_azure_client_secret_credential(clientId, clientSecret, tenantId)
 
-    def retrieve_azure_subscriptions_for_service_principal(self, azureCredentials: ClientSecretCredential) -> list:
+    def retrieve_azure_subscriptions_for_service_principal(self, azureCredentials) -> list:
         """
+        Returns the ID of every Azure Subscription the Service Principal can access
         """
-        azureSubscriptionsClient = SubscriptionClient(azureCredentials)
-
-        try:
-            azureSubscriptionIds = [sub.subscription_id for sub in azureSubscriptionsClient.subscriptions.list()]
-            if not azureSubscriptionIds:
-                logger.error(
-                    "No Subscription IDs are available for your current Service Principal, please review your credentials and Access Control (IAM) settings in Azure Entra ID and Azure Subscriptions, respectively"
-                )
-                sys.exit(2)
-        except Exception as e:
-            logger.error(
-                "Error encountered attempting to list Azure Subscriptions for Service Principal: %s", e
-            )
-            sys.exit(2)
+        from .provider_setup.azure import list_azure_subscription_ids
 
-        return azureSubscriptionIds
+        return list_azure_subscription_ids(azureCredentials)
 
-    def create_snowflake_cursor(self) -> tuple[snowconn.connection.SnowflakeConnection, snowconn.cursor.SnowflakeCursor]:
+    def create_snowflake_cursor(self) -> tuple:
         """
-        Returns a Snowflake cursor object for a given warehouse
+        Returns a Snowflake connection and cursor object for a given warehouse
         """
-        try:
-            conn = snowconn.connect(
-                user=self.snowflakeUsername,
-                password=self.snowflakePassowrd,
-                account=self.snowflakeAccountId,
-                warehouse=self.snowflakeWarehouseName
-            )
-        except Exception as e:
-            raise e
-
-        # This allows us to return a dictionary instead of tuples
-        logger.info("Connected to Snowflake successfully.")
-        cur = conn.cursor(snowconn.DictCursor)
+        from .provider_setup.snowflake import create_snowflake_cursor
 
-        # Use the warehouse provided, this is a required step if a custom role is used to catch if the custom role was not given a grant to the warehouse
-        try:
-            war = cur.execute(f"use warehouse {self.snowflakeWarehouseName}").fetchall()
-            logger.info("Using warehouse %s. %s", self.snowflakeWarehouseName, war)
-        except snowconn.errors.ProgrammingError as e:
-            logger.error(
-                "Failed to use warehouse %s: %s",
-                self.snowflakeWarehouseName, e
-            )
-            raise e
-
-        return conn, cur
+        return create_snowflake_cursor(
+            self.snowflakeUsername, self.snowflakePassowrd, self.snowflakeAccountId, self.snowflakeWarehouseName
+        )
 
     def process_non_toml_args(self, assessmentTarget: str, args: dict) -> None:
         """
@@ -873,6 +693,8 @@ class CloudConfig(object):
         # AWS
         if assessmentTarget == "AWS":
             sts = boto3.client("sts")
+            # Only populated when Accounts are discovered from AWS Organizations
+            self.awsAccountMetadata = {}
             # First process the global "aws_multi_account_target_type" and "aws_account_targets" args
             try:
                 awsMultiAccountTargetType = str(args.get("aws_multi_account_target_type"))
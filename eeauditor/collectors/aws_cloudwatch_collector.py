@@ -0,0 +1,174 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import datetime
+import logging
+from collectors.collector_base import get_pooled_client
+
+logger = logging.getLogger("AwsCloudWatchCollector")
+
+# GetMetricData accepts at most 500 MetricDataQueries per request
+METRIC_DATA_MAX_QUERIES = 500
+# How get_metric_window_totals() combines the daily datapoints of a statistic into a single value for the window,
+# averages and percentiles cannot be combined from daily values
+METRIC_WINDOW_STAT_COMBINERS = {
+    "Sum": sum,
+    "SampleCount": sum,
+    "Maximum": max,
+    "Minimum": min
+}
+
+def get_metric_filter_alarm_index(cache: dict, session) -> dict:
+    """
+    Builds an index of every CloudWatch Logs metric filter in the Region (Log Group -> normalized filter pattern ->
+    metrics) and every CloudWatch metric alarm (namespace & metric name -> alarm names) from two paginated sweeps,
+    instead of calling DescribeMetricFilters and DescribeAlarmsForMetric per Trail per Check
+    """
+    response = cache.get("get_metric_filter_alarm_index")
+    if response:
+        return response
+
+    logs = get_pooled_client(session, "logs")
+    cloudwatch = get_pooled_client(session, "cloudwatch")
+
+    metricFilters = {}
+    for page in logs.get_paginator("describe_metric_filters").paginate():
+        for metricFilter in page["metricFilters"]:
+            logGroupPatterns = metricFilters.setdefault(metricFilter["logGroupName"], {})
+            metrics = logGroupPatterns.setdefault(normalize_filter_pattern(metricFilter.get("filterPattern", "")), [])
+            for transformation in metricFilter.get("metricTransformations", []):
+                metrics.append((transformation["metricNamespace"], transformation["metricName"]))
+
+    alarms = {}
+    for page in cloudwatch.get_paginator("describe_alarms").paginate(AlarmTypes=["MetricAlarm"]):
+        for alarm in page["MetricAlarms"]:
+            # single metric alarms carry the metric on the alarm itself, metric math alarms carry it per query
+            alarmMetrics = []
+            if "MetricName" in alarm:
+                alarmMetrics.append((alarm.get("Namespace"), alarm["MetricName"]))
+            for query in alarm.get("Metrics", []):
+                metric = query.get("MetricStat", {}).get("Metric")
+                if metric:
+                    alarmMetrics.append((metric.get("Namespace"), metric["MetricName"]))
+            for alarmMetric in alarmMetrics:
+                alarms.setdefault(alarmMetric, []).append(alarm["AlarmName"])
+
+    cache["get_metric_filter_alarm_index"] = {
+        "MetricFilters": metricFilters,
+        "Alarms": alarms
+    }
+    return cache["get_metric_filter_alarm_index"]
+
+def normalize_filter_pattern(filterPattern: str) -> str:
+    """
+    Removes whitespace outside of double-quoted terms so that CIS filter patterns written with different spacing,
+    e.g., `($.eventName=CreateTrail)` and `($.eventName = CreateTrail)`, compare as equal
+    """
+    normalized = []
+    inQuotes = False
+    for character in filterPattern.strip():
+        if character == '"':
+            inQuotes = not inQuotes
+        if character.isspace() and not inQuotes:
+            continue
+        normalized.append(character)
+
+    return "".join(normalized)
+
+def metric_filter_has_alarm(index: dict, logGroupName: str, filterPattern: str) -> bool:
+    """
+    Returns True if a metric filter on the Log Group matches the filter pattern and at least one of its metrics
+    has a CloudWatch alarm
+    """
+    metrics = index["MetricFilters"].get(logGroupName, {}).get(normalize_filter_pattern(filterPattern), [])
+
+    return any(metric in index["Alarms"] for metric in metrics)
+
+def get_metric_data_batched(session, metricStats: dict, startTime: datetime.datetime, endTime: datetime.datetime) -> dict:
+    """
+    Runs any number of GetMetricData `MetricStat` queries, packed up to 500 per request and paginated with NextToken.
+    `metricStats` maps a caller-defined key (e.g., a resource name) to a `MetricStat` dictionary, the results are
+    returned under the same keys as {"Timestamps": [...], "Values": [...]}
+    """
+    cloudwatch = get_pooled_client(session, "cloudwatch")
+
+    keys = list(metricStats)
+    results = {key: {"Timestamps": [], "Values": []} for key in keys}
+
+    for batchStart in range(0, len(keys), METRIC_DATA_MAX_QUERIES):
+        batchKeys = keys[batchStart:batchStart + METRIC_DATA_MAX_QUERIES]
+        # query IDs must start with a lowercase letter and be unique within a request, so they are generated
+        # from the position of the key and mapped back afterwards
+        queryIds = {f"q{position}": key for position, key in enumerate(batchKeys)}
+        metricDataQueries = [
+            {
+                "Id": queryId,
+                "MetricStat": metricStats[key],
+                "ReturnData": True
+            } for queryId, key in queryIds.items()
+        ]
+        # results for a single query can be split across pages
+        for page in cloudwatch.get_paginator("get_metric_data").paginate(
+            MetricDataQueries=metricDataQueries,
+            StartTime=startTime,
+            EndTime=endTime
+        ):
+            for result in page["MetricDataResults"]:
+                key = queryIds[result["Id"]]
+                results[key]["Timestamps"].extend(result.get("Timestamps", []))
+                results[key]["Values"].extend(result.get("Values", []))
+
+    return results
+
+def get_metric_window_totals(session, namespace: str, metricName: str, dimensionName: str, dimensionValues: list, days: int, stat: str = "Sum") -> dict:
+    """
+    Returns a map of dimension value -> aggregate of a metric over the last `days` days. The window is split into daily
+    periods aligned to midnight UTC, the full days before today and today up to now, so CloudWatch returns at most
+    `days` datapoints per query instead of thousands of 5 minute values and none of them reach back before the window.
+    The daily values are combined according to `stat`, dimension values without any datapoints are returned as 0
+    """
+    if stat not in METRIC_WINDOW_STAT_COMBINERS:
+        raise ValueError(f"Daily {stat} values cannot be combined, use one of {list(METRIC_WINDOW_STAT_COMBINERS)}")
+
+    endTime = datetime.datetime.now(datetime.timezone.utc)
+    startOfToday = endTime.replace(hour=0, minute=0, second=0, microsecond=0)
+    startTime = startOfToday - datetime.timedelta(days=days - 1)
+
+    metricStats = {
+        dimensionValue: {
+            "Metric": {
+                "Namespace": namespace,
+                "MetricName": metricName,
+                "Dimensions": [{"Name": dimensionName, "Value": dimensionValue}]
+            },
+            "Period": 86400,
+            "Stat": stat
+        } for dimensionValue in dimensionValues
+    }
+
+    combine = METRIC_WINDOW_STAT_COMBINERS[stat]
+    return {
+        dimensionValue: combine(result["Values"]) if result["Values"] else 0 for dimensionValue, result in get_metric_data_batched(
+            session, metricStats, startTime, endTime
+        ).items()
+    }
+
+# EOF
@@ -0,0 +1,75 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import json
+import logging
+from datetime import datetime, timezone
+from collectors.collector_base import get_pooled_client
+
+logger = logging.getLogger("AwsConfigCollector")
+
+def get_recorded_resource_types(session, resourceTypes: list) -> set:
+    """
+    Returns which of `resourceTypes` the AWS Config recorder in the Session's Region is currently recording, an empty
+    set is returned when no recorder is turned on
+    """
+    config = get_pooled_client(session, "config")
+
+    statuses = config.describe_configuration_recorder_status()["ConfigurationRecordersStatus"]
+    if not any(status.get("recording") for status in statuses):
+        return set()
+
+    recorded = set()
+    for recorder in config.describe_configuration_recorders()["ConfigurationRecorders"]:
+        recordingGroup = recorder.get("recordingGroup", {})
+        if recordingGroup.get("recordingStrategy", {}).get("useOnly") == "EXCLUSION_BY_RESOURCE_TYPES":
+            excluded = set(recordingGroup.get("exclusionByResourceTypes", {}).get("resourceTypes", []))
+            recorded.update(resourceType for resourceType in resourceTypes if resourceType not in excluded)
+        elif recordingGroup.get("allSupported", True):
+            recorded.update(resourceTypes)
+        else:
+            recorded.update(set(recordingGroup.get("resourceTypes", [])) & set(resourceTypes))
+
+    return recorded
+
+def select_resource_type_counts(session, resourceTypes: list, since: datetime | None = None) -> dict:
+    """
+    Returns the number of recorded resources per resource type with a single paginated AWS Config advanced query, when
+    `since` is provided only resources whose latest configuration item was captured after it are counted
+    """
+    config = get_pooled_client(session, "config")
+
+    resourceTypeList = ", ".join(f"'{resourceType}'" for resourceType in sorted(resourceTypes))
+    expression = f"SELECT resourceType, COUNT(*) WHERE resourceType IN ({resourceTypeList})"
+    if since is not None:
+        captureTime = since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        expression += f" AND configurationItemCaptureTime > '{captureTime}'"
+    expression += " GROUP BY resourceType"
+
+    counts = {}
+    for page in config.get_paginator("select_resource_config").paginate(Expression=expression):
+        for result in page["Results"]:
+            row = json.loads(result)
+            counts[row["resourceType"]] = row["COUNT(*)"]
+
+    return counts
+
+# EOF
@@ -0,0 +1,80 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import logging
+from threading import Lock
+from botocore.exceptions import ClientError
+from collectors.collector_base import fan_out, get_pooled_client, get_session_store
+
+logger = logging.getLogger("AwsDynamoDbCollector")
+
+_tableRecordsLock = Lock()
+
+def get_dynamodb_tables(session) -> list:
+    """
+    Returns a record for every DynamoDB table in the Session's Region, cached for the lifetime of the Session so the
+    DynamoDB and Backup Auditors share it. Each record holds the DescribeTable `Table` and the DescribeContinuousBackups
+    `ContinuousBackupsDescription` (None if it could not be read), the per-table calls are fanned out concurrently
+    """
+    store = get_session_store(session)
+    with _tableRecordsLock:
+        tableRecords = store.get("dynamodb_tables")
+    if tableRecords is not None:
+        return tableRecords
+
+    dynamodb = get_pooled_client(session, "dynamodb")
+
+    tableNames = []
+    for page in dynamodb.get_paginator("list_tables").paginate():
+        tableNames.extend(page["TableNames"])
+
+    tableRecords = [
+        record for record in fan_out(lambda tableName: get_dynamodb_table_record(dynamodb, tableName), tableNames)
+        if record is not None
+    ]
+
+    with _tableRecordsLock:
+        store["dynamodb_tables"] = tableRecords
+
+    return tableRecords
+
+def get_dynamodb_table_record(dynamodb, tableName: str) -> dict | None:
+    """
+    Describes a single table and its continuous backups. Returns None if the table was deleted after it was listed
+    """
+    try:
+        table = dynamodb.describe_table(TableName=tableName)["Table"]
+    except ClientError as e:
+        logger.warning("Failed to describe DynamoDB table %s: %s", tableName, e)
+        return None
+
+    try:
+        continuousBackups = dynamodb.describe_continuous_backups(TableName=tableName)["ContinuousBackupsDescription"]
+    except ClientError as e:
+        logger.warning("Failed to describe continuous backups for DynamoDB table %s: %s", tableName, e)
+        continuousBackups = None
+
+    return {
+        "Table": table,
+        "ContinuousBackupsDescription": continuousBackups
+    }
+
+# EOF
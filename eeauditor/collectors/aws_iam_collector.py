@@ -0,0 +1,230 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import csv
+import datetime
+import io
+import logging
+from time import sleep
+from botocore.exceptions import ClientError
+from collectors.collector_base import fan_out, get_pooled_client
+
+logger = logging.getLogger("AwsIamCollector")
+
+# GetAccountAuthorizationDetails filters, AWS Managed Policies are excluded as there are over a thousand of them
+# and the Auditor only ever needs the customer managed ones
+AUTHORIZATION_DETAILS_FILTER = ["User", "Role", "Group", "LocalManagedPolicy"]
+# How many times to poll GenerateCredentialReport before giving up, and how long to wait between polls
+CREDENTIAL_REPORT_MAX_POLLS = 15
+CREDENTIAL_REPORT_POLL_SECONDS = 2
+# Credential report cells that do not hold a timestamp
+CREDENTIAL_REPORT_EMPTY_VALUES = ["N/A", "no_information", "not_supported", ""]
+
+def get_iam_inventory(cache: dict, session) -> dict:
+    """
+    Builds an indexed inventory of IAM Users, Groups, Roles and customer managed Policies from a paginated
+    GetAccountAuthorizationDetails sweep joined with the IAM Credential Report. Checks read from this instead of
+    calling per-User IAM APIs
+    """
+    response = cache.get("get_iam_inventory")
+    if response:
+        return response
+
+    iam = get_pooled_client(session, "iam")
+
+    authDetails = {
+        "UserDetailList": [],
+        "GroupDetailList": [],
+        "RoleDetailList": [],
+        "Policies": []
+    }
+    for page in iam.get_paginator("get_account_authorization_details").paginate(Filter=AUTHORIZATION_DETAILS_FILTER):
+        for key in authDetails:
+            authDetails[key].extend(page.get(key, []))
+
+    credentialReport = get_credential_report(iam)
+
+    users = {}
+    for userDetail in authDetails["UserDetailList"]:
+        userName = userDetail["UserName"]
+        reportRow = credentialReport.get(userName) if credentialReport is not None else None
+        users[userName] = build_user_record(userDetail, reportRow)
+
+    # Access Key IDs are not part of the Credential Report, so ListAccessKeys is only called for Users which the
+    # report says have (or had) a key. Users missing from the report, or every User when the report is not
+    # available, fall back to the per-User IAM APIs - but still only once per User instead of once per Check
+    usersToEnrich = [
+        userName for userName, record in users.items() if record["CredentialReport"] is None or (
+            record["CredentialReport"].get("access_key_1_last_rotated") not in CREDENTIAL_REPORT_EMPTY_VALUES
+            or record["CredentialReport"].get("access_key_2_last_rotated") not in CREDENTIAL_REPORT_EMPTY_VALUES
+        )
+    ]
+
+    def _enrich_user(userName):
+        record = users[userName]
+        reportRow = record["CredentialReport"]
+        try:
+            accessKeys = iam.list_access_keys(UserName=userName)["AccessKeyMetadata"]
+        except ClientError as e:
+            logger.warning("Failed to list access keys for IAM User %s: %s", userName, e)
+            accessKeys = []
+
+        for key in accessKeys:
+            lastUsed = access_key_last_used_from_report(key, reportRow)
+            if lastUsed is None:
+                try:
+                    lastUsed = iam.get_access_key_last_used(AccessKeyId=key["AccessKeyId"])["AccessKeyLastUsed"]
+                except ClientError as e:
+                    logger.warning("Failed to get access key last used for IAM User %s: %s", userName, e)
+                    lastUsed = {}
+            record["AccessKeys"].append(
+                {
+                    "Metadata": key,
+                    "LastUsed": lastUsed
+                }
+            )
+
+        if record["MfaActive"] is None:
+            try:
+                record["MfaActive"] = bool(iam.list_mfa_devices(UserName=userName)["MFADevices"])
+            except ClientError as e:
+                logger.warning("Failed to list MFA devices for IAM User %s: %s", userName, e)
+
+    fan_out(_enrich_user, usersToEnrich)
+
+    cache["get_iam_inventory"] = {
+        "Users": users,
+        "Groups": {group["GroupName"]: group for group in authDetails["GroupDetailList"]},
+        "Roles": {role["RoleName"]: role for role in authDetails["RoleDetailList"]},
+        "Policies": {policy["Arn"]: policy for policy in authDetails["Policies"]},
+        "CredentialReportAvailable": credentialReport is not None
+    }
+    return cache["get_iam_inventory"]
+
+def get_credential_report(iam) -> dict | None:
+    """
+    Generates (if required) and downloads the IAM Credential Report and returns it indexed by User name, the
+    `<root_account>` row is kept as-is. Returns None if the report cannot be generated so callers can fall back
+    """
+    try:
+        for _ in range(CREDENTIAL_REPORT_MAX_POLLS):
+            if iam.generate_credential_report()["State"] == "COMPLETE":
+                break
+            sleep(CREDENTIAL_REPORT_POLL_SECONDS)
+        content = iam.get_credential_report()["Content"]
+    except ClientError as e:
+        logger.warning(
+            "IAM Credential Report is not available, falling back to per-User IAM APIs: %s", e
+        )
+        return None
+
+    return parse_credential_report(content)
+
+def parse_credential_report(content: bytes | str) -> dict:
+    """
+    Parses the CSV content of an IAM Credential Report into a dictionary of rows keyed by the `user` column
+    """
+    if isinstance(content, bytes):
+        content = content.decode("utf-8")
+
+    return {row["user"]: row for row in csv.DictReader(io.StringIO(content))}
+
+def parse_credential_report_timestamp(value: str | None) -> datetime.datetime | None:
+    """
+    Converts a Credential Report timestamp cell to a timezone-aware datetime, or None for N/A style values
+    """
+    if value is None or value in CREDENTIAL_REPORT_EMPTY_VALUES:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+def build_user_record(userDetail: dict, reportRow: dict | None) -> dict:
+    """
+    Creates the per-User inventory record. `User` mirrors the ListUsers schema so Checks keep emitting the same
+    Asset details, the remaining keys hold what used to be fetched with one IAM API call per User per Check
+    """
+    user = {
+        key: userDetail[key] for key in ["Path", "UserName", "UserId", "Arn", "CreateDate", "PermissionsBoundary", "Tags"] if key in userDetail
+    }
+    passwordEnabled = None
+    mfaActive = None
+    if reportRow is not None:
+        passwordLastUsed = parse_credential_report_timestamp(reportRow.get("password_last_used"))
+        if passwordLastUsed:
+            user["PasswordLastUsed"] = passwordLastUsed
+        passwordEnabled = reportRow.get("password_enabled") == "true"
+        mfaActive = reportRow.get("mfa_active") == "true"
+
+    return {
+        "User": user,
+        "PasswordEnabled": passwordEnabled,
+        "MfaActive": mfaActive,
+        "InlinePolicies": {
+            policy["PolicyName"]: policy["PolicyDocument"] for policy in userDetail.get("UserPolicyList", [])
+        },
+        "AttachedManagedPolicies": userDetail.get("AttachedManagedPolicies", []),
+        "GroupList": userDetail.get("GroupList", []),
+        "AccessKeys": [],
+        "CredentialReport": reportRow
+    }
+
+def access_key_last_used_from_report(accessKey: dict, reportRow: dict | None) -> dict:
+    """
+    Matches an Access Key to its Credential Report slot by creation time and returns a dictionary shaped like the
+    GetAccessKeyLastUsed `AccessKeyLastUsed` response. `LastUsedDate` is omitted when the key was never used, None
+    is returned when the key cannot be matched to the report
+    """
+    if reportRow is None:
+        return None
+
+    keyCreateDate = accessKey["CreateDate"]
+    if keyCreateDate.tzinfo is None:
+        keyCreateDate = keyCreateDate.replace(tzinfo=datetime.timezone.utc)
+
+    for slot in ["access_key_1", "access_key_2"]:
+        lastRotated = parse_credential_report_timestamp(reportRow.get(f"{slot}_last_rotated"))
+        if lastRotated is None:
+            continue
+        # the report is only accurate to the second
+        if abs((lastRotated - keyCreateDate).total_seconds()) < 1:
+            lastUsed = {
+                "ServiceName": reportRow.get(f"{slot}_last_used_service"),
+                "Region": reportRow.get(f"{slot}_last_used_region")
+            }
+            lastUsedDate = parse_credential_report_timestamp(reportRow.get(f"{slot}_last_used_date"))
+            if lastUsedDate:
+                lastUsed["LastUsedDate"] = lastUsedDate
+            return lastUsed
+
+    return None
+
+def get_policy_default_document(policy: dict) -> dict | None:
+    """
+    Returns the default version's document for a managed Policy from GetAccountAuthorizationDetails
+    """
+    for version in policy.get("PolicyVersionList", []):
+        if version.get("IsDefaultVersion"):
+            return version["Document"]
+
+    return None
+
+# EOF
@@ -0,0 +1,109 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import json
+import logging
+from threading import Lock
+from botocore.exceptions import ClientError
+from collectors.collector_base import fan_out, get_pooled_client, get_session_store
+
+logger = logging.getLogger("AwsKmsCollector")
+
+_keyInventoryLock = Lock()
+
+def get_kms_key_inventory(session) -> dict:
+    """
+    Returns a record for every KMS key in the Session's Region keyed by Key ID and cached for the lifetime of the
+    Session. Each record holds the ListKeys entry, DescribeKey `KeyMetadata`, rotation status, the Aliases that
+    target the key and the parsed default Key Policy. Anything that cannot be read (usually because the Key Policy
+    does not grant it) is None and the error code is kept in `Errors`
+    """
+    store = get_session_store(session)
+    with _keyInventoryLock:
+        keyInventory = store.get("kms_key_inventory")
+    if keyInventory is not None:
+        return keyInventory
+
+    kms = get_pooled_client(session, "kms")
+
+    keys = []
+    for page in kms.get_paginator("list_keys").paginate():
+        keys.extend(page["Keys"])
+
+    # one paginated ListAliases sweep covers every key, instead of one call per key
+    aliases = {}
+    try:
+        for page in kms.get_paginator("list_aliases").paginate():
+            for alias in page["Aliases"]:
+                if alias.get("TargetKeyId"):
+                    aliases.setdefault(alias["TargetKeyId"], []).append(alias)
+    except ClientError as e:
+        logger.warning("Failed to list KMS aliases: %s", e)
+
+    def _get_kms_key_record(key):
+        return get_kms_key_record(kms, key, aliases.get(key["KeyId"], []))
+
+    keyInventory = {
+        key["KeyId"]: record for key, record in zip(keys, fan_out(_get_kms_key_record, keys))
+    }
+
+    with _keyInventoryLock:
+        store["kms_key_inventory"] = keyInventory
+
+    return keyInventory
+
+def get_kms_key_record(kms, key: dict, aliases: list) -> dict:
+    """
+    Collects the metadata, rotation status and default Key Policy of a single KMS key. Rotation status is only
+    requested for keys that support automatic rotation, it is None for every other key
+    """
+    keyId = key["KeyId"]
+    record = {
+        "Key": key,
+        "KeyMetadata": None,
+        "KeyRotationEnabled": None,
+        "Aliases": aliases,
+        "Policy": None,
+        "Errors": {}
+    }
+
+    try:
+        record["KeyMetadata"] = kms.describe_key(KeyId=keyId)["KeyMetadata"]
+    except ClientError as e:
+        record["Errors"]["KeyMetadata"] = e.response["Error"]["Code"]
+
+    if record["KeyMetadata"] is not None and record["KeyMetadata"].get("KeyUsage") != "SIGN_VERIFY":
+        try:
+            record["KeyRotationEnabled"] = kms.get_key_rotation_status(KeyId=keyId)["KeyRotationEnabled"]
+        except ClientError as e:
+            record["Errors"]["KeyRotationEnabled"] = e.response["Error"]["Code"]
+
+    try:
+        record["Policy"] = json.loads(kms.get_key_policy(KeyId=keyId, PolicyName="default")["Policy"])
+    except ClientError as e:
+        record["Errors"]["Policy"] = e.response["Error"]["Code"]
+    except json.JSONDecodeError as e:
+        logger.warning("Failed to parse the Key Policy of KMS key %s: %s", keyId, e)
+        record["Errors"]["Policy"] = "InvalidPolicyDocument"
+
+    return record
+
+# EOF
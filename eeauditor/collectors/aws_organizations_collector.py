@@ -0,0 +1,137 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import logging
+from threading import Lock
+from time import monotonic
+from botocore.exceptions import ClientError
+from collectors.collector_base import fan_out, get_pooled_client
+
+logger = logging.getLogger("AwsOrganizationsCollector")
+
+# How long a discovered Account inventory is reused by a long-lived process (e.g. a warm Lambda) before the OU tree
+# is walked again
+ORGANIZATION_ACCOUNTS_TTL_SECONDS = 900
+
+# Discovered inventories keyed by the Organization ID and the (sorted) parent IDs they were discovered from, None for the
+# entire Organization. The Organization ID keeps a process that switches credentials from being served another
+# Organization's Accounts
+_organizationAccounts = {}
+_organizationAccountsLock = Lock()
+
+def get_organization_accounts(session, parentIds: list[str] | None = None, ttlSeconds: int = ORGANIZATION_ACCOUNTS_TTL_SECONDS) -> dict:
+    """
+    Returns every ACTIVE AWS Account below `parentIds` (OU or Root IDs), or within the entire Organization when no parents
+    are given, indexed by Account ID. The OU tree is walked one level at a time with paginated APIs, sibling OUs are
+    listed concurrently, and nested OUs are included. Every record has `Id`, `Name`, `Email`, `Status`, `ParentId`,
+    `OrganizationalUnitPath` (e.g. `/Root/Workloads/Prod`) and `Tags`
+    """
+    org = get_pooled_client(session, "organizations")
+
+    organizationId = org.describe_organization()["Organization"]["Id"]
+    cacheKey = (organizationId, tuple(sorted(parentIds)) if parentIds else None)
+    with _organizationAccountsLock:
+        cached = _organizationAccounts.get(cacheKey)
+    if cached is not None and cached[0] > monotonic():
+        return cached[1]
+
+    rootNames = {
+        root["Id"]: root["Name"] for page in org.get_paginator("list_roots").paginate() for root in page["Roots"]
+    }
+    if parentIds:
+        parents = list(zip(parentIds, fan_out(lambda parentId: get_parent_path(org, parentId, rootNames), parentIds)))
+    else:
+        parents = [(rootId, f"/{rootName}") for rootId, rootName in rootNames.items()]
+
+    accounts = {}
+    while parents:
+        childOus = []
+        for parentAccounts, parentChildOus in fan_out(lambda parent: list_parent_children(org, *parent), parents):
+            for account in parentAccounts:
+                # an OU and one of its descendants may both be targeted, the first (shallowest) path is kept
+                accounts.setdefault(account["Id"], account)
+            childOus.extend(parentChildOus)
+        parents = childOus
+
+    for record, tags in zip(accounts.values(), fan_out(lambda accountId: list_account_tags(org, accountId), accounts)):
+        record["Tags"] = tags
+
+    with _organizationAccountsLock:
+        _organizationAccounts[cacheKey] = (monotonic() + ttlSeconds, accounts)
+
+    return accounts
+
+def get_parent_path(org, parentId: str, rootNames: dict) -> str:
+    """
+    Returns the OU path of a Root or OU, such as `/Root/Workloads/Prod`, by walking up the tree with ListParents
+    """
+    names = []
+    currentId = parentId
+    while currentId not in rootNames:
+        names.insert(0, org.describe_organizational_unit(OrganizationalUnitId=currentId)["OrganizationalUnit"]["Name"])
+        currentId = org.list_parents(ChildId=currentId)["Parents"][0]["Id"]
+    names.insert(0, rootNames[currentId])
+
+    return "/" + "/".join(names)
+
+def list_parent_children(org, parentId: str, parentPath: str) -> tuple[list, list]:
+    """
+    Returns the ACTIVE Accounts directly below a Root or OU as inventory records, and its child OUs as (ID, path) pairs
+    """
+    accounts = []
+    for page in org.get_paginator("list_accounts_for_parent").paginate(ParentId=parentId):
+        for account in page["Accounts"]:
+            if account["Status"] != "ACTIVE":
+                continue
+            accounts.append(
+                {
+                    "Id": account["Id"],
+                    "Name": account.get("Name"),
+                    "Email": account.get("Email"),
+                    "Status": account["Status"],
+                    "ParentId": parentId,
+                    "OrganizationalUnitPath": parentPath,
+                    "Tags": {}
+                }
+            )
+
+    childOus = []
+    for page in org.get_paginator("list_organizational_units_for_parent").paginate(ParentId=parentId):
+        for ou in page["OrganizationalUnits"]:
+            childOus.append((ou["Id"], f"{parentPath}/{ou['Name']}"))
+
+    return accounts, childOus
+
+def list_account_tags(org, accountId: str) -> dict:
+    """
+    Returns the tags of an Account as a dictionary, tags are optional metadata so failing to read them is not fatal
+    """
+    tags = {}
+    try:
+        for page in org.get_paginator("list_tags_for_resource").paginate(ResourceId=accountId):
+            for tag in page["Tags"]:
+                tags[tag["Key"]] = tag["Value"]
+    except ClientError as e:
+        logger.warning("Failed to list tags for AWS Account %s: %s", accountId, e)
+
+    return tags
+
+# EOF
@@ -0,0 +1,132 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import logging
+from threading import Lock
+from botocore.exceptions import ClientError
+from collectors.collector_base import fan_out, get_pooled_client, get_session_store
+
+logger = logging.getLogger("AwsS3Collector")
+
+# Bucket sub-resources that can be collected, mapped to the S3 client method and the key of the response to keep.
+# A key of None keeps the entire response (minus ResponseMetadata)
+S3_BUCKET_COMPONENTS = {
+    "Encryption": ("get_bucket_encryption", "ServerSideEncryptionConfiguration"),
+    "Lifecycle": ("get_bucket_lifecycle_configuration", "Rules"),
+    "Versioning": ("get_bucket_versioning", None),
+    "Policy": ("get_bucket_policy", "Policy"),
+    "PolicyStatus": ("get_bucket_policy_status", "PolicyStatus"),
+    "Logging": ("get_bucket_logging", None),
+    "PublicAccessBlock": ("get_public_access_block", "PublicAccessBlockConfiguration")
+}
+
+_bucketRecordsLock = Lock()
+
+def get_bucket_configurations(session, buckets: list, components: list | None = None) -> dict:
+    """
+    Collects the configuration records for a list of buckets (as returned by ListBuckets) concurrently and returns
+    them keyed by bucket name, see `get_bucket_configuration` for the record schema
+    """
+    def _get_bucket_configuration(bucket):
+        return get_bucket_configuration(session, bucket["Name"], bucket.get("BucketRegion"), components)
+
+    return {
+        bucket["Name"]: record for bucket, record in zip(buckets, fan_out(_get_bucket_configuration, buckets))
+    }
+
+def get_bucket_configuration(session, bucketName: str, bucketRegion: str | None = None, components: list | None = None) -> dict | None:
+    """
+    Returns a configuration record for a single bucket which is cached for the lifetime of the Session and shared
+    by every Auditor. The bucket's Region is resolved once and every sub-resource is fetched from a client in that
+    Region. Sub-resources that are not configured (or cannot be read) are None and the error code is kept in
+    `Errors`. Returns None if the bucket cannot be reached with the Session's credentials at all
+    """
+    if components is None:
+        components = list(S3_BUCKET_COMPONENTS)
+
+    store = get_session_store(session)
+    with _bucketRecordsLock:
+        bucketRecords = store.setdefault("s3_bucket_configurations", {})
+        inaccessibleBuckets = store.setdefault("s3_inaccessible_buckets", set())
+        if bucketName in inaccessibleBuckets:
+            return None
+        record = bucketRecords.get(bucketName)
+
+    if record is None:
+        if bucketRegion is None:
+            bucketRegion = resolve_bucket_region(session, bucketName)
+            if bucketRegion is None:
+                with _bucketRecordsLock:
+                    inaccessibleBuckets.add(bucketName)
+                return None
+        record = {
+            "Name": bucketName,
+            "Region": bucketRegion,
+            "Errors": {}
+        }
+
+    s3 = get_pooled_client(session, "s3", record["Region"])
+    for component in components:
+        if component in record:
+            continue
+        method, responseKey = S3_BUCKET_COMPONENTS[component]
+        try:
+            response = getattr(s3, method)(Bucket=bucketName)
+            response.pop("ResponseMetadata", None)
+            record[component] = response.get(responseKey) if responseKey else response
+        except ClientError as e:
+            record[component] = None
+            record["Errors"][component] = e.response["Error"]["Code"]
+
+    with _bucketRecordsLock:
+        bucketRecords[bucketName] = record
+
+    return record
+
+def resolve_bucket_region(session, bucketName: str) -> str | None:
+    """
+    Uses HeadBucket to find the Region of a bucket, falling back to GetBucketLocation. Returns None if the bucket
+    does not exist or is not accessible
+    """
+    s3 = get_pooled_client(session, "s3")
+    try:
+        response = s3.head_bucket(Bucket=bucketName)
+    except ClientError as e:
+        logger.info("S3 Bucket %s is not accessible: %s", bucketName, e)
+        return None
+
+    if response.get("BucketRegion"):
+        return response["BucketRegion"]
+
+    try:
+        locationConstraint = s3.get_bucket_location(Bucket=bucketName)["LocationConstraint"]
+    except ClientError as e:
+        logger.info("Failed to get the location of S3 Bucket %s: %s", bucketName, e)
+        return session.region_name
+    # buckets in us-east-1 have no location constraint, and "EU" is a legacy value for eu-west-1
+    if not locationConstraint:
+        return "us-east-1"
+    if locationConstraint == "EU":
+        return "eu-west-1"
+
+    return locationConstraint
+
+# EOF
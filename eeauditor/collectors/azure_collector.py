@@ -0,0 +1,101 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import logging
+from threading import Lock
+import requests
+from requests.adapters import HTTPAdapter
+from collectors.collector_base import DEFAULT_MAX_WORKERS, fan_out, get_session_store
+
+logger = logging.getLogger("AzureCollector")
+
+# How many Subscriptions EEAuditor assesses at the same time, every Subscription also fans out on its own
+AZURE_MAX_CONCURRENT_SUBSCRIPTIONS = 4
+
+_azureClientsLock = Lock()
+
+def get_shared_http_session(azureCredential) -> requests.Session:
+    """
+    Returns the HTTP session (and its connection pool) that every management client created for a credential uses
+    """
+    store = get_session_store(azureCredential)
+    with _azureClientsLock:
+        httpSession = store.get("azure_http_session")
+        if httpSession is None:
+            httpSession = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=DEFAULT_MAX_WORKERS,
+                pool_maxsize=DEFAULT_MAX_WORKERS * AZURE_MAX_CONCURRENT_SUBSCRIPTIONS
+            )
+            httpSession.mount("https://", adapter)
+            store["azure_http_session"] = httpSession
+
+    return httpSession
+
+def get_azure_management_client(clientClass, azureCredential, azSubId: str):
+    """
+    Returns an Azure management SDK client for a Subscription which is created once per run instead of once per Check.
+    Every client is given a transport over the same HTTP session, which the client does not own, so connections
+    are pooled across services and Subscriptions. Management clients are safe to share between threads
+    """
+    # imported here to keep this module importable without the Azure SDK, e.g. for the other Collectors' tests
+    from azure.core.pipeline.transport import RequestsTransport
+
+    store = get_session_store(azureCredential)
+    key = (clientClass, azSubId)
+    with _azureClientsLock:
+        clients = store.setdefault("azure_management_clients", {})
+        client = clients.get(key)
+    if client is not None:
+        return client
+
+    transport = RequestsTransport(session=get_shared_http_session(azureCredential), session_owner=False)
+    client = clientClass(azureCredential, azSubId, transport=transport)
+
+    with _azureClientsLock:
+        # another thread may have won the race, keep the first client
+        client = clients.setdefault(key, client)
+
+    return client
+
+def fan_out_azure_resources(func, resources: list, description: str) -> dict:
+    """
+    Calls `func` for every resource concurrently and returns the results keyed by resource ID. Per-resource errors
+    (usually missing permissions or a resource deleted mid-run) are logged and stored as None
+    """
+    def _call(resource):
+        try:
+            return func(resource)
+        except Exception as e:
+            logger.warning("Failed to get %s for %s: %s", description, resource.id, e)
+            return None
+
+    return {
+        str(resource.id): result for resource, result in zip(resources, fan_out(_call, resources))
+    }
+
+def get_resource_group_name(resourceId: str) -> str:
+    """
+    Returns the Resource Group name from an ARM resource ID
+    """
+    return str(resourceId).split("/")[4]
+
+# EOF
@@ -0,0 +1,133 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import logging
+from threading import Lock
+from collectors.collector_base import get_session_store
+
+logger = logging.getLogger("AzureResourceGraphCollector")
+
+# Resource Graph accepts up to 1000 Subscriptions per query and returns at most 1000 rows per page
+RESOURCE_GRAPH_MAX_SUBSCRIPTIONS = 1000
+RESOURCE_GRAPH_PAGE_SIZE = 1000
+
+_resourceGraphLock = Lock()
+
+def enable_resource_graph(azureCredential, azureSubscriptions: list[str], queryFunc=None) -> None:
+    """
+    Turns on the Resource Graph backend for a credential. Inventory is then collected with one paginated KQL query
+    per resource type across all `azureSubscriptions` and served to every Subscription's Checks from the cache.
+    `queryFunc` replaces the Resource Graph SDK call, which is how recorded responses are replayed in tests
+    """
+    store = get_session_store(azureCredential)
+    with _resourceGraphLock:
+        store["azure_resource_graph"] = {
+            "Subscriptions": list(azureSubscriptions),
+            "QueryFunc": queryFunc or query_resource_graph,
+            "Results": {}
+        }
+
+def is_resource_graph_enabled(azureCredential) -> bool:
+    """
+    Returns True if `enable_resource_graph` was called for this credential
+    """
+    return "azure_resource_graph" in get_session_store(azureCredential)
+
+def query_resource_graph(azureCredential, subscriptions: list[str], query: str, skipToken: str | None) -> tuple[list[dict], str | None]:
+    """
+    Runs one page of a Resource Graph query with the Azure SDK and returns the rows along with the skip token of
+    the next page. The SDK is imported here as it is only needed when the backend is turned on
+    """
+    from azure.mgmt.resourcegraph import ResourceGraphClient
+    from azure.mgmt.resourcegraph.models import QueryRequest, QueryRequestOptions
+
+    store = get_session_store(azureCredential)
+    with _resourceGraphLock:
+        client = store.get("azure_resource_graph_client")
+        if client is None:
+            client = ResourceGraphClient(azureCredential)
+            store["azure_resource_graph_client"] = client
+
+    response = client.resources(
+        QueryRequest(
+            subscriptions=subscriptions,
+            query=query,
+            options=QueryRequestOptions(
+                skip_token=skipToken,
+                top=RESOURCE_GRAPH_PAGE_SIZE,
+                result_format="objectArray"
+            )
+        )
+    )
+
+    return response.data, response.skip_token
+
+def run_resource_graph_query(azureCredential, query: str) -> list[dict]:
+    """
+    Runs a KQL query across every enabled Subscription, following skip tokens, and caches the rows for the run
+    """
+    store = get_session_store(azureCredential)
+    backend = store["azure_resource_graph"]
+    with _resourceGraphLock:
+        rows = backend["Results"].get(query)
+    if rows is not None:
+        return rows
+
+    rows = []
+    subscriptions = backend["Subscriptions"]
+    for i in range(0, len(subscriptions), RESOURCE_GRAPH_MAX_SUBSCRIPTIONS):
+        subscriptionChunk = subscriptions[i:i + RESOURCE_GRAPH_MAX_SUBSCRIPTIONS]
+        skipToken = None
+        while True:
+            page, skipToken = backend["QueryFunc"](azureCredential, subscriptionChunk, query, skipToken)
+            rows.extend(page)
+            if not skipToken:
+                break
+
+    logger.info("Azure Resource Graph returned %s rows for query: %s", len(rows), query)
+
+    with _resourceGraphLock:
+        backend["Results"][query] = rows
+
+    return rows
+
+def get_resources_by_type(azureCredential, azSubId: str, resourceType: str, model=None) -> list:
+    """
+    Returns the ARM representation of every resource of a type in a Subscription from a single cross-Subscription
+    Resource Graph query. Rows are deserialized into `model` (an Azure SDK model class) when given so that Checks
+    receive the same objects as they would from the management SDK list operation
+    """
+    query = (
+        f"Resources | where type =~ '{resourceType}' "
+        "| project id, name, type, kind, location, resourceGroup, subscriptionId, managedBy, sku, plan, "
+        "properties, tags, identity, zones, extendedLocation "
+        "| order by id asc"
+    )
+
+    resources = [
+        row for row in run_resource_graph_query(azureCredential, query) if str(row.get("subscriptionId")).lower() == azSubId.lower()
+    ]
+    if model is None:
+        return resources
+
+    return [model.deserialize(resource) for resource in resources]
+
+# EOF
@@ -0,0 +1,116 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from weakref import WeakKeyDictionary
+import boto3
+from botocore.config import Config
+
+logger = logging.getLogger("CollectorBase")
+
+# Upper bound on worker threads used by a single Collector fan-out, this is kept low enough to stay
+# under most per-account API rate limits while still overlapping network latency
+DEFAULT_MAX_WORKERS = 16
+
+# Clients created by Collectors use adaptive retry mode, which adds client-side rate limiting on top of
+# exponential backoff when the service starts throttling, the connection pool is sized to the fan-out
+ADAPTIVE_RETRY_CONFIG = Config(
+    retries={
+        "max_attempts": 10,
+        "mode": "adaptive"
+    },
+    max_pool_connections=DEFAULT_MAX_WORKERS * 2
+)
+
+# Session-scoped stores are weakly keyed so that they are released along with the Boto3 Session (or any
+# other per-target credential object) once EEAuditor moves on to the next Account & Region
+_sessionStores = WeakKeyDictionary()
+_sessionStoresLock = Lock()
+
+def get_session_store(session) -> dict:
+    """
+    Returns a dictionary scoped to a single Session that is shared by every Auditor that is executed with it.
+    The per-Auditor `cache` is reset for every service, this store is used for inventory that multiple Auditors read
+    """
+    with _sessionStoresLock:
+        store = _sessionStores.get(session)
+        if store is None:
+            store = {}
+            _sessionStores[session] = store
+
+    return store
+
+def get_pooled_client(session, serviceName: str, regionName: str | None = None):
+    """
+    Returns a Boto3 client for a service (and optionally a Region other than the Session's) that is created once
+    per Session with the adaptive retry configuration. Boto3 clients are thread-safe, Sessions are not, so clients
+    should be created here before they are handed to worker threads
+    """
+    store = get_session_store(session)
+    clients = store.setdefault("pooled_clients", {})
+    key = (serviceName, regionName)
+
+    with _sessionStoresLock:
+        client = clients.get(key)
+        if client is None:
+            if regionName:
+                client = session.client(serviceName, region_name=regionName, config=ADAPTIVE_RETRY_CONFIG)
+            else:
+                client = session.client(serviceName, config=ADAPTIVE_RETRY_CONFIG)
+            clients[key] = client
+
+    return client
+
+def clone_session(session):
+    """
+    Returns a new Boto3 Session with the same credentials and Region which shares no state with `session`. Sessions
+    created from STS AssumeRole credentials are cloned with those credentials, anything else resolves the default
+    credential chain again exactly as EEAuditor did for the original
+    """
+    credentials = session.get_credentials()
+    if credentials is not None and credentials.method == "explicit":
+        frozenCredentials = credentials.get_frozen_credentials()
+        return boto3.Session(
+            aws_access_key_id=frozenCredentials.access_key,
+            aws_secret_access_key=frozenCredentials.secret_key,
+            aws_session_token=frozenCredentials.token,
+            region_name=session.region_name
+        )
+
+    return boto3.Session(region_name=session.region_name)
+
+def fan_out(func, items, maxWorkers: int = DEFAULT_MAX_WORKERS) -> list:
+    """
+    Calls `func` for every item on a bounded thread pool and returns the results in the same order as `items`.
+    `func` is responsible for handling its own per-item errors, any uncaught exception is re-raised to the caller
+    """
+    items = list(items)
+    if not items:
+        return []
+    # avoid the thread pool overhead when there is nothing to overlap
+    if len(items) == 1 or maxWorkers <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(maxWorkers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+# EOF
@@ -0,0 +1,122 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import logging
+from threading import Lock, get_ident
+from collectors.collector_base import fan_out, get_session_store
+
+logger = logging.getLogger("GcpCollector")
+
+_gcpStoreLock = Lock()
+
+def build_discovery_client(apiName: str, apiVersion: str, gcpCredentials):
+    """
+    Builds a Google API discovery client, google-api-python-client is imported here so that the pagination and
+    caching helpers in this module do not require it
+    """
+    import googleapiclient.discovery
+
+    # discovery documents are bundled with google-api-python-client, skip fetching them over the network
+    return googleapiclient.discovery.build(
+        apiName, apiVersion, credentials=gcpCredentials, cache_discovery=False, static_discovery=True
+    )
+
+def get_discovery_client(apiName: str, apiVersion: str, gcpCredentials):
+    """
+    Returns a Google API discovery client which is built once per API, version and credentials instead of once per
+    Check. The underlying httplib2 transport is not thread-safe so clients are additionally kept per thread
+    """
+    store = get_session_store(gcpCredentials)
+    key = (apiName, apiVersion, get_ident())
+
+    with _gcpStoreLock:
+        clients = store.setdefault("gcp_discovery_clients", {})
+        client = clients.get(key)
+    if client is None:
+        client = build_discovery_client(apiName, apiVersion, gcpCredentials)
+        with _gcpStoreLock:
+            clients[key] = client
+
+    return client
+
+def execute_all_pages(collection, methodName: str, **kwargs):
+    """
+    Executes a list-style method and yields every page of the response, following `nextPageToken` with the
+    matching `<method>_next` helper that the discovery client generates
+    """
+    request = getattr(collection, methodName)(**kwargs)
+    nextMethod = getattr(collection, f"{methodName}_next", None)
+    while request is not None:
+        response = request.execute()
+        yield response
+        if nextMethod is None:
+            break
+        request = nextMethod(previous_request=request, previous_response=response)
+
+def get_compute_engine_instances(gcpProjectId: str, gcpCredentials) -> list:
+    """
+    Returns every Compute Engine instance in a Project from a fully paginated AggregatedList, cached per Project
+    for as long as the credentials are in use so that every GCE Check (and the Attack Surface Auditor) share it
+    """
+    store = get_session_store(gcpCredentials)
+    with _gcpStoreLock:
+        projectInstances = store.setdefault("gce_instances", {})
+        instances = projectInstances.get(gcpProjectId)
+    if instances is not None:
+        return instances
+
+    compute = get_discovery_client("compute", "v1", gcpCredentials)
+
+    instances = []
+    for page in execute_all_pages(compute.instances(), "aggregatedList", project=gcpProjectId):
+        # Zones without instances only carry a "warning" key
+        for zone in page.get("items", {}).values():
+            instances.extend(zone.get("instances", []))
+
+    with _gcpStoreLock:
+        projectInstances[gcpProjectId] = instances
+
+    return instances
+
+# Project-level inventory that can be collected ahead of time, keyed by the service name Auditors register Checks with
+GCP_PROJECT_COLLECTORS = {
+    "gce": get_compute_engine_instances
+}
+
+def prefetch_gcp_projects(gcpProjectIds: list, gcpCredentials, serviceNames) -> None:
+    """
+    Collects project-level inventory for every registered service across all Projects concurrently, so that
+    multi-Project scans scale with the number of Projects and not with Projects multiplied by Checks. Failures are
+    logged and left for the Checks to surface when they collect the same inventory themselves
+    """
+    collectors = [GCP_PROJECT_COLLECTORS[serviceName] for serviceName in serviceNames if serviceName in GCP_PROJECT_COLLECTORS]
+    work = [(collector, projectId) for projectId in gcpProjectIds for collector in collectors]
+
+    def _prefetch(item):
+        collector, projectId = item
+        try:
+            collector(projectId, gcpCredentials)
+        except Exception as e:
+            logger.warning("Failed to prefetch %s for GCP Project %s: %s", collector.__name__, projectId, e)
+
+    fan_out(_prefetch, work)
+
+# EOF
@@ -0,0 +1,163 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import logging
+from time import sleep
+import requests
+from requests.adapters import HTTPAdapter
+from collectors.collector_base import DEFAULT_MAX_WORKERS, fan_out
+
+logger = logging.getLogger("M365GraphCollector")
+
+GRAPH_API_ROOT = "https://graph.microsoft.com/v1.0"
+# JSON batching accepts at most 20 sub-requests per $batch call
+GRAPH_BATCH_MAX_REQUESTS = 20
+# Throttled (429) and transiently unavailable responses are retried, honoring Retry-After when Graph sends it
+GRAPH_RETRYABLE_STATUS_CODES = [429, 503, 504]
+GRAPH_MAX_RETRIES = 5
+GRAPH_MAX_BACKOFF_SECONDS = 60
+GRAPH_REQUEST_TIMEOUT_SECONDS = 60
+
+class GraphClient(object):
+    """
+    Microsoft Graph client for the M365 Auditors. Requests share one pooled HTTP session, list endpoints are paged
+    through `@odata.nextLink` and per-object lookups are sent as concurrent JSON `$batch` requests
+    """
+
+    def __init__(self, token: str, apiRoot: str = GRAPH_API_ROOT, maxWorkers: int = DEFAULT_MAX_WORKERS):
+        self.apiRoot = apiRoot.rstrip("/")
+        self.maxWorkers = maxWorkers
+        self.session = requests.Session()
+        self.session.headers.update({"Authorization": f"Bearer {token}"})
+        self.session.mount("https://", HTTPAdapter(pool_connections=maxWorkers, pool_maxsize=maxWorkers))
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a request, relative URLs are resolved against the API root. Retryable responses are retried after
+        the Retry-After interval (or an exponential backoff) and the last response is returned either way
+        """
+        if not url.startswith("https://"):
+            url = f"{self.apiRoot}{url}"
+
+        for attempt in range(GRAPH_MAX_RETRIES + 1):
+            r = self.session.request(method, url, timeout=GRAPH_REQUEST_TIMEOUT_SECONDS, **kwargs)
+            if r.status_code not in GRAPH_RETRYABLE_STATUS_CODES or attempt == GRAPH_MAX_RETRIES:
+                return r
+            retryAfter = get_retry_after_seconds(r.headers, attempt)
+            logger.info("Microsoft Graph returned %s for %s, retrying in %s seconds", r.status_code, url, retryAfter)
+            sleep(retryAfter)
+
+    def get_all_pages(self, url: str) -> list:
+        """
+        Returns the `value` of every page of a list endpoint. Raises `requests.HTTPError` if any page fails
+        """
+        items = []
+        while url:
+            r = self.request("GET", url)
+            r.raise_for_status()
+            page = r.json()
+            items.extend(page.get("value", []))
+            url = page.get("@odata.nextLink")
+
+        return items
+
+    def batch_get(self, urls: list[str]) -> list[dict]:
+        """
+        Sends GET requests for relative URLs as `$batch` requests of up to 20 sub-requests, with the batches sent
+        concurrently. Returns the sub-responses (`status`, `headers` and `body`) in the same order as `urls`
+        """
+        chunks = [urls[i:i + GRAPH_BATCH_MAX_REQUESTS] for i in range(0, len(urls), GRAPH_BATCH_MAX_REQUESTS)]
+
+        return [response for chunk in fan_out(self._send_batch, chunks, self.maxWorkers) for response in chunk]
+
+    def _send_batch(self, urls: list[str]) -> list[dict]:
+        """
+        Sends a single `$batch` request and re-sends the sub-requests that were throttled
+        """
+        responses = [None] * len(urls)
+        pending = list(range(len(urls)))
+        # status reported for sub-requests which never got a response of their own
+        failedStatus = 500
+
+        for attempt in range(GRAPH_MAX_RETRIES + 1):
+            payload = {
+                "requests": [
+                    {
+                        "id": str(i),
+                        "method": "GET",
+                        "url": urls[i]
+                    } for i in pending
+                ]
+            }
+            r = self.request("POST", "/$batch", json=payload)
+            if r.status_code != 200:
+                logger.warning("Microsoft Graph $batch request failed with %s: %s", r.status_code, r.reason)
+                failedStatus = r.status_code
+                break
+
+            throttled = []
+            retryAfter = 0
+            for subResponse in r.json().get("responses", []):
+                i = int(subResponse["id"])
+                if subResponse.get("status") in GRAPH_RETRYABLE_STATUS_CODES and attempt < GRAPH_MAX_RETRIES:
+                    throttled.append(i)
+                    retryAfter = max(retryAfter, get_retry_after_seconds(subResponse.get("headers", {}), attempt))
+                else:
+                    responses[i] = subResponse
+
+            pending = throttled
+            if not pending:
+                break
+            sleep(retryAfter)
+
+        # anything left over failed as a whole, report it the same way as a failed sub-request
+        return [
+            response if response is not None else {"status": failedStatus, "headers": {}, "body": {}}
+            for response in responses
+        ]
+
+def get_retry_after_seconds(headers, attempt: int) -> int:
+    """
+    Reads the Retry-After header (in seconds) from a response or a `$batch` sub-response, falling back to an
+    exponential backoff when Graph does not send one
+    """
+    retryAfter = None
+    for key, value in dict(headers or {}).items():
+        if key.lower() == "retry-after":
+            retryAfter = value
+            break
+    try:
+        return min(int(retryAfter), GRAPH_MAX_BACKOFF_SECONDS)
+    except (TypeError, ValueError):
+        return min(2 ** attempt, GRAPH_MAX_BACKOFF_SECONDS)
+
+def index_by_key(items: list[dict], key: str) -> dict[str, list[dict]]:
+    """
+    Groups a list of Graph objects by the value of one of their keys, so they can be joined to other objects in
+    constant time instead of being searched for every object
+    """
+    index = {}
+    for item in items:
+        index.setdefault(item.get(key), []).append(item)
+
+    return index
+
+# EOF
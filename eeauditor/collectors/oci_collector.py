@@ -0,0 +1,264 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import json
+import logging
+import os
+from threading import Lock, get_ident
+from collectors.collector_base import DEFAULT_MAX_WORKERS, fan_out
+
+logger = logging.getLogger("OciCollector")
+
+# How many Compartments are listed at the same time, OCI throttles per tenancy so this stays at the Collector default
+OCI_MAX_CONCURRENT_COMPARTMENTS = DEFAULT_MAX_WORKERS
+
+# OCI has no credential object to scope a store to, configs and clients are keyed by the values that build them
+_ociConfigs = {}
+_ociClients = {}
+_ociInventory = {}
+_ociLock = Lock()
+
+# Per Vulnerability Scanning resource type: the `impacted_resources_count` key that must be non-zero for a CVE to
+# matter and the API that lists the resources the CVE impacts
+VSS_IMPACTED_RESOURCE_APIS = {
+    "host": ("host_count", "list_vulnerability_impacted_hosts"),
+    "image": ("image_count", "list_vulnerability_impacted_containers")
+}
+
+def process_response(responseObject):
+    """
+    Receives an OCI Python SDK `Response` type (differs by service) and returns a JSON object
+    """
+
+    payload = json.loads(
+        str(
+            responseObject
+        )
+    )
+
+    return payload
+
+def get_oci_config(ociTenancyId: str, ociUserId: str, ociRegionName: str, ociUserApiKeyFingerprint: str) -> dict:
+    """
+    Returns the OCI SDK config for a Tenancy, User and Region, it is built and validated once per run instead of once
+    per Collector call
+    """
+    keyFile = os.environ["OCI_PEM_FILE_PATH"]
+    key = (ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint, keyFile)
+
+    with _ociLock:
+        config = _ociConfigs.get(key)
+    if config is not None:
+        return config
+
+    # imported here to keep this module importable without the OCI SDK, e.g. for the other Collectors' tests
+    from oci.config import validate_config
+
+    config = {
+        "tenancy": ociTenancyId,
+        "user": ociUserId,
+        "region": ociRegionName,
+        "fingerprint": ociUserApiKeyFingerprint,
+        "key_file": keyFile
+    }
+    validate_config(config)
+
+    with _ociLock:
+        config = _ociConfigs.setdefault(key, config)
+
+    return config
+
+def get_oci_client(clientClass, ociTenancyId: str, ociUserId: str, ociRegionName: str, ociUserApiKeyFingerprint: str):
+    """
+    Returns an OCI SDK service client (e.g. `oci.core.ComputeClient`) which is created once per service instead of once
+    per Collector call. OCI clients wrap a requests Session and are not safe to share, so they are kept per thread,
+    and they use the SDK's default retry strategy to back off when concurrent Compartment sweeps are throttled
+    """
+    config = get_oci_config(ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+    key = (clientClass, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint, get_ident())
+
+    with _ociLock:
+        client = _ociClients.get(key)
+    if client is None:
+        import oci
+
+        client = clientClass(config, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+        with _ociLock:
+            _ociClients[key] = client
+
+    return client
+
+def list_all(listMethod, *args, **kwargs) -> list:
+    """
+    Calls an OCI `list_*` client method for every page and returns the combined `data` as a list of SDK models, for
+    responses that are collections (e.g. `DeploymentCollection`) the `items` of every page are combined instead
+    """
+    import oci
+
+    return oci.pagination.list_call_get_all_results(listMethod, *args, **kwargs).data
+
+def sweep_compartments(func, ociCompartments: list, maxWorkers: int = OCI_MAX_CONCURRENT_COMPARTMENTS) -> list:
+    """
+    Calls `func(compartmentId)` for every Compartment concurrently and combines the lists it returns into one list in
+    Compartment order. A Compartment that fails (e.g. missing policy or deleted mid-run) is logged and skipped so that
+    it does not hide the resources in the other Compartments
+    """
+    def _sweep(compartmentId):
+        try:
+            return func(compartmentId)
+        except Exception as e:
+            logger.warning("Failed to list resources in OCI Compartment %s: %s", compartmentId, e)
+            return []
+
+    results = []
+    for compartmentResults in fan_out(_sweep, ociCompartments, maxWorkers):
+        results.extend(compartmentResults)
+
+    return results
+
+def get_compute_instance_vnics(ociTenancyId: str, ociUserId: str, ociRegionName: str, ociCompartments: list, ociUserApiKeyFingerprint: str) -> dict:
+    """
+    Returns the primary VNIC (as a dictionary, including the public IP and NSG IDs) of every Cloud Compute instance indexed
+    by instance OCID. VNIC attachments are listed once per Compartment and every distinct VNIC is fetched once, this
+    index is shared by the Compute and Attack Surface Auditors instead of calling ListVnicAttachments and GetVnic per
+    instance per Check
+    """
+    import oci
+
+    key = ("compute_instance_vnics", ociTenancyId, ociUserId, ociRegionName, tuple(ociCompartments))
+    with _ociLock:
+        instanceVnics = _ociInventory.get(key)
+    if instanceVnics is not None:
+        return instanceVnics
+
+    def _list_compartment_vnic_attachments(compartment):
+        instanceClient = get_oci_client(oci.core.ComputeClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        return [
+            process_response(attachment) for attachment in list_all(
+                instanceClient.list_vnic_attachments, compartment_id=compartment
+            ) if attachment.lifecycle_state == "ATTACHED"
+        ]
+
+    def _get_vnic(vnicId):
+        vncClient = get_oci_client(oci.core.VirtualNetworkClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        try:
+            return process_response(vncClient.get_vnic(vnic_id=vnicId).data)
+        except oci.exceptions.ServiceError as e:
+            logger.warning("Failed to get OCI VNIC %s: %s", vnicId, e)
+            return None
+
+    instanceVnics = index_instance_vnics(
+        sweep_compartments(_list_compartment_vnic_attachments, ociCompartments), _get_vnic
+    )
+
+    with _ociLock:
+        instanceVnics = _ociInventory.setdefault(key, instanceVnics)
+
+    return instanceVnics
+
+def index_instance_vnics(attachments: list, get_vnic) -> dict:
+    """
+    Fetches every distinct VNIC of `attachments` concurrently with `get_vnic(vnicId)` and returns the primary VNIC of
+    each instance by instance OCID. Instances whose VNICs could not be fetched (`get_vnic` returned None) are left out
+    """
+    vnicIds = list(dict.fromkeys(attachment["vnic_id"] for attachment in attachments))
+    vnics = dict(zip(vnicIds, fan_out(get_vnic, vnicIds)))
+
+    instanceVnics = {}
+    for attachment in attachments:
+        vnic = vnics.get(attachment["vnic_id"])
+        if vnic is None:
+            continue
+        instanceId = attachment["instance_id"]
+        # secondary VNICs never replace the primary one, otherwise the first attached VNIC is used
+        if instanceId not in instanceVnics or (vnic["is_primary"] and not instanceVnics[instanceId]["is_primary"]):
+            instanceVnics[instanceId] = vnic
+
+    return instanceVnics
+
+def get_exploitable_vulnerability_impacts(ociTenancyId: str, ociUserId: str, ociRegionName: str, ociCompartments: list, ociUserApiKeyFingerprint: str, kevCves: set, resourceType: str) -> list:
+    """
+    Returns a list of `CompartmentId`, `Cve` and `ImpactedResource` dictionaries, one per resource of `resourceType` ("host"
+    or "image") that is impacted by an open CVE in the CISA KEV catalog. Vulnerabilities are listed per Compartment with
+    pagination and the impacted resources of every matching CVE are listed concurrently
+    """
+    import oci
+
+    countKey, impactedMethodName = VSS_IMPACTED_RESOURCE_APIS[resourceType]
+    key = ("exploitable_vulnerability_impacts", resourceType, ociTenancyId, ociUserId, ociRegionName, tuple(ociCompartments))
+    with _ociLock:
+        impacts = _ociInventory.get(key)
+    if impacts is not None:
+        return impacts
+
+    def _list_compartment_exploitable_vulns(compartment):
+        vssClient = get_oci_client(oci.vulnerability_scanning.VulnerabilityScanningClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        # ensure the "state" is OPEN and that the "vulnerability_reference" is actually a CVE ID, though we filter
+        # for it within the API, then that the vuln impacts this resource type and finally that it is in the KEV
+        return [
+            (compartment, vuln) for vuln in (
+                process_response(vuln) for vuln in list_all(
+                    vssClient.list_vulnerabilities, compartment_id=compartment, vulnerability_type="CVE"
+                )
+            ) if vuln["state"] == "OPEN"
+            and vuln["vulnerability_reference"].startswith("CVE-")
+            and vuln["impacted_resources_count"][countKey] > 0
+            and vuln["vulnerability_reference"] in kevCves
+        ]
+
+    def _list_impacted_resources(compartmentVuln):
+        compartment, vuln = compartmentVuln
+        vssClient = get_oci_client(oci.vulnerability_scanning.VulnerabilityScanningClient, ociTenancyId, ociUserId, ociRegionName, ociUserApiKeyFingerprint)
+        try:
+            impactedResources = list_all(getattr(vssClient, impactedMethodName), vulnerability_id=vuln["id"])
+        except oci.exceptions.ServiceError as e:
+            logger.warning("Failed to list resources impacted by OCI vulnerability %s: %s", vuln["id"], e)
+            return []
+
+        return [
+            {
+                "CompartmentId": compartment,
+                "Cve": vuln["vulnerability_reference"],
+                "ImpactedResource": process_response(resource)
+            } for resource in impactedResources
+        ]
+
+    exploitableVulns = sweep_compartments(_list_compartment_exploitable_vulns, ociCompartments)
+    impacts = []
+    for resourceImpacts in fan_out(_list_impacted_resources, exploitableVulns):
+        impacts.extend(resourceImpacts)
+
+    with _ociLock:
+        impacts = _ociInventory.setdefault(key, impacts)
+
+    return impacts
+
+def get_exploitable_compute_instance_cves(ociTenancyId: str, ociUserId: str, ociRegionName: str, ociCompartments: list, ociUserApiKeyFingerprint: str, kevCves: set) -> dict:
+    """
+    Returns the set of exploitable CVE IDs that impact each Cloud Compute instance, indexed by instance OCID
+    """
+    instanceCves = {}
+    for impact in get_exploitable_vulnerability_impacts(ociTenancyId, ociUserId, ociRegionName, ociCompartments, ociUserApiKeyFingerprint, kevCves, "host"):
+        instanceCves.setdefault(impact["ImpactedResource"]["instance_id"], set()).add(impact["Cve"])
+
+    return instanceCves
+
+# EOF
@@ -0,0 +1,96 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import logging
+from os import environ
+from threading import Lock
+
+logger = logging.getLogger("ServicenowCollector")
+
+# Only the fields the Auditors evaluate or write into the Asset are downloaded from sys_properties
+SYS_PROPERTY_FIELDS = [
+    "name",
+    "value",
+    "description",
+    "sys_id",
+    "sys_created_on",
+    "sys_created_by",
+    "sys_updated_on",
+    "sys_updated_by",
+    "sys_scope"
+]
+
+_referencedSysProperties = set()
+_sysPropertySnapshots = {}
+_sysPropertiesLock = Lock()
+
+def register_sys_properties(propertyNames: list[str]) -> None:
+    """
+    Records the System Properties an Auditor evaluates. Auditors call this when they are loaded, which happens
+    before any Check runs, so that the snapshot only downloads the properties that are actually referenced
+    """
+    with _sysPropertiesLock:
+        _referencedSysProperties.update(propertyNames)
+
+def get_sys_properties_resource(instanceName: str):
+    """
+    Returns the pysnow Resource for the sys_properties table, pysnow is imported here so that the snapshot logic in
+    this module does not require it
+    """
+    import pysnow
+
+    # Will need to create the pysnow.Client object everywhere - doesn't appear to be thread-safe
+    snow = pysnow.Client(
+        instance=instanceName,
+        user=environ["SNOW_SSPM_USERNAME"],
+        password=environ["SNOW_SSPM_PASSWORD"]
+    )
+
+    return snow.resource(api_path="/table/sys_properties")
+
+def get_sys_properties_snapshot() -> dict:
+    """
+    Returns the System Properties of the ServiceNow instance indexed by property name. The table is downloaded once
+    per run and shared by every ServiceNow Auditor, filtered server-side to the registered property names if any
+    """
+    instanceName = environ["SNOW_INSTANCE_NAME"]
+
+    with _sysPropertiesLock:
+        snapshot = _sysPropertySnapshots.get(instanceName)
+        if snapshot is not None:
+            return snapshot
+
+        sysPropResource = get_sys_properties_resource(instanceName)
+        if _referencedSysProperties:
+            query = f"nameIN{','.join(sorted(_referencedSysProperties))}"
+        else:
+            query = {}
+        sysProps = sysPropResource.get(query=query, fields=SYS_PROPERTY_FIELDS).all()
+
+        # There should not ever be a duplicate system property
+        snapshot = {sysprop["name"]: sysprop for sysprop in sysProps}
+        _sysPropertySnapshots[instanceName] = snapshot
+
+    logger.info("Retrieved %s ServiceNow System Properties", len(snapshot))
+
+    return snapshot
+
+# EOF
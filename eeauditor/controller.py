@@ -21,7 +21,10 @@
 import sys
 import click
 from .eeauditor import EEAuditor
-from .processor.main import get_providers, process_findings
+from .check_supervisor import AUDITOR_TIMEOUT_SECONDS, CHECK_TIMEOUT_SECONDS
+from .checkpoint_journal import CHECKPOINT_DIRECTORY
+from .replay_harness import get_replay_harness
+from .processor.main import FindingStore, get_providers, process_findings
 from os import environ
 
 def print_controls(assessmentTarget, args, useToml, auditorName=None, tomlPath=None):
@@ -38,41 +41,63 @@ def print_checks(assessmentTarget, args, useToml, auditorName=None, tomlPath=Non
         
     app.print_checks_md()
 
-def run_auditor(assessmentTarget, args, useToml, auditorName=None, pluginName=None, delay=0, outputs=None, outputFile="", tomlPath=None):
+def run_auditor(assessmentTarget, args, useToml, auditorName=None, pluginName=None, delay=0, outputs=None, outputFile="", tomlPath=None, checkTimeout=CHECK_TIMEOUT_SECONDS, auditorTimeout=AUDITOR_TIMEOUT_SECONDS, resumeRunId=None, checkpoint=False, checkpointDir=None, incremental=False, incrementalMaxAge=None, incrementalDir=None, recordFixtures=None, replayFixtures=None, replayLatency=0):
     if not outputs:
         outputs = ["stdout"]
     
-    app = EEAuditor(assessmentTarget, args, useToml, tomlPath)
+    # Capture every SDK and HTTP response of the scan into a fixture bundle, or serve them from one with no network.
+    # Outputs are written after the harness exits so they always reach their real destination
+    with get_replay_harness(recordFixtures, replayFixtures, replayLatency):
+        app = EEAuditor(assessmentTarget, args, useToml, tomlPath, checkTimeout=checkTimeout, auditorTimeout=auditorTimeout)
 
-    app.load_plugins(auditorName)
-    # Per-target calls - ensure you use the right run_*_checks*() function
+        app.load_plugins(auditorName)
+
+        # Optionally journal completed Auditors so an interrupted run can be picked back up with --resume
+        if checkpoint or checkpointDir or resumeRunId:
+            runId = app.checkpoints.open(assessmentTarget, resumeRunId, directory=checkpointDir or CHECKPOINT_DIRECTORY)
+            if runId:
+                print(f"Running Checks for {assessmentTarget} as run {runId}, use --resume {runId} to continue it if it is interrupted")
+        # Per-target calls - ensure you use the right run_*_checks*() function. Findings are held in a FindingStore,
+        # which keeps one copy of every asset no matter how many Checks reported on it
     
-    # Amazon Web Services
-    if assessmentTarget == "AWS":
-        findings = list(app.run_aws_checks(pluginName=pluginName, delay=delay))
-    # Google Cloud Platform
-    if assessmentTarget == "GCP":
-        findings = list(app.run_gcp_checks(pluginName=pluginName, delay=delay))
-    # Oracle Cloud Infrastructure
-    if assessmentTarget == "OCI":
-        findings = list(app.run_oci_checks(pluginName=pluginName, delay=delay))
-    # Microsoft Azure
-    if assessmentTarget == "Azure":
-        findings = list(app.run_azure_checks(pluginName=pluginName, delay=delay))
-    # Microsoft 365
-    if assessmentTarget == "M365":
-        findings = list(app.run_m365_checks(pluginName=pluginName, delay=delay))
-    # Salesforce
-    if assessmentTarget == "Salesforce":
-        findings = list(app.run_salesforce_checks(pluginName=pluginName, delay=delay))
-    # Snowflake
-    if assessmentTarget == "Snowflake":
-        findings = list(app.run_snowflake_checks(pluginName=pluginName, delay=delay))
-    # ServiceNow
-    if assessmentTarget == "ServiceNow":
-        findings = list(app.run_non_aws_checks(pluginName=pluginName, delay=delay))
-
-    print(f"Done running Checks for {assessmentTarget}")
+        # Amazon Web Services
+        if assessmentTarget == "AWS":
+            findings = FindingStore(
+                app.run_aws_checks(
+                    pluginName=pluginName,
+                    delay=delay,
+                    incremental=incremental or bool(incrementalDir),
+                    incrementalMaxAge=incrementalMaxAge,
+                    incrementalDir=incrementalDir
+                )
+            )
+        # Google Cloud Platform
+        if assessmentTarget == "GCP":
+            findings = FindingStore(app.run_gcp_checks(pluginName=pluginName, delay=delay))
+        # Oracle Cloud Infrastructure
+        if assessmentTarget == "OCI":
+            findings = FindingStore(app.run_oci_checks(pluginName=pluginName, delay=delay))
+        # Microsoft Azure
+        if assessmentTarget == "Azure":
+            findings = FindingStore(app.run_azure_checks(pluginName=pluginName, delay=delay))
+        # Microsoft 365
+        if assessmentTarget == "M365":
+            findings = FindingStore(app.run_m365_checks(pluginName=pluginName, delay=delay))
+        # Salesforce
+        if assessmentTarget == "Salesforce":
+            findings = FindingStore(app.run_salesforce_checks(pluginName=pluginName, delay=delay))
+        # Snowflake
+        if assessmentTarget == "Snowflake":
+            findings = FindingStore(app.run_snowflake_checks(pluginName=pluginName, delay=delay))
+        # ServiceNow
+        if assessmentTarget == "ServiceNow":
+            findings = FindingStore(app.run_non_aws_checks(pluginName=pluginName, delay=delay))
+
+        print(f"Done running Checks for {assessmentTarget}")
+
+        if app.supervisor.timeouts:
+            timedOutChecks = sorted(set(timeout["CheckName"] for timeout in app.supervisor.timeouts))
+            print(f"{len(app.supervisor.timeouts)} Check executions did not complete within their time budget: {timedOutChecks}")
 
     if tomlPath is None:
         environ["TOML_FILE_PATH"] = "None"
@@ -85,6 +110,8 @@ def run_auditor(assessmentTarget, args, useToml, auditorName=None, pluginName=No
         outputs=outputs,
         output_file=outputFile
     )
+    # the journal is only needed until the findings reach the Outputs
+    app.checkpoints.discard()
 
 @click.command()
 # Assessment Target
@@ -127,6 +154,82 @@ def run_auditor(assessmentTarget, args, useToml, auditorName=None, pluginName=No
     default=0, 
     help="Time in seconds to sleep between Auditors being ran, defaults to 0. Use this argument to avoid rate limiting"
 )
+# Check Timeout
+@click.option(
+    "-ct",
+    "--check-timeout",
+    default=CHECK_TIMEOUT_SECONDS,
+    show_default=True,
+    help="Wall-clock budget in seconds for a single Check against a single target, Checks that run longer are abandoned and reported with a WARNING finding. Set to 0 to disable"
+)
+# Auditor Timeout
+@click.option(
+    "-at",
+    "--auditor-timeout",
+    default=AUDITOR_TIMEOUT_SECONDS,
+    show_default=True,
+    help="Wall-clock budget in seconds for all Checks of a single Auditor against a single target, remaining Checks are skipped once it is spent. Set to 0 to disable"
+)
+# Resume
+@click.option(
+    "--resume",
+    "resume_run_id",
+    default=None,
+    help="The run ID of an interrupted run to continue, Auditors that already completed are skipped and their findings are replayed from the checkpoint journal in --checkpoint-dir. Implies --checkpoint"
+)
+# Checkpoint
+@click.option(
+    "--checkpoint",
+    is_flag=True,
+    help="Journal every completed Auditor and its findings so that an interrupted run can be continued with --resume. The journal holds every finding, including asset details, and is deleted once the findings reach the Outputs"
+)
+# Checkpoint Directory
+@click.option(
+    "--checkpoint-dir",
+    default=None,
+    envvar="ELECTRICEYE_CHECKPOINT_DIR",
+    help="Directory the checkpoint journals are written to, defaults to ElectricEye/eeauditor/checkpoints/. Use a writable location such as /tmp when the package directory is read-only. Can also be set with the ELECTRICEYE_CHECKPOINT_DIR environment variable, either implies --checkpoint"
+)
+# Incremental
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="AWS only: use AWS Config to detect the resource types that changed since the previous run of each Account & Region, Auditors whose resources did not change have their findings carried forward instead of being executed. Requires an AWS Config recorder in each Region"
+)
+# Incremental Max Age
+@click.option(
+    "--incremental-max-age",
+    default=None,
+    type=int,
+    help="The maximum age in seconds of findings carried forward by --incremental before the Auditor is executed again regardless of changes, defaults to 604800 (7 days)"
+)
+# Incremental Directory
+@click.option(
+    "--incremental-dir",
+    default=None,
+    envvar="ELECTRICEYE_INCREMENTAL_DIR",
+    help="Directory the --incremental state of each Account & Region is written to, defaults to ElectricEye/eeauditor/incremental/. Use a writable location such as /tmp when the package directory is read-only. Can also be set with the ELECTRICEYE_INCREMENTAL_DIR environment variable, either implies --incremental"
+)
+# Record Fixtures
+@click.option(
+    "--record-fixtures",
+    default=None,
+    help="Path of a JSON fixture bundle to record every SDK and HTTP response of the scan into. Secrets returned by AWS Secrets Manager, SSM Parameter Store and STS, API keys and other credentials in HTTP query strings and tokens in JSON or form encoded HTTP responses are redacted, review a bundle before sharing it as other responses are stored as-is"
+)
+# Replay Fixtures
+@click.option(
+    "--replay-fixtures",
+    default=None,
+    help="Path of a JSON fixture bundle recorded with --record-fixtures to serve every SDK and HTTP response from instead of the network, calls that were not recorded fail with a ReplayFixtureMissing error"
+)
+# Replay Latency
+@click.option(
+    "--replay-latency",
+    default=0,
+    type=float,
+    show_default=True,
+    help="Synthetic latency in milliseconds added to every call served by --replay-fixtures"
+)
 # Outputs
 @click.option(
     "-o",
@@ -198,6 +301,17 @@ def main(
     auditor_name,
     check_name,
     delay,
+    check_timeout,
+    auditor_timeout,
+    resume_run_id,
+    checkpoint,
+    checkpoint_dir,
+    incremental,
+    incremental_max_age,
+    incremental_dir,
+    record_fixtures,
+    replay_fixtures,
+    replay_latency,
     outputs,
     output_file,
     list_options,
@@ -207,6 +321,10 @@ def main(
     use_toml,
     args
 ):
+    if record_fixtures and replay_fixtures:
+        print("--record-fixtures and --replay-fixtures cannot be used together")
+        sys.exit(2)
+
     if list_controls:
         print_controls(
             assessmentTarget=target_provider,
@@ -242,7 +360,18 @@ def main(
         outputs=outputs,
         outputFile=output_file,
         tomlPath=toml_path,
-        useToml=use_toml
+        useToml=use_toml,
+        checkTimeout=check_timeout,
+        auditorTimeout=auditor_timeout,
+        resumeRunId=resume_run_id,
+        checkpoint=checkpoint,
+        checkpointDir=checkpoint_dir,
+        incremental=incremental,
+        incrementalMaxAge=incremental_max_age,
+        incrementalDir=incremental_dir,
+        recordFixtures=record_fixtures,
+        replayFixtures=replay_fixtures,
+        replayLatency=replay_latency
     )
 
 if __name__ == "__main__":
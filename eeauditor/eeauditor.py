@@ -23,9 +23,11 @@ from os import path
 from functools import partial
 from inspect import getfile
 from time import sleep
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
-from requests import get
 from .check_register import CheckRegister
+from .checkpoint_journal import CheckpointJournal
+from .check_supervisor import AUDITOR_TIMEOUT_SECONDS, CHECK_TIMEOUT_SECONDS, CheckSupervisor, UnitOutcome
 from .cloud_utils import CloudConfig
 from pluginbase import PluginBase
 
@@ -41,10 +43,14 @@ class EEAuditor(object):
     credentials and cross-boundary configurations, and runs Checks and yields results back to controller.py CLI
     """
 
-    def __init__(self, assessmentTarget, args, useToml, tomlPath=None, searchPath=None):
+    def __init__(self, assessmentTarget, args, useToml, tomlPath=None, searchPath=None, checkTimeout=CHECK_TIMEOUT_SECONDS, auditorTimeout=AUDITOR_TIMEOUT_SECONDS):
         # each check must be decorated with the @registry.register_check("cache_name") to be discovered during plugin loading.
         self.registry = CheckRegister()
         self.name = assessmentTarget
+        # every Check is executed under per-Check and per-Auditor wall-clock budgets
+        self.supervisor = CheckSupervisor(checkTimeout, auditorTimeout)
+        # completed Auditors are only journaled once controller.py opens the journal for a run
+        self.checkpoints = CheckpointJournal()
         self.plugin_base = PluginBase(package="electriceye")
         ##################################
         # PUBLIC CLOUD SERVICE PROVIDERS #
@@ -55,6 +61,7 @@ class EEAuditor(object):
             utils = CloudConfig(assessmentTarget, tomlPath, useToml, args)
             # parse specific values for Assessment Target - these should match 1:1 with CloudConfig
             self.awsAccountTargets = utils.awsAccountTargets
+            self.awsAccountMetadata = utils.awsAccountMetadata
             self.awsRegionsSelection = utils.awsRegionsSelection
             self.electricEyeRoleName = utils.electricEyeRoleName
         # GCP
@@ -81,6 +88,7 @@ class EEAuditor(object):
             # parse specific values for Assessment Target - these should match 1:1 with CloudConfig
             self.azureSubscriptions = utils.azureSubscriptions
             self.azureCredentials = utils.azureCredentials
+            self.azureUseResourceGraph = utils.azureUseResourceGraph
         # Alibaba
         if assessmentTarget == "Alibaba":
             searchPath = "./auditors/alibabacloud"
@@ -223,11 +231,13 @@ class EEAuditor(object):
         return serviceAvailable
     
     # Called from eeauditor/controller.py run_auditor()
-    def run_aws_checks(self, pluginName=None, delay=0):
+    def run_aws_checks(self, pluginName=None, delay=0, incremental=False, incrementalMaxAge=None, incrementalDir=None):
         """
-        Runs AWS Auditors across all TOML-specified Accounts and Regions in a specific Partition
+        Runs AWS Auditors across all TOML-specified Accounts and Regions in a specific Partition. With `incremental`
+        only the Auditors whose resources changed since the previous run, according to AWS Config, are executed
         """
         import boto3
+        from requests import get
 
         # "Global" Auditors that should only need to be ran once per Account
         globalAuditors = ["cloudfront", "globalaccelerator", "iam", "health", "support", "account", "s3"]
@@ -266,6 +276,18 @@ class EEAuditor(object):
                         account, region
                     )
 
+                # ask AWS Config which resource types changed since the previous run of this Account & Region
+                incrementalScan = None
+                if incremental:
+                    from incremental_scan import INCREMENTAL_MAX_AGE_SECONDS, INCREMENTAL_STATE_DIRECTORY, IncrementalScan
+                    incrementalScan = IncrementalScan(
+                        account,
+                        region,
+                        incrementalMaxAge or INCREMENTAL_MAX_AGE_SECONDS,
+                        directory=incrementalDir or INCREMENTAL_STATE_DIRECTORY
+                    )
+                    incrementalScan.detect_changes(session)
+
                 for serviceName, checkList in self.registry.checks.items():
                     # Pass the Cache at the "serviceName" level aka Plugin
                     auditorCache = {}
@@ -310,6 +332,21 @@ class EEAuditor(object):
                             )
                             continue
 
+                    # skip Auditors which completed before a resumed run was interrupted and replay their findings
+                    unit = ("AWS", account, region, serviceName)
+                    if self.checkpoints.is_completed(unit):
+                        yield from self.checkpoints.replay(unit)
+                        continue
+                    # carry forward the previous findings of Auditors whose resources did not change
+                    selectedChecks = [checkName for checkName in checkList if not pluginName or pluginName == checkName]
+                    if incrementalScan is not None and incrementalScan.is_unchanged(serviceName, selectedChecks):
+                        unitFindings = incrementalScan.carry_forward(serviceName)
+                        yield from unitFindings
+                        self.checkpoints.complete(unit, unitFindings)
+                        continue
+                    unitFindings = []
+                    unitOutcome = UnitOutcome()
+                    auditorDeadline = self.supervisor.start_auditor()
                     for checkName, check in checkList.items():
                         # if a specific check is requested, only run that one check
                         if (
@@ -323,7 +360,13 @@ class EEAuditor(object):
                                     checkName, account, region
                                 )
 
-                                for finding in check(
+                                for finding in self.supervisor.run_check(
+                                    check,
+                                    checkName,
+                                    auditorDeadline,
+                                    "AWS",
+                                    account,
+                                    outcome=unitOutcome,
                                     cache=auditorCache,
                                     session=session,
                                     awsAccountId=account,
@@ -331,12 +374,24 @@ class EEAuditor(object):
                                     awsPartition=partition
                                 ):
                                     if finding is not None:
+                                        unitFindings.append(finding)
                                         yield finding
                             except Exception as e:
                                 logger.warning(
                                     "Failed to execute check %s with exception: %s",
                                     checkName, e
                                 )
+                    # Auditors with a Check that raised or ran out of time are run again when the run is resumed
+                    if unitOutcome.completed:
+                        self.checkpoints.complete(unit, unitFindings)
+                        # findings of a failed Check are incomplete and are never carried forward
+                        if incrementalScan is not None:
+                            incrementalScan.record(serviceName, selectedChecks, unitFindings)
+                    else:
+                        self.checkpoints.incomplete(unit)
+
+                if incrementalScan is not None:
+                    incrementalScan.save()
                         
             # optional sleep if specified - defaults to 0 seconds
             sleep(delay)
@@ -351,10 +406,24 @@ class EEAuditor(object):
         account = "000000000000"
         partition = "not-aws"
 
+        # collect shared Project inventory for every Project concurrently before the Checks read it, this is imported
+        # here so that the Google API client libraries are only required for GCP assessments
+        if len(self.gcpProjectIds) > 1:
+            from collectors.gcp_collector import prefetch_gcp_projects
+            prefetch_gcp_projects(self.gcpProjectIds, self.gcpCredentials, self.registry.checks.keys())
+
         for project in self.gcpProjectIds:
             for serviceName, checkList in self.registry.checks.items():
                 # Pass the Cache at the "serviceName" level aka Plugin
                 auditorCache = {}
+                # skip Auditors which completed before a resumed run was interrupted and replay their findings
+                unit = ("GCP", project, serviceName)
+                if self.checkpoints.is_completed(unit):
+                    yield from self.checkpoints.replay(unit)
+                    continue
+                unitFindings = []
+                unitOutcome = UnitOutcome()
+                auditorDeadline = self.supervisor.start_auditor()
                 for checkName, check in checkList.items():
                     # if a specific check is requested, only run that one check
                     if (
@@ -367,7 +436,13 @@ class EEAuditor(object):
                                 "Executing Check %s for GCP Project %s",
                                 checkName, project
                             )
-                            for finding in check(
+                            for finding in self.supervisor.run_check(
+                                check,
+                                checkName,
+                                auditorDeadline,
+                                "GCP",
+                                project,
+                                outcome=unitOutcome,
                                 cache=auditorCache,
                                 awsAccountId=account,
                                 awsRegion=region,
@@ -376,12 +451,18 @@ class EEAuditor(object):
                                 gcpCredentials=self.gcpCredentials
                             ):
                                 if finding is not None:
+                                    unitFindings.append(finding)
                                     yield finding
                         except Exception as e:
                             logger.warning(
                                 "Failed to execute check %s with exception: %s",
                                 checkName, e
                             )
+                # Auditors with a Check that raised or ran out of time are run again when the run is resumed
+                if unitOutcome.completed:
+                    self.checkpoints.complete(unit, unitFindings)
+                else:
+                    self.checkpoints.incomplete(unit)
                 # optional sleep if specified - defaults to 0 seconds
                 sleep(delay)
 
@@ -400,6 +481,14 @@ class EEAuditor(object):
         for serviceName, checkList in self.registry.checks.items():
             # Pass the Cache at the "serviceName" level aka Plugin
             auditorCache = {}
+            # skip Auditors which completed before a resumed run was interrupted and replay their findings
+            unit = ("OCI", self.ociTenancyId, serviceName)
+            if self.checkpoints.is_completed(unit):
+                yield from self.checkpoints.replay(unit)
+                continue
+            unitFindings = []
+            unitOutcome = UnitOutcome()
+            auditorDeadline = self.supervisor.start_auditor()
             for checkName, check in checkList.items():
                 # if a specific check is requested, only run that one check
                 if (
@@ -412,7 +501,13 @@ class EEAuditor(object):
                             "Executing Check %s for OCI",
                             checkName
                         )
-                        for finding in check(
+                        for finding in self.supervisor.run_check(
+                            check,
+                            checkName,
+                            auditorDeadline,
+                            "OCI",
+                            self.ociTenancyId,
+                            outcome=unitOutcome,
                             cache=auditorCache,
                             awsAccountId=account,
                             awsRegion=region,
@@ -424,12 +519,18 @@ class EEAuditor(object):
                             ociUserApiKeyFingerprint=self.ociUserApiKeyFingerprint
                         ):
                             if finding is not None:
+                                unitFindings.append(finding)
                                 yield finding
                     except Exception as e:
                         logger.warning(
                             "Failed to execute check %s with exception: %s",
                             checkName, e
                         )
+            # Auditors with a Check that raised or ran out of time are run again when the run is resumed
+            if unitOutcome.completed:
+                self.checkpoints.complete(unit, unitFindings)
+            else:
+                self.checkpoints.incomplete(unit)
             # optional sleep if specified - defaults to 0 seconds
             sleep(delay)
 
@@ -445,39 +546,91 @@ class EEAuditor(object):
 
         logger.info("Microsoft Azure assessment has started.")
 
-        for azSubId in self.azureSubscriptions:
-            for serviceName, checkList in self.registry.checks.items():
-                # Pass the Cache at the "serviceName" level aka Plugin
-                auditorCache = {}
-                for checkName, check in checkList.items():
-                    # if a specific check is requested, only run that one check
-                    if (
-                        not pluginName
-                        or pluginName
-                        and pluginName == checkName
-                    ):
-                        try:
-                            logger.info(
-                                "Executing Check %s for Azure Sub %s",
-                                checkName, azSubId
-                            )
-                            for finding in check(
-                                cache=auditorCache,
-                                awsAccountId=account,
-                                awsRegion=region,
-                                awsPartition=partition,
-                                azureCredential=self.azureCredentials,
-                                azSubId=azSubId
-                            ):
-                                if finding is not None:
-                                    yield finding
-                        except Exception as e:
-                            logger.warning(
-                                "Failed to execute check %s with exception: %s",
-                                checkName, e
-                            )
-            # optional sleep if specified - defaults to 0 seconds
-            sleep(delay)
+        # optionally serve inventory from cross-Subscription Azure Resource Graph queries
+        if self.azureUseResourceGraph:
+            from collectors.azure_resource_graph_collector import enable_resource_graph
+            enable_resource_graph(self.azureCredentials, self.azureSubscriptions)
+
+        # Subscriptions are assessed concurrently, findings are yielded as soon as a Subscription is finished
+        from collectors.azure_collector import AZURE_MAX_CONCURRENT_SUBSCRIPTIONS
+
+        with ThreadPoolExecutor(max_workers=AZURE_MAX_CONCURRENT_SUBSCRIPTIONS) as executor:
+            futures = [
+                executor.submit(
+                    self.run_azure_subscription_checks,
+                    azSubId,
+                    pluginName,
+                    delay,
+                    account=account,
+                    region=region,
+                    partition=partition
+                ) for azSubId in self.azureSubscriptions
+            ]
+            for future in as_completed(futures):
+                for finding in future.result():
+                    yield finding
+
+    # Called within this class
+    def run_azure_subscription_checks(self, azSubId, pluginName=None, delay=0, account="000000000000", region="us-placeholder-1", partition="not-aws"):
+        """
+        Runs every Azure Check against a single Subscription and returns the findings
+        """
+        findings = []
+
+        for serviceName, checkList in self.registry.checks.items():
+            # Pass the Cache at the "serviceName" level aka Plugin
+            auditorCache = {}
+            # skip Auditors which completed before a resumed run was interrupted and replay their findings
+            unit = ("Azure", azSubId, serviceName)
+            if self.checkpoints.is_completed(unit):
+                findings.extend(self.checkpoints.replay(unit))
+                continue
+            unitFindings = []
+            unitOutcome = UnitOutcome()
+            auditorDeadline = self.supervisor.start_auditor()
+            for checkName, check in checkList.items():
+                # if a specific check is requested, only run that one check
+                if (
+                    not pluginName
+                    or pluginName
+                    and pluginName == checkName
+                ):
+                    try:
+                        logger.info(
+                            "Executing Check %s for Azure Sub %s",
+                            checkName, azSubId
+                        )
+                        for finding in self.supervisor.run_check(
+                            check,
+                            checkName,
+                            auditorDeadline,
+                            "Azure",
+                            azSubId,
+                            outcome=unitOutcome,
+                            cache=auditorCache,
+                            awsAccountId=account,
+                            awsRegion=region,
+                            awsPartition=partition,
+                            azureCredential=self.azureCredentials,
+                            azSubId=azSubId
+                        ):
+                            if finding is not None:
+                                unitFindings.append(finding)
+                                findings.append(finding)
+                    except Exception as e:
+                        logger.warning(
+                            "Failed to execute check %s with exception: %s",
+                            checkName, e
+                        )
+            # Auditors with a Check that raised or ran out of time are run again when the run is resumed
+            if unitOutcome.completed:
+                self.checkpoints.complete(unit, unitFindings)
+            else:
+                self.checkpoints.incomplete(unit)
+        # optional sleep if specified - defaults to 0 seconds
+        sleep(delay)
+
+        return findings
 
     # Called from eeauditor/controller.py run_auditor()
     def run_m365_checks(self, pluginName=None, delay=0):
@@ -494,6 +647,14 @@ class EEAuditor(object):
         for serviceName, checkList in self.registry.checks.items():
             # Pass the Cache at the "serviceName" level aka Plugin
             auditorCache = {}
+            # skip Auditors which completed before a resumed run was interrupted and replay their findings
+            unit = ("M365", self.m365TenantId, serviceName)
+            if self.checkpoints.is_completed(unit):
+                yield from self.checkpoints.replay(unit)
+                continue
+            unitFindings = []
+            unitOutcome = UnitOutcome()
+            auditorDeadline = self.supervisor.start_auditor()
             for checkName, check in checkList.items():
                 # if a specific check is requested, only run that one check
                 if (
@@ -506,7 +667,13 @@ class EEAuditor(object):
                             "Executing Check %s for M365",
                             checkName
                         )
-                        for finding in check(
+                        for finding in self.supervisor.run_check(
+                            check,
+                            checkName,
+                            auditorDeadline,
+                            "M365",
+                            self.m365TenantId,
+                            outcome=unitOutcome,
                             cache=auditorCache,
                             awsAccountId=account,
                             awsRegion=region,
@@ -517,12 +684,18 @@ class EEAuditor(object):
                             tenantLocation=self.m365TenantLocation,
                         ):
                             if finding is not None:
+                                unitFindings.append(finding)
                                 yield finding
                     except Exception as e:
                         logger.warning(
                             "Failed to execute check %s with exception: %s",
                             checkName, e
                         )
+            # Auditors with a Check that raised or ran out of time are run again when the run is resumed
+            if unitOutcome.completed:
+                self.checkpoints.complete(unit, unitFindings)
+            else:
+                self.checkpoints.incomplete(unit)
             # optional sleep if specified - defaults to 0 seconds
             sleep(delay)
 
@@ -542,6 +715,14 @@ class EEAuditor(object):
         for serviceName, checkList in self.registry.checks.items():
             # Pass the Cache at the "serviceName" level aka Plugin
             auditorCache = {}
+            # skip Auditors which completed before a resumed run was interrupted and replay their findings
+            unit = ("Salesforce", self.salesforceInstanceLocation, serviceName)
+            if self.checkpoints.is_completed(unit):
+                yield from self.checkpoints.replay(unit)
+                continue
+            unitFindings = []
+            unitOutcome = UnitOutcome()
+            auditorDeadline = self.supervisor.start_auditor()
             for checkName, check in checkList.items():
                 # if a specific check is requested, only run that one check
                 if (
@@ -554,7 +735,13 @@ class EEAuditor(object):
                             "Executing Check %s for Salesforce",
                             checkName
                         )
-                        for finding in check(
+                        for finding in self.supervisor.run_check(
+                            check,
+                            checkName,
+                            auditorDeadline,
+                            "Salesforce",
+                            self.salesforceInstanceLocation,
+                            outcome=unitOutcome,
                             cache=auditorCache,
                             awsAccountId=account,
                             awsRegion=region,
@@ -567,12 +754,18 @@ class EEAuditor(object):
                             salesforceInstanceLocation = self.salesforceInstanceLocation
                         ):
                             if finding is not None:
+                                unitFindings.append(finding)
                                 yield finding
                     except Exception as e:
                         logger.warning(
                             "Failed to execute check %s with exception: %s",
                             checkName, e
                         )
+            # Auditors with a Check that raised or ran out of time are run again when the run is resumed
+            if unitOutcome.completed:
+                self.checkpoints.complete(unit, unitFindings)
+            else:
+                self.checkpoints.incomplete(unit)
             # optional sleep if specified - defaults to 0 seconds
             sleep(delay)
 
@@ -591,6 +784,14 @@ class EEAuditor(object):
         for serviceName, checkList in self.registry.checks.items():
             # Pass the Cache at the "serviceName" level aka Plugin
             auditorCache = {}
+            # skip Auditors which completed before a resumed run was interrupted and replay their findings
+            unit = ("Snowflake", self.snowflakeAccountId, serviceName)
+            if self.checkpoints.is_completed(unit):
+                yield from self.checkpoints.replay(unit)
+                continue
+            unitFindings = []
+            unitOutcome = UnitOutcome()
+            auditorDeadline = self.supervisor.start_auditor()
             for checkName, check in checkList.items():
                 # if a specific check is requested, only run that one check
                 if (
@@ -603,7 +804,13 @@ class EEAuditor(object):
                             "Executing Check %s for Snowflake",
                             checkName
                         )
-                        for finding in check(
+                        for finding in self.supervisor.run_check(
+                            check,
+                            checkName,
+                            auditorDeadline,
+                            "Snowflake",
+                            self.snowflakeAccountId,
+                            outcome=unitOutcome,
                             cache=auditorCache,
                             awsAccountId=account,
                             awsRegion=region,
@@ -614,12 +821,18 @@ class EEAuditor(object):
                             serviceAccountExemptions=self.serviceAccountExemptions
                         ):
                             if finding is not None:
+                                unitFindings.append(finding)
                                 yield finding
                     except Exception as e:
                         logger.warning(
                             "Failed to execute check %s with exception: %s",
                             checkName, e
                         )
+            # Auditors with a Check that raised or ran out of time are run again when the run is resumed
+            if unitOutcome.completed:
+                self.checkpoints.complete(unit, unitFindings)
+            else:
+                self.checkpoints.incomplete(unit)
             # optional sleep if specified - defaults to 0 seconds
             sleep(delay)
 
@@ -645,6 +858,14 @@ class EEAuditor(object):
         for serviceName, checkList in self.registry.checks.items():
             # Pass the Cache at the "serviceName" level aka Plugin
             auditorCache = {}
+            # skip Auditors which completed before a resumed run was interrupted and replay their findings
+            unit = (self.name, serviceName)
+            if self.checkpoints.is_completed(unit):
+                yield from self.checkpoints.replay(unit)
+                continue
+            unitFindings = []
+            unitOutcome = UnitOutcome()
+            auditorDeadline = self.supervisor.start_auditor()
             for checkName, check in checkList.items():
                 # if a specific check is requested, only run that one check
                 if (
@@ -657,19 +878,31 @@ class EEAuditor(object):
                             "Executing Check %s",
                             checkName
                         )
-                        for finding in check(
+                        for finding in self.supervisor.run_check(
+                            check,
+                            checkName,
+                            auditorDeadline,
+                            self.name,
+                            account,
+                            outcome=unitOutcome,
                             cache=auditorCache,
                             awsAccountId=account,
                             awsRegion=region,
                             awsPartition=partition
                         ):
                             if finding is not None:
+                                unitFindings.append(finding)
                                 yield finding
                     except Exception as e:
                         logger.warning(
                             "Failed to execute check %s with exception: %s",
                             checkName, e
                         )
+            # Auditors with a Check that raised or ran out of time are run again when the run is resumed
+            if unitOutcome.completed:
+                self.checkpoints.complete(unit, unitFindings)
+            else:
+                self.checkpoints.incomplete(unit)
             # optional sleep if specified - defaults to 0 seconds
             sleep(delay)
 
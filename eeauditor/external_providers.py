@@ -0,0 +1,357 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import logging
+import sys
+from os import environ, path
+from threading import Lock
+from time import monotonic
+from types import MappingProxyType
+import boto3
+from botocore.exceptions import ClientError
+from tomli import load as tomload
+
+logger = logging.getLogger("ExternalProviders")
+
+# These Constants define legitimate values for certain parameters within the external_providers.toml file
+CREDENTIALS_LOCATION_CHOICES = ["AWS_SSM", "AWS_SECRETS_MANAGER", "CONFIG_FILE"]
+# How long a secret retrieved from SSM Parameter Store or AWS Secrets Manager is reused before it is fetched again
+SECRET_TTL_SECONDS = 3600
+# Maximum amount of names accepted by a single SSM GetParameters and ASM BatchGetSecretValue call
+SSM_GET_PARAMETERS_BATCH_SIZE = 10
+ASM_BATCH_GET_SECRET_VALUE_BATCH_SIZE = 20
+# Error codes returned when the batch APIs are not allowed, GetParameters and BatchGetSecretValue are separate IAM
+# actions from the GetParameter and GetSecretValue permissions that older deployments were set up with
+ACCESS_DENIED_ERROR_CODES = ["AccessDeniedException", "AccessDenied"]
+
+# Snapshots are keyed by the absolute path of the TOML file, Resolvers by the credentials location
+_configSnapshots = {}
+_secretResolvers = {}
+# The TOML file CloudConfig was configured from, read by Auditors and Outputs that do not provide a path
+_activeTomlFile = None
+_externalProvidersLock = Lock()
+
+def get_toml_file_path(tomlPath: str | None = None) -> str:
+    """
+    Returns the absolute path of the external_providers.toml file. An explicit path wins, then the path the
+    controller exported as `TOML_FILE_PATH` (the string "None" means it was not provided), then the file activated
+    by CloudConfig and lastly the file shipped in /eeauditor/
+    """
+    if tomlPath is None:
+        tomlPath = environ.get("TOML_FILE_PATH", "None")
+    if tomlPath == "None" and _activeTomlFile is not None:
+        return _activeTomlFile
+    if tomlPath == "None":
+        here = path.abspath(path.dirname(__file__))
+        tomlPath = f"{here}/external_providers.toml"
+
+    return path.abspath(tomlPath)
+
+def freeze_config(value):
+    """
+    Recursively converts the parsed TOML into read-only mappings and tuples so that a single snapshot can be
+    handed to every Auditor and Output without any of them being able to change it for the others
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze_config(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze_config(item) for item in value)
+
+    return value
+
+def load_external_providers_config(tomlPath: str | None = None) -> MappingProxyType:
+    """
+    Returns the immutable snapshot of the external_providers.toml file, the file is only read and parsed the first
+    time it is requested for a given path
+    """
+    tomlFile = get_toml_file_path(tomlPath)
+
+    with _externalProvidersLock:
+        snapshot = _configSnapshots.get(tomlFile)
+        if snapshot is None:
+            with open(tomlFile, "rb") as f:
+                snapshot = freeze_config(tomload(f))
+            _configSnapshots[tomlFile] = snapshot
+
+    return snapshot
+
+def activate_external_providers_config(tomlPath: str | None = None) -> MappingProxyType:
+    """
+    Loads the snapshot of an external_providers.toml file and makes it the snapshot returned when no path is provided,
+    so that the Auditors reading [global] credentials during the scan use the same file as CloudConfig
+    """
+    global _activeTomlFile
+
+    snapshot = load_external_providers_config(tomlPath)
+    with _externalProvidersLock:
+        _activeTomlFile = get_toml_file_path(tomlPath)
+
+    return snapshot
+
+def get_credentials_location(config: MappingProxyType) -> str:
+    """
+    Returns [global.credentials_location] from a snapshot, exiting on invalid values like the rest of ElectricEye
+    """
+    credentialsLocation = config["global"]["credentials_location"]
+    if credentialsLocation not in CREDENTIALS_LOCATION_CHOICES:
+        logger.error(
+            "Invalid option for [global.credentials_location]. Must be one of %s.",
+            CREDENTIALS_LOCATION_CHOICES
+        )
+        sys.exit(2)
+
+    return credentialsLocation
+
+def is_access_denied(error: ClientError) -> bool:
+    """
+    Returns True when a ClientError was raised because the caller lacks the IAM permission for the API
+    """
+    return error.response.get("Error", {}).get("Code") in ACCESS_DENIED_ERROR_CODES
+
+class SecretResolver(object):
+    """
+    Resolves TOML "_value" entries into the credential they point to for a single credentials location. Secrets are
+    memoized for `SECRET_TTL_SECONDS` so that CloudConfig, every Auditor and every Output share one retrieval per run,
+    and multiple SSM Parameters or ASM Secrets are fetched with batch APIs
+    """
+
+    def __init__(self, credentialsLocation: str, ttlSeconds: int = SECRET_TTL_SECONDS):
+        if credentialsLocation not in CREDENTIALS_LOCATION_CHOICES:
+            logger.error(
+                "Invalid option for [global.credentials_location]. Must be one of %s.",
+                CREDENTIALS_LOCATION_CHOICES
+            )
+            sys.exit(2)
+        self.credentialsLocation = credentialsLocation
+        self.ttlSeconds = ttlSeconds
+        self._secrets = {}
+        self._clients = {}
+        # services whose batch API the caller is not allowed to use, those are only called one secret at a time
+        self._batchDenied = {}
+        self._lock = Lock()
+
+    def get_client(self, serviceName: str):
+        """
+        Returns a Boto3 client that is created once per Resolver
+        """
+        with self._lock:
+            client = self._clients.get(serviceName)
+            if client is None:
+                client = boto3.client(serviceName)
+                self._clients[serviceName] = client
+
+        return client
+
+    def get_cached_secret(self, value: str) -> str | None:
+        """
+        Returns a memoized secret, or None if it was never retrieved or has expired
+        """
+        with self._lock:
+            cached = self._secrets.get(value)
+        if cached is None or cached[0] <= monotonic():
+            return None
+
+        return cached[1]
+
+    def set_cached_secret(self, value: str, secret: str) -> None:
+        with self._lock:
+            self._secrets[value] = (monotonic() + self.ttlSeconds, secret)
+
+    def resolve(self, value: str, configurationName: str) -> str:
+        """
+        Returns the credential for a single TOML value
+        """
+        return self.resolve_many({configurationName: value})[configurationName]
+
+    def resolve_many(self, values: dict) -> dict:
+        """
+        Returns the credentials for a dictionary of {configurationName: value}, keyed by configurationName. Values
+        which have not been retrieved yet (or have expired) are fetched together
+        """
+        for configurationName, value in values.items():
+            if value is None or value == "":
+                logger.error(
+                    "A value for %s was not provided. Fix the TOML file and run ElectricEye again.",
+                    configurationName
+                )
+                sys.exit(2)
+
+        if self.credentialsLocation == "CONFIG_FILE":
+            return dict(values)
+
+        secrets = {value: self.get_cached_secret(value) for value in values.values()}
+        missing = [value for value, secret in secrets.items() if secret is None]
+        if missing:
+            if self.credentialsLocation == "AWS_SSM":
+                secrets.update(self.fetch_ssm_parameters(missing, values))
+            else:
+                secrets.update(self.fetch_secrets_manager_secrets(missing, values))
+
+        return {configurationName: secrets[value] for configurationName, value in values.items()}
+
+    def fetch_ssm_parameters(self, names: list, values: dict) -> dict:
+        """
+        Retrieves SSM Parameters with GetParameters. Names which are not matched in the response, such as ARNs, names
+        with a version or label selector and Parameters reported as invalid, are retried with GetParameter so the
+        caller receives the same value (or ClientError) it always has. Without the `ssm:GetParameters` permission every
+        Parameter is retrieved with GetParameter. Returns the Parameters keyed by the requested name
+        """
+        ssm = self.get_client("ssm")
+        retrieved = {}
+
+        for i in range(0, len(names), SSM_GET_PARAMETERS_BATCH_SIZE):
+            batch = names[i:i + SSM_GET_PARAMETERS_BATCH_SIZE]
+            if not self._batchDenied.get("ssm"):
+                try:
+                    response = ssm.get_parameters(Names=batch, WithDecryption=True)
+                except ClientError as e:
+                    if not is_access_denied(e):
+                        logger.error(
+                            "Failed to retrieve the credentials for %s from SSM Parameter Store: %s",
+                            self.get_configuration_names(batch, values), e
+                        )
+                        raise e
+                    logger.info("GetParameters is not allowed, retrieving SSM Parameters one at a time: %s", e)
+                    self._batchDenied["ssm"] = True
+                else:
+                    for parameter in response["Parameters"]:
+                        for requestedName in (
+                            parameter["Name"], f"{parameter['Name']}{parameter.get('Selector', '')}", parameter.get("ARN")
+                        ):
+                            if requestedName in batch:
+                                retrieved[requestedName] = parameter["Value"]
+
+            for name in batch:
+                if name in retrieved:
+                    continue
+                try:
+                    parameter = ssm.get_parameter(Name=name, WithDecryption=True)["Parameter"]
+                except ClientError as e:
+                    logger.error(
+                        "Failed to retrieve the credential for %s from SSM Parameter Store: %s",
+                        self.get_configuration_names([name], values), e
+                    )
+                    raise e
+                retrieved[name] = parameter["Value"]
+
+        for name, secret in retrieved.items():
+            self.set_cached_secret(name, secret)
+
+        return retrieved
+
+    def fetch_secrets_manager_secrets(self, secretIds: list, values: dict) -> dict:
+        """
+        Retrieves Secrets with BatchGetSecretValue, individual failures are raised as a ClientError for the Secret.
+        Without the `secretsmanager:BatchGetSecretValue` permission every Secret is retrieved with GetSecretValue.
+        Returns the Secrets keyed by the requested identifier
+        """
+        asm = self.get_client("secretsmanager")
+        retrieved = {}
+
+        for i in range(0, len(secretIds), ASM_BATCH_GET_SECRET_VALUE_BATCH_SIZE):
+            batch = secretIds[i:i + ASM_BATCH_GET_SECRET_VALUE_BATCH_SIZE]
+            if not self._batchDenied.get("secretsmanager"):
+                try:
+                    response = asm.batch_get_secret_value(SecretIdList=batch)
+                except ClientError as e:
+                    if not is_access_denied(e):
+                        logger.error(
+                            "Failed to retrieve the credentials for %s from AWS Secrets Manager: %s",
+                            self.get_configuration_names(batch, values), e
+                        )
+                        raise e
+                    logger.info("BatchGetSecretValue is not allowed, retrieving Secrets one at a time: %s", e)
+                    self._batchDenied["secretsmanager"] = True
+                else:
+                    # Secrets are returned by ARN and Name, map them back to the identifier used in the TOML
+                    for secret in response["SecretValues"]:
+                        for secretId in batch:
+                            if secretId in (secret["ARN"], secret["Name"]):
+                                retrieved[secretId] = secret["SecretString"]
+
+                    for error in response.get("Errors", []):
+                        e = ClientError(
+                            {"Error": {"Code": error["ErrorCode"], "Message": error["Message"]}},
+                            "BatchGetSecretValue"
+                        )
+                        logger.error(
+                            "Failed to retrieve the credential for %s from AWS Secrets Manager: %s",
+                            self.get_configuration_names([error["SecretId"]], values), e
+                        )
+                        raise e
+
+            # partial ARNs cannot be matched against the response, fetch those one at a time
+            for secretId in batch:
+                if secretId not in retrieved:
+                    try:
+                        secret = asm.get_secret_value(SecretId=secretId)["SecretString"]
+                    except ClientError as e:
+                        logger.error(
+                            "Failed to retrieve the credential for %s from AWS Secrets Manager: %s",
+                            self.get_configuration_names([secretId], values), e
+                        )
+                        raise e
+                    retrieved[secretId] = secret
+
+        for secretId, secret in retrieved.items():
+            self.set_cached_secret(secretId, secret)
+
+        return retrieved
+
+    @staticmethod
+    def get_configuration_names(batch: list, values: dict) -> list:
+        """
+        Maps SSM Parameter names or ASM Secret IDs back to the TOML settings they were provided for, for logging
+        """
+        return [configurationName for configurationName, value in values.items() if value in batch]
+
+def get_secret_resolver(credentialsLocation: str | None = None) -> SecretResolver:
+    """
+    Returns the shared SecretResolver for a credentials location, by default the one from the TOML snapshot
+    """
+    if credentialsLocation is None:
+        credentialsLocation = get_credentials_location(load_external_providers_config())
+
+    with _externalProvidersLock:
+        resolver = _secretResolvers.get(credentialsLocation)
+        if resolver is None:
+            resolver = SecretResolver(credentialsLocation)
+            _secretResolvers[credentialsLocation] = resolver
+
+    return resolver
+
+def get_global_credential(settingName: str) -> str | None:
+    """
+    Returns an optional credential from the [global] section, such as the Shodan or VirusTotal API Keys. None is
+    returned when the value is empty or it cannot be retrieved so that Auditors can skip the Checks that need it
+    """
+    config = load_external_providers_config()
+    value = config["global"].get(settingName)
+    if not value:
+        return None
+
+    try:
+        return get_secret_resolver(get_credentials_location(config)).resolve(value, settingName)
+    except ClientError as e:
+        logger.warning("Error retrieving %s, skipping the Checks which require it: %s", settingName, e)
+        return None
+
+# EOF
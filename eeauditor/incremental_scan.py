@@ -0,0 +1,197 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import json
+import logging
+from datetime import datetime, timezone
+from os import makedirs, path, replace
+from botocore.exceptions import ClientError
+from checkpoint_journal import decode_value, encode_value
+from collectors.aws_config_collector import get_recorded_resource_types, select_resource_type_counts
+
+logger = logging.getLogger("IncrementalScan")
+
+here = path.abspath(path.dirname(__file__))
+# State is written to /eeauditor/incremental/<account>_<region>.json unless another directory is configured
+INCREMENTAL_STATE_DIRECTORY = path.join(here, "incremental")
+# Findings are never carried forward for longer than this, so Checks which also depend on time (expiry dates, end of
+# support versions) are still re-evaluated periodically
+INCREMENTAL_MAX_AGE_SECONDS = 604800
+
+# Auditors, by the cache name their Checks are registered with, whose Checks only read configuration that AWS Config
+# records as these resource types. Every Check registered with the name counts, including those in other Auditor files
+# such as the secret scanners. Auditors that are not listed here, along with the "Global" Auditors as AWS Config is
+# queried per Region, are always executed. Auditors that also read anything else are deliberately left out, e.g.,
+# CloudTrail (CloudWatch Logs metric filters and the trail's S3 bucket), CloudFormation (drift status), RDS,
+# Elasticsearch, Amazon MQ and ELB (Shodan, RDS event subscriptions) and the AttackSurface port scans
+AWS_CONFIG_AUDITOR_RESOURCE_TYPES = {
+    "dynamodb": ["AWS::DynamoDB::Table"],
+    "ecs": ["AWS::ECS::Cluster", "AWS::ECS::Service", "AWS::ECS::TaskDefinition"],
+    "eks": ["AWS::EKS::Cluster"],
+    "elasticache": ["AWS::ElastiCache::CacheCluster", "AWS::ElastiCache::ReplicationGroup"],
+    "elasticfilesystem": ["AWS::EFS::FileSystem", "AWS::EFS::AccessPoint"],
+    "firehose": ["AWS::KinesisFirehose::DeliveryStream"],
+    "kafka": ["AWS::MSK::Cluster"],
+    "kinesis": ["AWS::Kinesis::Stream"],
+    "redshift": ["AWS::Redshift::Cluster", "AWS::Redshift::ClusterParameterGroup"]
+}
+
+class IncrementalScan(object):
+    """
+    Change-driven scanning for a single AWS Account & Region. The findings of every listed Auditor are kept from the
+    previous run, AWS Config is asked which resource types changed since then (or gained or lost resources) and only
+    the Auditors reading those types are executed again, the rest have their findings carried forward. Anything that
+    cannot be determined, such as AWS Config not recording in the Region, falls back to executing the Auditor
+    """
+
+    def __init__(self, account: str, region: str, maxAgeSeconds: int = INCREMENTAL_MAX_AGE_SECONDS, directory: str = INCREMENTAL_STATE_DIRECTORY):
+        self.directory = directory
+        self.statePath = path.join(directory, f"{account}_{region}.json")
+        self.maxAgeSeconds = maxAgeSeconds
+        self.startedAt = datetime.now(timezone.utc)
+        self.previousState = self.load()
+        # None means changes could not be determined and every Auditor is executed
+        self.changedResourceTypes = None
+        self.recordedResourceTypes = set()
+        self.resourceTypeCounts = None
+        self.auditors = {}
+
+    def load(self) -> dict:
+        """
+        Returns the state saved by the previous run, or an empty state
+        """
+        if not path.exists(self.statePath):
+            return {}
+
+        try:
+            with open(self.statePath, "r") as f:
+                return json.load(f, object_hook=decode_value)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable incremental scan state %s: %s", self.statePath, e)
+            return {}
+
+    def detect_changes(self, session) -> None:
+        """
+        Determines which resource types changed since the previous run with two AWS Config advanced queries, one for
+        the current resource counts and one for resources with a configuration item captured after the previous run
+        """
+        resourceTypes = sorted(set(resourceType for types in AWS_CONFIG_AUDITOR_RESOURCE_TYPES.values() for resourceType in types))
+
+        try:
+            self.recordedResourceTypes = get_recorded_resource_types(session, resourceTypes)
+            if not self.recordedResourceTypes:
+                logger.info("AWS Config is not recording in this Region, every Auditor will be executed.")
+                return
+
+            self.resourceTypeCounts = select_resource_type_counts(session, self.recordedResourceTypes)
+            if not self.previousState.get("ScannedAt"):
+                return
+
+            changedResourceTypes = set(
+                select_resource_type_counts(
+                    session, self.recordedResourceTypes, datetime.fromisoformat(self.previousState["ScannedAt"])
+                )
+            )
+        except ClientError as e:
+            logger.warning("Failed to query AWS Config for changes, every Auditor will be executed: %s", e)
+            self.resourceTypeCounts = None
+            return
+
+        # deleted resources no longer have a configuration item to match, they show up as a different count
+        previousCounts = self.previousState.get("ResourceTypeCounts", {})
+        changedResourceTypes.update(
+            resourceType for resourceType in self.recordedResourceTypes
+            if self.resourceTypeCounts.get(resourceType, 0) != previousCounts.get(resourceType, 0)
+        )
+        self.changedResourceTypes = changedResourceTypes
+
+    def is_unchanged(self, serviceName: str, checkNames: list) -> bool:
+        """
+        Returns True when the findings of an Auditor from the previous run can be carried forward
+        """
+        if self.changedResourceTypes is None:
+            return False
+
+        resourceTypes = set(AWS_CONFIG_AUDITOR_RESOURCE_TYPES.get(serviceName, []))
+        if not resourceTypes or not resourceTypes <= self.recordedResourceTypes:
+            return False
+        if resourceTypes & self.changedResourceTypes:
+            return False
+
+        # the previous findings must come from the same set of Checks, e.g., not from a run with -a or -c
+        previous = self.previousState.get("Auditors", {}).get(serviceName)
+        if previous is None or previous["CheckNames"] != sorted(checkNames):
+            return False
+
+        evaluatedAt = datetime.fromisoformat(previous["EvaluatedAt"])
+        return (self.startedAt - evaluatedAt).total_seconds() < self.maxAgeSeconds
+
+    def carry_forward(self, serviceName: str) -> list:
+        """
+        Returns the previous findings of an unchanged Auditor with a refreshed `UpdatedAt` and keeps them for the next run
+        """
+        previous = self.previousState["Auditors"][serviceName]
+        self.auditors[serviceName] = previous
+
+        updatedAt = self.startedAt.isoformat()
+        logger.info(
+            "No changes were recorded by AWS Config for %s, carrying forward %s findings.",
+            serviceName, len(previous["Findings"])
+        )
+        return [dict(finding, UpdatedAt=updatedAt) for finding in previous["Findings"]]
+
+    def record(self, serviceName: str, checkNames: list, findings: list) -> None:
+        """
+        Keeps the findings of an Auditor that was executed so they can be carried forward by the next run
+        """
+        if serviceName not in AWS_CONFIG_AUDITOR_RESOURCE_TYPES:
+            return
+
+        self.auditors[serviceName] = {
+            "CheckNames": sorted(checkNames),
+            "EvaluatedAt": self.startedAt.isoformat(),
+            "Findings": findings
+        }
+
+    def save(self) -> None:
+        """
+        Atomically replaces the state file. Auditors which were neither executed nor carried forward are dropped, as
+        changes to their resources would otherwise be hidden by the new baseline
+        """
+        state = {
+            "ResourceTypeCounts": self.resourceTypeCounts or {},
+            "Auditors": self.auditors
+        }
+        # without resource counts AWS Config could not be used, the next run has no baseline to compare against
+        if self.resourceTypeCounts is not None:
+            state["ScannedAt"] = self.startedAt.isoformat()
+
+        temporaryPath = f"{self.statePath}.tmp"
+        try:
+            makedirs(self.directory, exist_ok=True)
+            with open(temporaryPath, "w") as f:
+                json.dump(state, f, default=encode_value)
+            replace(temporaryPath, self.statePath)
+        except OSError as e:
+            # the findings of this run still reach the Outputs, the next run simply executes every Auditor
+            logger.error("Cannot write incremental scan state %s, it will not be used by the next run: %s", self.statePath, e)
+
+# EOF
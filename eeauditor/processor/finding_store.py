@@ -0,0 +1,143 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import json
+import logging
+from base64 import b64decode, b64encode
+from binascii import Error as Base64Error
+from hashlib import sha256
+
+logger = logging.getLogger("FindingStore")
+
+class CompactFinding(object):
+    """
+    A finding without its `ProductFields.AssetDetails`, which is referenced by the ID of the asset in the store
+    """
+    __slots__ = ("finding", "assetId")
+
+    def __init__(self, finding: dict, assetId: str | None = None):
+        self.finding = finding
+        self.assetId = assetId
+
+class FindingStore(object):
+    """
+    Holds the findings of a run with every asset payload stored once. Checks base64 encode the asset into
+    `ProductFields.AssetDetails` of every finding they emit, so the same asset is held once per Check that evaluated
+    it. Assets are stored as their JSON, keyed by the hash of the encoded form so that a payload which was already
+    seen is not even decoded, and findings only keep the key. ASFF is materialized when the findings reach the
+    Outputs, where each asset is encoded or parsed once and shared by all of its findings
+    """
+
+    def __init__(self, findings=None):
+        # asset ID -> asset JSON, the JSON is several times smaller than the parsed asset
+        self.assets = {}
+        self.records = []
+        if findings is not None:
+            self.extend(findings)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.to_asff())
+
+    def add(self, finding: dict) -> None:
+        """
+        Adds a finding, replacing its asset payload with a reference into the store. The finding is copied so the
+        Auditor's findings, which may still be journaled or carried forward, are left untouched
+        """
+        productFields = finding.get("ProductFields")
+        if not productFields or productFields.get("AssetDetails") is None:
+            self.records.append(CompactFinding(finding))
+            return
+
+        assetId = self.add_asset(productFields["AssetDetails"])
+        if assetId is None:
+            self.records.append(CompactFinding(finding))
+            return
+
+        self.records.append(
+            CompactFinding(
+                # the key is kept so that materialized findings have the same field order as the Checks emitted
+                {**finding, "ProductFields": {**productFields, "AssetDetails": None}},
+                assetId
+            )
+        )
+
+    def extend(self, findings) -> None:
+        for finding in findings:
+            self.add(finding)
+
+    def add_asset(self, assetDetails) -> str | None:
+        """
+        Stores an asset, given base64 encoded as the Checks emit it or already decoded, and returns its ID. Returns
+        None if an encoded asset cannot be decoded, the finding then keeps its payload as-is
+        """
+        if isinstance(assetDetails, (bytes, str)):
+            encoded = assetDetails.encode("ascii") if isinstance(assetDetails, str) else assetDetails
+            assetId = sha256(encoded).hexdigest()
+            if assetId not in self.assets:
+                try:
+                    self.assets[assetId] = b64decode(encoded, validate=True)
+                except Base64Error as e:
+                    logger.warning("Failed to decode AssetDetails, the finding keeps its original payload: %s", e)
+                    return None
+            return assetId
+
+        # decoded assets are hashed as the Checks would have encoded them, so both forms share one entry
+        assetJson = json.dumps(assetDetails, default=str).encode("utf-8")
+        assetId = sha256(b64encode(assetJson)).hexdigest()
+        self.assets.setdefault(assetId, assetJson)
+
+        return assetId
+
+    def get_asset(self, assetId: str) -> dict:
+        """
+        Returns a newly parsed copy of a stored asset
+        """
+        return json.loads(self.assets[assetId])
+
+    def to_asff(self, encodeAssets: bool = True) -> list:
+        """
+        Materializes the findings as ASFF. With `encodeAssets` the assets are base64 encoded into `AssetDetails` as the
+        Checks emitted them, otherwise the parsed asset is used. Either way every finding of an asset shares a single
+        object, Outputs must not modify `AssetDetails`
+        """
+        materializedAssets = {}
+        findings = []
+        for record in self.records:
+            if record.assetId is None:
+                findings.append(record.finding)
+                continue
+
+            assetDetails = materializedAssets.get(record.assetId)
+            if assetDetails is None:
+                assetJson = self.assets[record.assetId]
+                assetDetails = b64encode(assetJson) if encodeAssets else json.loads(assetJson)
+                materializedAssets[record.assetId] = assetDetails
+
+            findings.append(
+                {**record.finding, "ProductFields": {**record.finding["ProductFields"], "AssetDetails": assetDetails}}
+            )
+
+        return findings
+
+# EOF
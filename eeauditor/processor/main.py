@@ -17,13 +17,20 @@
 #KIND, either express or implied.  See the License for the
 #specific language governing permissions and limitations
 #under the License.
+from processor.finding_store import FindingStore
 from processor.outputs.output_base import ElectricEyeOutput
 
-def process_findings(findings: list, outputs: list, **kwargs):
+def process_findings(findings: list | FindingStore, outputs: list, **kwargs):
     """Process all findings from json file and send to outputs sepecified"""
     for output in outputs:
         try:
-            ElectricEyeOutput.get_provider(output)().write_findings(findings=findings, **kwargs)
+            provider = ElectricEyeOutput.get_provider(output)
+            # ASFF is only materialized here, Outputs which decode the assets anyway are handed the decoded ones
+            if isinstance(findings, FindingStore):
+                providerFindings = findings.to_asff(encodeAssets=not getattr(provider, "__decoded_assets__", False))
+            else:
+                providerFindings = findings
+            provider().write_findings(findings=providerFindings, **kwargs)
         except Exception as e:
             print(f"Error writing output: {e}")
             raise e
@@ -18,35 +18,23 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import tomli
 import boto3
 import sys
-import os
 import json
-from base64 import b64decode
 #from hashlib import new as hasher
 from botocore.exceptions import ClientError
-from processor.outputs.output_base import ElectricEyeOutput
+from processor.outputs.output_base import ElectricEyeOutput, decode_asset_details
+from external_providers import load_external_providers_config
 
 @ElectricEyeOutput
 class AmazonSqsProvider(object):
     __provider__ = "amazon_sqs"
+    __decoded_assets__ = True
 
     def __init__(self):
         print("Preparing Amazon SQS output.")
 
-        if os.environ["TOML_FILE_PATH"] == "None":
-            # Get the absolute path of the current directory
-            currentDir = os.path.abspath(os.path.dirname(__file__))
-            # Go two directories back to /eeauditor/
-            twoBack = os.path.abspath(os.path.join(currentDir, "../../"))
-            # TOML is located in /eeauditor/ directory
-            tomlFile = f"{twoBack}/external_providers.toml"
-        else:
-            tomlFile = os.environ["TOML_FILE_PATH"]
-
-        with open(tomlFile, "rb") as f:
-            data = tomli.load(f)
+        data = load_external_providers_config()
 
         # Variable for the entire [outputs.amazon_sqs] section
         sqsDetails = data["outputs"]["amazon_sqs"]
@@ -77,9 +65,7 @@ class AmazonSqsProvider(object):
         # Unfold the AssetDetails
         decodedFindings = [
             {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
+                "AssetDetails": decode_asset_details(d["ProductFields"]["AssetDetails"])
             }} if "AssetDetails" in d["ProductFields"]
             else d
             for d in findings
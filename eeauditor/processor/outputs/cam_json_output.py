@@ -18,9 +18,8 @@
 #specific language governing permissions and limitations
 #under the License.
 
-from processor.outputs.output_base import ElectricEyeOutput
+from processor.outputs.output_base import ElectricEyeOutput, decode_asset_details
 import json
-import base64
 from os import path
 
 here = path.abspath(path.dirname(__file__))
@@ -28,6 +27,7 @@ here = path.abspath(path.dirname(__file__))
 @ElectricEyeOutput
 class CamJsonProvider(object):
     __provider__ = "cam_json"
+    __decoded_assets__ = True
 
     def write_findings(self, findings: list, output_file: str, **kwargs):
         if len(findings) == 0:
@@ -65,9 +65,7 @@ class CamJsonProvider(object):
 
         data = [
             {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(base64.b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
+                "AssetDetails": decode_asset_details(d["ProductFields"]["AssetDetails"])
             }} if "AssetDetails" in d["ProductFields"]
             else d
             for d in findings
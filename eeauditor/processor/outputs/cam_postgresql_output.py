@@ -18,19 +18,11 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import tomli
-import boto3
 import sys
-import os
 import json
-import base64
 import psycopg2 as psql
-from botocore.exceptions import ClientError
-from processor.outputs.output_base import ElectricEyeOutput
-
-# Boto3 Clients
-ssm = boto3.client("ssm")
-asm = boto3.client("secretsmanager")
+from processor.outputs.output_base import ElectricEyeOutput, decode_asset_details
+from external_providers import get_secret_resolver, load_external_providers_config
 
 # These Constants define legitimate values for certain parameters within the external_providers.toml file
 CREDENTIALS_LOCATION_CHOICES = ["AWS_SSM", "AWS_SECRETS_MANAGER", "CONFIG_FILE"]
@@ -38,22 +30,12 @@ CREDENTIALS_LOCATION_CHOICES = ["AWS_SSM", "AWS_SECRETS_MANAGER", "CONFIG_FILE"]
 @ElectricEyeOutput
 class CamPostgresProvider(object):
     __provider__ = "cam_postgresql"
+    __decoded_assets__ = True
 
     def __init__(self):
         print("Preparing PostgreSQL credentials.")
 
-        if os.environ["TOML_FILE_PATH"] == "None":
-            # Get the absolute path of the current directory
-            currentDir = os.path.abspath(os.path.dirname(__file__))
-            # Go two directories back to /eeauditor/
-            twoBack = os.path.abspath(os.path.join(currentDir, "../../"))
-            # TOML is located in /eeauditor/ directory
-            tomlFile = f"{twoBack}/external_providers.toml"
-        else:
-            tomlFile = os.environ["TOML_FILE_PATH"]
-            
-        with open(tomlFile, "rb") as f:
-            data = tomli.load(f)
+        data = load_external_providers_config()
 
         # Parse from [global] to determine credential location of PostgreSQL Password
         if data["global"]["credentials_location"] not in CREDENTIALS_LOCATION_CHOICES:
@@ -201,42 +183,13 @@ class CamPostgresProvider(object):
         """
         Retrieves a TOML variable from AWS Systems Manager Parameter Store and returns it
         """
-
-        # Check that a value was provided
-        if value == (None or ""):
-            print(f"A value for {configurationName} was not provided. Fix the TOML file and run ElectricEye again.")
-            sys.exit(2)
-
-        # Retrieve the credential from SSM Parameter Store
-        try:
-            credential = ssm.get_parameter(
-                Name=value,
-                WithDecryption=True
-            )["Parameter"]["Value"]
-        except ClientError as e:
-            raise e
-        
-        return credential
+        return get_secret_resolver("AWS_SSM").resolve(value, configurationName)
     
     def get_credential_from_aws_secrets_manager(self, value, configurationName):
         """
         Retrieves a TOML variable from AWS Secrets Manager and returns it
         """
-
-        # Check that a value was provided
-        if value == (None or ""):
-            print(f"A value for {configurationName} was not provided. Fix the TOML file and run ElectricEye again.")
-            sys.exit(2)
-
-        # Retrieve the credential from AWS Secrets Manager
-        try:
-            credential = asm.get_secret_value(
-                SecretId=value,
-            )["SecretString"]
-        except ClientError as e:
-            raise e
-        
-        return credential
+        return get_secret_resolver("AWS_SECRETS_MANAGER").resolve(value, configurationName)
     
     def create_cam_format(self, findings):
         """
@@ -256,9 +209,7 @@ class CamPostgresProvider(object):
 
         data = [
             {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(base64.b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
+                "AssetDetails": decode_asset_details(d["ProductFields"]["AssetDetails"])
             }} if "AssetDetails" in d["ProductFields"]
             else d
             for d in findings
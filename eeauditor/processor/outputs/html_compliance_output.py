@@ -18,7 +18,7 @@
 #specific language governing permissions and limitations
 #under the License.
 
-from processor.outputs.output_base import ElectricEyeOutput
+from processor.outputs.output_base import ElectricEyeOutput, load_mapped_compliance_controls
 import json
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -59,8 +59,7 @@ SUPPORTED_FRAMEWORKS = [
     "CIS Microsoft Azure Foundations Benchmark V2.0.0"
 ]
 
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
+CONTROLS_CROSSWALK = load_mapped_compliance_controls()
 
 @ElectricEyeOutput
 class JsonProvider(object):
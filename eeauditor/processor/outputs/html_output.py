@@ -21,8 +21,7 @@
 import os
 from datetime import datetime
 import yaml
-from processor.outputs.output_base import ElectricEyeOutput
-import json
+from processor.outputs.output_base import ElectricEyeOutput, load_mapped_compliance_controls
 from os import path
 
 here = path.abspath(path.dirname(__file__))
@@ -34,8 +33,7 @@ with open(ICONOGRAPHY_FILE) as f:
     ICONOGRAPHY = yaml.safe_load(f)
 
 here = path.abspath(path.dirname(__file__))
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
+CONTROLS_CROSSWALK = load_mapped_compliance_controls()
 
 @ElectricEyeOutput
 class HtmlProvider(object):
@@ -26,6 +26,7 @@ here = path.abspath(path.dirname(__file__))
 @ElectricEyeOutput
 class JsonProvider(object):
     __provider__ = "json_normalized"
+    __decoded_assets__ = True
 
     def write_findings(self, findings: list, output_file: str, **kwargs):
         if len(findings) == 0:
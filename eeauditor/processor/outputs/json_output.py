@@ -18,18 +18,15 @@
 #specific language governing permissions and limitations
 #under the License.
 
-from os import path
-from processor.outputs.output_base import ElectricEyeOutput
+from processor.outputs.output_base import ElectricEyeOutput, decode_asset_details, load_mapped_compliance_controls
 import json
-from base64 import b64decode
 
-here = path.abspath(path.dirname(__file__))
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
+CONTROLS_CROSSWALK = load_mapped_compliance_controls()
 
 @ElectricEyeOutput
 class JsonProvider(object):
     __provider__ = "json"
+    __decoded_assets__ = True
 
     def write_findings(self, findings: list, output_file: str, **kwargs):
         if len(findings) == 0:
@@ -52,9 +49,7 @@ class JsonProvider(object):
         """
         decodedFindings = [
             {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
+                "AssetDetails": decode_asset_details(d["ProductFields"]["AssetDetails"])
             }} if "AssetDetails" in d["ProductFields"]
             else d
             for d in findings
@@ -21,10 +21,8 @@
 import logging
 import sys
 from typing import NamedTuple
-from os import path
-from processor.outputs.output_base import ElectricEyeOutput
+from processor.outputs.output_base import ElectricEyeOutput, decode_asset_details, load_mapped_compliance_controls
 import json
-from base64 import b64decode
 from datetime import datetime
 
 logger = logging.getLogger("OCSF_Stdout_Output")
@@ -78,13 +76,12 @@ class ActivityStatusTypeMapping(NamedTuple):
     typeUid: int
     typeName: str
 
-here = path.abspath(path.dirname(__file__))
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
+CONTROLS_CROSSWALK = load_mapped_compliance_controls()
 
 @ElectricEyeOutput
 class OcsfStdoutOutput(object):
     __provider__ = "ocsf_stdout"
+    __decoded_assets__ = True
 
     def write_findings(self, findings: list, **kwargs):
         if len(findings) == 0:
@@ -98,9 +95,7 @@ class OcsfStdoutOutput(object):
 
         decodedFindings = [
             {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
+                "AssetDetails": decode_asset_details(d["ProductFields"]["AssetDetails"])
             }} if "AssetDetails" in d["ProductFields"]
             else d
             for d in findings
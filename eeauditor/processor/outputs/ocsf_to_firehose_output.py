@@ -19,14 +19,12 @@
 #under the License.
 
 import logging
-import tomli
 import boto3
 import sys
 from typing import NamedTuple
-from os import path, environ
-from processor.outputs.output_base import ElectricEyeOutput
+from processor.outputs.output_base import ElectricEyeOutput, decode_asset_details, load_mapped_compliance_controls
+from external_providers import load_external_providers_config
 import json
-from base64 import b64decode
 from datetime import datetime
 from botocore.exceptions import ClientError
 
@@ -81,29 +79,17 @@ class ActivityStatusTypeMapping(NamedTuple):
     typeUid: int
     typeName: str
 
-here = path.abspath(path.dirname(__file__))
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
+CONTROLS_CROSSWALK = load_mapped_compliance_controls()
 
 @ElectricEyeOutput
 class OcsfFirehoseOutput(object):
     __provider__ = "ocsf_kdf"
+    __decoded_assets__ = True
 
     def __init__(self):
         print("Preparing to send OCSF V1.4.0 Compliance Findings to Amazon Kinesis Data Firehose.")
 
-        if environ["TOML_FILE_PATH"] == "None":
-            # Get the absolute path of the current directory
-            currentDir = path.abspath(path.dirname(__file__))
-            # Go two directories back to /eeauditor/
-            twoBack = path.abspath(path.join(currentDir, "../../"))
-            # TOML is located in /eeauditor/ directory
-            tomlFile = f"{twoBack}/external_providers.toml"
-        else:
-            tomlFile = environ["TOML_FILE_PATH"]
-
-        with open(tomlFile, "rb") as f:
-            data = tomli.load(f)
+        data = load_external_providers_config()
 
         # Variable for the entire [outputs.amazon_sqs] section
         sqsDetails = data["outputs"]["firehose"]
@@ -146,9 +132,7 @@ class OcsfFirehoseOutput(object):
         """
         decodedFindings = [
             {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
+                "AssetDetails": decode_asset_details(d["ProductFields"]["AssetDetails"])
             }} if "AssetDetails" in d["ProductFields"]
             else d
             for d in findings
@@ -21,10 +21,8 @@
 import logging
 import sys
 from typing import NamedTuple
-from os import path
-from processor.outputs.output_base import ElectricEyeOutput
+from processor.outputs.output_base import ElectricEyeOutput, decode_asset_details, load_mapped_compliance_controls
 import json
-from base64 import b64decode
 from datetime import datetime
 
 logging.basicConfig(level=logging.INFO)
@@ -79,13 +77,12 @@ class ActivityStatusTypeMapping(NamedTuple):
     typeUid: int
     typeName: str
 
-here = path.abspath(path.dirname(__file__))
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
+CONTROLS_CROSSWALK = load_mapped_compliance_controls()
 
 @ElectricEyeOutput
 class OcsfV140Output(object):
     __provider__ = "ocsf_v1_4_0"
+    __decoded_assets__ = True
 
     def write_findings(self, findings: list, output_file: str, **kwargs):
         if len(findings) == 0:
@@ -99,9 +96,7 @@ class OcsfV140Output(object):
 
         decodedFindings = [
             {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
+                "AssetDetails": decode_asset_details(d["ProductFields"]["AssetDetails"])
             }} if "AssetDetails" in d["ProductFields"]
             else d
             for d in findings
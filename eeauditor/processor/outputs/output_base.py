@@ -18,11 +18,60 @@
 #specific language governing permissions and limitations
 #under the License.
 
+import importlib
+import json
+from base64 import b64decode
 import logging
+from functools import cache
+from os import path
 from sys import exit as sysexit
 
 logger = logging.getLogger("OutputBase")
 
+# Static table of every output provider name and the module within processor.outputs that registers it. Outputs pull
+# in heavy dependencies (pandas, matplotlib, pymongo, psycopg2, etc.) so a module is only imported once its
+# provider is selected, this table must be kept in line with the `__provider__` of each output class
+OUTPUT_PROVIDER_MODULES = {
+    "amazon_sqs": "amazon_sqs_output",
+    "cam_json": "cam_json_output",
+    "cam_mongodb": "cam_mongodb_output",
+    "cam_postgresql": "cam_postgresql_output",
+    "csv": "csv_output",
+    "html": "html_output",
+    "html_compliance": "html_compliance_output",
+    "json": "json_output",
+    "json_normalized": "json_normalized_output",
+    "mongodb": "mongodb_output",
+    "ocsf_kdf": "ocsf_to_firehose_output",
+    "ocsf_stdout": "ocsf_stdout",
+    "ocsf_v1_1_0": "ocsf_v1_1_0_output",
+    "ocsf_v1_4_0": "ocsf_v1_4_0_output",
+    "postgresql": "postgresql_output",
+    "sechub": "sechub_output",
+    "slack": "slack_output",
+    "stdout": "stdout_output"
+}
+
+@cache
+def load_mapped_compliance_controls() -> dict:
+    """
+    Returns the NIST CSF V1.1 to compliance framework crosswalk, it is read once no matter how many outputs use it
+    """
+    here = path.abspath(path.dirname(__file__))
+    with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
+        return json.load(jsonfile)
+
+def decode_asset_details(assetDetails):
+    """
+    Returns the asset of a finding's `ProductFields.AssetDetails`, which is base64 encoded JSON as the Checks emit it or
+    already decoded when the findings come from a FindingStore. Outputs which decode it this way set
+    `__decoded_assets__` so that the store hands them its decoded assets
+    """
+    if assetDetails is None or isinstance(assetDetails, dict):
+        return assetDetails
+
+    return json.loads(b64decode(assetDetails).decode("utf-8"))
+
 class ElectricEyeOutput(object):
     """Class to be used as a decorator to register all output providers"""
 
@@ -34,16 +83,21 @@ class ElectricEyeOutput(object):
 
     @classmethod
     def get_provider(cls, provider):
-        """Returns the class to process the findings"""
-        try:
-            return cls._outputs[provider]
-        except KeyError:
-            logger.warning(
-                "Designated output provider %s does not exist", provider
-            )
-            sysexit(2)
+        """Returns the class to process the findings, importing its module the first time it is selected"""
+        if provider not in cls._outputs:
+            try:
+                moduleName = OUTPUT_PROVIDER_MODULES[provider]
+            except KeyError:
+                logger.warning(
+                    "Designated output provider %s does not exist", provider
+                )
+                sysexit(2)
+            # importing the module registers the output class through the decorator
+            importlib.import_module(f"processor.outputs.{moduleName}")
+
+        return cls._outputs[provider]
 
     @classmethod
     def get_all_providers(cls):
-        """Return a list of all the possible output providers"""
-        return [*cls._outputs]
\ No newline at end of file
+        """Return a list of all the possible output providers, without importing any of them"""
+        return [*OUTPUT_PROVIDER_MODULES]
\ No newline at end of file
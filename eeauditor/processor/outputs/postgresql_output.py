@@ -18,23 +18,13 @@
 #specific language governing permissions and limitations
 #under the License.
 
-import boto3
-from os import path
-import tomli
 import sys
-import os
 import json
 import psycopg2 as psql
-from botocore.exceptions import ClientError
-from processor.outputs.output_base import ElectricEyeOutput
+from processor.outputs.output_base import ElectricEyeOutput, load_mapped_compliance_controls
+from external_providers import get_secret_resolver, load_external_providers_config
 
-# Boto3 Clients
-ssm = boto3.client("ssm")
-asm = boto3.client("secretsmanager")
-
-here = path.abspath(path.dirname(__file__))
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
+CONTROLS_CROSSWALK = load_mapped_compliance_controls()
 
 # These Constants define legitimate values for certain parameters within the external_providers.toml file
 CREDENTIALS_LOCATION_CHOICES = ["AWS_SSM", "AWS_SECRETS_MANAGER", "CONFIG_FILE"]
@@ -46,18 +36,7 @@ class PostgresProvider(object):
     def __init__(self):
         print("Preparing PostgreSQL credentials.")
 
-        if os.environ["TOML_FILE_PATH"] == "None":
-            # Get the absolute path of the current directory
-            currentDir = os.path.abspath(os.path.dirname(__file__))
-            # Go two directories back to /eeauditor/
-            twoBack = os.path.abspath(os.path.join(currentDir, "../../"))
-            # TOML is located in /eeauditor/ directory
-            tomlFile = f"{twoBack}/external_providers.toml"
-        else:
-            tomlFile = os.environ["TOML_FILE_PATH"]
-            
-        with open(tomlFile, "rb") as f:
-            data = tomli.load(f)
+        data = load_external_providers_config()
 
         # Parse from [global] to determine credential location of PostgreSQL Password
         if data["global"]["credentials_location"] not in CREDENTIALS_LOCATION_CHOICES:
@@ -242,42 +221,13 @@ class PostgresProvider(object):
         """
         Retrieves a TOML variable from AWS Systems Manager Parameter Store and returns it
         """
-
-        # Check that a value was provided
-        if value == (None or ""):
-            print(f"A value for {configurationName} was not provided. Fix the TOML file and run ElectricEye again.")
-            sys.exit(2)
-
-        # Retrieve the credential from SSM Parameter Store
-        try:
-            credential = ssm.get_parameter(
-                Name=value,
-                WithDecryption=True
-            )["Parameter"]["Value"]
-        except ClientError as e:
-            raise e
-        
-        return credential
+        return get_secret_resolver("AWS_SSM").resolve(value, configurationName)
     
     def get_credential_from_aws_secrets_manager(self, value, configurationName):
         """
         Retrieves a TOML variable from AWS Secrets Manager and returns it
         """
-
-        # Check that a value was provided
-        if value == (None or ""):
-            print(f"A value for {configurationName} was not provided. Fix the TOML file and run ElectricEye again.")
-            sys.exit(2)
-
-        # Retrieve the credential from AWS Secrets Manager
-        try:
-            credential = asm.get_secret_value(
-                SecretId=value,
-            )["SecretString"]
-        except ClientError as e:
-            raise e
-        
-        return credential
+        return get_secret_resolver("AWS_SECRETS_MANAGER").resolve(value, configurationName)
     
     def processing_findings_for_upsert(self, findings):
         """
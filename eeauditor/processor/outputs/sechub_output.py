@@ -24,6 +24,7 @@ from processor.outputs.output_base import ElectricEyeOutput
 @ElectricEyeOutput
 class SecHubProvider(object):
     __provider__ = "sechub"
+    __decoded_assets__ = True
 
     def write_findings(self, findings: list, **kwargs):
         print(f"Writing {len(findings)} results to AWS Security Hub")
@@ -0,0 +1,65 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import logging
+import sys
+from azure.identity import ClientSecretCredential
+from azure.mgmt.resource.subscriptions import SubscriptionClient
+
+logger = logging.getLogger("ProviderSetupAzure")
+
+def create_azure_client_secret_credential(clientId: str, clientSecret: str, tenantId: str) -> ClientSecretCredential:
+    """
+    Attempts to create and return Azure Identity Credentials built from Client Secret creds within an App Registration
+    """
+    # Create Azure Identity credentials from Client ID/Secret Value/Tenant ID
+    try:
+        azureCredentials = ClientSecretCredential(client_id=clientId,client_secret=clientSecret,tenant_id=tenantId)
+    except Exception as e:
+        logger.error(
+            "Error encountered attempting to create Azure Identity credentials from client secret: %s", e
+        )
+        sys.exit(2)
+
+    return azureCredentials
+
+def list_azure_subscription_ids(azureCredentials: ClientSecretCredential) -> list:
+    """
+    Returns the ID of every Azure Subscription the Service Principal can access
+    """
+    azureSubscriptionsClient = SubscriptionClient(azureCredentials)
+
+    try:
+        azureSubscriptionIds = [sub.subscription_id for sub in azureSubscriptionsClient.subscriptions.list()]
+        if not azureSubscriptionIds:
+            logger.error(
+                "No Subscription IDs are available for your current Service Principal, please review your credentials and Access Control (IAM) settings in Azure Entra ID and Azure Subscriptions, respectively"
+            )
+            sys.exit(2)
+    except Exception as e:
+        logger.error(
+            "Error encountered attempting to list Azure Subscriptions for Service Principal: %s", e
+        )
+        sys.exit(2)
+
+    return azureSubscriptionIds
+
+# EOF
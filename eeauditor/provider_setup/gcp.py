@@ -0,0 +1,47 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import json
+import logging
+import sys
+from google.oauth2 import service_account
+
+logger = logging.getLogger("ProviderSetupGcp")
+
+def create_gcp_credentials(credentialValue: str) -> service_account.Credentials:
+    """
+    Takes the Service Account JSON payload derived from the TOML file and creates a GCP credential object that can be
+    passed to EEAuditor
+    """
+    credentials = json.loads(credentialValue)
+
+    # Create a GCP credential object from the JSON payload
+    try:
+        gcpCredentials = service_account.Credentials.from_service_account_info(credentials)
+    except Exception as e:
+        logger.error(
+            "Error encountered attempting to create GCP credentials from JSON payload: %s", e
+        )
+        sys.exit(2)
+
+    return gcpCredentials
+
+# EOF
@@ -0,0 +1,58 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import logging
+import snowflake.connector as snowconn
+
+logger = logging.getLogger("ProviderSetupSnowflake")
+
+def create_snowflake_cursor(username: str, password: str, accountId: str, warehouseName: str) -> tuple[snowconn.connection.SnowflakeConnection, snowconn.cursor.SnowflakeCursor]:
+    """
+    Returns a Snowflake connection and (dictionary) cursor object for a given warehouse
+    """
+    try:
+        conn = snowconn.connect(
+            user=username,
+            password=password,
+            account=accountId,
+            warehouse=warehouseName
+        )
+    except Exception as e:
+        raise e
+
+    # This allows us to return a dictionary instead of tuples
+    logger.info("Connected to Snowflake successfully.")
+    cur = conn.cursor(snowconn.DictCursor)
+
+    # Use the warehouse provided, this is a required step if a custom role is used to catch if the custom role was not given a grant to the warehouse
+    try:
+        war = cur.execute(f"use warehouse {warehouseName}").fetchall()
+        logger.info("Using warehouse %s. %s", warehouseName, war)
+    except snowconn.errors.ProgrammingError as e:
+        logger.error(
+            "Failed to use warehouse %s: %s",
+            warehouseName, e
+        )
+        raise e
+
+    return conn, cur
+
+# EOF
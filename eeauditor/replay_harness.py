@@ -0,0 +1,540 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import json
+import logging
+from base64 import b64decode, b64encode
+from contextlib import nullcontext
+from datetime import datetime
+from hashlib import sha256
+from io import BytesIO
+from os import makedirs, path, replace
+from random import Random
+from threading import Lock
+from time import sleep
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import boto3
+from botocore.awsrequest import AWSResponse
+from botocore.response import StreamingBody
+
+logger = logging.getLogger("ReplayHarness")
+
+RECORD = "record"
+REPLAY = "replay"
+FIXTURE_BUNDLE_VERSION = 1
+# Error code of the response served in place of a call that is not in the bundle, Checks handle it like any other
+# ClientError. Use `strict` to raise instead while building a bundle
+REPLAY_MISS_ERROR_CODE = "ReplayFixtureMissing"
+# Response members that are never written to a bundle, fixture bundles are meant to be shared and committed
+REDACTED_RESPONSE_MEMBERS = {
+    "secretsmanager": ["SecretString", "SecretBinary"],
+    "ssm": ["Value"],
+    "sts": ["SecretAccessKey", "SessionToken"]
+}
+# URL query parameters and HTTP response members (JSON or form encoded) which hold credentials, compared without case.
+# Shodan and other APIs take their key in the query string, OAuth token endpoints such as Entra ID and Salesforce
+# return bearer tokens in the response body
+REDACTED_QUERY_PARAMETERS = [
+    "key", "apikey", "api_key", "access_token", "token", "client_secret", "password", "secret", "signature", "sig",
+    "x-amz-credential", "x-amz-security-token", "x-amz-signature"
+]
+REDACTED_HTTP_MEMBERS = [
+    "access_token", "refresh_token", "id_token", "client_secret", "password", "token", "signature"
+]
+# HTTP response headers which are never written to a bundle
+REDACTED_HTTP_HEADERS = ["set-cookie"]
+
+class FixtureMissingError(KeyError):
+    """
+    Raised by a `strict` replay for an SDK or HTTP call that was never recorded
+    """
+
+def encode_fixture_value(value):
+    """
+    Converts SDK parameters and parsed responses to JSON types, bytes and datetimes are kept as tagged objects
+    """
+    if isinstance(value, dict):
+        return {str(k): encode_fixture_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_fixture_value(v) for v in value]
+    if isinstance(value, bytes):
+        return {"__bytes__": b64encode(value).decode("ascii")}
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+
+    return str(value)
+
+def decode_fixture_value(value: dict):
+    """
+    JSON `object_hook` which restores the values encoded by `encode_fixture_value`, recorded streaming bodies are
+    served as a new StreamingBody every time they are decoded
+    """
+    if len(value) == 1:
+        if "__bytes__" in value:
+            return b64decode(value["__bytes__"])
+        if "__datetime__" in value:
+            return datetime.fromisoformat(value["__datetime__"])
+        if "__stream__" in value:
+            data = b64decode(value["__stream__"])
+            return StreamingBody(BytesIO(data), len(data))
+
+    return value
+
+def fixture_key(*parts) -> str:
+    """
+    Returns the bundle key of a call from its identifying parts, parameters are canonicalized so that the key does not
+    depend on keyword order
+    """
+    canonical = json.dumps(encode_fixture_value(parts), sort_keys=True, separators=(",", ":"))
+
+    return sha256(canonical.encode("utf-8")).hexdigest()
+
+def redact_response(serviceName: str, parsed):
+    """
+    Replaces the values of the members in `REDACTED_RESPONSE_MEMBERS` for the service, wherever they are nested
+    """
+    members = REDACTED_RESPONSE_MEMBERS.get(serviceName)
+    if not members:
+        return parsed
+    if isinstance(parsed, dict):
+        return {k: "REDACTED" if k in members else redact_response(serviceName, v) for k, v in parsed.items()}
+    if isinstance(parsed, list):
+        return [redact_response(serviceName, v) for v in parsed]
+
+    return parsed
+
+def redact_url(url: str) -> str:
+    """
+    Replaces the values of the query parameters in `REDACTED_QUERY_PARAMETERS`
+    """
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = [
+        (name, "REDACTED" if name.lower() in REDACTED_QUERY_PARAMETERS else value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+    ]
+
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def redact_http_members(value):
+    """
+    Replaces the values of the members in `REDACTED_HTTP_MEMBERS`, wherever they are nested
+    """
+    if isinstance(value, dict):
+        return {
+            k: "REDACTED" if str(k).lower() in REDACTED_HTTP_MEMBERS else redact_http_members(v) for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [redact_http_members(v) for v in value]
+
+    return value
+
+def redact_http_content(content: bytes, contentType: str | None) -> bytes:
+    """
+    Redacts the credentials in a JSON or form encoded HTTP response body, other bodies are returned as-is
+    """
+    contentType = (contentType or "").lower()
+    if not content:
+        return content
+    if "json" in contentType:
+        try:
+            document = json.loads(content)
+        except ValueError:
+            return content
+        return json.dumps(redact_http_members(document)).encode("utf-8")
+    if "application/x-www-form-urlencoded" in contentType:
+        fields = parse_qsl(content.decode("utf-8", "replace"), keep_blank_values=True)
+        return urlencode(
+            [(name, "REDACTED" if name.lower() in REDACTED_HTTP_MEMBERS else value) for name, value in fields]
+        ).encode("utf-8")
+
+    return content
+
+class FixtureBundle(object):
+    """
+    Recorded SDK and HTTP responses keyed by the call that produced them. A call that was made several times is served
+    its responses in the order they were recorded, the last one is repeated once they are used up
+    """
+
+    def __init__(self, calls: dict | None = None):
+        # key -> {"Request": {...}, "Responses": [{...}]}, responses are kept in their encoded form
+        self.calls = calls if calls is not None else {}
+        self._cursors = {}
+        self._lock = Lock()
+
+    def __len__(self):
+        return sum(len(call["Responses"]) for call in self.calls.values())
+
+    def add(self, key: str, request: dict, response: dict) -> None:
+        """
+        Appends an encoded response for a call
+        """
+        with self._lock:
+            call = self.calls.setdefault(key, {"Request": request, "Responses": []})
+            call["Responses"].append(response)
+
+    def add_botocore_response(self, serviceName: str, operationName: str, regionName: str, params: dict, parsed: dict, statusCode: int = 200) -> None:
+        """
+        Adds the parsed response of an SDK call, `params` are the keyword arguments the client method is called with,
+        `serviceName` is the Boto3 client name and `regionName` is the client's Region (aws-global for IAM and the
+        other global endpoints)
+        """
+        self.add(
+            fixture_key("botocore", serviceName, operationName, regionName, params),
+            encode_fixture_value(
+                {
+                    "Service": serviceName,
+                    "Operation": operationName,
+                    "Region": regionName,
+                    "Params": params
+                }
+            ),
+            {
+                "StatusCode": statusCode,
+                "Parsed": encode_fixture_value(parsed)
+            }
+        )
+
+    def add_botocore_error(self, serviceName: str, operationName: str, regionName: str, params: dict, errorCode: str, message: str = "", statusCode: int = 400) -> None:
+        """
+        Adds an error response for an SDK call, it is raised by the client as a ClientError with `errorCode`
+        """
+        self.add_botocore_response(
+            serviceName,
+            operationName,
+            regionName,
+            params,
+            {
+                "Error": {"Code": errorCode, "Message": message},
+                "ResponseMetadata": {"HTTPStatusCode": statusCode}
+            },
+            statusCode
+        )
+
+    def add_http_response(self, method: str, url: str, body, statusCode: int, headers: dict, content: bytes, reason: str = "") -> None:
+        """
+        Adds the response of a raw HTTP request made with Requests, the URL is redacted as it is when recording
+        """
+        url = redact_url(url)
+        self.add(
+            fixture_key("http", method.upper(), url, body),
+            encode_fixture_value(
+                {
+                    "Method": method.upper(),
+                    "Url": url
+                }
+            ),
+            {
+                "StatusCode": statusCode,
+                "Reason": reason,
+                "Headers": dict(headers),
+                "Content": encode_fixture_value(content)
+            }
+        )
+
+    def next_response(self, key: str) -> dict | None:
+        """
+        Returns the next decoded response for a call, or None if the call was never recorded
+        """
+        with self._lock:
+            call = self.calls.get(key)
+            if call is None:
+                return None
+            index = self._cursors.get(key, 0)
+            self._cursors[key] = index + 1
+            response = call["Responses"][min(index, len(call["Responses"]) - 1)]
+
+        # decoding through JSON hands every caller its own copy, Collectors and Checks mutate what they receive
+        return json.loads(json.dumps(response), object_hook=decode_fixture_value)
+
+    def rewind(self) -> None:
+        """
+        Serves every call from its first recorded response again
+        """
+        with self._lock:
+            self._cursors.clear()
+
+    def save(self, filePath: str) -> None:
+        """
+        Writes the bundle to a JSON file, the file is replaced atomically
+        """
+        directory = path.dirname(path.abspath(filePath))
+        makedirs(directory, exist_ok=True)
+        tempPath = f"{filePath}.tmp"
+        with self._lock:
+            with open(tempPath, "w") as jsonfile:
+                json.dump(
+                    {
+                        "Version": FIXTURE_BUNDLE_VERSION,
+                        "Calls": self.calls
+                    },
+                    jsonfile
+                )
+        replace(tempPath, filePath)
+
+    @classmethod
+    def load(cls, filePath: str):
+        """
+        Reads a bundle written by `save()`
+        """
+        with open(filePath) as jsonfile:
+            bundle = json.load(jsonfile)
+
+        if bundle.get("Version") != FIXTURE_BUNDLE_VERSION:
+            raise ValueError(f"Fixture bundle {filePath} is version {bundle.get('Version')}, expected {FIXTURE_BUNDLE_VERSION}")
+
+        return cls(bundle["Calls"])
+
+class ReplayHarness(object):
+    """
+    Records the responses of every Boto3 call and every Requests HTTP call made while it is active into a
+    FixtureBundle, or replays them from one without touching the network. Replays are deterministic, optional
+    synthetic latency is drawn from a seeded generator. The harness hooks Boto3 Sessions as they are created, so it
+    must be entered before the Sessions and clients a run uses are created
+    """
+
+    def __init__(self, bundle: FixtureBundle | None = None, mode: str = REPLAY, latencyMs: float = 0, jitterMs: float = 0, seed: int = 0, strict: bool = False, bundlePath: str | None = None):
+        if mode not in [RECORD, REPLAY]:
+            raise ValueError(f"Replay harness mode must be {RECORD} or {REPLAY}, got {mode}")
+        self.bundle = bundle if bundle is not None else FixtureBundle()
+        self.mode = mode
+        self.latencyMs = latencyMs
+        self.jitterMs = jitterMs
+        self.strict = strict
+        # a recording is written here when the harness exits
+        self.bundlePath = bundlePath
+        # (kind, description) of every replayed call that was not in the bundle
+        self.missing = []
+        self._random = Random(seed)
+        self._lock = Lock()
+        self._patches = []
+
+    def __enter__(self):
+        harness = self
+        originalInit = boto3.session.Session.__init__
+
+        def _init(session, *args, **kwargs):
+            originalInit(session, *args, **kwargs)
+            harness.attach(session)
+
+        boto3.session.Session.__init__ = _init
+        self._patches.append((boto3.session.Session, "__init__", originalInit))
+        # the module-level boto3.client() Session was created before the harness, it is recreated on next use
+        self._patches.append((boto3, "DEFAULT_SESSION", boto3.DEFAULT_SESSION))
+        boto3.DEFAULT_SESSION = None
+
+        try:
+            from requests import Session
+        except ImportError:
+            logger.info("Requests is not installed, only Boto3 calls are %sed", self.mode)
+        else:
+            originalSend = Session.send
+
+            def _send(session, request, **kwargs):
+                return harness.handle_http(originalSend, session, request, **kwargs)
+
+            Session.send = _send
+            self._patches.append((Session, "send", originalSend))
+
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        for target, attribute, original in reversed(self._patches):
+            setattr(target, attribute, original)
+        self._patches.clear()
+
+        if self.mode == RECORD and self.bundlePath:
+            self.bundle.save(self.bundlePath)
+            logger.info("Recorded %s responses to fixture bundle %s", len(self.bundle), self.bundlePath)
+        if self.missing:
+            logger.warning("%s calls were not found in the fixture bundle", len(self.missing))
+
+        return False
+
+    def attach(self, session) -> None:
+        """
+        Registers the record or replay handlers on a Boto3 Session, clients copy the Session's handlers when they are
+        created so this has to happen before any client is
+        """
+        session.events.register("provide-client-params", self.capture_params, unique_id="replay-harness-params")
+        if self.mode == RECORD:
+            session.events.register("after-call", self.record_call, unique_id="replay-harness-record")
+        else:
+            session.events.register("before-call", self.replay_call, unique_id="replay-harness-replay")
+
+    def capture_params(self, params, model, context, **kwargs):
+        """
+        `provide-client-params` handler which keys the call by the parameters it was made with, before botocore
+        serializes them into a request
+        """
+        serviceName = model.service_model.service_name
+        regionName = context.get("client_region")
+        context["replay_harness"] = (
+            fixture_key("botocore", serviceName, model.name, regionName, params),
+            {
+                "Service": serviceName,
+                "Operation": model.name,
+                "Region": regionName,
+                "Params": encode_fixture_value(params)
+            }
+        )
+
+    def record_call(self, http_response, parsed, model, context, **kwargs):
+        """
+        `after-call` handler which adds the parsed response to the bundle. Streaming bodies are read into the bundle
+        and swapped for an in-memory copy so the caller can still read them
+        """
+        if "replay_harness" not in context:
+            return
+        key, request = context["replay_harness"]
+        streams = {}
+        for member, value in list(parsed.items()):
+            if isinstance(value, StreamingBody):
+                data = value.read()
+                parsed[member] = StreamingBody(BytesIO(data), len(data))
+                streams[member] = {"__stream__": b64encode(data).decode("ascii")}
+
+        recorded = encode_fixture_value(
+            redact_response(request["Service"], {k: v for k, v in parsed.items() if k not in streams})
+        )
+        recorded.update(streams)
+        self.bundle.add(
+            key,
+            request,
+            {
+                "StatusCode": http_response.status_code,
+                "Parsed": recorded
+            }
+        )
+
+    def replay_call(self, model, context, **kwargs):
+        """
+        `before-call` handler which short-circuits the call with its recorded response, error responses are raised by
+        botocore as the same ClientError that was recorded
+        """
+        if "replay_harness" not in context:
+            return None
+        key, request = context["replay_harness"]
+        self.inject_latency()
+        response = self.bundle.next_response(key)
+        if response is None:
+            description = f"{request['Service']}.{request['Operation']} in {request['Region']} with {request['Params']}"
+            self.record_miss("botocore", description)
+            response = {
+                "StatusCode": 400,
+                "Parsed": {
+                    "Error": {
+                        "Code": REPLAY_MISS_ERROR_CODE,
+                        "Message": f"No recorded response for {description}"
+                    },
+                    "ResponseMetadata": {"HTTPStatusCode": 400}
+                }
+            }
+
+        return AWSResponse(None, response["StatusCode"], {}, None), response["Parsed"]
+
+    def handle_http(self, send, session, request, **kwargs):
+        """
+        Stands in for `requests.Session.send`, recording the response of the real request or replaying it
+        """
+        from requests.models import Response
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers
+
+        # credentials in the query string are neither written to the bundle nor needed to replay the call
+        url = redact_url(request.url)
+        key = fixture_key("http", request.method.upper(), url, request.body)
+        if self.mode == RECORD:
+            response = send(session, request, **kwargs)
+            # reading the content buffers it, streamed responses remain readable by the caller
+            self.bundle.add(
+                key,
+                {"Method": request.method.upper(), "Url": url},
+                {
+                    "StatusCode": response.status_code,
+                    "Reason": response.reason,
+                    "Headers": {
+                        k: v for k, v in response.headers.items() if k.lower() not in REDACTED_HTTP_HEADERS
+                    },
+                    "Content": encode_fixture_value(
+                        redact_http_content(response.content, response.headers.get("Content-Type"))
+                    )
+                }
+            )
+            return response
+
+        self.inject_latency()
+        recorded = self.bundle.next_response(key)
+        if recorded is None:
+            self.record_miss("http", f"{request.method.upper()} {url}")
+            recorded = {"StatusCode": 404, "Reason": REPLAY_MISS_ERROR_CODE, "Headers": {}, "Content": b""}
+
+        response = Response()
+        response.status_code = recorded["StatusCode"]
+        response.reason = recorded["Reason"]
+        response.headers = CaseInsensitiveDict(recorded["Headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = recorded["Content"]
+        response._content_consumed = True
+        response.raw = BytesIO(recorded["Content"])
+        response.url = request.url
+        response.request = request
+
+        return response
+
+    def record_miss(self, kind: str, description: str) -> None:
+        """
+        Tracks a replayed call that is not in the bundle, raising when the harness is strict
+        """
+        with self._lock:
+            self.missing.append((kind, description))
+        if self.strict:
+            raise FixtureMissingError(description)
+        logger.debug("No recorded response for %s call %s", kind, description)
+
+    def inject_latency(self) -> None:
+        """
+        Sleeps for the configured synthetic latency plus a seeded random jitter before a call is replayed
+        """
+        if not self.latencyMs and not self.jitterMs:
+            return
+        with self._lock:
+            delayMs = self.latencyMs + self._random.uniform(0, self.jitterMs)
+        sleep(delayMs / 1000)
+
+def get_replay_harness(recordPath: str | None = None, replayPath: str | None = None, latencyMs: float = 0):
+    """
+    Returns the harness for a run that records to `recordPath` or replays from `replayPath`, or a no-op context
+    when neither is given
+    """
+    if recordPath and replayPath:
+        raise ValueError("A run can either record or replay a fixture bundle, not both")
+    if recordPath:
+        return ReplayHarness(mode=RECORD, bundlePath=recordPath)
+    if replayPath:
+        return ReplayHarness(FixtureBundle.load(replayPath), mode=REPLAY, latencyMs=latencyMs)
+
+    return nullcontext()
+
+# EOF
@@ -0,0 +1,824 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import base64
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from functools import cache
+from random import Random
+import botocore.session
+from botocore.validate import ParamValidator
+from collectors.aws_iam_collector import AUTHORIZATION_DETAILS_FILTER
+from collectors.azure_resource_graph_collector import RESOURCE_GRAPH_PAGE_SIZE
+from replay_harness import FixtureBundle
+
+# Page size of generated AWS list responses, which is the largest page most list APIs return
+SYNTHETIC_PAGE_SIZE = 1000
+# Compute Engine AggregatedList returns at most 500 instances per page
+GCP_PAGE_SIZE = 500
+SYNTHETIC_ACCOUNT_ID = "012345678901"
+SYNTHETIC_REGION = "us-east-1"
+# Timestamps are generated relative to a fixed date so that estates generated from the same seed are identical
+SYNTHETIC_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+CREDENTIAL_REPORT_COLUMNS = [
+    "user", "arn", "user_creation_time", "password_enabled", "password_last_used", "password_last_changed",
+    "password_next_rotation", "mfa_active", "access_key_1_active", "access_key_1_last_rotated",
+    "access_key_1_last_used_date", "access_key_1_last_used_region", "access_key_1_last_used_service",
+    "access_key_2_active", "access_key_2_last_rotated", "access_key_2_last_used_date",
+    "access_key_2_last_used_region", "access_key_2_last_used_service", "cert_1_active", "cert_1_last_rotated",
+    "cert_2_active", "cert_2_last_rotated"
+]
+EC2_INSTANCE_TYPES = ["t3.micro", "t3.large", "m5.xlarge", "m6i.2xlarge", "c6i.large", "r6g.xlarge"]
+AZURE_LOCATIONS = ["eastus", "eastus2", "westeurope", "northeurope", "southeastasia"]
+GCP_ZONES = ["us-central1-a", "us-central1-b", "us-east1-c", "europe-west1-b", "asia-southeast1-a"]
+# Controls attached to generated findings, the NIST CSF V1.1 ones are crosswalked by the Outputs
+SYNTHETIC_RELATED_REQUIREMENTS = [
+    "NIST CSF V1.1 PR.AC-1",
+    "NIST CSF V1.1 PR.DS-1",
+    "NIST SP 800-53 Rev. 4 AC-1",
+    "NIST SP 800-53 Rev. 4 SC-28",
+    "AICPA TSC CC6.1",
+    "ISO 27001:2013 A.9.2.1"
+]
+
+@cache
+def get_output_shape(serviceName: str, operationName: str):
+    """
+    Returns the botocore output shape of an operation, service models are loaded once
+    """
+    return botocore.session.get_session().get_service_model(serviceName).operation_model(operationName).output_shape
+
+def validate_response(serviceName: str, operationName: str, parsed: dict) -> None:
+    """
+    Validates a generated response against the botocore output shape of the operation, raising ValueError for
+    unknown members, missing required members and wrongly typed values
+    """
+    report = ParamValidator().validate(parsed, get_output_shape(serviceName, operationName))
+    if report.has_errors():
+        raise ValueError(f"Synthetic {serviceName} {operationName} response is not schema-valid: {report.generate_report()}")
+
+class SyntheticEstate(object):
+    """
+    Generates realistic cloud inventories of any size from a seed. AWS resources are written to a FixtureBundle as
+    the responses the Auditors and Collectors request, so a scan of them is served by the ReplayHarness. Azure rows
+    are served through the Resource Graph `queryFunc`, GCP resources are returned as Compute Engine API pages, and
+    ASFF findings are generated directly for the Outputs. The same seed always produces the same estate
+    """
+
+    def __init__(self, seed: int = 0, accountId: str = SYNTHETIC_ACCOUNT_ID, region: str = SYNTHETIC_REGION, partition: str = "aws", validate: bool = True):
+        self.seed = seed
+        self.accountId = accountId
+        self.region = region
+        self.partition = partition
+        # every AWS response is checked against its botocore output shape when True
+        self.validate = validate
+        self.random = Random(seed)
+
+    def timestamp(self, maxDaysAgo: int = 720) -> datetime:
+        """
+        Returns a random UTC time before the synthetic epoch, to the second as the IAM Credential Report is
+        """
+        return SYNTHETIC_EPOCH - timedelta(seconds=self.random.randint(0, maxDaysAgo * 86400))
+
+    def chance(self, probability: float) -> bool:
+        return self.random.random() < probability
+
+    def hex_id(self, length: int) -> str:
+        return f"{self.random.getrandbits(length * 4):0{length}x}"
+
+    def uuid(self) -> str:
+        value = self.hex_id(32)
+        return f"{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}"
+
+    def ip_address(self, firstOctet: int = 10) -> str:
+        return f"{firstOctet}.{self.random.randint(0, 255)}.{self.random.randint(0, 255)}.{self.random.randint(1, 254)}"
+
+    def add_response(self, bundle: FixtureBundle, serviceName: str, operationName: str, regionName: str, params: dict, parsed: dict) -> None:
+        """
+        Validates (when enabled) and adds a generated response to the bundle
+        """
+        if self.validate:
+            validate_response(serviceName, operationName, parsed)
+        bundle.add_botocore_response(serviceName, operationName, regionName, params, parsed)
+
+    def add_pages(self, bundle: FixtureBundle, serviceName: str, operationName: str, regionName: str, params: dict, items: list, itemKey: str, tokenKey: str, outputTokenKey: str | None = None, truncatedKey: str | None = None, extra: dict | None = None) -> None:
+        """
+        Splits `items` into pages chained together by pagination tokens, in the same way a botocore paginator
+        requests them, `tokenKey` is the input token and `outputTokenKey` the output token when they differ
+        """
+        pages = [items[start:start + SYNTHETIC_PAGE_SIZE] for start in range(0, len(items), SYNTHETIC_PAGE_SIZE)] or [[]]
+        for pageNumber, page in enumerate(pages):
+            pageParams = dict(params)
+            if pageNumber:
+                pageParams[tokenKey] = f"{operationName}-{pageNumber}"
+            response = {itemKey: page, **(extra or {})}
+            hasMore = pageNumber + 1 < len(pages)
+            if hasMore:
+                response[outputTokenKey or tokenKey] = f"{operationName}-{pageNumber + 1}"
+            if truncatedKey:
+                response[truncatedKey] = hasMore
+            self.add_response(bundle, serviceName, operationName, regionName, pageParams, response)
+
+    # Amazon Web Services
+
+    def add_iam_users(self, bundle: FixtureBundle, count: int) -> list:
+        """
+        Adds `count` IAM Users with passwords, MFA, Access Keys and policies to the bundle as the
+        GetAccountAuthorizationDetails pages, Credential Report and ListAccessKeys responses the IAM Collector reads.
+        IAM is global so the responses are for the aws-global Region. Returns the User names
+        """
+        globalRegion = "aws-global" if self.partition == "aws" else f"{self.partition}-global"
+        userDetails = []
+        reportRows = [",".join(CREDENTIAL_REPORT_COLUMNS)]
+        for index in range(count):
+            userName = f"synthetic-user-{index:06d}"
+            userArn = f"arn:{self.partition}:iam::{self.accountId}:user/{userName}"
+            createDate = self.timestamp()
+            hasPassword = self.chance(0.6)
+            hasMfa = hasPassword and self.chance(0.7)
+            keyCount = self.random.choices([0, 1, 2], weights=[4, 5, 1])[0]
+
+            userDetail = {
+                "Path": "/",
+                "UserName": userName,
+                "UserId": f"AIDA{self.hex_id(16).upper()}",
+                "Arn": userArn,
+                "CreateDate": createDate,
+                "UserPolicyList": [],
+                "GroupList": [],
+                "AttachedManagedPolicies": [],
+                "Tags": [{"Key": "team", "Value": self.random.choice(["platform", "data", "security", "web"])}]
+            }
+            if self.chance(0.1):
+                userDetail["UserPolicyList"].append(
+                    {
+                        "PolicyName": "inline",
+                        "PolicyDocument": json.dumps(
+                            {"Version": "2012-10-17", "Statement": [{"Effect": "Allow", "Action": "s3:GetObject", "Resource": "*"}]}
+                        )
+                    }
+                )
+            if self.chance(0.3):
+                userDetail["AttachedManagedPolicies"].append(
+                    {"PolicyName": "ReadOnlyAccess", "PolicyArn": f"arn:{self.partition}:iam::aws:policy/ReadOnlyAccess"}
+                )
+            userDetails.append(userDetail)
+
+            keyColumns = []
+            accessKeys = []
+            for keyNumber in range(2):
+                if keyNumber < keyCount:
+                    keyCreateDate = createDate + timedelta(days=keyNumber)
+                    lastUsed = self.timestamp(90).isoformat() if self.chance(0.8) else "N/A"
+                    accessKeys.append(
+                        {
+                            "UserName": userName,
+                            "AccessKeyId": f"AKIA{self.hex_id(16).upper()}",
+                            "Status": "Active",
+                            "CreateDate": keyCreateDate
+                        }
+                    )
+                    keyColumns.extend(
+                        ["true", keyCreateDate.isoformat(), lastUsed, self.region if lastUsed != "N/A" else "N/A", "s3" if lastUsed != "N/A" else "N/A"]
+                    )
+                else:
+                    keyColumns.extend(["false", "N/A", "N/A", "N/A", "N/A"])
+            if accessKeys:
+                self.add_response(
+                    bundle,
+                    "iam",
+                    "ListAccessKeys",
+                    globalRegion,
+                    {"UserName": userName},
+                    {"AccessKeyMetadata": accessKeys, "IsTruncated": False}
+                )
+
+            reportRows.append(
+                ",".join(
+                    [
+                        userName,
+                        userArn,
+                        createDate.isoformat(),
+                        str(hasPassword).lower(),
+                        self.timestamp(30).isoformat() if hasPassword else "N/A",
+                        "N/A",
+                        "N/A",
+                        str(hasMfa).lower(),
+                        *keyColumns,
+                        "false",
+                        "N/A",
+                        "false",
+                        "N/A"
+                    ]
+                )
+            )
+
+        self.add_pages(
+            bundle,
+            "iam",
+            "GetAccountAuthorizationDetails",
+            globalRegion,
+            {"Filter": AUTHORIZATION_DETAILS_FILTER},
+            userDetails,
+            "UserDetailList",
+            "Marker",
+            truncatedKey="IsTruncated",
+            extra={"GroupDetailList": [], "RoleDetailList": [], "Policies": []}
+        )
+        self.add_response(bundle, "iam", "GenerateCredentialReport", globalRegion, {}, {"State": "COMPLETE"})
+        self.add_response(
+            bundle,
+            "iam",
+            "GetCredentialReport",
+            globalRegion,
+            {},
+            {
+                "Content": ("\n".join(reportRows) + "\n").encode("utf-8"),
+                "ReportFormat": "text/csv",
+                "GeneratedTime": SYNTHETIC_EPOCH
+            }
+        )
+
+        return [userDetail["UserName"] for userDetail in userDetails]
+
+    def ec2_instance(self, index: int) -> dict:
+        """
+        Returns a single instance in the DescribeInstances schema
+        """
+        instanceId = f"i-{self.hex_id(17)}"
+        subnetId = f"subnet-{self.hex_id(17)}"
+        vpcId = f"vpc-{self.hex_id(17)}"
+        privateIp = self.ip_address()
+        running = self.chance(0.85)
+        instance = {
+            "AmiLaunchIndex": 0,
+            "ImageId": f"ami-{self.hex_id(17)}",
+            "InstanceId": instanceId,
+            "InstanceType": self.random.choice(EC2_INSTANCE_TYPES),
+            "LaunchTime": self.timestamp(365),
+            "Monitoring": {"State": "disabled"},
+            "Placement": {"AvailabilityZone": f"{self.region}{self.random.choice('abc')}", "GroupName": "", "Tenancy": "default"},
+            "PrivateDnsName": f"ip-{privateIp.replace('.', '-')}.ec2.internal",
+            "PrivateIpAddress": privateIp,
+            "ProductCodes": [],
+            "PublicDnsName": "",
+            "State": {"Code": 16, "Name": "running"} if running else {"Code": 80, "Name": "stopped"},
+            "SubnetId": subnetId,
+            "VpcId": vpcId,
+            "Architecture": "x86_64",
+            "BlockDeviceMappings": [
+                {
+                    "DeviceName": "/dev/xvda",
+                    "Ebs": {
+                        "AttachTime": self.timestamp(365),
+                        "DeleteOnTermination": True,
+                        "Status": "attached",
+                        "VolumeId": f"vol-{self.hex_id(17)}"
+                    }
+                }
+            ],
+            "EbsOptimized": False,
+            "EnaSupport": True,
+            "Hypervisor": "xen",
+            "NetworkInterfaces": [
+                {
+                    "Attachment": {"AttachmentId": f"eni-attach-{self.hex_id(17)}", "DeleteOnTermination": True, "DeviceIndex": 0, "Status": "attached"},
+                    "Groups": [{"GroupName": "default", "GroupId": f"sg-{self.hex_id(17)}"}],
+                    "NetworkInterfaceId": f"eni-{self.hex_id(17)}",
+                    "OwnerId": self.accountId,
+                    "PrivateIpAddress": privateIp,
+                    "SourceDestCheck": True,
+                    "Status": "in-use",
+                    "SubnetId": subnetId,
+                    "VpcId": vpcId
+                }
+            ],
+            "RootDeviceName": "/dev/xvda",
+            "RootDeviceType": "ebs",
+            "SecurityGroups": [{"GroupName": "default", "GroupId": f"sg-{self.hex_id(17)}"}],
+            "SourceDestCheck": True,
+            "Tags": [{"Key": "Name", "Value": f"synthetic-instance-{index:06d}"}],
+            "VirtualizationType": "hvm",
+            "MetadataOptions": {
+                "State": "applied",
+                "HttpTokens": "required" if self.chance(0.6) else "optional",
+                "HttpPutResponseHopLimit": self.random.choice([1, 2]),
+                "HttpEndpoint": "enabled",
+                "InstanceMetadataTags": "disabled"
+            },
+            "PlatformDetails": "Linux/UNIX",
+            "UsageOperation": "RunInstances"
+        }
+        if running and self.chance(0.2):
+            publicIp = self.ip_address(self.random.choice([3, 18, 34, 54]))
+            instance["PublicIpAddress"] = publicIp
+            instance["PublicDnsName"] = f"ec2-{publicIp.replace('.', '-')}.compute-1.amazonaws.com"
+        if self.chance(0.7):
+            instance["IamInstanceProfile"] = {
+                "Arn": f"arn:{self.partition}:iam::{self.accountId}:instance-profile/synthetic-profile",
+                "Id": f"AIPA{self.hex_id(16).upper()}"
+            }
+
+        return instance
+
+    def add_ec2_instances(self, bundle: FixtureBundle, count: int) -> list:
+        """
+        Adds `count` EC2 instances to the bundle as the DescribeInstances pages the EC2 Auditor requests along with
+        the Systems Manager inventory it joins them with. Returns the instance IDs
+        """
+        reservations = []
+        managedInstances = []
+        instanceIds = []
+        index = 0
+        while index < count:
+            reservation = {
+                "ReservationId": f"r-{self.hex_id(17)}",
+                "OwnerId": self.accountId,
+                "Groups": [],
+                "Instances": []
+            }
+            for _ in range(min(self.random.randint(1, 3), count - index)):
+                instance = self.ec2_instance(index)
+                reservation["Instances"].append(instance)
+                instanceIds.append(instance["InstanceId"])
+                if self.chance(0.5):
+                    managedInstances.append(
+                        {
+                            "InstanceId": instance["InstanceId"],
+                            "PingStatus": "Online",
+                            "LastPingDateTime": SYNTHETIC_EPOCH,
+                            "AgentVersion": "3.3.40.0",
+                            "IsLatestVersion": self.chance(0.5),
+                            "PlatformType": "Linux",
+                            "PlatformName": "Amazon Linux",
+                            "PlatformVersion": "2023",
+                            "ResourceType": "EC2Instance",
+                            "IPAddress": instance["PrivateIpAddress"],
+                            "ComputerName": instance["PrivateDnsName"]
+                        }
+                    )
+                index += 1
+            reservations.append(reservation)
+
+        self.add_pages(
+            bundle,
+            "ec2",
+            "DescribeInstances",
+            self.region,
+            {"Filters": [{"Name": "instance-state-name", "Values": ["running", "stopped"]}]},
+            reservations,
+            "Reservations",
+            "NextToken"
+        )
+        self.add_response(
+            bundle, "ssm", "DescribeInstanceInformation", self.region, {}, {"InstanceInformationList": managedInstances}
+        )
+
+        return instanceIds
+
+    def add_s3_buckets(self, bundle: FixtureBundle, count: int) -> list:
+        """
+        Adds `count` S3 buckets to the bundle as the ListBuckets pages and per-bucket configuration responses the
+        S3 Auditor and Collector request, sub-resources that are not configured are error responses as they are in
+        S3. The account-level Public Access Block is included. Returns the bucket names
+        """
+        buckets = []
+        for index in range(count):
+            bucketName = f"synthetic-bucket-{self.seed}-{index:06d}"
+            buckets.append({"Name": bucketName, "CreationDate": self.timestamp(), "BucketRegion": self.region})
+            params = {"Bucket": bucketName}
+
+            self.add_response(
+                bundle,
+                "s3",
+                "GetBucketEncryption",
+                self.region,
+                params,
+                {
+                    "ServerSideEncryptionConfiguration": {
+                        "Rules": [
+                            {
+                                "ApplyServerSideEncryptionByDefault": {"SSEAlgorithm": "aws:kms" if self.chance(0.3) else "AES256"},
+                                "BucketKeyEnabled": True
+                            }
+                        ]
+                    }
+                }
+            )
+            if self.chance(0.4):
+                self.add_response(
+                    bundle,
+                    "s3",
+                    "GetBucketLifecycleConfiguration",
+                    self.region,
+                    params,
+                    {"Rules": [{"ID": "expire", "Status": "Enabled", "Filter": {"Prefix": ""}, "Expiration": {"Days": 365}}]}
+                )
+            else:
+                bundle.add_botocore_error("s3", "GetBucketLifecycleConfiguration", self.region, params, "NoSuchLifecycleConfiguration", statusCode=404)
+            self.add_response(
+                bundle, "s3", "GetBucketVersioning", self.region, params, {"Status": "Enabled"} if self.chance(0.5) else {}
+            )
+            if self.chance(0.5):
+                isPublic = self.chance(0.05)
+                self.add_response(
+                    bundle,
+                    "s3",
+                    "GetBucketPolicy",
+                    self.region,
+                    params,
+                    {
+                        "Policy": json.dumps(
+                            {
+                                "Version": "2012-10-17",
+                                "Statement": [
+                                    {
+                                        "Sid": "DenyInsecureTransport",
+                                        "Effect": "Deny",
+                                        "Principal": "*",
+                                        "Action": "s3:*",
+                                        "Resource": [f"arn:{self.partition}:s3:::{bucketName}", f"arn:{self.partition}:s3:::{bucketName}/*"],
+                                        "Condition": {"Bool": {"aws:SecureTransport": "false"}}
+                                    },
+                                    {
+                                        "Sid": "Read",
+                                        "Effect": "Allow",
+                                        "Principal": "*" if isPublic else {"AWS": f"arn:{self.partition}:iam::{self.accountId}:root"},
+                                        "Action": "s3:GetObject",
+                                        "Resource": f"arn:{self.partition}:s3:::{bucketName}/*"
+                                    }
+                                ]
+                            }
+                        )
+                    }
+                )
+                self.add_response(bundle, "s3", "GetBucketPolicyStatus", self.region, params, {"PolicyStatus": {"IsPublic": isPublic}})
+            else:
+                bundle.add_botocore_error("s3", "GetBucketPolicy", self.region, params, "NoSuchBucketPolicy", statusCode=404)
+                bundle.add_botocore_error("s3", "GetBucketPolicyStatus", self.region, params, "NoSuchBucketPolicy", statusCode=404)
+            self.add_response(
+                bundle,
+                "s3",
+                "GetBucketLogging",
+                self.region,
+                params,
+                {"LoggingEnabled": {"TargetBucket": f"synthetic-logs-{self.seed}", "TargetPrefix": f"{bucketName}/"}} if self.chance(0.3) else {}
+            )
+            self.add_response(
+                bundle,
+                "s3",
+                "GetPublicAccessBlock",
+                self.region,
+                params,
+                {
+                    "PublicAccessBlockConfiguration": {
+                        "BlockPublicAcls": True,
+                        "IgnorePublicAcls": True,
+                        "BlockPublicPolicy": True,
+                        "RestrictPublicBuckets": True
+                    }
+                }
+            )
+
+        self.add_pages(
+            bundle,
+            "s3",
+            "ListBuckets",
+            self.region,
+            {},
+            buckets,
+            "Buckets",
+            "ContinuationToken",
+            extra={"Owner": {"DisplayName": "synthetic", "ID": self.hex_id(64)}}
+        )
+        self.add_response(
+            bundle,
+            "s3control",
+            "GetPublicAccessBlock",
+            self.region,
+            {"AccountId": self.accountId},
+            {
+                "PublicAccessBlockConfiguration": {
+                    "BlockPublicAcls": True,
+                    "IgnorePublicAcls": True,
+                    "BlockPublicPolicy": True,
+                    "RestrictPublicBuckets": True
+                }
+            }
+        )
+
+        return [bucket["Name"] for bucket in buckets]
+
+    # Microsoft Azure
+
+    def azure_resources(self, resourceType: str, count: int, subscriptionIds: list) -> list:
+        """
+        Returns `count` Resource Graph rows of a resource type (virtual machines, storage accounts or SQL servers)
+        spread across the Subscriptions, in the ARM schema and with the columns `get_resources_by_type` projects
+        """
+        resourceType = resourceType.lower()
+        providerType = {
+            "microsoft.compute/virtualmachines": "Microsoft.Compute/virtualMachines",
+            "microsoft.storage/storageaccounts": "Microsoft.Storage/storageAccounts",
+            "microsoft.sql/servers": "Microsoft.Sql/servers"
+        }[resourceType]
+        rows = []
+        for index in range(count):
+            subscriptionId = subscriptionIds[index % len(subscriptionIds)]
+            resourceGroup = f"synthetic-rg-{index % 25:02d}"
+            name = f"synthetic{providerType.split('/')[1].lower()[:8]}{index:06d}"
+            row = {
+                "id": f"/subscriptions/{subscriptionId}/resourceGroups/{resourceGroup}/providers/{providerType}/{name}",
+                "name": name,
+                "type": resourceType,
+                "kind": "",
+                "location": self.random.choice(AZURE_LOCATIONS),
+                "resourceGroup": resourceGroup,
+                "subscriptionId": subscriptionId,
+                "managedBy": "",
+                "sku": None,
+                "plan": None,
+                "properties": {},
+                "tags": {"team": self.random.choice(["platform", "data", "security", "web"])},
+                "identity": None,
+                "zones": None,
+                "extendedLocation": None
+            }
+            if resourceType == "microsoft.compute/virtualmachines":
+                row["zones"] = [self.random.choice(["1", "2", "3"])]
+                row["properties"] = {
+                    "vmId": self.uuid(),
+                    "hardwareProfile": {"vmSize": self.random.choice(["Standard_B2s", "Standard_D2s_v5", "Standard_E4s_v5"])},
+                    "storageProfile": {
+                        "osDisk": {
+                            "osType": "Linux",
+                            "name": f"{name}_OsDisk",
+                            "createOption": "FromImage",
+                            "caching": "ReadWrite",
+                            "managedDisk": {"storageAccountType": "Premium_LRS"},
+                            "diskSizeGB": 30
+                        },
+                        "dataDisks": []
+                    },
+                    "osProfile": {
+                        "computerName": name,
+                        "adminUsername": "azureuser",
+                        "linuxConfiguration": {"disablePasswordAuthentication": self.chance(0.8), "provisionVMAgent": True}
+                    },
+                    "securityProfile": {
+                        "securityType": "TrustedLaunch",
+                        "uefiSettings": {"secureBootEnabled": self.chance(0.7), "vTpmEnabled": True}
+                    },
+                    "networkProfile": {
+                        "networkInterfaces": [{"id": f"/subscriptions/{subscriptionId}/resourceGroups/{resourceGroup}/providers/Microsoft.Network/networkInterfaces/{name}-nic"}]
+                    },
+                    "diagnosticsProfile": {"bootDiagnostics": {"enabled": self.chance(0.5)}},
+                    "provisioningState": "Succeeded"
+                }
+            elif resourceType == "microsoft.storage/storageaccounts":
+                row["kind"] = "StorageV2"
+                row["sku"] = {"name": self.random.choice(["Standard_LRS", "Standard_GRS", "Standard_ZRS"]), "tier": "Standard"}
+                row["properties"] = {
+                    "minimumTlsVersion": "TLS1_2" if self.chance(0.8) else "TLS1_0",
+                    "allowBlobPublicAccess": self.chance(0.1),
+                    "supportsHttpsTrafficOnly": True,
+                    "publicNetworkAccess": "Enabled" if self.chance(0.6) else "Disabled",
+                    "encryption": {
+                        "keySource": "Microsoft.Storage",
+                        "services": {"blob": {"enabled": True, "keyType": "Account"}, "file": {"enabled": True, "keyType": "Account"}}
+                    },
+                    "networkAcls": {"defaultAction": "Allow" if self.chance(0.5) else "Deny", "bypass": "AzureServices", "ipRules": [], "virtualNetworkRules": []},
+                    "creationTime": self.timestamp().isoformat(),
+                    "provisioningState": "Succeeded"
+                }
+            else:
+                row["kind"] = "v12.0"
+                row["properties"] = {
+                    "administratorLogin": "sqladmin",
+                    "version": "12.0",
+                    "state": "Ready",
+                    "fullyQualifiedDomainName": f"{name}.database.windows.net",
+                    "minimalTlsVersion": "1.2",
+                    "publicNetworkAccess": "Enabled" if self.chance(0.4) else "Disabled",
+                    "restrictOutboundNetworkAccess": "Disabled"
+                }
+            rows.append(row)
+
+        return rows
+
+    def resource_graph_query_func(self, rows: list):
+        """
+        Returns a `queryFunc` for `enable_resource_graph` which serves the rows of the queried resource type in
+        Resource Graph sized pages, skip tokens are the offset of the next page
+        """
+        rowsByType = {}
+        for row in rows:
+            rowsByType.setdefault(row["type"], []).append(row)
+
+        def synthetic_query(azureCredential, subscriptions: list, query: str, skipToken: str | None):
+            resourceType = re.search(r"type =~ '([^']+)'", query).group(1).lower()
+            subscriptionIds = {subscription.lower() for subscription in subscriptions}
+            matching = [row for row in rowsByType.get(resourceType, []) if row["subscriptionId"].lower() in subscriptionIds]
+            offset = int(skipToken or 0)
+            nextOffset = offset + RESOURCE_GRAPH_PAGE_SIZE
+
+            return matching[offset:nextOffset], str(nextOffset) if nextOffset < len(matching) else None
+
+        return synthetic_query
+
+    # Google Cloud Platform
+
+    def gcp_compute_instance_pages(self, projectId: str, count: int) -> list:
+        """
+        Returns `count` Compute Engine instances as the response pages of `instances().aggregatedList()`, which
+        can be served to the Google API client with googleapiclient.http.HttpMockSequence
+        """
+        projectNumber = str(self.random.randint(10**11, 10**12 - 1))
+        computeUrl = f"https://www.googleapis.com/compute/v1/projects/{projectId}"
+        pages = []
+        for start in range(0, max(count, 1), GCP_PAGE_SIZE):
+            items = {}
+            for index in range(start, min(start + GCP_PAGE_SIZE, count)):
+                zone = self.random.choice(GCP_ZONES)
+                region = zone.rsplit("-", 1)[0]
+                name = f"synthetic-instance-{index:06d}"
+                networkInterface = {
+                    "kind": "compute#networkInterface",
+                    "network": f"{computeUrl}/global/networks/default",
+                    "subnetwork": f"{computeUrl}/regions/{region}/subnetworks/default",
+                    "networkIP": self.ip_address(),
+                    "name": "nic0",
+                    "fingerprint": self.hex_id(16),
+                    "stackType": "IPV4_ONLY"
+                }
+                if self.chance(0.3):
+                    networkInterface["accessConfigs"] = [
+                        {
+                            "kind": "compute#accessConfig",
+                            "type": "ONE_TO_ONE_NAT",
+                            "name": "External NAT",
+                            "natIP": self.ip_address(self.random.choice([34, 35])),
+                            "networkTier": "PREMIUM"
+                        }
+                    ]
+                items.setdefault(f"zones/{zone}", {"instances": []})["instances"].append(
+                    {
+                        "kind": "compute#instance",
+                        "id": str(self.random.getrandbits(63)),
+                        "creationTimestamp": self.timestamp().isoformat(),
+                        "name": name,
+                        "description": "",
+                        "tags": {"items": ["http-server"] if self.chance(0.2) else [], "fingerprint": self.hex_id(16)},
+                        "machineType": f"{computeUrl}/zones/{zone}/machineTypes/{self.random.choice(['e2-medium', 'n2-standard-4', 'c3-standard-8'])}",
+                        "status": "RUNNING" if self.chance(0.85) else "TERMINATED",
+                        "zone": f"{computeUrl}/zones/{zone}",
+                        "canIpForward": self.chance(0.05),
+                        "networkInterfaces": [networkInterface],
+                        "disks": [
+                            {
+                                "kind": "compute#attachedDisk",
+                                "type": "PERSISTENT",
+                                "mode": "READ_WRITE",
+                                "source": f"{computeUrl}/zones/{zone}/disks/{name}",
+                                "deviceName": "persistent-disk-0",
+                                "index": 0,
+                                "boot": True,
+                                "autoDelete": True,
+                                "interface": "SCSI",
+                                "diskSizeGb": "10"
+                            }
+                        ],
+                        "metadata": {
+                            "kind": "compute#metadata",
+                            "fingerprint": self.hex_id(16),
+                            "items": [{"key": "enable-oslogin", "value": "TRUE" if self.chance(0.6) else "FALSE"}]
+                        },
+                        "serviceAccounts": [
+                            {
+                                "email": f"{projectNumber}-compute@developer.gserviceaccount.com",
+                                "scopes": ["https://www.googleapis.com/auth/cloud-platform"]
+                            }
+                        ],
+                        "selfLink": f"{computeUrl}/zones/{zone}/instances/{name}",
+                        "scheduling": {"onHostMaintenance": "MIGRATE", "automaticRestart": True, "preemptible": False, "provisioningModel": "STANDARD"},
+                        "cpuPlatform": "Intel Cascade Lake",
+                        "labelFingerprint": self.hex_id(16),
+                        "startRestricted": False,
+                        "deletionProtection": self.chance(0.3),
+                        "shieldedInstanceConfig": {"enableSecureBoot": self.chance(0.5), "enableVtpm": True, "enableIntegrityMonitoring": True},
+                        "shieldedInstanceIntegrityPolicy": {"updateAutoLearnPolicy": True},
+                        "confidentialInstanceConfig": {"enableConfidentialCompute": False},
+                        "fingerprint": self.hex_id(16),
+                        "lastStartTimestamp": self.timestamp(30).isoformat()
+                    }
+                )
+            pages.append(
+                {
+                    "kind": "compute#instanceAggregatedList",
+                    "id": f"projects/{projectId}/aggregated/instances",
+                    "items": items,
+                    "selfLink": f"{computeUrl}/aggregated/instances"
+                }
+            )
+        for pageNumber, page in enumerate(pages[:-1]):
+            page["nextPageToken"] = f"aggregatedList-{pageNumber + 1}"
+
+        return pages
+
+    # ASFF findings
+
+    def asff_findings(self, count: int, checksPerAsset: int = 5) -> list:
+        """
+        Returns `count` ASFF findings as the Auditors emit them, every asset is evaluated by `checksPerAsset` Checks
+        and each finding carries its own base64 encoded copy of the asset in `ProductFields.AssetDetails`
+        """
+        findings = []
+        iso8601Time = SYNTHETIC_EPOCH.isoformat()
+        asset = None
+        for index in range(count):
+            checkNumber = index % checksPerAsset
+            if checkNumber == 0:
+                asset = self.ec2_instance(index // checksPerAsset)
+                assetArn = f"arn:{self.partition}:ec2:{self.region}:{self.accountId}:instance/{asset['InstanceId']}"
+            passed = self.chance(0.7)
+            assetB64 = base64.b64encode(json.dumps(asset, default=str).encode("utf-8"))
+            findings.append(
+                {
+                    "SchemaVersion": "2018-10-08",
+                    "Id": f"{assetArn}/synthetic-check-{checkNumber}",
+                    "ProductArn": f"arn:{self.partition}:securityhub:{self.region}:{self.accountId}:product/{self.accountId}/default",
+                    "GeneratorId": f"{assetArn}/synthetic-check-{checkNumber}",
+                    "AwsAccountId": self.accountId,
+                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+                    "FirstObservedAt": iso8601Time,
+                    "CreatedAt": iso8601Time,
+                    "UpdatedAt": iso8601Time,
+                    "Severity": {"Label": "INFORMATIONAL" if passed else self.random.choice(["LOW", "MEDIUM", "HIGH", "CRITICAL"])},
+                    "Confidence": 99,
+                    "Title": f"[Synthetic.{checkNumber}] EC2 instances should pass synthetic check {checkNumber}",
+                    "Description": f"EC2 instance {asset['InstanceId']} {'passes' if passed else 'fails'} synthetic check {checkNumber}.",
+                    "Remediation": {
+                        "Recommendation": {
+                            "Text": "Synthetic findings are generated for scale testing and have no remediation.",
+                            "Url": "https://github.com/jonrau1/ElectricEye"
+                        }
+                    },
+                    "ProductFields": {
+                        "ProductName": "ElectricEye",
+                        "Provider": "AWS",
+                        "ProviderType": "CSP",
+                        "ProviderAccountId": self.accountId,
+                        "AssetRegion": self.region,
+                        "AssetDetails": assetB64,
+                        "AssetClass": "Compute",
+                        "AssetService": "Amazon EC2",
+                        "AssetComponent": "Instance"
+                    },
+                    "Resources": [
+                        {
+                            "Type": "AwsEc2Instance",
+                            "Id": assetArn,
+                            "Partition": self.partition,
+                            "Region": self.region,
+                            "Details": {
+                                "AwsEc2Instance": {
+                                    "Type": asset["InstanceType"],
+                                    "ImageId": asset["ImageId"],
+                                    "VpcId": asset["VpcId"],
+                                    "SubnetId": asset["SubnetId"],
+                                    "LaunchedAt": asset["LaunchTime"].isoformat()
+                                }
+                            }
+                        }
+                    ],
+                    "Compliance": {
+                        "Status": "PASSED" if passed else "FAILED",
+                        "RelatedRequirements": list(SYNTHETIC_RELATED_REQUIREMENTS)
+                    },
+                    "Workflow": {"Status": "RESOLVED" if passed else "NEW"},
+                    "RecordState": "ARCHIVED" if passed else "ACTIVE"
+                }
+            )
+
+        return findings
+
+# EOF
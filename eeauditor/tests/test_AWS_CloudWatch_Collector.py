@@ -0,0 +1,188 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import datetime
+import pytest
+
+import boto3
+from botocore.stub import Stubber
+
+from collectors.aws_cloudwatch_collector import (
+    get_metric_filter_alarm_index,
+    get_metric_window_totals,
+    metric_filter_has_alarm,
+    normalize_filter_pattern
+)
+from collectors.collector_base import get_pooled_client
+
+describe_metric_filters = {
+    "metricFilters": [
+        {
+            "filterName": "cloudtrail-changes",
+            "logGroupName": "cloudtrail-logs",
+            "filterPattern": "{($.eventName=CreateTrail)||($.eventName=UpdateTrail)||($.eventName=DeleteTrail)||($.eventName=StartLogging)||($.eventName=StopLogging)}",
+            "metricTransformations": [
+                {
+                    "metricName": "CloudTrailChanges",
+                    "metricNamespace": "CISBenchmark",
+                    "metricValue": "1"
+                }
+            ]
+        },
+        {
+            "filterName": "console-login-no-mfa",
+            "logGroupName": "cloudtrail-logs",
+            "filterPattern": '{ ($.eventName = "ConsoleLogin") && ($.additionalEventData.MFAUsed != "Yes") }',
+            "metricTransformations": [
+                {
+                    "metricName": "ConsoleLoginNoMfa",
+                    "metricNamespace": "CISBenchmark",
+                    "metricValue": "1"
+                }
+            ]
+        }
+    ]
+}
+
+describe_alarms = {
+    "MetricAlarms": [
+        {
+            "AlarmName": "cloudtrail-changes-alarm",
+            "MetricName": "CloudTrailChanges",
+            "Namespace": "CISBenchmark"
+        }
+    ]
+}
+
+@pytest.fixture(scope="function")
+def cloudwatch_session():
+    session = boto3.Session(
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+        region_name="us-east-1"
+    )
+    logs_stubber = Stubber(get_pooled_client(session, "logs"))
+    cloudwatch_stubber = Stubber(get_pooled_client(session, "cloudwatch"))
+    logs_stubber.activate()
+    cloudwatch_stubber.activate()
+    yield session, logs_stubber, cloudwatch_stubber
+    logs_stubber.deactivate()
+    cloudwatch_stubber.deactivate()
+
+def test_normalize_filter_pattern_keeps_quoted_whitespace():
+    assert normalize_filter_pattern('{ ($.eventName = CreateTrail) }') == "{($.eventName=CreateTrail)}"
+    assert normalize_filter_pattern('{ ($.errorMessage = "Failed authentication") }') == '{($.errorMessage="Failed authentication")}'
+
+def test_metric_filter_alarm_index(cloudwatch_session):
+    session, logs_stubber, cloudwatch_stubber = cloudwatch_session
+    logs_stubber.add_response("describe_metric_filters", describe_metric_filters)
+    cloudwatch_stubber.add_response("describe_alarms", describe_alarms)
+    index = get_metric_filter_alarm_index({}, session)
+    logs_stubber.assert_no_pending_responses()
+    cloudwatch_stubber.assert_no_pending_responses()
+
+    # same pattern as the CIS check but with different spacing
+    assert metric_filter_has_alarm(
+        index,
+        "cloudtrail-logs",
+        "{ ($.eventName = CreateTrail) || ($.eventName = UpdateTrail) || ($.eventName = DeleteTrail) || ($.eventName = StartLogging) || ($.eventName = StopLogging) }"
+    ) is True
+    # filter exists but its metric has no alarm
+    assert metric_filter_has_alarm(
+        index,
+        "cloudtrail-logs",
+        '{ ($.eventName = "ConsoleLogin") && ($.additionalEventData.MFAUsed != "Yes") }'
+    ) is False
+    # no filters on this Log Group
+    assert metric_filter_has_alarm(index, "other-logs", "{ ($.eventName = CreateTrail) }") is False
+
+def test_metric_window_totals_are_batched(cloudwatch_session):
+    session, logs_stubber, cloudwatch_stubber = cloudwatch_session
+    functionNames = [f"function-{i}" for i in range(501)]
+    # 501 functions fit in two requests, the first one is split over two pages
+    cloudwatch_stubber.add_response(
+        "get_metric_data",
+        {
+            "MetricDataResults": [{"Id": "q0", "Values": [3.0]}],
+            "NextToken": "page-2"
+        }
+    )
+    cloudwatch_stubber.add_response(
+        "get_metric_data",
+        {
+            "MetricDataResults": [{"Id": "q0", "Values": [2.0]}, {"Id": "q1", "Values": []}]
+        }
+    )
+    cloudwatch_stubber.add_response(
+        "get_metric_data",
+        {
+            "MetricDataResults": [{"Id": "q0", "Values": [7.0]}]
+        }
+    )
+    totals = get_metric_window_totals(
+        session,
+        namespace="AWS/Lambda",
+        metricName="Invocations",
+        dimensionName="FunctionName",
+        dimensionValues=functionNames,
+        days=30
+    )
+    cloudwatch_stubber.assert_no_pending_responses()
+
+    assert len(totals) == 501
+    assert totals["function-0"] == 5.0
+    assert totals["function-1"] == 0
+    assert totals["function-500"] == 7.0
+
+def test_metric_window_is_split_into_aligned_days(cloudwatch_session):
+    session, logs_stubber, cloudwatch_stubber = cloudwatch_session
+    requests = []
+
+    def record_request(params, **kwargs):
+        requests.append(params)
+
+    cloudwatch = get_pooled_client(session, "cloudwatch")
+    cloudwatch.meta.events.register("provide-client-params.cloudwatch.GetMetricData", record_request)
+    cloudwatch_stubber.add_response(
+        "get_metric_data",
+        {
+            "MetricDataResults": [{"Id": "q0", "Values": [4.0, 9.0, 1.0]}]
+        }
+    )
+    totals = get_metric_window_totals(
+        session,
+        namespace="AWS/Lambda",
+        metricName="Duration",
+        dimensionName="FunctionName",
+        dimensionValues=["function-0"],
+        days=30,
+        stat="Maximum"
+    )
+    cloudwatch.meta.events.unregister("provide-client-params.cloudwatch.GetMetricData", record_request)
+
+    assert totals == {"function-0": 9.0}
+    startTime = requests[0]["StartTime"]
+    # daily periods start at midnight UTC and never reach back further than the window
+    assert requests[0]["MetricDataQueries"][0]["MetricStat"]["Period"] == 86400
+    assert (startTime.hour, startTime.minute, startTime.second) == (0, 0, 0)
+    assert requests[0]["EndTime"] - startTime <= datetime.timedelta(days=30)
+
+    with pytest.raises(ValueError):
+        get_metric_window_totals(session, "AWS/Lambda", "Duration", "FunctionName", ["function-0"], 30, stat="Average")
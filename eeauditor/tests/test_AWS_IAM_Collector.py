@@ -0,0 +1,131 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import datetime
+import pytest
+
+import boto3
+from botocore.stub import Stubber
+
+from collectors.aws_iam_collector import (
+    get_iam_inventory,
+    parse_credential_report,
+    access_key_last_used_from_report
+)
+from collectors.collector_base import get_pooled_client
+
+credential_report = (
+    "user,arn,user_creation_time,password_enabled,password_last_used,password_last_changed,password_next_rotation,mfa_active,"
+    "access_key_1_active,access_key_1_last_rotated,access_key_1_last_used_date,access_key_1_last_used_region,access_key_1_last_used_service,"
+    "access_key_2_active,access_key_2_last_rotated,access_key_2_last_used_date,access_key_2_last_used_region,access_key_2_last_used_service,"
+    "cert_1_active,cert_1_last_rotated,cert_2_active,cert_2_last_rotated\n"
+    "example-user1,arn:aws:iam::012345678901:user/example-user1,2020-09-03T11:23:13+00:00,true,2021-05-09T01:25:01+00:00,N/A,N/A,false,"
+    "true,2020-09-03T11:30:00+00:00,2021-05-01T00:00:00+00:00,us-east-1,s3,"
+    "false,N/A,N/A,N/A,N/A,false,N/A,false,N/A\n"
+    "example-user2,arn:aws:iam::012345678901:user/example-user2,2020-09-03T11:23:13+00:00,false,N/A,N/A,N/A,false,"
+    "false,N/A,N/A,N/A,N/A,false,N/A,N/A,N/A,N/A,false,N/A,false,N/A\n"
+)
+
+get_account_authorization_details = {
+    "UserDetailList": [
+        {
+            "Path": "/",
+            "UserName": "example-user1",
+            "UserId": "AIDFUIOSFJKLDFJLKSJF",
+            "Arn": "arn:aws:iam::012345678901:user/example-user1",
+            "CreateDate": datetime.datetime(2020, 9, 3, 11, 23, 13),
+            "UserPolicyList": [
+                {
+                    "PolicyName": "example-inline",
+                    "PolicyDocument": '{"Version": "2012-10-17", "Statement": [{"Effect": "Allow", "Action": "*", "Resource": "*"}]}'
+                }
+            ],
+            "GroupList": [],
+            "AttachedManagedPolicies": []
+        },
+        {
+            "Path": "/",
+            "UserName": "example-user2",
+            "UserId": "AIDFUIOSFJKLDFJLKSJG",
+            "Arn": "arn:aws:iam::012345678901:user/example-user2",
+            "CreateDate": datetime.datetime(2020, 9, 3, 11, 23, 13),
+            "GroupList": [],
+            "AttachedManagedPolicies": []
+        }
+    ],
+    "GroupDetailList": [],
+    "RoleDetailList": [],
+    "Policies": [],
+    "IsTruncated": False
+}
+
+list_access_keys = {
+    "AccessKeyMetadata": [
+        {
+            "UserName": "example-user1",
+            "AccessKeyId": "AKIAEXAMPLE123456789",
+            "Status": "Active",
+            "CreateDate": datetime.datetime(2020, 9, 3, 11, 30, 0, tzinfo=datetime.timezone.utc)
+        }
+    ]
+}
+
+@pytest.fixture(scope="function")
+def iam_session():
+    session = boto3.Session(
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+        region_name="us-east-1"
+    )
+    iam_stubber = Stubber(get_pooled_client(session, "iam"))
+    iam_stubber.activate()
+    yield session, iam_stubber
+    iam_stubber.deactivate()
+
+def test_parse_credential_report():
+    report = parse_credential_report(credential_report.encode("utf-8"))
+    assert list(report) == ["example-user1", "example-user2"]
+    assert report["example-user1"]["mfa_active"] == "false"
+
+def test_access_key_last_used_unmatched_key():
+    report = parse_credential_report(credential_report)
+    key = {"CreateDate": datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc)}
+    assert access_key_last_used_from_report(key, report["example-user1"]) is None
+
+def test_get_iam_inventory(iam_session):
+    session, iam_stubber = iam_session
+    iam_stubber.add_response("get_account_authorization_details", get_account_authorization_details)
+    iam_stubber.add_response("generate_credential_report", {"State": "COMPLETE"})
+    iam_stubber.add_response("get_credential_report", {"Content": credential_report.encode("utf-8"), "ReportFormat": "text/csv"})
+    # only the User with an Access Key in the Credential Report is enriched
+    iam_stubber.add_response("list_access_keys", list_access_keys, {"UserName": "example-user1"})
+    cache = {}
+    inventory = get_iam_inventory(cache, session)
+    iam_stubber.assert_no_pending_responses()
+
+    user = inventory["Users"]["example-user1"]
+    assert user["User"]["PasswordLastUsed"] == datetime.datetime(2021, 5, 9, 1, 25, 1, tzinfo=datetime.timezone.utc)
+    assert user["PasswordEnabled"] is True
+    assert user["MfaActive"] is False
+    assert "example-inline" in user["InlinePolicies"]
+    assert user["AccessKeys"][0]["LastUsed"]["LastUsedDate"] == datetime.datetime(2021, 5, 1, tzinfo=datetime.timezone.utc)
+    assert inventory["Users"]["example-user2"]["AccessKeys"] == []
+    # second call is served from the cache
+    assert get_iam_inventory(cache, session) is inventory
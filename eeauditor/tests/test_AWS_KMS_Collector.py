@@ -0,0 +1,90 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import pytest
+
+import boto3
+from botocore.stub import Stubber
+
+from collectors.aws_kms_collector import get_kms_key_inventory
+from collectors.collector_base import get_pooled_client
+
+KEY_ID = "273e5d8e-4746-4ba9-be3a-4dce36783814"
+KEY_ARN = f"arn:aws:kms:us-east-1:012345678901:key/{KEY_ID}"
+
+@pytest.fixture(scope="function")
+def kms_session():
+    session = boto3.Session(
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+        region_name="us-east-1"
+    )
+    stubber = Stubber(get_pooled_client(session, "kms"))
+    stubber.activate()
+    yield session, stubber
+    stubber.deactivate()
+
+def test_key_inventory_is_paginated_and_indexed(kms_session):
+    session, stubber = kms_session
+    stubber.add_response("list_keys", {"Keys": [], "Truncated": True, "NextMarker": "page2"}, {})
+    stubber.add_response("list_keys", {"Keys": [{"KeyId": KEY_ID, "KeyArn": KEY_ARN}], "Truncated": False}, {"Marker": "page2"})
+    stubber.add_response(
+        "list_aliases",
+        {"Aliases": [{"AliasName": "alias/app", "AliasArn": "arn:aws:kms:us-east-1:012345678901:alias/app", "TargetKeyId": KEY_ID}]},
+        {}
+    )
+    stubber.add_response(
+        "describe_key",
+        {"KeyMetadata": {"KeyId": KEY_ID, "Arn": KEY_ARN, "KeyUsage": "ENCRYPT_DECRYPT"}},
+        {"KeyId": KEY_ID}
+    )
+    stubber.add_response("get_key_rotation_status", {"KeyRotationEnabled": True}, {"KeyId": KEY_ID})
+    stubber.add_response(
+        "get_key_policy",
+        {"Policy": '{"Version": "2012-10-17","Statement": [{"Effect": "Allow","Principal": {"AWS": "*"},"Action": "kms:*","Resource": "*"}]}'},
+        {"KeyId": KEY_ID, "PolicyName": "default"}
+    )
+
+    inventory = get_kms_key_inventory(session)
+    record = inventory[KEY_ID]
+    assert record["KeyRotationEnabled"] is True
+    assert record["Policy"]["Statement"][0]["Principal"] == {"AWS": "*"}
+    assert record["Errors"] == {}
+    assert record["Aliases"][0]["AliasName"] == "alias/app"
+    # every KMS Check reading the same Session shares the inventory without any further API calls
+    assert get_kms_key_inventory(session) is inventory
+    stubber.assert_no_pending_responses()
+
+def test_key_policy_denied(kms_session):
+    session, stubber = kms_session
+    stubber.add_response("list_keys", {"Keys": [{"KeyId": KEY_ID, "KeyArn": KEY_ARN}]}, {})
+    stubber.add_response("list_aliases", {"Aliases": []}, {})
+    stubber.add_client_error("describe_key", service_error_code="AccessDeniedException", http_status_code=400)
+    stubber.add_client_error("get_key_policy", service_error_code="AccessDeniedException", http_status_code=400)
+
+    record = get_kms_key_inventory(session)[KEY_ID]
+    assert record["KeyMetadata"] is None
+    assert record["KeyRotationEnabled"] is None
+    assert record["Policy"] is None
+    assert record["Errors"] == {"KeyMetadata": "AccessDeniedException", "Policy": "AccessDeniedException"}
+    stubber.assert_no_pending_responses()
+
+# EOF
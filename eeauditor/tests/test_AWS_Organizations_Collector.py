@@ -0,0 +1,116 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+from collectors import aws_organizations_collector
+from collectors.aws_organizations_collector import get_organization_accounts
+
+# r-root
+# |- 111111111111 (ACTIVE), 222222222222 (SUSPENDED)
+# '- ou-root-workloads "Workloads"
+#    |- 333333333333
+#    '- ou-root-prod "Prod"
+#       '- 444444444444, 555555555555 (second page)
+ACCOUNTS = {
+    "r-root": [[("111111111111", "ACTIVE"), ("222222222222", "SUSPENDED")]],
+    "ou-root-workloads": [[("333333333333", "ACTIVE")]],
+    "ou-root-prod": [[("444444444444", "ACTIVE")], [("555555555555", "ACTIVE")]]
+}
+OUS = {
+    "r-root": [("ou-root-workloads", "Workloads")],
+    "ou-root-workloads": [("ou-root-prod", "Prod")],
+    "ou-root-prod": []
+}
+PARENTS = {"ou-root-workloads": "r-root", "ou-root-prod": "ou-root-workloads"}
+
+class PaginatorStandIn(object):
+    def __init__(self, pagesFunc):
+        self.pagesFunc = pagesFunc
+
+    def paginate(self, **kwargs):
+        return iter(self.pagesFunc(**kwargs))
+
+class OrganizationsStandIn(object):
+    def __init__(self, organizationId="o-example"):
+        self.organizationId = organizationId
+
+    def describe_organization(self):
+        return {"Organization": {"Id": self.organizationId}}
+
+    def get_paginator(self, operationName):
+        return PaginatorStandIn(getattr(self, f"_{operationName}_pages"))
+
+    def _list_roots_pages(self):
+        return [{"Roots": [{"Id": "r-root", "Name": "Root"}]}]
+
+    def _list_accounts_for_parent_pages(self, ParentId):
+        return [
+            {"Accounts": [{"Id": accountId, "Name": f"acct-{accountId[:3]}", "Email": "a@example.com", "Status": status} for accountId, status in page]}
+            for page in ACCOUNTS[ParentId]
+        ]
+
+    def _list_organizational_units_for_parent_pages(self, ParentId):
+        return [{"OrganizationalUnits": [{"Id": ouId, "Name": name} for ouId, name in OUS[ParentId]]}]
+
+    def _list_tags_for_resource_pages(self, ResourceId):
+        return [{"Tags": [{"Key": "env", "Value": "prod" if ResourceId.startswith("4") else "dev"}]}]
+
+    def describe_organizational_unit(self, OrganizationalUnitId):
+        names = {ouId: name for ous in OUS.values() for ouId, name in ous}
+        return {"OrganizationalUnit": {"Id": OrganizationalUnitId, "Name": names[OrganizationalUnitId]}}
+
+    def list_parents(self, ChildId):
+        return {"Parents": [{"Id": PARENTS[ChildId]}]}
+
+def test_get_organization_accounts_walks_nested_ous(monkeypatch):
+    monkeypatch.setattr(aws_organizations_collector, "get_pooled_client", lambda session, service: OrganizationsStandIn())
+
+    accounts = get_organization_accounts(object(), ttlSeconds=0)
+    assert list(accounts) == ["111111111111", "333333333333", "444444444444", "555555555555"]
+    assert accounts["555555555555"]["OrganizationalUnitPath"] == "/Root/Workloads/Prod"
+    assert accounts["444444444444"]["Tags"] == {"env": "prod"}
+
+def test_get_organization_accounts_from_ou_targets_is_cached(monkeypatch):
+    monkeypatch.setattr(aws_organizations_collector, "get_pooled_client", lambda session, service: OrganizationsStandIn())
+
+    accounts = get_organization_accounts(object(), ["ou-root-workloads"])
+    assert list(accounts) == ["333333333333", "444444444444", "555555555555"]
+    assert accounts["333333333333"]["OrganizationalUnitPath"] == "/Root/Workloads"
+
+    # within the TTL the OU tree of the same Organization is not walked again
+    walked = []
+    class WalkTrackingStandIn(OrganizationsStandIn):
+        def get_paginator(self, operationName):
+            walked.append(operationName)
+            return super().get_paginator(operationName)
+
+    monkeypatch.setattr(aws_organizations_collector, "get_pooled_client", lambda session, service: WalkTrackingStandIn())
+    assert get_organization_accounts(object(), ["ou-root-workloads"]) is accounts
+    assert walked == []
+
+    # credentials for another Organization are never served the cached inventory
+    monkeypatch.setattr(
+        aws_organizations_collector, "get_pooled_client", lambda session, service: WalkTrackingStandIn("o-other")
+    )
+    otherAccounts = get_organization_accounts(object(), ["ou-root-workloads"])
+    assert otherAccounts is not accounts
+    assert walked
+
+# EOF
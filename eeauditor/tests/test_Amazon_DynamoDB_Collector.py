@@ -0,0 +1,97 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import datetime
+
+import pytest
+
+import boto3
+from botocore.stub import Stubber
+
+from auditors.aws.Amazon_DynamoDB_Auditor import ddb_pitr_check
+from collectors.aws_dynamodb_collector import get_dynamodb_tables
+from collectors.collector_base import get_pooled_client
+
+def describe_table_response(tableName):
+    return {
+        "Table": {
+            "TableName": tableName,
+            "TableArn": f"arn:aws:dynamodb:us-east-1:012345678901:table/{tableName}",
+            "CreationDateTime": datetime.datetime(2023, 1, 1)
+        }
+    }
+
+@pytest.fixture(scope="function")
+def dynamodb_session():
+    session = boto3.Session(
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+        region_name="us-east-1"
+    )
+    stubber = Stubber(get_pooled_client(session, "dynamodb"))
+    stubber.activate()
+    yield session, stubber
+    stubber.deactivate()
+
+def test_table_records_are_shared_by_session(dynamodb_session):
+    session, stubber = dynamodb_session
+    stubber.add_response("list_tables", {"TableNames": ["orders"]}, {})
+    stubber.add_response("describe_table", describe_table_response("orders"), {"TableName": "orders"})
+    stubber.add_response(
+        "describe_continuous_backups",
+        {
+            "ContinuousBackupsDescription": {
+                "ContinuousBackupsStatus": "ENABLED",
+                "PointInTimeRecoveryDescription": {"PointInTimeRecoveryStatus": "ENABLED"}
+            }
+        },
+        {"TableName": "orders"}
+    )
+
+    tables = get_dynamodb_tables(session)
+    assert len(tables) == 1
+    assert tables[0]["Table"]["TableName"] == "orders"
+    assert tables[0]["ContinuousBackupsDescription"]["PointInTimeRecoveryDescription"]["PointInTimeRecoveryStatus"] == "ENABLED"
+    # a second Auditor reading the same Session does not call DynamoDB again
+    assert get_dynamodb_tables(session) is tables
+    stubber.assert_no_pending_responses()
+
+def test_deleted_table_is_skipped(dynamodb_session):
+    session, stubber = dynamodb_session
+    stubber.add_response("list_tables", {"TableNames": ["deleted"]}, {})
+    stubber.add_client_error("describe_table", service_error_code="ResourceNotFoundException", http_status_code=400)
+
+    assert get_dynamodb_tables(session) == []
+    stubber.assert_no_pending_responses()
+
+def test_unreadable_continuous_backups_are_not_failed(dynamodb_session):
+    session, stubber = dynamodb_session
+    stubber.add_response("list_tables", {"TableNames": ["orders"]}, {})
+    stubber.add_response("describe_table", describe_table_response("orders"), {"TableName": "orders"})
+    stubber.add_client_error("describe_continuous_backups", service_error_code="AccessDeniedException", http_status_code=400)
+
+    tables = get_dynamodb_tables(session)
+    assert tables[0]["ContinuousBackupsDescription"] is None
+    # an unknown PITR status produces no finding instead of a FAILED one
+    assert list(ddb_pitr_check({}, session, "012345678901", "us-east-1", "aws")) == []
+    stubber.assert_no_pending_responses()
+
+# EOF
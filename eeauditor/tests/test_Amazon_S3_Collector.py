@@ -0,0 +1,80 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import pytest
+
+import boto3
+from botocore.stub import Stubber
+
+from collectors.aws_s3_collector import get_bucket_configuration, get_bucket_configurations
+from collectors.collector_base import get_pooled_client
+
+@pytest.fixture(scope="function")
+def s3_session():
+    session = boto3.Session(
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+        region_name="us-east-1"
+    )
+    # the Session's own client is used to resolve Regions, the eu-west-1 client for the bucket sub-resources
+    default_stubber = Stubber(get_pooled_client(session, "s3"))
+    regional_stubber = Stubber(get_pooled_client(session, "s3", "eu-west-1"))
+    default_stubber.activate()
+    regional_stubber.activate()
+    yield session, default_stubber, regional_stubber
+    default_stubber.deactivate()
+    regional_stubber.deactivate()
+
+def test_bucket_configuration_uses_bucket_region(s3_session):
+    session, default_stubber, regional_stubber = s3_session
+    default_stubber.add_response("head_bucket", {"BucketRegion": "eu-west-1"}, {"Bucket": "trail-bucket"})
+    regional_stubber.add_response("get_bucket_policy_status", {"PolicyStatus": {"IsPublic": False}}, {"Bucket": "trail-bucket"})
+    regional_stubber.add_client_error("get_bucket_logging", service_error_code="AccessDenied", http_status_code=403)
+
+    record = get_bucket_configuration(session, "trail-bucket", components=["PolicyStatus", "Logging"])
+    assert record["Region"] == "eu-west-1"
+    assert record["PolicyStatus"] == {"IsPublic": False}
+    assert record["Logging"] is None
+    assert record["Errors"] == {"Logging": "AccessDenied"}
+
+    # served from the Session-scoped store without any further API calls
+    assert get_bucket_configuration(session, "trail-bucket", components=["PolicyStatus", "Logging"]) is record
+    default_stubber.assert_no_pending_responses()
+    regional_stubber.assert_no_pending_responses()
+
+def test_inaccessible_bucket_is_not_retried(s3_session):
+    session, default_stubber, regional_stubber = s3_session
+    default_stubber.add_client_error("head_bucket", service_error_code="403", http_status_code=403)
+
+    assert get_bucket_configuration(session, "other-account-bucket", components=[]) is None
+    assert get_bucket_configuration(session, "other-account-bucket", components=[]) is None
+    default_stubber.assert_no_pending_responses()
+
+def test_bucket_configurations_with_listed_region(s3_session):
+    session, default_stubber, regional_stubber = s3_session
+    regional_stubber.add_client_error("get_bucket_policy", service_error_code="NoSuchBucketPolicy", http_status_code=404)
+
+    records = get_bucket_configurations(
+        session,
+        [{"Name": "data-bucket", "BucketRegion": "eu-west-1"}],
+        components=["Policy"]
+    )
+    assert records["data-bucket"]["Policy"] is None
+    assert records["data-bucket"]["Errors"] == {"Policy": "NoSuchBucketPolicy"}
@@ -0,0 +1,48 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+from collectors.azure_collector import fan_out_azure_resources, get_resource_group_name
+
+SERVER_ID = "/subscriptions/00000000-0000-0000-0000-00000000000a/resourceGroups/rg1/providers/Microsoft.Sql/servers/sql-a1"
+
+class ResourceStandIn(object):
+    def __init__(self, resourceId, name):
+        self.id = resourceId
+        self.name = name
+
+def test_fan_out_azure_resources_keys_results_by_id():
+    resources = [ResourceStandIn(f"{SERVER_ID}{i}", f"sql-a1{i}") for i in range(10)]
+
+    def get_policy(resource):
+        # a Server deleted mid-run must not fail the other Servers
+        if resource.name == "sql-a13":
+            raise RuntimeError("ResourceNotFound")
+        return {"state": "Enabled", "server": resource.name}
+
+    policies = fan_out_azure_resources(get_policy, resources, "SQL Server auditing policy")
+    assert policies[f"{SERVER_ID}3"] is None
+    assert policies[f"{SERVER_ID}7"] == {"state": "Enabled", "server": "sql-a17"}
+    assert len(policies) == 10
+
+def test_get_resource_group_name():
+    assert get_resource_group_name(SERVER_ID) == "rg1"
+
+# EOF
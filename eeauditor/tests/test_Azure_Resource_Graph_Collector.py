@@ -0,0 +1,95 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+from collectors.azure_resource_graph_collector import (
+    enable_resource_graph,
+    get_resources_by_type,
+    is_resource_graph_enabled
+)
+
+SUBSCRIPTION_A = "00000000-0000-0000-0000-00000000000a"
+SUBSCRIPTION_B = "00000000-0000-0000-0000-00000000000b"
+
+# Recorded Resource Graph pages for a `microsoft.sql/servers` query, keyed by skip token
+RECORDED_SQL_SERVER_PAGES = {
+    None: (
+        [
+            {
+                "id": f"/subscriptions/{SUBSCRIPTION_A}/resourceGroups/rg1/providers/Microsoft.Sql/servers/sql-a1",
+                "name": "sql-a1",
+                "type": "microsoft.sql/servers",
+                "subscriptionId": SUBSCRIPTION_A,
+                "properties": {"publicNetworkAccess": "Enabled"}
+            }
+        ],
+        "page-2"
+    ),
+    "page-2": (
+        [
+            {
+                "id": f"/subscriptions/{SUBSCRIPTION_B}/resourceGroups/rg2/providers/Microsoft.Sql/servers/sql-b1",
+                "name": "sql-b1",
+                "type": "microsoft.sql/servers",
+                "subscriptionId": SUBSCRIPTION_B,
+                "properties": {"publicNetworkAccess": "Disabled"}
+            }
+        ],
+        None
+    )
+}
+
+class AzureCredentialStandIn(object):
+    pass
+
+class ServerModelStandIn(object):
+    def __init__(self, name, publicNetworkAccess):
+        self.name = name
+        self.public_network_access = publicNetworkAccess
+
+    @classmethod
+    def deserialize(cls, data):
+        return cls(data["name"], data["properties"]["publicNetworkAccess"])
+
+def test_resource_graph_is_queried_once_for_every_subscription():
+    calls = []
+
+    def recorded_query(azureCredential, subscriptions, query, skipToken):
+        calls.append((tuple(subscriptions), skipToken))
+        assert "microsoft.sql/servers" in query
+        return RECORDED_SQL_SERVER_PAGES[skipToken]
+
+    credential = AzureCredentialStandIn()
+    assert not is_resource_graph_enabled(credential)
+    enable_resource_graph(credential, [SUBSCRIPTION_A, SUBSCRIPTION_B], queryFunc=recorded_query)
+    assert is_resource_graph_enabled(credential)
+
+    serversA = get_resources_by_type(credential, SUBSCRIPTION_A, "microsoft.sql/servers", ServerModelStandIn)
+    serversB = get_resources_by_type(credential, SUBSCRIPTION_B, "microsoft.sql/servers")
+
+    assert [(server.name, server.public_network_access) for server in serversA] == [("sql-a1", "Enabled")]
+    assert [server["name"] for server in serversB] == ["sql-b1"]
+    # both pages were read once and the second Subscription was served from the cached rows
+    assert calls == [
+        ((SUBSCRIPTION_A, SUBSCRIPTION_B), None),
+        ((SUBSCRIPTION_A, SUBSCRIPTION_B), "page-2")
+    ]
+
+# EOF
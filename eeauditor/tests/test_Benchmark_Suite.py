@@ -0,0 +1,237 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+"""
+End-to-end throughput benchmarks against synthetic estates. Collectors and Auditors are executed the way EEAuditor
+runs them, through the CheckSupervisor with the SDK responses replayed, and the Outputs write synthetic findings.
+Only the IAM and S3 Auditors, the IAM, S3 and Azure Resource Graph Collectors and the JSON and OCSF Outputs are
+measured, not whole-provider runs. The suite asserts wall-clock throughput and is skipped unless ELECTRICEYE_BENCHMARK
+is set, which the benchmarks workflow does, so that timing never fails the regular test run. Scales are set with ELECTRICEYE_BENCHMARK_SCALES (default 1000, e.g. 1000,10000,100000) and the measurements are
+written as JSON to ELECTRICEYE_BENCHMARK_RESULTS when it is set so they can be tracked between builds. Set
+ELECTRICEYE_BENCHMARK_MEMORY to also record the peak memory of every stage, which slows the stages down
+"""
+
+import json
+import tracemalloc
+from os import environ
+from time import perf_counter
+import pytest
+
+if not environ.get("ELECTRICEYE_BENCHMARK"):
+    pytest.skip("Set ELECTRICEYE_BENCHMARK to run the benchmark suite", allow_module_level=True)
+
+import boto3
+from check_register import CheckRegister
+from check_supervisor import CheckSupervisor
+from collectors.aws_iam_collector import get_iam_inventory
+from collectors.aws_s3_collector import get_bucket_configurations
+from collectors.azure_resource_graph_collector import enable_resource_graph, get_resources_by_type
+from processor.outputs.output_base import ElectricEyeOutput
+from replay_harness import FixtureBundle, ReplayHarness
+from synthetic_estate import SYNTHETIC_ACCOUNT_ID, SyntheticEstate
+import auditors.aws.AWS_IAM_Auditor  # noqa: F401 - registers the IAM Checks
+import auditors.aws.Amazon_S3_Auditor  # noqa: F401 - registers the S3 Checks
+
+BENCHMARK_SCALES = [int(scale) for scale in environ.get("ELECTRICEYE_BENCHMARK_SCALES", "1000").split(",")]
+TRACK_MEMORY = bool(environ.get("ELECTRICEYE_BENCHMARK_MEMORY"))
+# Minimum items per second for each stage, these sit far below what a CI runner achieves so that only genuine
+# regressions trip them
+MINIMUM_THROUGHPUT = {
+    "collector": 100,
+    "runner": 250,
+    "output": 100
+}
+# How much the cost per item at the largest scale may grow over the smallest scale, anything more is superlinear
+MAXIMUM_SCALING_FACTOR = 3
+# Auditors by the cache name their Checks are registered with, and the estate generator for their resources
+AUDITOR_ESTATES = {
+    "iam": SyntheticEstate.add_iam_users,
+    "s3": SyntheticEstate.add_s3_buckets
+}
+# Outputs which write to the path they are given, the others write next to their module
+FILE_OUTPUTS = ["json", "ocsf_v1_4_0"]
+AZURE_SUBSCRIPTIONS = [f"00000000-0000-0000-0000-{index:012d}" for index in range(10)]
+
+results = {}
+
+class AzureCredentialStandIn(object):
+    pass
+
+def new_session():
+    return boto3.Session(region_name="us-east-1", aws_access_key_id="testing", aws_secret_access_key="testing")
+
+def build_estate(serviceName: str, scale: int) -> FixtureBundle:
+    bundle = FixtureBundle()
+    AUDITOR_ESTATES[serviceName](SyntheticEstate(validate=False), bundle, scale)
+    return bundle
+
+def run_auditor(serviceName: str, bundle: FixtureBundle) -> list:
+    """
+    Executes every Check of an Auditor with a shared Auditor cache, the way EEAuditor.run_aws_checks does
+    """
+    supervisor = CheckSupervisor()
+    auditorCache = {}
+    findings = []
+    with ReplayHarness(bundle):
+        session = new_session()
+        auditorDeadline = supervisor.start_auditor()
+        for checkName, check in CheckRegister.checks[serviceName].items():
+            try:
+                for finding in supervisor.run_check(
+                    check,
+                    checkName,
+                    auditorDeadline,
+                    "AWS",
+                    SYNTHETIC_ACCOUNT_ID,
+                    cache=auditorCache,
+                    session=session,
+                    awsAccountId=SYNTHETIC_ACCOUNT_ID,
+                    awsRegion="us-east-1",
+                    awsPartition="aws"
+                ):
+                    if finding is not None:
+                        findings.append(finding)
+            # Checks of APIs that are not part of the synthetic estate fail as they would against a live Account
+            except Exception:
+                continue
+
+    return findings
+
+def measure(stage: str, name: str, scale: int, func) -> tuple:
+    """
+    Times `func`, which returns the number of items it processed along with its result, stores the measurement
+    and returns the throughput in items per second along with the result
+    """
+    if TRACK_MEMORY:
+        tracemalloc.start()
+    startTime = perf_counter()
+    itemCount, result = func()
+    seconds = perf_counter() - startTime
+    throughput = itemCount / max(seconds, 1e-9)
+
+    measurement = {
+        "Items": itemCount,
+        "Seconds": round(seconds, 4),
+        "ItemsPerSecond": round(throughput, 1)
+    }
+    if TRACK_MEMORY:
+        measurement["PeakMemoryBytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    results.setdefault(stage, {}).setdefault(name, {})[scale] = measurement
+    if environ.get("ELECTRICEYE_BENCHMARK_RESULTS"):
+        with open(environ["ELECTRICEYE_BENCHMARK_RESULTS"], "w") as jsonfile:
+            json.dump(results, jsonfile, indent=2)
+
+    # tracing allocations slows everything down, the floor is only enforced on untraced runs
+    if not TRACK_MEMORY:
+        assert throughput >= MINIMUM_THROUGHPUT[stage], f"{stage} {name} processed {throughput:.0f} items per second at {scale}"
+
+    return throughput, result
+
+def assert_scales_linearly(stage: str, name: str) -> None:
+    measurements = results[stage][name]
+    smallest, largest = measurements[min(measurements)], measurements[max(measurements)]
+    if smallest is largest:
+        return
+    costGrowth = (largest["Seconds"] / largest["Items"]) / max(smallest["Seconds"] / smallest["Items"], 1e-9)
+    assert costGrowth <= MAXIMUM_SCALING_FACTOR, f"{stage} {name} cost per item grew {costGrowth:.1f}x from {min(measurements)} to {max(measurements)}"
+
+def test_iam_collector_throughput():
+    for scale in BENCHMARK_SCALES:
+        with ReplayHarness(build_estate("iam", scale)) as harness:
+            session = new_session()
+
+            def _collect():
+                inventory = get_iam_inventory({}, session)
+                return len(inventory["Users"]), inventory
+
+            _, inventory = measure("collector", "aws_iam", scale, _collect)
+
+        assert harness.missing == []
+        assert len(inventory["Users"]) == scale
+
+    assert_scales_linearly("collector", "aws_iam")
+
+def test_s3_collector_throughput():
+    for scale in BENCHMARK_SCALES:
+        with ReplayHarness(build_estate("s3", scale)) as harness:
+            session = new_session()
+
+            def _collect():
+                buckets = [bucket for page in session.client("s3").get_paginator("list_buckets").paginate() for bucket in page["Buckets"]]
+                records = get_bucket_configurations(session, buckets)
+                return len(records), records
+
+            measure("collector", "aws_s3", scale, _collect)
+
+        assert harness.missing == []
+
+    assert_scales_linearly("collector", "aws_s3")
+
+def test_azure_resource_graph_collector_throughput():
+    for scale in BENCHMARK_SCALES:
+        estate = SyntheticEstate()
+        rows = estate.azure_resources("Microsoft.Compute/virtualMachines", scale, AZURE_SUBSCRIPTIONS)
+        credential = AzureCredentialStandIn()
+        enable_resource_graph(credential, AZURE_SUBSCRIPTIONS, queryFunc=estate.resource_graph_query_func(rows))
+
+        def _collect():
+            resources = [
+                resource
+                for subscriptionId in AZURE_SUBSCRIPTIONS
+                for resource in get_resources_by_type(credential, subscriptionId, "microsoft.compute/virtualmachines")
+            ]
+            return len(resources), resources
+
+        _, resources = measure("collector", "azure_resource_graph", scale, _collect)
+        assert len(resources) == scale
+
+    assert_scales_linearly("collector", "azure_resource_graph")
+
+@pytest.mark.parametrize("serviceName", AUDITOR_ESTATES)
+def test_runner_throughput(serviceName):
+    for scale in BENCHMARK_SCALES:
+        bundle = build_estate(serviceName, scale)
+
+        def _run():
+            findings = run_auditor(serviceName, bundle)
+            return len(findings), findings
+
+        _, findings = measure("runner", serviceName, scale, _run)
+        # every resource is evaluated by at least one Check
+        assert len(findings) >= scale
+
+    assert_scales_linearly("runner", serviceName)
+
+@pytest.mark.parametrize("provider", FILE_OUTPUTS)
+def test_output_throughput(provider, tmp_path, capsys):
+    output = ElectricEyeOutput.get_provider(provider)()
+    for scale in BENCHMARK_SCALES:
+        findings = SyntheticEstate().asff_findings(scale)
+
+        def _write():
+            output.write_findings(findings=findings, output_file=str(tmp_path / f"{provider}-{scale}"))
+            return scale, None
+
+        measure("output", provider, scale, _write)
+
+    capsys.readouterr()
+    assert_scales_linearly("output", provider)
@@ -0,0 +1,173 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+from threading import Event, current_thread
+from time import monotonic
+import boto3
+import pytest
+from collectors import collector_base
+from check_supervisor import CheckSupervisor, UnitOutcome
+
+CHECK_KWARGS = {
+    "cache": {},
+    "awsAccountId": "111111111111",
+    "awsRegion": "us-east-1",
+    "awsPartition": "aws"
+}
+
+def passing_check(cache, awsAccountId, awsRegion, awsPartition):
+    """[Test.1] A Check that finishes"""
+    yield {"Id": "finding-1"}
+    yield {"Id": "finding-2"}
+
+def test_findings_are_passed_through():
+    supervisor = CheckSupervisor(checkTimeout=5, auditorTimeout=5)
+
+    findings = list(
+        supervisor.run_check(passing_check, "passing_check", supervisor.start_auditor(), "AWS", "111111111111", **CHECK_KWARGS)
+    )
+    assert [finding["Id"] for finding in findings] == ["finding-1", "finding-2"]
+    assert supervisor.timeouts == []
+
+def test_hung_check_is_abandoned():
+    supervisor = CheckSupervisor(checkTimeout=0.2, auditorTimeout=None)
+    release = Event()
+
+    def hung_check(cache, awsAccountId, awsRegion, awsPartition):
+        """[Test.2] A Check that hangs after its first finding"""
+        yield {"Id": "finding-1"}
+        release.wait(10)
+        yield {"Id": "finding-2"}
+
+    startTime = monotonic()
+    findings = list(supervisor.run_check(hung_check, "hung_check", None, "AWS", "111111111111", **CHECK_KWARGS))
+    release.set()
+
+    assert monotonic() - startTime < 5
+    assert findings[0]["Id"] == "finding-1"
+    assert findings[1]["Title"] == "[Test.2] A Check that hangs after its first finding - Check did not complete"
+    assert findings[1]["Compliance"]["Status"] == "WARNING"
+    assert findings[1]["ProductFields"]["ProviderAccountId"] == "111111111111"
+    assert len(findings) == 2
+    assert supervisor.timeouts[0]["CheckName"] == "hung_check"
+    assert supervisor.timeouts[0]["Budget"] == "Check"
+
+def test_spent_auditor_budget_skips_check():
+    supervisor = CheckSupervisor(checkTimeout=5, auditorTimeout=5)
+    called = []
+
+    def skipped_check(cache, awsAccountId, awsRegion, awsPartition):
+        called.append(True)
+        yield {"Id": "finding-1"}
+
+    findings = list(supervisor.run_check(skipped_check, "skipped_check", monotonic() - 1, "AWS", "111111111111", **CHECK_KWARGS))
+    assert called == []
+    assert findings[0]["Title"] == "skipped_check - Check did not complete"
+    assert supervisor.timeouts[0]["Budget"] == "Auditor"
+    assert supervisor.timeouts[0]["ElapsedSeconds"] == 0
+
+def test_check_exceptions_are_reraised():
+    supervisor = CheckSupervisor(checkTimeout=5, auditorTimeout=5)
+
+    def failing_check(cache, awsAccountId, awsRegion, awsPartition):
+        yield {"Id": "finding-1"}
+        raise ValueError("boom")
+
+    outcome = UnitOutcome()
+    with pytest.raises(ValueError):
+        list(supervisor.run_check(failing_check, "failing_check", None, "AWS", "111111111111", outcome=outcome, **CHECK_KWARGS))
+    assert outcome.failed
+    assert not outcome.completed
+
+    # Checks run inline without budgets are flagged the same way
+    inlineOutcome = UnitOutcome()
+    with pytest.raises(ValueError):
+        list(CheckSupervisor(0, 0).run_check(failing_check, "failing_check", None, "AWS", "111111111111", outcome=inlineOutcome, **CHECK_KWARGS))
+    assert inlineOutcome.failed
+
+def test_timeouts_are_flagged_on_their_own_unit():
+    supervisor = CheckSupervisor(checkTimeout=5, auditorTimeout=5)
+    timedOutUnit = UnitOutcome()
+    concurrentUnit = UnitOutcome()
+
+    list(supervisor.run_check(passing_check, "passing_check", monotonic() - 1, "AWS", "111111111111", outcome=timedOutUnit, **CHECK_KWARGS))
+    list(supervisor.run_check(passing_check, "passing_check", supervisor.start_auditor(), "AWS", "222222222222", outcome=concurrentUnit, **CHECK_KWARGS))
+
+    assert timedOutUnit.timedOut
+    assert not timedOutUnit.completed
+    assert concurrentUnit.completed
+    assert len(supervisor.timeouts) == 1
+
+def test_disabled_budgets_run_inline():
+    supervisor = CheckSupervisor(checkTimeout=0, auditorTimeout=0)
+    threads = []
+
+    def inline_check(cache, awsAccountId, awsRegion, awsPartition):
+        threads.append(current_thread())
+        yield {"Id": "finding-1"}
+
+    assert supervisor.start_auditor() is None
+    list(supervisor.run_check(inline_check, "inline_check", None, "AWS", "111111111111", **CHECK_KWARGS))
+    assert threads == [current_thread()]
+
+def test_abandoned_check_state_does_not_leak(monkeypatch):
+    supervisor = CheckSupervisor(checkTimeout=0.2, auditorTimeout=None)
+    monkeypatch.setattr(collector_base, "clone_session", lambda session: {"ClonedFrom": session})
+    release = Event()
+    written = Event()
+    auditorCache = {}
+    session = object()
+
+    def zombie_check(cache, session, awsAccountId, awsRegion, awsPartition):
+        yield {"Id": "finding-1"}
+        release.wait(10)
+        cache["zombie"] = True
+        written.set()
+        yield {"Id": "finding-2"}
+
+    def later_check(cache, session, awsAccountId, awsRegion, awsPartition):
+        cache.setdefault("checks", []).append("later_check")
+        yield {"Cache": dict(cache), "Session": session}
+
+    kwargs = dict(CHECK_KWARGS, cache=auditorCache, session=session)
+    list(supervisor.run_check(zombie_check, "zombie_check", None, "AWS", "111111111111", **kwargs))
+    release.set()
+    assert written.wait(5)
+
+    findings = list(supervisor.run_check(later_check, "later_check", None, "AWS", "111111111111", **kwargs))
+    findings += list(supervisor.run_check(later_check, "later_check", None, "AWS", "111111111111", **kwargs))
+    assert "zombie" not in findings[0]["Cache"]
+    # the Auditor's remaining Checks still share the replacement cache
+    assert findings[1]["Cache"] == {"checks": ["later_check", "later_check"]}
+    assert findings[0]["Session"] == {"ClonedFrom": session}
+    assert findings[1]["Session"] is findings[0]["Session"]
+
+def test_cloned_session_keeps_credentials_and_region():
+    session = boto3.Session(
+        aws_access_key_id="AKIAEXAMPLE", aws_secret_access_key="secret", aws_session_token="token", region_name="eu-west-1"
+    )
+
+    clone = collector_base.clone_session(session)
+    assert clone is not session
+    assert clone.region_name == "eu-west-1"
+    assert clone.get_credentials().get_frozen_credentials() == session.get_credentials().get_frozen_credentials()
+
+# EOF
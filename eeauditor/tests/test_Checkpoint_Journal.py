@@ -0,0 +1,135 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import base64
+import json
+import pytest
+from types import SimpleNamespace
+from checkpoint_journal import CheckpointJournal
+
+FINDING = {
+    "Id": "111111111111/us-east-1/ec2-imdsv2-check",
+    "ProductFields": {
+        "Provider": "AWS",
+        "AssetDetails": base64.b64encode(json.dumps({"InstanceId": "i-123"}).encode("utf-8"))
+    },
+    "Compliance": {"Status": "PASSED", "RelatedRequirements": ["NIST CSF V1.1 PR.AC-4"]}
+}
+UNIT = ("AWS", "111111111111", "us-east-1", "ec2")
+
+def test_completed_units_are_replayed(tmp_path):
+    journal = CheckpointJournal()
+    runId = journal.open("AWS", directory=str(tmp_path))
+    journal.complete(UNIT, [FINDING])
+
+    resumed = CheckpointJournal()
+    assert resumed.open("AWS", runId, directory=str(tmp_path)) == runId
+    assert resumed.is_completed(UNIT)
+    assert not resumed.is_completed(("AWS", "111111111111", "us-east-2", "ec2"))
+    assert resumed.replay(UNIT) == [FINDING]
+
+    # a resumed run keeps appending to the same journal
+    resumed.complete(("AWS", "111111111111", "us-east-2", "ec2"), [])
+    assert len((tmp_path / f"{runId}.jsonl").read_text().splitlines()) == 3
+
+def test_partially_written_record_is_ignored(tmp_path):
+    journal = CheckpointJournal()
+    runId = journal.open("AWS", directory=str(tmp_path))
+    journal.complete(UNIT, [FINDING])
+    with open(tmp_path / f"{runId}.jsonl", "a") as f:
+        f.write('{"Unit": ["AWS", "111111111111", "us-east-2", "ec2"], "Findings": [{"Id": ')
+
+    resumed = CheckpointJournal()
+    resumed.open("AWS", runId, directory=str(tmp_path))
+    assert resumed.is_completed(UNIT)
+    assert not resumed.is_completed(("AWS", "111111111111", "us-east-2", "ec2"))
+
+def test_resume_rejects_other_targets_and_unknown_runs(tmp_path):
+    journal = CheckpointJournal()
+    runId = journal.open("AWS", directory=str(tmp_path))
+
+    with pytest.raises(SystemExit):
+        CheckpointJournal().open("GCP", runId, directory=str(tmp_path))
+    with pytest.raises(SystemExit):
+        CheckpointJournal().open("AWS", "20000101T000000Z-00000000", directory=str(tmp_path))
+
+def test_unit_with_a_failed_check_is_not_journaled(tmp_path):
+    pytest.importorskip("pluginbase")
+    from eeauditor.check_supervisor import CheckSupervisor
+    from eeauditor.eeauditor import EEAuditor
+
+    def passing_check(cache, awsAccountId, awsRegion, awsPartition, **kwargs):
+        yield {"Id": "passing-finding"}
+
+    def expired_token_check(cache, awsAccountId, awsRegion, awsPartition, **kwargs):
+        yield {"Id": "partial-finding"}
+        raise RuntimeError("ExpiredToken")
+
+    app = EEAuditor.__new__(EEAuditor)
+    app.registry = SimpleNamespace(
+        checks={
+            "passing": {"passing_check": passing_check},
+            "failing": {"passing_check": passing_check, "expired_token_check": expired_token_check}
+        }
+    )
+    app.supervisor = CheckSupervisor(checkTimeout=5, auditorTimeout=5)
+    app.checkpoints = CheckpointJournal()
+    app.ociTenancyId = "ocid1.tenancy.oc1..test"
+    app.ociUserId = app.ociRegionName = app.ociCompartments = app.ociUserApiKeyFingerprint = None
+    runId = app.checkpoints.open("OCI", directory=str(tmp_path))
+
+    assert len(list(app.run_oci_checks())) == 3
+
+    resumed = CheckpointJournal()
+    resumed.open("OCI", runId, directory=str(tmp_path))
+    assert resumed.is_completed(("OCI", app.ociTenancyId, "passing"))
+    assert not resumed.is_completed(("OCI", app.ociTenancyId, "failing"))
+
+def test_unwritable_directory_disables_checkpointing(tmp_path):
+    # a file where the directory should be fails the same way as a read-only filesystem
+    notADirectory = tmp_path / "checkpoints"
+    notADirectory.write_text("")
+
+    journal = CheckpointJournal()
+    assert journal.open("AWS", directory=str(notADirectory)) is None
+    journal.complete(UNIT, [FINDING])
+    journal.discard()
+
+def test_journal_is_discarded_only_when_every_unit_completed(tmp_path):
+    journal = CheckpointJournal()
+    runId = journal.open("AWS", directory=str(tmp_path))
+    journal.complete(UNIT, [FINDING])
+    journal.discard()
+    assert not (tmp_path / f"{runId}.jsonl").exists()
+
+    journal = CheckpointJournal()
+    runId = journal.open("AWS", directory=str(tmp_path))
+    journal.complete(UNIT, [FINDING])
+    journal.incomplete(("AWS", "111111111111", "us-east-2", "ec2"))
+    journal.discard()
+    assert (tmp_path / f"{runId}.jsonl").exists()
+
+def test_unopened_journal_records_nothing():
+    journal = CheckpointJournal()
+    journal.complete(UNIT, [FINDING])
+    assert not journal.is_completed(UNIT)
+
+# EOF
@@ -0,0 +1,215 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import pytest
+from botocore.exceptions import ClientError
+import external_providers
+from external_providers import SecretResolver, get_global_credential, load_external_providers_config
+
+TOML_CONTENTS = """
+[global]
+credentials_location = "AWS_SSM"
+shodan_api_key_value = "/electriceye/shodan"
+virustotal_api_key_value = ""
+
+[regions_and_accounts.aws]
+aws_account_targets = ["111111111111"]
+"""
+
+class SsmStandIn(object):
+    def __init__(self):
+        self.calls = []
+
+    def get_parameters(self, Names, WithDecryption):
+        self.calls.append(list(Names))
+        return {
+            "Parameters": [{"Name": name, "Value": f"secret-{name}"} for name in Names if not name.endswith("missing")],
+            "InvalidParameters": [name for name in Names if name.endswith("missing")]
+        }
+
+    def get_parameter(self, Name, WithDecryption):
+        raise ClientError({"Error": {"Code": "ParameterNotFound", "Message": Name}}, "GetParameter")
+
+class SecretsManagerStandIn(object):
+    def batch_get_secret_value(self, SecretIdList):
+        return {
+            "SecretValues": [
+                {"ARN": f"arn:aws:secretsmanager:us-east-1:111111111111:secret:{secretId}", "Name": secretId, "SecretString": f"secret-{secretId}"}
+                for secretId in SecretIdList if secretId != "denied"
+            ],
+            "Errors": [
+                {"SecretId": secretId, "ErrorCode": "AccessDeniedException", "Message": "denied"}
+                for secretId in SecretIdList if secretId == "denied"
+            ]
+        }
+
+class SelectorSsmStandIn(SsmStandIn):
+    """
+    Returns Parameters requested by ARN or with a selector under their plain name, as SSM does
+    """
+
+    def get_parameters(self, Names, WithDecryption):
+        self.calls.append(list(Names))
+        parameters = []
+        for name in Names:
+            plainName, _, selector = name.rpartition("/")[2].partition(":")
+            parameters.append({"Name": plainName, "Value": f"secret-{name}"})
+        return {"Parameters": parameters, "InvalidParameters": []}
+
+    def get_parameter(self, Name, WithDecryption):
+        self.calls.append(Name)
+        return {"Parameter": {"Name": Name, "Value": f"secret-{Name}"}}
+
+class DeniedBatchStandIn(object):
+    def __init__(self):
+        self.calls = []
+
+    def get_parameters(self, Names, WithDecryption):
+        self.calls.append("GetParameters")
+        raise ClientError({"Error": {"Code": "AccessDeniedException", "Message": "ssm:GetParameters"}}, "GetParameters")
+
+    def get_parameter(self, Name, WithDecryption):
+        self.calls.append(Name)
+        return {"Parameter": {"Name": Name, "Value": f"secret-{Name}"}}
+
+    def batch_get_secret_value(self, SecretIdList):
+        self.calls.append("BatchGetSecretValue")
+        raise ClientError({"Error": {"Code": "AccessDeniedException", "Message": "secretsmanager:BatchGetSecretValue"}}, "BatchGetSecretValue")
+
+    def get_secret_value(self, SecretId):
+        self.calls.append(SecretId)
+        return {"ARN": SecretId, "Name": SecretId, "SecretString": f"secret-{SecretId}"}
+
+@pytest.fixture
+def tomlFile(tmp_path, monkeypatch):
+    tomlFile = tmp_path / "external_providers.toml"
+    tomlFile.write_text(TOML_CONTENTS)
+    monkeypatch.setenv("TOML_FILE_PATH", str(tomlFile))
+    monkeypatch.setattr(external_providers, "_configSnapshots", {})
+    monkeypatch.setattr(external_providers, "_secretResolvers", {})
+    monkeypatch.setattr(external_providers, "_activeTomlFile", None)
+    return tomlFile
+
+def test_config_is_parsed_once_and_read_only(tomlFile, monkeypatch):
+    parses = []
+    tomload = external_providers.tomload
+    monkeypatch.setattr(external_providers, "tomload", lambda f: parses.append(f) or tomload(f))
+
+    config = load_external_providers_config()
+    assert load_external_providers_config(str(tomlFile)) is config
+    assert len(parses) == 1
+    assert config["regions_and_accounts"]["aws"]["aws_account_targets"] == ("111111111111",)
+    with pytest.raises(TypeError):
+        config["global"]["credentials_location"] = "CONFIG_FILE"
+
+def test_ssm_values_are_batched_and_memoized(monkeypatch):
+    ssm = SsmStandIn()
+    resolver = SecretResolver("AWS_SSM")
+    monkeypatch.setattr(resolver, "get_client", lambda serviceName: ssm)
+
+    values = {f"setting_{i}": f"/electriceye/{i}" for i in range(12)}
+    resolved = resolver.resolve_many(values)
+    assert resolved["setting_11"] == "secret-/electriceye/11"
+    assert [len(batch) for batch in ssm.calls] == [10, 2]
+
+    assert resolver.resolve("/electriceye/3", "setting_3") == "secret-/electriceye/3"
+    assert len(ssm.calls) == 2
+
+def test_expired_secrets_are_fetched_again(monkeypatch):
+    ssm = SsmStandIn()
+    resolver = SecretResolver("AWS_SSM", ttlSeconds=0)
+    monkeypatch.setattr(resolver, "get_client", lambda serviceName: ssm)
+
+    assert resolver.resolve("/electriceye/1", "setting_1") == "secret-/electriceye/1"
+    assert resolver.resolve("/electriceye/1", "setting_1") == "secret-/electriceye/1"
+    assert len(ssm.calls) == 2
+
+def test_missing_values_raise_client_error(monkeypatch):
+    resolver = SecretResolver("AWS_SSM")
+    monkeypatch.setattr(resolver, "get_client", lambda serviceName: SsmStandIn())
+    with pytest.raises(ClientError):
+        resolver.resolve("/electriceye/missing", "setting_1")
+
+    resolver = SecretResolver("AWS_SECRETS_MANAGER")
+    monkeypatch.setattr(resolver, "get_client", lambda serviceName: SecretsManagerStandIn())
+    assert resolver.resolve("electriceye-shodan", "shodan_api_key_value") == "secret-electriceye-shodan"
+    with pytest.raises(ClientError):
+        resolver.resolve_many({"setting_1": "electriceye-shodan", "setting_2": "denied"})
+
+def test_ssm_arns_and_selectors_are_resolved(monkeypatch):
+    ssm = SelectorSsmStandIn()
+    resolver = SecretResolver("AWS_SSM")
+    monkeypatch.setattr(resolver, "get_client", lambda serviceName: ssm)
+
+    values = {
+        "setting_1": "shodan",
+        "setting_2": "arn:aws:ssm:us-east-1:111111111111:parameter/virustotal",
+        "setting_3": "slack:3"
+    }
+    resolved = resolver.resolve_many(values)
+    assert resolved == {configurationName: f"secret-{value}" for configurationName, value in values.items()}
+    # names which could not be matched in the GetParameters response are retried one at a time
+    assert ssm.calls[1:] == ["arn:aws:ssm:us-east-1:111111111111:parameter/virustotal", "slack:3"]
+
+def test_batch_apis_fall_back_when_denied(monkeypatch):
+    for credentialsLocation, batchApi in [("AWS_SSM", "GetParameters"), ("AWS_SECRETS_MANAGER", "BatchGetSecretValue")]:
+        standIn = DeniedBatchStandIn()
+        resolver = SecretResolver(credentialsLocation)
+        monkeypatch.setattr(resolver, "get_client", lambda serviceName: standIn)
+
+        assert resolver.resolve_many({"setting_1": "shodan", "setting_2": "slack"}) == {
+            "setting_1": "secret-shodan", "setting_2": "secret-slack"
+        }
+        assert resolver.resolve("virustotal", "setting_3") == "secret-virustotal"
+        # the batch API is not tried again once it was denied
+        assert standIn.calls == [batchApi, "shodan", "slack", "virustotal"]
+
+def test_get_global_credential(tomlFile, monkeypatch):
+    ssm = SsmStandIn()
+    monkeypatch.setattr(SecretResolver, "get_client", lambda self, serviceName: ssm)
+
+    assert get_global_credential("shodan_api_key_value") == "secret-/electriceye/shodan"
+    assert get_global_credential("shodan_api_key_value") == "secret-/electriceye/shodan"
+    assert get_global_credential("virustotal_api_key_value") is None
+    assert len(ssm.calls) == 1
+
+def test_get_global_credential_reads_the_toml_cloudconfig_loaded(tmp_path, monkeypatch):
+    cloud_utils = pytest.importorskip("cloud_utils")
+    tomlFile = tmp_path / "custom.toml"
+    tomlFile.write_text(
+        """
+[global]
+aws_multi_account_target_type = "Accounts"
+credentials_location = "CONFIG_FILE"
+shodan_api_key_value = "MYKEY"
+"""
+    )
+    # the controller only exports TOML_FILE_PATH for the Outputs once the Checks have finished
+    monkeypatch.setenv("TOML_FILE_PATH", "None")
+    monkeypatch.setattr(external_providers, "_configSnapshots", {})
+    monkeypatch.setattr(external_providers, "_secretResolvers", {})
+    monkeypatch.setattr(external_providers, "_activeTomlFile", None)
+
+    cloud_utils.CloudConfig("Alibaba", str(tomlFile), "True", None)
+    assert get_global_credential("shodan_api_key_value") == "MYKEY"
+    assert load_external_providers_config() is load_external_providers_config(str(tomlFile))
+
+# EOF
@@ -0,0 +1,115 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import copy
+import gc
+import json
+import tracemalloc
+from base64 import b64encode
+from processor.finding_store import FindingStore
+from processor.main import process_findings
+from processor.outputs.output_base import ElectricEyeOutput, decode_asset_details
+from synthetic_estate import SyntheticEstate
+
+@ElectricEyeOutput
+class RecordingOutput(object):
+    __provider__ = "test_finding_store_recording"
+    findings = None
+
+    def write_findings(self, findings: list, **kwargs):
+        RecordingOutput.findings = findings
+
+@ElectricEyeOutput
+class DecodedRecordingOutput(RecordingOutput):
+    __provider__ = "test_finding_store_decoded_recording"
+    __decoded_assets__ = True
+
+def test_assets_are_stored_once():
+    findings = SyntheticEstate(1).asff_findings(200, checksPerAsset=20)
+    store = FindingStore(findings)
+
+    assert len(store) == 200
+    assert len(store.assets) == 10
+    assert all(record.finding["ProductFields"]["AssetDetails"] is None for record in store.records)
+
+def test_materialized_findings_match_the_originals():
+    findings = SyntheticEstate(2).asff_findings(100)
+    originals = copy.deepcopy(findings)
+    store = FindingStore(findings)
+    materialized = store.to_asff()
+
+    # Auditor findings are left untouched
+    assert findings == originals
+    assert materialized == originals
+    assert repr(materialized) == repr(originals)
+    assert list(materialized[0]["ProductFields"]) == list(originals[0]["ProductFields"])
+
+def test_decoded_assets_are_shared():
+    findings = SyntheticEstate(3).asff_findings(50, checksPerAsset=5)
+    store = FindingStore(findings)
+    decoded = store.to_asff(encodeAssets=False)
+
+    assert decoded[0]["ProductFields"]["AssetDetails"] is decoded[4]["ProductFields"]["AssetDetails"]
+    assert decoded[0]["ProductFields"]["AssetDetails"] == decode_asset_details(findings[0]["ProductFields"]["AssetDetails"])
+    # decoded and encoded forms of the same asset share one entry
+    store.add_asset(decoded[0]["ProductFields"]["AssetDetails"])
+    assert len(store.assets) == 10
+
+def test_findings_without_usable_assets_are_kept_as_is():
+    findings = [
+        {"Id": "no-product-fields"},
+        {"Id": "no-asset", "ProductFields": {"AssetDetails": None}},
+        {"Id": "not-base64", "ProductFields": {"AssetDetails": "%%% not base64 %%%"}},
+        {"Id": "encoded", "ProductFields": {"AssetDetails": b64encode(json.dumps({"Name": "asset"}).encode("utf-8"))}}
+    ]
+    store = FindingStore(findings)
+
+    assert store.to_asff() == findings
+    assert len(store.assets) == 1
+    assert store.to_asff(encodeAssets=False)[3]["ProductFields"]["AssetDetails"] == {"Name": "asset"}
+
+def test_outputs_are_handed_the_assets_they_expect():
+    findings = SyntheticEstate(4).asff_findings(20)
+    store = FindingStore(findings)
+
+    process_findings(store, ["test_finding_store_recording"])
+    assert RecordingOutput.findings == findings
+    process_findings(store, ["test_finding_store_decoded_recording"])
+    assert isinstance(RecordingOutput.findings[0]["ProductFields"]["AssetDetails"], dict)
+
+def test_store_holds_less_memory_than_the_findings():
+    def traced(build):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            held = build()
+            gc.collect()
+            return held, tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    findings, findingsSize = traced(lambda: SyntheticEstate(5).asff_findings(2000, checksPerAsset=20))
+    store, storeSize = traced(lambda: FindingStore(SyntheticEstate(5).asff_findings(2000, checksPerAsset=20)))
+
+    assert len(store) == len(findings)
+    assert storeSize * 1.5 < findingsSize
+
+# EOF
@@ -0,0 +1,148 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+from threading import Thread
+
+from collectors import gcp_collector
+from collectors.gcp_collector import execute_all_pages, get_compute_engine_instances, get_discovery_client
+
+class Credentials(object):
+    pass
+
+class RequestStandIn(object):
+    def __init__(self, response: dict):
+        self.response = response
+        self.executions = 0
+
+    def execute(self):
+        self.executions += 1
+        return self.response
+
+class PagedCollectionStandIn(object):
+    """
+    Mirrors a discovery collection where `list_next` returns None once a response has no `nextPageToken`
+    """
+
+    def __init__(self, pages: list):
+        self.pages = pages
+        self.listKwargs = None
+
+    def list(self, **kwargs):
+        self.listKwargs = kwargs
+        return RequestStandIn(self.pages[0])
+
+    def list_next(self, previous_request, previous_response):
+        pageToken = previous_response.get("nextPageToken")
+        if pageToken is None:
+            return None
+        return RequestStandIn(self.pages[int(pageToken)])
+
+class SinglePageCollectionStandIn(object):
+    def get(self, **kwargs):
+        return RequestStandIn({"name": kwargs["name"], "nextPageToken": "1"})
+
+def test_execute_all_pages_follows_list_next_until_exhausted():
+    collection = PagedCollectionStandIn(
+        [
+            {"items": ["a", "b"], "nextPageToken": "1"},
+            {"items": ["c"], "nextPageToken": "2"},
+            {"items": ["d"]}
+        ]
+    )
+
+    pages = list(execute_all_pages(collection, "list", project="project-a"))
+    assert [item for page in pages for item in page["items"]] == ["a", "b", "c", "d"]
+    assert collection.listKwargs == {"project": "project-a"}
+
+def test_execute_all_pages_without_next_method_yields_one_page():
+    pages = list(execute_all_pages(SinglePageCollectionStandIn(), "get", name="dataset"))
+    assert pages == [{"name": "dataset", "nextPageToken": "1"}]
+
+def count_builds(monkeypatch) -> list:
+    builds = []
+
+    def build_discovery_client(apiName, apiVersion, gcpCredentials):
+        builds.append((apiName, apiVersion))
+        return object()
+
+    monkeypatch.setattr(gcp_collector, "build_discovery_client", build_discovery_client)
+    return builds
+
+def test_get_discovery_client_is_reused_per_credentials(monkeypatch):
+    builds = count_builds(monkeypatch)
+    credentials = Credentials()
+
+    client = get_discovery_client("sqladmin", "v1beta4", credentials)
+    assert get_discovery_client("sqladmin", "v1beta4", credentials) is client
+    assert get_discovery_client("bigquery", "v2", credentials) is not client
+    assert get_discovery_client("sqladmin", "v1beta4", Credentials()) is not client
+    assert builds == [("sqladmin", "v1beta4"), ("bigquery", "v2"), ("sqladmin", "v1beta4")]
+
+def test_get_discovery_client_is_not_shared_across_threads(monkeypatch):
+    builds = count_builds(monkeypatch)
+    credentials = Credentials()
+    clients = []
+
+    client = get_discovery_client("compute", "v1", credentials)
+    thread = Thread(target=lambda: clients.append(get_discovery_client("compute", "v1", credentials)))
+    thread.start()
+    thread.join()
+
+    assert clients[0] is not client
+    assert len(builds) == 2
+
+class ComputeStandIn(object):
+    def __init__(self, pages: list):
+        self.collection = PagedCollectionStandIn(pages)
+        self.collection.aggregatedList = self.collection.list
+        self.collection.aggregatedList_next = self.collection.list_next
+
+    def instances(self):
+        return self.collection
+
+def test_get_compute_engine_instances_aggregates_pages_once_per_project(monkeypatch):
+    compute = ComputeStandIn(
+        [
+            {
+                "items": {
+                    "zones/us-east1-b": {"instances": [{"name": "vm-1"}, {"name": "vm-2"}]},
+                    # zones without instances only carry a warning
+                    "zones/us-east1-c": {"warning": {"code": "NO_RESULTS_ON_PAGE"}}
+                },
+                "nextPageToken": "1"
+            },
+            {"items": {"zones/us-west1-a": {"instances": [{"name": "vm-3"}]}}}
+        ]
+    )
+    builds = []
+
+    def build_discovery_client(apiName, apiVersion, gcpCredentials):
+        builds.append(apiName)
+        return compute
+
+    monkeypatch.setattr(gcp_collector, "build_discovery_client", build_discovery_client)
+    credentials = Credentials()
+
+    instances = get_compute_engine_instances("project-a", credentials)
+    assert [instance["name"] for instance in instances] == ["vm-1", "vm-2", "vm-3"]
+    assert compute.collection.listKwargs == {"project": "project-a"}
+    assert get_compute_engine_instances("project-a", credentials) is instances
+    assert builds == ["compute"]
@@ -0,0 +1,139 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import base64
+import json
+import pytest
+from collectors import aws_config_collector
+from incremental_scan import IncrementalScan
+
+REDSHIFT_CHECKS = ["redshift_cluster_public_access_check", "redshift_cluster_encryption_check"]
+FINDING = {
+    "Id": "arn:aws:redshift:us-east-1:111111111111:cluster:prod/redshift-cluster-public-access-check",
+    "UpdatedAt": "2020-01-01T00:00:00+00:00",
+    "ProductFields": {"AssetDetails": base64.b64encode(b'{"ClusterIdentifier": "prod"}')},
+    "Compliance": {"Status": "PASSED"}
+}
+
+class PaginatorStandIn(object):
+    def __init__(self, config):
+        self.config = config
+
+    def paginate(self, Expression):
+        self.config.expressions.append(Expression)
+        counts = self.config.changedCounts if "configurationItemCaptureTime" in Expression else self.config.counts
+        return [{"Results": [json.dumps({"resourceType": resourceType, "COUNT(*)": count}) for resourceType, count in counts.items()]}]
+
+class ConfigStandIn(object):
+    def __init__(self, recording=True, counts=None, changedCounts=None):
+        self.recording = recording
+        self.counts = counts if counts is not None else {"AWS::Redshift::Cluster": 2, "AWS::Redshift::ClusterParameterGroup": 9}
+        self.changedCounts = changedCounts or {}
+        self.expressions = []
+
+    def describe_configuration_recorder_status(self):
+        return {"ConfigurationRecordersStatus": [{"name": "default", "recording": self.recording}]}
+
+    def describe_configuration_recorders(self):
+        return {"ConfigurationRecorders": [{"name": "default", "recordingGroup": {"allSupported": True}}]}
+
+    def get_paginator(self, operationName):
+        return PaginatorStandIn(self)
+
+@pytest.fixture
+def config(monkeypatch):
+    standIn = ConfigStandIn()
+    monkeypatch.setattr(aws_config_collector, "get_pooled_client", lambda session, service: standIn)
+    return standIn
+
+def run_baseline(directory):
+    scan = IncrementalScan("111111111111", "us-east-1", directory=directory)
+    scan.detect_changes(object())
+    assert not scan.is_unchanged("redshift", REDSHIFT_CHECKS)
+    scan.record("redshift", REDSHIFT_CHECKS, [FINDING])
+    scan.save()
+
+def test_unchanged_auditors_are_carried_forward(config, tmp_path):
+    run_baseline(str(tmp_path))
+
+    scan = IncrementalScan("111111111111", "us-east-1", directory=str(tmp_path))
+    scan.detect_changes(object())
+    assert scan.is_unchanged("redshift", REDSHIFT_CHECKS)
+    assert "configurationItemCaptureTime >" in config.expressions[-1]
+
+    carried = scan.carry_forward("redshift")
+    assert carried[0]["UpdatedAt"] == scan.startedAt.isoformat()
+    assert carried[0]["ProductFields"]["AssetDetails"] == FINDING["ProductFields"]["AssetDetails"]
+
+    # Auditors that are not mapped to AWS Config resource types always run, as do those which also read other data
+    assert not scan.is_unchanged("ec2", ["ec2_imdsv2_check"])
+    assert not scan.is_unchanged("cloudtrail", ["cloudtrail_multi_region_check"])
+    assert not scan.is_unchanged("rds", ["rds_instance_public_access_check"])
+    # nor do Auditors run with a different set of Checks
+    assert not scan.is_unchanged("redshift", REDSHIFT_CHECKS[:1])
+
+def test_changed_and_deleted_resources_are_rescanned(config, tmp_path):
+    run_baseline(str(tmp_path))
+
+    config.changedCounts = {"AWS::Redshift::ClusterParameterGroup": 1}
+    scan = IncrementalScan("111111111111", "us-east-1", directory=str(tmp_path))
+    scan.detect_changes(object())
+    assert not scan.is_unchanged("redshift", REDSHIFT_CHECKS)
+
+    config.changedCounts = {}
+    config.counts = {"AWS::Redshift::Cluster": 1, "AWS::Redshift::ClusterParameterGroup": 9}
+    scan = IncrementalScan("111111111111", "us-east-1", directory=str(tmp_path))
+    scan.detect_changes(object())
+    assert not scan.is_unchanged("redshift", REDSHIFT_CHECKS)
+
+def test_stale_findings_and_missing_recorder_are_rescanned(config, tmp_path):
+    run_baseline(str(tmp_path))
+
+    scan = IncrementalScan("111111111111", "us-east-1", maxAgeSeconds=0, directory=str(tmp_path))
+    scan.detect_changes(object())
+    assert not scan.is_unchanged("redshift", REDSHIFT_CHECKS)
+
+    config.recording = False
+    scan = IncrementalScan("111111111111", "us-east-1", directory=str(tmp_path))
+    scan.detect_changes(object())
+    assert not scan.is_unchanged("redshift", REDSHIFT_CHECKS)
+    scan.save()
+
+    # without AWS Config there is no baseline for the next run either
+    config.recording = True
+    scan = IncrementalScan("111111111111", "us-east-1", directory=str(tmp_path))
+    scan.detect_changes(object())
+    assert scan.changedResourceTypes is None
+
+def test_unwritable_state_does_not_fail_the_scan(config, tmp_path):
+    # a file in place of the directory fails like a read-only install does
+    readOnlyDirectory = tmp_path / "incremental"
+    readOnlyDirectory.write_text("")
+
+    scan = IncrementalScan("111111111111", "us-east-1", directory=str(readOnlyDirectory))
+    scan.detect_changes(object())
+    scan.record("redshift", REDSHIFT_CHECKS, [FINDING])
+    scan.save()
+
+    scan = IncrementalScan("111111111111", "us-east-1", directory=str(readOnlyDirectory))
+    assert scan.previousState == {}
+
+# EOF
@@ -0,0 +1,90 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import pytest
+
+from collectors import m365_graph_collector
+from collectors.m365_graph_collector import GraphClient, get_retry_after_seconds, index_by_key
+
+class FakeResponse(object):
+    def __init__(self, status_code, payload, headers=None):
+        self.status_code = status_code
+        self.payload = payload
+        self.headers = headers or {}
+        self.reason = "Fake"
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        pass
+
+@pytest.fixture(scope="function")
+def graph(monkeypatch):
+    monkeypatch.setattr(m365_graph_collector, "sleep", lambda seconds: None)
+    return GraphClient("token")
+
+def test_get_all_pages_follows_next_link(graph, monkeypatch):
+    pages = {
+        "https://graph.microsoft.com/v1.0/users": {"value": [{"id": "1"}], "@odata.nextLink": "https://graph.microsoft.com/v1.0/users?$skiptoken=2"},
+        "https://graph.microsoft.com/v1.0/users?$skiptoken=2": {"value": [{"id": "2"}]}
+    }
+    monkeypatch.setattr(graph.session, "request", lambda method, url, **kwargs: FakeResponse(200, pages[url]))
+
+    assert graph.get_all_pages("/users") == [{"id": "1"}, {"id": "2"}]
+
+def test_batch_get_chunks_and_retries_throttled_requests(graph, monkeypatch):
+    batches = []
+    throttledOnce = set()
+
+    def fake_request(method, url, **kwargs):
+        assert url == "https://graph.microsoft.com/v1.0/$batch"
+        subRequests = kwargs["json"]["requests"]
+        batches.append(len(subRequests))
+        responses = []
+        for subRequest in subRequests:
+            # the first time user 7 is requested Graph throttles it
+            if subRequest["url"] == "/users/7/authentication/methods" and subRequest["url"] not in throttledOnce:
+                throttledOnce.add(subRequest["url"])
+                responses.append({"id": subRequest["id"], "status": 429, "headers": {"Retry-After": "1"}, "body": {}})
+            else:
+                responses.append({"id": subRequest["id"], "status": 200, "headers": {}, "body": {"value": [subRequest["url"]]}})
+        return FakeResponse(200, {"responses": responses})
+
+    monkeypatch.setattr(graph.session, "request", fake_request)
+
+    urls = [f"/users/{i}/authentication/methods" for i in range(45)]
+    responses = graph.batch_get(urls)
+
+    # 45 sub-requests fit into three $batch calls, plus one retry of the throttled sub-request
+    assert sorted(batches) == [1, 5, 20, 20]
+    assert [response["body"]["value"][0] for response in responses] == urls
+    assert all(response["status"] == 200 for response in responses)
+
+def test_retry_after_and_index_helpers():
+    assert get_retry_after_seconds({"retry-after": "7"}, 0) == 7
+    assert get_retry_after_seconds({}, 3) == 8
+    assert index_by_key([{"userId": "a"}, {"userId": "b"}, {"userId": "a"}], "userId") == {
+        "a": [{"userId": "a"}, {"userId": "a"}],
+        "b": [{"userId": "b"}]
+    }
+
+# EOF
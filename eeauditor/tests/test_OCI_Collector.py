@@ -0,0 +1,89 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+from collectors import oci_collector
+from collectors.oci_collector import get_exploitable_compute_instance_cves, index_instance_vnics, sweep_compartments
+
+COMPARTMENTS = [f"ocid1.compartment.oc1..aaaa{i}" for i in range(20)]
+
+def test_sweep_compartments_combines_results_in_compartment_order():
+    def list_instances(compartment):
+        # empty Compartments must not end the sweep early
+        if compartment.endswith("2"):
+            return []
+        return [f"{compartment}/instance-a", f"{compartment}/instance-b"]
+
+    instances = sweep_compartments(list_instances, COMPARTMENTS)
+    assert instances[0] == "ocid1.compartment.oc1..aaaa0/instance-a"
+    assert instances[-1] == "ocid1.compartment.oc1..aaaa19/instance-b"
+    assert len(instances) == 36
+
+def test_sweep_compartments_skips_failed_compartments():
+    def list_instances(compartment):
+        if compartment == COMPARTMENTS[5]:
+            raise RuntimeError("NotAuthorizedOrNotFound")
+        return [compartment]
+
+    assert sweep_compartments(list_instances, COMPARTMENTS) == [c for c in COMPARTMENTS if c != COMPARTMENTS[5]]
+
+def test_get_exploitable_compute_instance_cves_dedupes_instances(monkeypatch):
+    impacts = [
+        {"CompartmentId": COMPARTMENTS[0], "Cve": "CVE-2021-44228", "ImpactedResource": {"instance_id": "ocid1.instance.oc1..a"}},
+        {"CompartmentId": COMPARTMENTS[0], "Cve": "CVE-2021-44228", "ImpactedResource": {"instance_id": "ocid1.instance.oc1..b"}},
+        {"CompartmentId": COMPARTMENTS[1], "Cve": "CVE-2023-4966", "ImpactedResource": {"instance_id": "ocid1.instance.oc1..a"}},
+        {"CompartmentId": COMPARTMENTS[1], "Cve": "CVE-2023-4966", "ImpactedResource": {"instance_id": "ocid1.instance.oc1..a"}}
+    ]
+    monkeypatch.setattr(oci_collector, "get_exploitable_vulnerability_impacts", lambda *args: impacts)
+
+    instanceCves = get_exploitable_compute_instance_cves("tenancy", "user", "us-ashburn-1", COMPARTMENTS, "fingerprint", set())
+    assert instanceCves == {
+        "ocid1.instance.oc1..a": {"CVE-2021-44228", "CVE-2023-4966"},
+        "ocid1.instance.oc1..b": {"CVE-2021-44228"}
+    }
+
+def test_index_instance_vnics_prefers_primary_vnics():
+    attachments = [
+        # the secondary VNIC is attached first and is replaced once the primary VNIC is seen
+        {"instance_id": "ocid1.instance.oc1..a", "vnic_id": "ocid1.vnic.oc1..a-secondary"},
+        {"instance_id": "ocid1.instance.oc1..a", "vnic_id": "ocid1.vnic.oc1..a-primary"},
+        {"instance_id": "ocid1.instance.oc1..a", "vnic_id": "ocid1.vnic.oc1..a-other"},
+        {"instance_id": "ocid1.instance.oc1..b", "vnic_id": "ocid1.vnic.oc1..b-secondary"},
+        # a VNIC that could not be fetched leaves its instance out of the index
+        {"instance_id": "ocid1.instance.oc1..c", "vnic_id": "ocid1.vnic.oc1..c-deleted"},
+        # the same attachment listed twice is only fetched once
+        {"instance_id": "ocid1.instance.oc1..b", "vnic_id": "ocid1.vnic.oc1..b-secondary"}
+    ]
+    fetched = []
+
+    def get_vnic(vnicId):
+        fetched.append(vnicId)
+        if vnicId.endswith("deleted"):
+            return None
+        return {"id": vnicId, "is_primary": vnicId.endswith("primary")}
+
+    instanceVnics = index_instance_vnics(attachments, get_vnic)
+    assert instanceVnics == {
+        "ocid1.instance.oc1..a": {"id": "ocid1.vnic.oc1..a-primary", "is_primary": True},
+        "ocid1.instance.oc1..b": {"id": "ocid1.vnic.oc1..b-secondary", "is_primary": False}
+    }
+    assert sorted(fetched) == sorted(set(attachment["vnic_id"] for attachment in attachments))
+
+# EOF
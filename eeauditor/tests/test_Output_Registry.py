@@ -0,0 +1,52 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import os
+import re
+import sys
+from processor.outputs.output_base import OUTPUT_PROVIDER_MODULES, ElectricEyeOutput
+
+OUTPUTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "processor", "outputs"))
+
+def test_output_provider_table_matches_output_modules():
+    # read the `__provider__` of every output module from source so that no output is imported
+    declaredProviders = {}
+    for outputFile in os.listdir(OUTPUTS_DIR):
+        if outputFile.startswith(("__init__", "output_base")) or not outputFile.endswith(".py"):
+            continue
+        with open(os.path.join(OUTPUTS_DIR, outputFile)) as f:
+            for provider in re.findall(r'__provider__ = "([^"]+)"', f.read()):
+                declaredProviders[provider] = os.path.splitext(outputFile)[0]
+
+    assert declaredProviders == OUTPUT_PROVIDER_MODULES
+
+def test_get_all_providers_does_not_import_outputs():
+    providers = ElectricEyeOutput.get_all_providers()
+    assert "json" in providers and "html_compliance" in providers
+    assert "processor.outputs.html_compliance_output" not in sys.modules
+
+def test_get_provider_imports_only_the_selected_output():
+    provider = ElectricEyeOutput.get_provider("json")
+    assert provider.__provider__ == "json"
+    assert "processor.outputs.json_output" in sys.modules
+    assert "processor.outputs.mongodb_output" not in sys.modules
+
+# EOF
@@ -0,0 +1,178 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import datetime
+import json
+from io import BytesIO
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+import replay_harness
+from replay_harness import (
+    RECORD, REPLAY_MISS_ERROR_CODE, FixtureBundle, FixtureMissingError, ReplayHarness, redact_http_content, redact_url
+)
+
+LIST_USERS = {
+    "Users": [
+        {
+            "Path": "/",
+            "UserName": "example-user1",
+            "UserId": "AIDFUIOSFJKLDFJLKSJF",
+            "Arn": "arn:aws:iam::012345678901:user/example-user1",
+            "CreateDate": datetime.datetime(2020, 9, 3, 11, 23, 13, tzinfo=datetime.timezone.utc)
+        }
+    ],
+    "IsTruncated": False
+}
+
+def new_session():
+    return boto3.Session(region_name="us-east-1", aws_access_key_id="testing", aws_secret_access_key="testing")
+
+def record_bundle(filePath):
+    harness = ReplayHarness(mode=RECORD, bundlePath=filePath)
+    with harness:
+        session = new_session()
+        iam = session.client("iam")
+        s3 = session.client("s3")
+        secretsmanager = session.client("secretsmanager")
+        # Stubber stands in for the network, the harness records whatever the client receives
+        with Stubber(iam) as iamStubber, Stubber(s3) as s3Stubber, Stubber(secretsmanager) as smStubber:
+            iamStubber.add_response("list_users", LIST_USERS, {})
+            iamStubber.add_client_error("get_role", "NoSuchEntity", http_status_code=404, expected_params={"RoleName": "missing"})
+            s3Stubber.add_response("get_object", {"Body": StreamingBody(BytesIO(b"content"), 7)}, {"Bucket": "bucket", "Key": "key"})
+            smStubber.add_response("get_secret_value", {"Name": "secret", "SecretString": "hunter2"}, {"SecretId": "secret"})
+
+            assert iam.list_users()["Users"][0]["UserName"] == "example-user1"
+            with pytest.raises(ClientError):
+                iam.get_role(RoleName="missing")
+            # the recorder buffers streaming bodies, the caller can still read them
+            assert s3.get_object(Bucket="bucket", Key="key")["Body"].read() == b"content"
+            assert secretsmanager.get_secret_value(SecretId="secret")["SecretString"] == "hunter2"
+
+    return harness
+
+def test_recorded_calls_are_replayed_without_network(tmp_path):
+    bundlePath = str(tmp_path / "bundle.json")
+    record_bundle(bundlePath)
+
+    with ReplayHarness(FixtureBundle.load(bundlePath)) as harness:
+        session = new_session()
+        assert session.client("iam").list_users()["Users"] == LIST_USERS["Users"]
+        with pytest.raises(ClientError) as e:
+            session.client("iam").get_role(RoleName="missing")
+        assert e.value.response["Error"]["Code"] == "NoSuchEntity"
+        assert session.client("s3").get_object(Bucket="bucket", Key="key")["Body"].read() == b"content"
+        # secrets never reach the bundle
+        assert session.client("secretsmanager").get_secret_value(SecretId="secret")["SecretString"] == "REDACTED"
+
+    assert harness.missing == []
+
+def test_calls_missing_from_the_bundle(tmp_path):
+    with ReplayHarness(FixtureBundle()) as harness:
+        with pytest.raises(ClientError) as e:
+            new_session().client("iam").list_users()
+    assert e.value.response["Error"]["Code"] == REPLAY_MISS_ERROR_CODE
+    assert len(harness.missing) == 1
+
+    with ReplayHarness(FixtureBundle(), strict=True):
+        with pytest.raises(FixtureMissingError):
+            new_session().client("iam").list_users()
+
+def test_repeated_calls_are_served_in_recorded_order():
+    bundle = FixtureBundle()
+    bundle.add_botocore_response("iam", "ListUsers", "aws-global", {}, {"Users": [], "IsTruncated": False})
+    bundle.add_botocore_response("iam", "ListUsers", "aws-global", {}, LIST_USERS)
+
+    with ReplayHarness(bundle):
+        iam = new_session().client("iam")
+        assert iam.list_users()["Users"] == []
+        assert iam.list_users()["Users"] == LIST_USERS["Users"]
+        # the last response is repeated once the recorded ones are used up
+        assert iam.list_users()["Users"] == LIST_USERS["Users"]
+
+def test_synthetic_latency_is_deterministic(monkeypatch):
+    bundle = FixtureBundle()
+    bundle.add_botocore_response("iam", "ListUsers", "aws-global", {}, LIST_USERS)
+
+    def replay_delays(seed):
+        delays = []
+        monkeypatch.setattr(replay_harness, "sleep", delays.append)
+        with ReplayHarness(bundle, latencyMs=50, jitterMs=20, seed=seed):
+            iam = new_session().client("iam")
+            for _ in range(3):
+                iam.list_users()
+        return delays
+
+    delays = replay_delays(7)
+    assert len(delays) == 3
+    assert all(0.05 <= delay <= 0.07 for delay in delays)
+    assert replay_delays(7) == delays
+
+def test_http_credentials_are_redacted():
+    assert redact_url("https://api.shodan.io/shodan/host/203.0.113.10?key=shodan-secret&minify=true") == (
+        "https://api.shodan.io/shodan/host/203.0.113.10?key=REDACTED&minify=true"
+    )
+    assert redact_url("https://example.com/path") == "https://example.com/path"
+
+    tokenResponse = json.dumps(
+        {"access_token": "00D-bearer", "instance_url": "https://example.my.salesforce.com", "signature": "sig", "token_type": "Bearer"}
+    ).encode("utf-8")
+    redacted = json.loads(redact_http_content(tokenResponse, "application/json;charset=UTF-8"))
+    assert redacted["access_token"] == "REDACTED"
+    assert redacted["signature"] == "REDACTED"
+    assert redacted["instance_url"] == "https://example.my.salesforce.com"
+    assert redact_http_content(b"access_token=bearer&expires_in=3599", "application/x-www-form-urlencoded") == (
+        b"access_token=REDACTED&expires_in=3599"
+    )
+    assert redact_http_content(b"<html>token</html>", "text/html") == b"<html>token</html>"
+
+def test_recorded_http_calls_are_redacted_and_replayed():
+    requests = pytest.importorskip("requests")
+    from requests.models import Response
+
+    def send(session, request, **kwargs):
+        response = Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response.headers["Set-Cookie"] = "session=secret"
+        response._content = json.dumps({"access_token": "bearer", "expires_in": 3599}).encode("utf-8")
+        return response
+
+    harness = ReplayHarness(mode=RECORD)
+    request = requests.Request("GET", "https://api.shodan.io/shodan/host/203.0.113.10?key=shodan-secret").prepare()
+    assert harness.handle_http(send, None, request).json()["access_token"] == "bearer"
+
+    bundleJson = json.dumps(harness.bundle.calls)
+    assert "shodan-secret" not in bundleJson
+    assert "session=secret" not in bundleJson
+
+    # the call is replayed whichever API key it is made with
+    replayed = ReplayHarness(FixtureBundle(json.loads(bundleJson)), strict=True)
+    request = requests.Request("GET", "https://api.shodan.io/shodan/host/203.0.113.10?key=other-key").prepare()
+    assert replayed.handle_http(send, None, request).json()["access_token"] == "REDACTED"
+
+def test_harness_restores_boto3_on_exit():
+    originalInit = boto3.session.Session.__init__
+    with ReplayHarness(FixtureBundle()):
+        assert boto3.session.Session.__init__ is not originalInit
+    assert boto3.session.Session.__init__ is originalInit
@@ -0,0 +1,111 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import importlib
+import pytest
+from collectors import servicenow_collector
+from collectors.servicenow_collector import SYS_PROPERTY_FIELDS, get_sys_properties_snapshot, register_sys_properties
+
+SNOW_ENVIRONMENT = {
+    "SNOW_INSTANCE_NAME": "dev00000",
+    "SNOW_INSTANCE_REGION": "us",
+    "SNOW_SSPM_USERNAME": "electriceye",
+    "SNOW_SSPM_PASSWORD": "password",
+    "SNOW_FAILED_LOGIN_BREACHING_RATE": "5"
+}
+
+class ResponseStandIn(object):
+    def __init__(self, records: list):
+        self.records = records
+
+    def all(self):
+        return self.records
+
+class SysPropertiesStandIn(object):
+    """
+    Mirrors the pysnow Resource for sys_properties, returning only the requested properties that exist
+    """
+
+    def __init__(self, records: list):
+        self.records = records
+        self.instances = []
+        self.queries = []
+
+    def get(self, query, fields):
+        self.queries.append((query, fields))
+        names = query[len("nameIN"):].split(",")
+        return ResponseStandIn([record for record in self.records if record["name"] in names])
+
+@pytest.fixture
+def sysProperties(monkeypatch):
+    for name, value in SNOW_ENVIRONMENT.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setattr(servicenow_collector, "_referencedSysProperties", set())
+    monkeypatch.setattr(servicenow_collector, "_sysPropertySnapshots", {})
+
+    standIn = SysPropertiesStandIn(
+        [
+            {"name": "glide.security.file.mime_type.validation", "value": "true"},
+            {"name": "glide.attachment.extensions", "value": "pdf,png"}
+        ]
+    )
+
+    def get_sys_properties_resource(instanceName):
+        standIn.instances.append(instanceName)
+        return standIn
+
+    monkeypatch.setattr(servicenow_collector, "get_sys_properties_resource", get_sys_properties_resource)
+    return standIn
+
+def test_snapshot_is_queried_once_per_instance(sysProperties, monkeypatch):
+    register_sys_properties(["glide.security.file.mime_type.validation", "glide.attachment.extensions"])
+    register_sys_properties(["glide.attachment.extensions", "glide.ui.attachment.download_mime_types"])
+
+    snapshot = get_sys_properties_snapshot()
+    assert get_sys_properties_snapshot() is snapshot
+    assert sysProperties.queries == [
+        (
+            "nameINglide.attachment.extensions,glide.security.file.mime_type.validation,glide.ui.attachment.download_mime_types",
+            SYS_PROPERTY_FIELDS
+        )
+    ]
+    assert snapshot["glide.attachment.extensions"]["value"] == "pdf,png"
+    # properties that are not set on the instance are simply missing from the snapshot
+    assert "glide.ui.attachment.download_mime_types" not in snapshot
+
+    monkeypatch.setenv("SNOW_INSTANCE_NAME", "prod00000")
+    get_sys_properties_snapshot()
+    assert sysProperties.instances == ["dev00000", "prod00000"]
+
+def test_auditor_properties_are_filtered_and_missing_ones_fail(sysProperties):
+    pytest.importorskip("check_register")
+    auditor = importlib.import_module("auditors.servicenow.Servicenow_Attachments_Auditor")
+    # the Auditor registered its properties when it was first imported, which may have been by another test
+    register_sys_properties(auditor.SYS_PROPERTY_NAMES)
+
+    findings = list(auditor.servicenow_sspm_downloadable_mime_types_check({}, "000000000000", "us-placeholder-1", "not-aws"))
+    query, fields = sysProperties.queries[0]
+    assert set(query[len("nameIN"):].split(",")) == set(auditor.SYS_PROPERTY_NAMES)
+    # glide.ui.attachment.download_mime_types is not in the response, which fails the Check as NOT_CONFIGURED
+    assert findings[0]["Compliance"]["Status"] == "FAILED"
+    assert findings[0]["ProductFields"]["AssetDetails"] is None
+
+# EOF
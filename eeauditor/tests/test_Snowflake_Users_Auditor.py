@@ -0,0 +1,132 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import pytest
+
+pytest.importorskip("snowflake.connector")
+
+from auditors.snowflake.Snowflake_Users_Auditor import (
+    get_logons_without_mfa_by_user,
+    get_roles_by_user,
+    get_snowflake_users
+)
+
+USER_COLUMNS = [
+    "USER_ID", "NAME", "CREATED_ON", "DELETED_ON", "LOGIN_NAME", "DISPLAY_NAME", "FIRST_NAME", "LAST_NAME", "EMAIL",
+    "MUST_CHANGE_PASSWORD", "HAS_PASSWORD", "COMMENT", "DISABLED", "SNOWFLAKE_LOCK", "DEFAULT_WAREHOUSE",
+    "DEFAULT_NAMESPACE", "DEFAULT_ROLE", "EXT_AUTHN_DUO", "EXT_AUTHN_UID", "BYPASS_MFA_UNTIL", "LAST_SUCCESS_LOGIN",
+    "EXPIRES_AT", "LOCKED_UNTIL_TIME", "HAS_RSA_PUBLIC_KEY", "PASSWORD_LAST_SET_TIME", "OWNER", "DEFAULT_SECONDARY_ROLE"
+]
+
+class CursorStandIn(object):
+    """
+    Mirrors a Snowflake DictCursor over the ACCOUNT_USAGE views, applying the filters and the GROUP BY of the queries
+    the Auditor sends so that the tests fail if a query stops filtering revoked grants or MFA logons
+    """
+
+    def __init__(self, users: list, grants: list, logons: list, failingView: str | None = None):
+        self.users = users
+        self.grants = grants
+        self.logons = logons
+        self.failingView = failingView
+        self.queries = []
+        self.rows = []
+
+    def execute(self, query: str):
+        self.queries.append(query)
+        if self.failingView and self.failingView in query:
+            raise RuntimeError(f"Insufficient privileges to operate on {self.failingView}")
+
+        if "GRANTS_TO_USERS" in query:
+            grants = self.grants
+            if "DELETED_ON IS NULL" in query:
+                grants = [grant for grant in grants if grant["DELETED_ON"] is None]
+            self.rows = [{"GRANTEE_NAME": grant["GRANTEE_NAME"], "ROLE": grant["ROLE"]} for grant in grants]
+        elif "LOGIN_HISTORY" in query:
+            counts = {}
+            for logon in self.logons:
+                if logon["IS_SUCCESS"] == "YES" and logon["FIRST_AUTHENTICATION_FACTOR"] == "PASSWORD" and logon["SECOND_AUTHENTICATION_FACTOR"] is None:
+                    counts[logon["USER_NAME"]] = counts.get(logon["USER_NAME"], 0) + 1
+            assert "GROUP BY USER_NAME" in query
+            self.rows = [{"USER_NAME": userName, "LOGONS_WITHOUT_MFA": count} for userName, count in counts.items()]
+        else:
+            self.rows = [
+                dict(dict.fromkeys(USER_COLUMNS), USER_ID=i, NAME=name, PASSWORD_LAST_SET_TIME="2024-01-01 00:00:00")
+                for i, name in enumerate(self.users)
+            ]
+
+        return self
+
+    def fetchall(self):
+        return self.rows
+
+def create_cursor(failingView: str | None = None) -> CursorStandIn:
+    return CursorStandIn(
+        users=["ADMIN", "ANALYST", "SERVICE"],
+        grants=[
+            {"GRANTEE_NAME": "ADMIN", "ROLE": "ACCOUNTADMIN", "DELETED_ON": None},
+            {"GRANTEE_NAME": "ADMIN", "ROLE": "PUBLIC", "DELETED_ON": None},
+            # a revoked grant must not make the analyst an admin
+            {"GRANTEE_NAME": "ANALYST", "ROLE": "SYSADMIN", "DELETED_ON": "2024-01-01 00:00:00"},
+            {"GRANTEE_NAME": "ANALYST", "ROLE": "ANALYST", "DELETED_ON": None}
+        ],
+        logons=[
+            {"USER_NAME": "ADMIN", "IS_SUCCESS": "YES", "FIRST_AUTHENTICATION_FACTOR": "PASSWORD", "SECOND_AUTHENTICATION_FACTOR": None},
+            {"USER_NAME": "ADMIN", "IS_SUCCESS": "YES", "FIRST_AUTHENTICATION_FACTOR": "PASSWORD", "SECOND_AUTHENTICATION_FACTOR": None},
+            {"USER_NAME": "ANALYST", "IS_SUCCESS": "YES", "FIRST_AUTHENTICATION_FACTOR": "PASSWORD", "SECOND_AUTHENTICATION_FACTOR": "DUO"},
+            {"USER_NAME": "ANALYST", "IS_SUCCESS": "NO", "FIRST_AUTHENTICATION_FACTOR": "PASSWORD", "SECOND_AUTHENTICATION_FACTOR": None}
+        ],
+        failingView=failingView
+    )
+
+def test_roles_and_logons_are_keyed_by_user():
+    snowflakeCursor = create_cursor()
+
+    assert get_roles_by_user(snowflakeCursor) == {"ADMIN": ["ACCOUNTADMIN", "PUBLIC"], "ANALYST": ["ANALYST"]}
+    assert get_logons_without_mfa_by_user(snowflakeCursor) == {"ADMIN": 2}
+
+def test_users_without_grants_or_logons():
+    snowflakeCursor = create_cursor()
+
+    users = {user["name"]: user for user in get_snowflake_users({}, snowflakeCursor)}
+    # one query each for grants, logons and users no matter how many users there are
+    assert len(snowflakeCursor.queries) == 3
+
+    assert users["ADMIN"]["assigned_roles"] == ["ACCOUNTADMIN", "PUBLIC"]
+    assert users["ADMIN"]["is_admin"] is True
+    assert (users["ADMIN"]["logged_on_without_mfa"], users["ADMIN"]["total_logons_without_mfa"]) == (True, 2)
+
+    assert users["ANALYST"]["assigned_roles"] == ["ANALYST"]
+    assert users["ANALYST"]["is_admin"] is False
+    assert (users["ANALYST"]["logged_on_without_mfa"], users["ANALYST"]["total_logons_without_mfa"]) == (False, 0)
+
+    assert users["SERVICE"]["assigned_roles"] == []
+    assert users["SERVICE"]["is_admin"] is False
+    assert (users["SERVICE"]["logged_on_without_mfa"], users["SERVICE"]["total_logons_without_mfa"]) == (False, 0)
+
+def test_unreadable_grants_leave_admin_status_unknown():
+    users = get_snowflake_users({}, create_cursor(failingView="GRANTS_TO_USERS"))
+
+    assert [user["assigned_roles"] for user in users] == [[], [], []]
+    assert [user["is_admin"] for user in users] == [None, None, None]
+    assert users[0]["total_logons_without_mfa"] == 2
+
+# EOF
@@ -0,0 +1,96 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import base64
+import json
+import boto3
+import pytest
+from collectors.aws_iam_collector import get_iam_inventory
+from collectors.aws_s3_collector import get_bucket_configurations
+from collectors.azure_resource_graph_collector import enable_resource_graph, get_resources_by_type
+from replay_harness import FixtureBundle, ReplayHarness
+from synthetic_estate import SyntheticEstate, validate_response
+
+SUBSCRIPTIONS = ["00000000-0000-0000-0000-00000000000a", "00000000-0000-0000-0000-00000000000b"]
+
+class AzureCredentialStandIn(object):
+    pass
+
+def generate_bundle(seed):
+    estate = SyntheticEstate(seed)
+    bundle = FixtureBundle()
+    estate.add_iam_users(bundle, 1500)
+    estate.add_ec2_instances(bundle, 50)
+    estate.add_s3_buckets(bundle, 25)
+    return bundle
+
+def test_estates_are_reproducible_from_a_seed():
+    assert json.dumps(generate_bundle(7).calls, default=str) == json.dumps(generate_bundle(7).calls, default=str)
+    assert json.dumps(generate_bundle(7).calls, default=str) != json.dumps(generate_bundle(8).calls, default=str)
+
+def test_generated_aws_estate_is_served_by_the_replay_harness():
+    with ReplayHarness(generate_bundle(1), strict=True) as harness:
+        session = boto3.Session(region_name="us-east-1", aws_access_key_id="testing", aws_secret_access_key="testing")
+        # GetAccountAuthorizationDetails is paginated across two pages
+        inventory = get_iam_inventory({}, session)
+        instances = [
+            instance
+            for page in session.client("ec2").get_paginator("describe_instances").paginate(
+                Filters=[{"Name": "instance-state-name", "Values": ["running", "stopped"]}]
+            )
+            for reservation in page["Reservations"]
+            for instance in reservation["Instances"]
+        ]
+        buckets = [bucket for page in session.client("s3").get_paginator("list_buckets").paginate() for bucket in page["Buckets"]]
+        records = get_bucket_configurations(session, buckets)
+
+    assert harness.missing == []
+    assert len(inventory["Users"]) == 1500
+    assert inventory["CredentialReportAvailable"]
+    assert len(instances) == 50
+    assert len(records) == 25
+    # sub-resources that are not configured are served as the errors S3 returns
+    assert all(record["Policy"] is not None or record["Errors"]["Policy"] == "NoSuchBucketPolicy" for record in records.values())
+
+def test_invalid_responses_are_rejected():
+    with pytest.raises(ValueError):
+        validate_response("iam", "ListUsers", {"Users": [{"UserName": "missing-required-members"}]})
+
+def test_azure_rows_are_served_through_resource_graph():
+    estate = SyntheticEstate(3)
+    rows = estate.azure_resources("Microsoft.Storage/storageAccounts", 2500, SUBSCRIPTIONS)
+    credential = AzureCredentialStandIn()
+    enable_resource_graph(credential, SUBSCRIPTIONS, queryFunc=estate.resource_graph_query_func(rows))
+
+    storageAccounts = get_resources_by_type(credential, SUBSCRIPTIONS[0], "microsoft.storage/storageaccounts")
+    assert len(storageAccounts) == 1250
+    assert all(account["subscriptionId"] == SUBSCRIPTIONS[0] for account in storageAccounts)
+
+def test_gcp_pages_and_findings():
+    pages = SyntheticEstate(4).gcp_compute_instance_pages("synthetic-project", 1200)
+    assert [sum(len(zone["instances"]) for zone in page["items"].values()) for page in pages] == [500, 500, 200]
+    assert "nextPageToken" not in pages[-1]
+
+    findings = SyntheticEstate(5).asff_findings(100, checksPerAsset=4)
+    assert len(findings) == 100
+    assert len({finding["Resources"][0]["Id"] for finding in findings}) == 25
+    assetDetails = json.loads(base64.b64decode(findings[0]["ProductFields"]["AssetDetails"]))
+    assert findings[0]["Resources"][0]["Id"].endswith(assetDetails["InstanceId"])
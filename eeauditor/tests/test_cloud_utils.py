@@ -0,0 +1,58 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import json
+import os
+import subprocess
+import sys
+
+# Generous ceiling for importing the Controller modules, with the Provider SDKs deferred this is a fraction of it
+IMPORT_TIME_BUDGET_SECONDS = 3.0
+PROVIDER_SDK_MODULES = ["google", "googleapiclient", "azure", "snowflake", "oci", "pysnow"]
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import eeauditor.cloud_utils
+import eeauditor.eeauditor
+print(json.dumps({"seconds": time.perf_counter() - start, "modules": sorted(sys.modules)}))
+"""
+
+def import_controller_modules() -> dict:
+    # a fresh interpreter, otherwise other tests may have already imported the Provider SDKs
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_controller_import_does_not_load_provider_sdks():
+    loadedModules = import_controller_modules()["modules"]
+    loadedSdks = [module for module in loadedModules if module.split(".")[0] in PROVIDER_SDK_MODULES]
+    assert loadedSdks == []
+
+def test_controller_import_time_budget():
+    assert import_controller_modules()["seconds"] < IMPORT_TIME_BUDGET_SECONDS
+
+# EOF